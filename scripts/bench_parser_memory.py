@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria del parser BCN: árbol completo vs. streaming.
+
+Convierte una norma de la biblioteca (ley_v1) al formato ``obtxml`` de la BCN
+y la parsea en un subproceso limpio por modo:
+
+- ``arbol``: bytes completos + ``ET.fromstring`` + ``BCNXMLParser.parse``
+  (el camino de ``BCNLawScraperV2.fetch_xml``).
+- ``streaming``: ``BCNXMLParser.parse_stream`` leyendo el archivo por trozos.
+
+Para cada modo informa el pico de memoria Python (tracemalloc), el
+"sobrecosto XML" (pico menos la Norma resultante, que ambos modos deben
+retener) y el RSS máximo del proceso. Con ``--escala N`` las estructuras se
+replican N veces para ver cómo crece cada modo con el tamaño del documento.
+
+Uso:
+    python scripts/bench_parser_memory.py
+    python scripts/bench_parser_memory.py --escala 1 4 16
+    python scripts/bench_parser_memory.py --input biblioteca_xml/leyes/ley_21000.xml
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import argparse
+import copy
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from leychile_epub.bcn_fixtures import norma_from_ley_xml, norma_to_bcn_xml
+from leychile_epub.scraper_v2 import STREAM_CHUNK_SIZE, BCNXMLParser
+
+DEFAULT_INPUT = Path(__file__).parent.parent / "biblioteca_xml" / "codigos" / "codigo_civil.xml"
+MODOS = ("arbol", "streaming")
+
+
+def _max_rss_mb() -> float:
+    # ru_maxrss está en KiB en Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _worker(modo: str, path: Path) -> dict:
+    """Parsea ``path`` en el modo indicado y mide memoria (corre en subproceso)."""
+    from xml.etree import ElementTree as ET
+
+    parser = BCNXMLParser()
+    rss_inicial = _max_rss_mb()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+
+    if modo == "arbol":
+        data = path.read_bytes()
+        norma = parser.parse(ET.fromstring(data))
+        del data
+    else:
+        with open(path, "rb") as f:
+            norma = parser.parse_stream(iter(lambda: f.read(STREAM_CHUNK_SIZE), b""))
+
+    segundos = time.perf_counter() - inicio
+    retenido, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "modo": modo,
+        "estructuras": len(norma.estructuras),
+        "segundos": round(segundos, 3),
+        "pico_mb": round(pico / 2**20, 2),
+        "norma_mb": round(retenido / 2**20, 2),
+        "sobrecosto_mb": round((pico - retenido) / 2**20, 2),
+        "rss_delta_mb": round(_max_rss_mb() - rss_inicial, 2),
+    }
+
+
+def _build_input(source: Path, escala: int, destino: Path) -> int:
+    """Escribe el obtxml de ``source`` con las estructuras replicadas ``escala`` veces."""
+    norma = norma_from_ley_xml(source)
+    originales = norma.estructuras
+    norma.estructuras = []
+    for i in range(escala):
+        for ef in originales:
+            copia = copy.deepcopy(ef) if i else ef
+            if i:
+                copia.id_parte = f"{ef.id_parte}-{i}"
+            norma.estructuras.append(copia)
+    data = norma_to_bcn_xml(norma)
+    destino.write_bytes(data)
+    return len(data)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--input", type=Path, default=DEFAULT_INPUT, help="XML ley_v1 de origen")
+    parser.add_argument("--escala", type=int, nargs="+", default=[1], help="Factores de tamaño")
+    parser.add_argument("--json", action="store_true", help="Salida en JSON")
+    parser.add_argument("--worker", nargs=2, metavar=("MODO", "ARCHIVO"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_worker(args.worker[0], Path(args.worker[1]))))
+        return 0
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for escala in args.escala:
+            path = Path(tmp) / f"norma_x{escala}.xml"
+            tamano = _build_input(args.input, escala, path)
+            for modo in MODOS:
+                salida = subprocess.run(
+                    [sys.executable, __file__, "--worker", modo, str(path)],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                resultado = json.loads(salida)
+                resultado.update({"escala": escala, "xml_mb": round(tamano / 2**20, 2)})
+                resultados.append(resultado)
+
+    if args.json:
+        print(json.dumps(resultados, indent=2))
+        return 0
+
+    print(f"Entrada: {args.input}")
+    print(
+        f"{'escala':>6} {'xml MB':>7} {'modo':>10} {'seg':>7} {'pico MB':>8} "
+        f"{'Norma MB':>9} {'sobrecosto MB':>14} {'ΔRSS MB':>8}"
+    )
+    for r in resultados:
+        print(
+            f"{r['escala']:>6} {r['xml_mb']:>7} {r['modo']:>10} {r['segundos']:>7} "
+            f"{r['pico_mb']:>8} {r['norma_mb']:>9} {r['sobrecosto_mb']:>14} "
+            f"{r['rss_delta_mb']:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
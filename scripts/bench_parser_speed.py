@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark de velocidad de los backends del parser BCN (etree vs. lxml).
+
+Convierte normas de la biblioteca (ley_v1) al formato ``obtxml`` de la BCN y
+mide, para cada backend, el tiempo de construir el árbol y de extraer la
+Norma, normalizado por MB de XML. También verifica que ambos backends
+produzcan exactamente la misma Norma.
+
+Uso:
+    python scripts/bench_parser_speed.py
+    python scripts/bench_parser_speed.py --repeticiones 10
+    python scripts/bench_parser_speed.py --input biblioteca_xml/leyes/ley_21000.xml
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from leychile_epub.bcn_fixtures import ley_xml_to_bcn_xml
+from leychile_epub.scraper_v2 import PARSER_BACKENDS, create_parser
+
+DEFAULT_INPUT = [
+    Path(__file__).parent.parent / "biblioteca_xml" / "codigos" / "codigo_civil.xml",
+    Path(__file__).parent.parent / "biblioteca_xml" / "codigos" / "codigo_trabajo.xml",
+]
+
+
+def _medir(backend: str, xml: bytes, repeticiones: int) -> tuple[float, float]:
+    """Retorna el mejor tiempo (s) de construir el árbol y de extraer la Norma."""
+    parser = create_parser(backend)
+    arbol = extraccion = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        root = parser.fromstring(xml)
+        medio = time.perf_counter()
+        parser.parse(root)
+        fin = time.perf_counter()
+        arbol = min(arbol, medio - inicio)
+        extraccion = min(extraccion, fin - medio)
+    return arbol, extraccion
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--input", type=Path, nargs="+", default=DEFAULT_INPUT)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'norma':<28} {'MB':>5} {'backend':>8} "
+        f"{'árbol s/MB':>11} {'Norma s/MB':>11} {'total s/MB':>11}"
+    )
+    for path in args.input:
+        if not path.exists():
+            print(f"  (omitido, no existe: {path})")
+            continue
+        xml = ley_xml_to_bcn_xml(path)
+        mb = len(xml) / 2**20
+
+        normas = []
+        for backend in PARSER_BACKENDS:
+            bcn_parser = create_parser(backend)
+            normas.append(bcn_parser.parse(bcn_parser.fromstring(xml)))
+        if any(norma != normas[0] for norma in normas):
+            print(f"ERROR: los backends producen Normas distintas para {path.name}")
+            return 1
+
+        base = None
+        for backend in PARSER_BACKENDS:
+            arbol, extraccion = _medir(backend, xml, args.repeticiones)
+            total = (arbol + extraccion) / mb
+            base = base or total
+            print(
+                f"{path.stem:<28} {mb:>5.2f} {backend:>8} {arbol / mb:>11.4f} "
+                f"{extraccion / mb:>11.4f} {total:>11.4f}  (x{base / total:.2f})"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
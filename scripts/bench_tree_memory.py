@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria del árbol Norma/EstructuraFuncional sobre la biblioteca.
+
+Convierte cada norma de ``biblioteca_xml/`` (ley_v1) al formato ``obtxml`` de
+la BCN, la parsea con ``BCNXMLParser`` y mantiene todas las Normas en memoria,
+como hace el generador de la biblioteca. Cada modo corre en un subproceso
+limpio y mide con tracemalloc la memoria retenida por los árboles:
+
+- ``compacto``: la representación actual (``__slots__``, tupla vacía
+  compartida en los nodos sin materias/hijos, ``tipo_parte`` y
+  ``fecha_version`` internados).
+- ``legado``: los mismos árboles copiados a dataclasses equivalentes sin
+  ``__slots__``, con listas propias en cada nodo y cadenas no compartidas,
+  que es como quedaban antes de compactar la representación.
+
+Uso:
+    python scripts/bench_tree_memory.py
+    python scripts/bench_tree_memory.py --corpus biblioteca_xml/codigos --json
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import argparse
+import dataclasses
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from leychile_epub.bcn_fixtures import ley_xml_to_bcn_xml
+from leychile_epub.scraper_v2 import (
+    BCNXMLParser,
+    EstructuraFuncional,
+    Norma,
+    NormaIdentificador,
+    NormaMetadatos,
+)
+
+DEFAULT_CORPUS = Path(__file__).parent.parent / "biblioteca_xml"
+MODOS = ("legado", "compacto")
+
+
+def _legacy_class(cls: type) -> type:
+    """Copia de una dataclass sin ``__slots__`` y con listas por defecto."""
+    campos = []
+    for f in dataclasses.fields(cls):
+        if f.default_factory is not dataclasses.MISSING:
+            campos.append((f.name, f.type, dataclasses.field(default_factory=f.default_factory)))
+        else:
+            campos.append((f.name, f.type, dataclasses.field(default=f.default)))
+    return dataclasses.make_dataclass(f"Legacy{cls.__name__}", campos)
+
+
+LegacyEstructura = _legacy_class(EstructuraFuncional)
+LegacyNorma = _legacy_class(Norma)
+LegacyIdentificador = _legacy_class(NormaIdentificador)
+LegacyMetadatos = _legacy_class(NormaMetadatos)
+
+
+def _copia(texto: str) -> str:
+    # Cadena nueva con el mismo contenido (como las que entrega el parser XML)
+    return texto[:1] + texto[1:]
+
+
+def _legacy_estructura(ef: EstructuraFuncional) -> object:
+    return LegacyEstructura(
+        id_parte=ef.id_parte,
+        tipo_parte=_copia(ef.tipo_parte),
+        texto=ef.texto,
+        nombre_parte=ef.nombre_parte,
+        titulo_parte=ef.titulo_parte,
+        fecha_version=_copia(ef.fecha_version),
+        derogado=ef.derogado,
+        transitorio=ef.transitorio,
+        materias=list(ef.materias),
+        hijos=[_legacy_estructura(h) for h in ef.hijos],
+        nivel=ef.nivel,
+    )
+
+
+def _legacy_norma(norma: Norma) -> object:
+    valores = {f.name: getattr(norma, f.name) for f in dataclasses.fields(Norma)}
+    valores["identificador"] = LegacyIdentificador(**dataclasses.asdict(norma.identificador))
+    valores["metadatos"] = LegacyMetadatos(**dataclasses.asdict(norma.metadatos))
+    valores["estructuras"] = [_legacy_estructura(ef) for ef in norma.estructuras]
+    return LegacyNorma(**valores)
+
+
+def _contar(estructuras) -> int:
+    return sum(1 + _contar(ef.hijos) for ef in estructuras)
+
+
+def _worker(modo: str, directorio: Path) -> dict:
+    """Parsea todo el corpus y mide la memoria retenida (corre en subproceso)."""
+    parser = BCNXMLParser()
+    archivos = sorted(directorio.glob("*.xml"))
+    normas = []
+    nodos = 0
+
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    for path in archivos:
+        norma = parser.parse(ET.fromstring(path.read_bytes()))
+        nodos += _contar(norma.estructuras)
+        normas.append(_legacy_norma(norma) if modo == "legado" else norma)
+        del norma
+    segundos = time.perf_counter() - inicio
+    retenido, _pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "modo": modo,
+        "normas": len(normas),
+        "nodos": nodos,
+        "segundos": round(segundos, 3),
+        "retenido_mb": round(retenido / 2**20, 2),
+        "bytes_por_nodo": round(retenido / max(nodos, 1)),
+    }
+
+
+def _preparar_corpus(corpus: Path, destino: Path) -> int:
+    """Convierte las normas ley_v1 del corpus a obtxml en ``destino``."""
+    convertidas = 0
+    for i, path in enumerate(sorted(corpus.rglob("*.xml"))):
+        if path.name == "indice.xml":
+            continue
+        try:
+            data = ley_xml_to_bcn_xml(path)
+        except (ET.ParseError, ValueError) as e:
+            print(f"Se omite {path}: {e}", file=sys.stderr)
+            continue
+        (destino / f"{i:04d}_{path.stem}.xml").write_bytes(data)
+        convertidas += 1
+    return convertidas
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Directorio ley_v1")
+    parser.add_argument("--json", action="store_true", help="Salida en JSON")
+    parser.add_argument("--worker", nargs=2, metavar=("MODO", "DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_worker(args.worker[0], Path(args.worker[1]))))
+        return 0
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as tmp:
+        if not _preparar_corpus(args.corpus, Path(tmp)):
+            print(f"No hay normas en {args.corpus}", file=sys.stderr)
+            return 1
+        for modo in MODOS:
+            salida = subprocess.run(
+                [sys.executable, __file__, "--worker", modo, tmp],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            resultados.append(json.loads(salida))
+
+    legado = resultados[0]["retenido_mb"]
+    for r in resultados:
+        r["reduccion_pct"] = round(100 * (1 - r["retenido_mb"] / legado), 1) if legado else 0.0
+
+    if args.json:
+        print(json.dumps(resultados, indent=2))
+        return 0
+
+    print(f"Corpus: {args.corpus} ({resultados[0]['normas']} normas)")
+    print(
+        f"{'modo':>10} {'nodos':>8} {'seg':>7} {'retenido MB':>12} {'B/nodo':>7} {'reducción':>10}"
+    )
+    for r in resultados:
+        print(
+            f"{r['modo']:>10} {r['nodos']:>8} {r['segundos']:>7} {r['retenido_mb']:>12} "
+            f"{r['bytes_por_nodo']:>7} {r['reduccion_pct']:>9}%"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
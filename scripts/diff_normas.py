@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Compara dos versiones de una norma y reporta sus diferencias estructurales.
+
+Acepta XML de la BCN (``obtxml``) o XML ley_v1 de la biblioteca, en cualquier
+combinación, y escribe el diff como JSON o como XML anotado (ver
+:mod:`leychile_epub.diff`).
+
+Uso:
+    python scripts/diff_normas.py anterior.xml nueva.xml
+    python scripts/diff_normas.py anterior.xml nueva.xml --formato xml -o cambios.xml
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from leychile_epub.bcn_fixtures import LEY_NS, norma_from_ley_xml
+from leychile_epub.diff import diff_normas
+from leychile_epub.scraper_v2 import BCNXMLParser, Norma
+
+
+def cargar_norma(path: Path) -> Norma:
+    """Lee una norma en formato BCN o ley_v1 según su elemento raíz."""
+    root = ET.parse(path).getroot()
+    if root.tag == f"{{{LEY_NS}}}ley":
+        return norma_from_ley_xml(path)
+    return BCNXMLParser().parse(root)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("anterior", type=Path, help="Versión anterior")
+    parser.add_argument("nueva", type=Path, help="Versión nueva")
+    parser.add_argument("--formato", choices=("json", "xml"), default="json")
+    parser.add_argument("-o", "--output", type=Path, help="Archivo de salida (default: stdout)")
+    args = parser.parse_args()
+
+    diff = diff_normas(cargar_norma(args.anterior), cargar_norma(args.nueva))
+    salida = diff.to_json().encode("utf-8") if args.formato == "json" else diff.to_xml()
+
+    if args.output:
+        args.output.write_bytes(salida)
+        resumen = ", ".join(f"{n} {tipo}s" for tipo, n in diff.resumen().items() if n)
+        print(f"{args.output}: {resumen or 'sin cambios'}")
+    else:
+        sys.stdout.buffer.write(salida + b"\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
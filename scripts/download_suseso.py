@@ -17,20 +17,24 @@ import argparse
 import json
 import re
 import sys
-import time
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from urllib.parse import urljoin
 
 import requests
 from bs4 import BeautifulSoup, Tag
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from leychile_epub.http_session import SessionSettings, get_session
+from leychile_epub.rate_limiter import get_rate_limiter, throttled_get
 
 BASE_URL = "https://www.suseso.cl/620/"
 ROOT_URL = f"{BASE_URL}w3-propertyname-785.html"
 OUTPUT_DIR = Path("biblioteca_suseso")
 RATE_LIMIT = 0.5  # segundos entre requests
+LIMITER = get_rate_limiter(1 / RATE_LIMIT)
 
 
 # ---------------------------------------------------------------------------
@@ -91,30 +95,20 @@ class NodoCompendio:
 
 
 def crear_session() -> requests.Session:
-    """Crea una sesión HTTP con retry y headers apropiados."""
-    session = requests.Session()
-    retry = Retry(
-        total=3,
-        backoff_factor=1.0,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET"],
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
-    session.headers.update(
-        {
-            "User-Agent": "LeyChile-ePub-Generator/1.1.0 (compendio-suseso)",
-            "Accept": "text/html,application/xhtml+xml",
-            "Accept-Language": "es-CL,es;q=0.9",
-        }
+    """Obtiene la sesión HTTP compartida con retry y headers apropiados."""
+    return get_session(
+        SessionSettings(
+            user_agent="LeyChile-ePub-Generator/1.1.0 (compendio-suseso)",
+            accept="text/html,application/xhtml+xml",
+            max_retries=3,
+            backoff=1.0,
+        )
     )
-    return session
 
 
 def fetch_page(session: requests.Session, url: str) -> BeautifulSoup:
-    """Descarga y parsea una página HTML."""
-    resp = session.get(url, timeout=30)
+    """Descarga y parsea una página HTML respetando el limitador de tasa."""
+    resp = throttled_get(session, url, LIMITER, timeout=30, max_retries=3)
     resp.encoding = "utf-8"
     resp.raise_for_status()
     return BeautifulSoup(resp.text, "html.parser")
@@ -426,7 +420,6 @@ def descargar_libro(
     print(f"  Descargando índice desde {info['url']}")
 
     soup = fetch_page(session, info["url"])
-    time.sleep(RATE_LIMIT)
 
     arbol = parsear_indice_libro(soup, libro_num)
     if not arbol:
@@ -464,7 +457,6 @@ def descargar_libro(
         try:
             soup_nodo = fetch_page(session, nodo.url)
             contenido = extraer_contenido(soup_nodo, nodo.pvid)
-            time.sleep(RATE_LIMIT)
         except Exception as e:
             print(f"  ERROR [{nodo.numero}]: {e}")
             continue
@@ -10,6 +10,7 @@ Uso:
     python scripts/generar_biblioteca_xml.py --output ./mi_biblioteca
     python scripts/generar_biblioteca_xml.py --leyes comercial
     python scripts/generar_biblioteca_xml.py --leyes completa  # Todas las leyes
+    python scripts/generar_biblioteca_xml.py --leyes completa --incremental
 
 Author: Luis Aguilera Arteaga <luis@aguilera.cl>
 """
@@ -695,6 +696,13 @@ def parse_args() -> argparse.Namespace:
         help="URL específica de una ley para generar individualmente",
     )
 
+    parser.add_argument(
+        "-i",
+        "--incremental",
+        action="store_true",
+        help="Regenerar sólo las leyes cuya versión en la BCN cambió",
+    )
+
     parser.add_argument(
         "-v",
         "--verbose",
@@ -714,7 +722,7 @@ def generar_ley_individual(url: str, output_dir: str) -> None:
     logger.info(f"✅ Generado: {xml_path}")
 
 
-def generar_biblioteca(biblioteca_key: str, output_dir: str) -> None:
+def generar_biblioteca(biblioteca_key: str, output_dir: str, incremental: bool = False) -> None:
     """Genera una biblioteca completa de leyes."""
     biblioteca_config = BIBLIOTECAS[biblioteca_key]
 
@@ -729,6 +737,7 @@ def generar_biblioteca(biblioteca_key: str, output_dir: str) -> None:
         leyes=biblioteca_config["leyes"],
         output_dir=output_dir,
         nombre=biblioteca_config["nombre"],
+        incremental=incremental,
     )
 
     # Mostrar resumen
@@ -737,8 +746,12 @@ def generar_biblioteca(biblioteca_key: str, output_dir: str) -> None:
     print("-" * 60)
     print(f"   Directorio: {resultado['directorio']}")
     print(f"   Leyes procesadas: {len(resultado['leyes'])}")
+    plan = resultado["plan"]
+    print(f"   🌐 Descargas únicas: {plan['descargas']} ({plan['duplicadas']} duplicadas)")
     print(f"   ✅ Exitosas: {resultado['exitosas']}")
     print(f"   ❌ Fallidas: {resultado['fallidas']}")
+    if incremental:
+        print(f"   ⏭️  Sin cambios: {resultado['sin_cambios']}")
 
     if resultado.get("indice"):
         print(f"   📑 Índice: {resultado['indice']}")
@@ -769,7 +782,7 @@ def main() -> int:
             generar_ley_individual(args.url, args.output)
         else:
             # Generar biblioteca
-            generar_biblioteca(args.leyes, args.output)
+            generar_biblioteca(args.leyes, args.output, args.incremental)
 
         return 0
 
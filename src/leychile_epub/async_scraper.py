@@ -0,0 +1,197 @@
+"""
+Scraper asíncrono para descargar muchas normas de la BCN en paralelo.
+
+Mientras :class:`BCNLawScraperV2` descarga una norma a la vez, este módulo
+mantiene varias solicitudes en vuelo sobre el mismo pool de conexiones, con
+un tope de concurrencia. La cortesía hacia la BCN la impone el limitador de
+tasa compartido (:mod:`leychile_epub.rate_limiter`) que usa el scraper.
+
+La descarga y el parseo se delegan en :class:`BCNLawScraperV2`, por lo que
+las normas resultantes y las excepciones (``NetworkError``, ``ParsingError``,
+``ValidationError``) son idénticas a las del scraper síncrono.
+
+Example:
+    >>> from leychile_epub.async_scraper import AsyncBCNLawScraper
+    >>> urls = [
+    ...     "https://www.leychile.cl/Navegar?idNorma=172986",
+    ...     "https://www.leychile.cl/Navegar?idNorma=1974",
+    ... ]
+    >>> resultados = AsyncBCNLawScraper().scrape_all(urls)
+    >>> [r.norma.titulo_completo for r in resultados if r.ok]
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from .config import Config, get_config
+from .exceptions import LeyChileError
+from .scraper_v2 import BCNLawScraperV2, Norma
+
+logger = logging.getLogger("leychile_epub.async_scraper")
+
+T = TypeVar("T")
+
+
+@dataclass
+class ScrapeResult:
+    """Resultado de descargar una URL dentro de un lote.
+
+    Attributes:
+        index: Posición de la URL en la lista de entrada.
+        url: URL original de LeyChile.
+        norma: Norma parseada (None si hubo error).
+        error: Excepción del paquete que impidió obtener la norma.
+    """
+
+    index: int
+    url: str
+    norma: Norma | None = None
+    error: LeyChileError | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Indica si la norma se obtuvo correctamente."""
+        return self.error is None
+
+
+class AsyncBCNLawScraper:
+    """Scraper asíncrono que descarga varias normas de forma concurrente.
+
+    Las solicitudes HTTP comparten la sesión (y su pool de conexiones) de un
+    :class:`BCNLawScraperV2` interno y se ejecutan en un pool de hilos de
+    tamaño ``max_concurrency``. El inicio de cada solicitud a la red respeta
+    el limitador de tasa compartido del proceso; los aciertos del caché no
+    esperan.
+
+    Example:
+        >>> async def main(urls):
+        ...     async with AsyncBCNLawScraper() as scraper:
+        ...         async for resultado in scraper.scrape_many(urls):
+        ...             print(resultado.url, resultado.ok)
+    """
+
+    def __init__(self, config: Config | None = None, max_concurrency: int | None = None) -> None:
+        """Inicializa el scraper.
+
+        Args:
+            config: Configuración opcional.
+            max_concurrency: Solicitudes simultáneas. Por defecto
+                ``config.scraper.max_concurrency``.
+        """
+        self.config = config or get_config()
+        self.max_concurrency = max(max_concurrency or self.config.scraper.max_concurrency, 1)
+        self.scraper = BCNLawScraperV2(self.config)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="leychile-fetch"
+        )
+        logger.debug(f"AsyncBCNLawScraper inicializado (concurrencia={self.max_concurrency})")
+
+    async def __aenter__(self) -> AsyncBCNLawScraper:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Libera el pool de hilos y la sesión HTTP."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.scraper.close()
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def scrape(self, url: str) -> Norma:
+        """Descarga y parsea una norma.
+
+        Args:
+            url: URL de LeyChile con el parámetro idNorma.
+
+        Returns:
+            Objeto Norma con todos los datos estructurados.
+
+        Raises:
+            ValidationError: Si la URL no contiene idNorma válido.
+            NetworkError: Si hay problemas de conexión.
+            ParsingError: Si el XML no se puede procesar.
+        """
+        return await self._run(self.scraper.scrape, url)
+
+    async def _scrape_indexed(
+        self, index: int, url: str, semaphore: asyncio.Semaphore
+    ) -> ScrapeResult:
+        async with semaphore:
+            try:
+                norma = await self.scrape(url)
+            except LeyChileError as e:
+                logger.warning(f"Error obteniendo {url}: {e}")
+                return ScrapeResult(index=index, url=url, error=e)
+        return ScrapeResult(index=index, url=url, norma=norma)
+
+    async def scrape_many(self, urls: Iterable[str]) -> AsyncIterator[ScrapeResult]:
+        """Descarga varias normas y las entrega a medida que terminan.
+
+        Los errores de una URL no interrumpen el lote: se reportan en
+        ``ScrapeResult.error`` con la misma excepción que lanzaría
+        :meth:`BCNLawScraperV2.scrape`.
+
+        Args:
+            urls: URLs de LeyChile.
+
+        Yields:
+            ScrapeResult por cada URL, en orden de finalización.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            asyncio.create_task(self._scrape_indexed(i, url, semaphore))
+            for i, url in enumerate(urls)
+        ]
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def gather(self, urls: Iterable[str]) -> list[ScrapeResult]:
+        """Descarga varias normas y retorna los resultados en el orden de entrada."""
+        resultados = [r async for r in self.scrape_many(urls)]
+        resultados.sort(key=lambda r: r.index)
+        return resultados
+
+    def scrape_all(self, urls: Iterable[str]) -> list[ScrapeResult]:
+        """Versión síncrona de :meth:`gather` para código sin event loop.
+
+        Args:
+            urls: URLs de LeyChile.
+
+        Returns:
+            Lista de ScrapeResult en el mismo orden que ``urls``.
+        """
+        return asyncio.run(self.gather(list(urls)))
+
+
+def scrape_many(urls: Iterable[str], config: Config | None = None) -> list[ScrapeResult]:
+    """Función de conveniencia para descargar un lote de normas concurrentemente.
+
+    Args:
+        urls: URLs de LeyChile.
+        config: Configuración opcional.
+
+    Returns:
+        Lista de ScrapeResult en el mismo orden que ``urls``.
+    """
+    scraper = AsyncBCNLawScraper(config)
+    try:
+        return scraper.scrape_all(urls)
+    finally:
+        scraper.close()
@@ -0,0 +1,301 @@
+"""
+Fixtures en formato BCN (``obtxml``) para pruebas y benchmarks sin red.
+
+La biblioteca (``biblioteca_xml/``) guarda las normas en el esquema ley_v1
+generado por :class:`~leychile_epub.xml_generator.LawXMLGenerator`, no en el
+XML de intercambio que entrega la BCN. Este módulo hace el camino inverso:
+reconstruye una :class:`Norma` desde un XML ley_v1 y la serializa con el
+esquema ``EsquemaIntercambioNorma-v1-0`` que consume :class:`BCNXMLParser`.
+
+La reconstrucción es aproximada (los incisos numerados vuelven como
+párrafos "N. texto" y se pierden las referencias calculadas), pero
+``BCNXMLParser().parse()`` de la salida de :func:`norma_to_bcn_xml` es igual
+a la Norma de entrada salvo ``url_original`` e ``id_version``.
+
+Example:
+    >>> from leychile_epub.bcn_fixtures import ley_xml_to_bcn_xml
+    >>> xml = ley_xml_to_bcn_xml("biblioteca_xml/codigos/codigo_civil.xml")
+    >>> Path("codigo_civil.obtxml").write_bytes(xml)
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+from .scraper_v2 import (
+    NS,
+    EstructuraFuncional,
+    Norma,
+    NormaIdentificador,
+    NormaMetadatos,
+)
+
+# Namespace del esquema ley_v1 de la biblioteca
+LEY_NS = "https://leychile.cl/schema/ley/v1"
+
+
+def _bcn(tag: str) -> str:
+    return f"{{{NS['lc']}}}{tag}"
+
+
+def _ley(tag: str) -> str:
+    return f"{{{LEY_NS}}}{tag}"
+
+
+# =============================================================================
+# ley_v1 → Norma
+# =============================================================================
+
+
+def norma_from_ley_xml(path: str | Path) -> Norma:
+    """Reconstruye una Norma desde un XML ley_v1 de la biblioteca.
+
+    Args:
+        path: Ruta al XML ley_v1.
+
+    Returns:
+        Norma equivalente (ver limitaciones en la documentación del módulo).
+    """
+    root = ET.parse(path).getroot()
+
+    norma = Norma(
+        norma_id=root.get("id_norma", ""),
+        fecha_version=root.get("fecha_version", ""),
+        derogado=root.get("estado", "") == "derogado",
+        url_original=root.get("url_original", ""),
+        identificador=NormaIdentificador(
+            tipo=root.get("tipo", ""),
+            numero=root.get("numero", ""),
+            fecha_promulgacion=root.get("fecha_promulgacion", ""),
+            fecha_publicacion=root.get("fecha_publicacion", ""),
+        ),
+    )
+
+    meta = root.find(_ley("metadatos"))
+    if meta is not None:
+        norma.identificador.organismos = _texts(meta, "organismos", "organismo")
+        norma.metadatos = NormaMetadatos(
+            titulo=_text(meta.find(_ley("titulo"))),
+            materias=_texts(meta, "materias", "materia"),
+            nombres_uso_comun=_texts(meta, "nombres_comunes", "nombre"),
+            identificacion_fuente=_text(meta.find(_ley("fuente"))),
+            numero_fuente=_text(meta.find(_ley("numero_fuente"))),
+        )
+
+    encabezado = root.find(_ley("encabezado"))
+    if encabezado is not None:
+        texto = encabezado.find(_ley("texto"))
+        norma.encabezado_texto = _text(texto if texto is not None else encabezado)
+
+    contenido = root.find(_ley("contenido"))
+    if contenido is not None:
+        norma.estructuras = _estructuras_from_ley(contenido, 0)
+
+    promulgacion = root.find(_ley("promulgacion"))
+    if promulgacion is not None:
+        norma.promulgacion_texto = _text(promulgacion)
+        norma.promulgacion_derogado = promulgacion.get("derogado", "") == "true"
+
+    anexos = root.find(_ley("anexos"))
+    if anexos is not None:
+        for anexo in anexos.findall(_ley("anexo")):
+            norma.anexos.append(
+                {
+                    "id_parte": anexo.get("id", ""),
+                    "fecha_version": "",
+                    "derogado": anexo.get("estado", "") == "derogado",
+                    "transitorio": False,
+                    "titulo": _text(anexo.find(_ley("titulo"))),
+                    "materias": _texts(anexo, "materias", "materia"),
+                    "texto": _text(anexo.find(_ley("texto"))),
+                }
+            )
+
+    return norma
+
+
+def _text(elem: ET.Element | None) -> str:
+    if elem is None:
+        return ""
+    return (elem.text or "").strip()
+
+
+def _texts(parent: ET.Element, container: str, item: str) -> list[str]:
+    path = f"{_ley(container)}/{_ley(item)}"
+    return [t for t in (_text(e) for e in parent.findall(path)) if t]
+
+
+def _estructuras_from_ley(parent: ET.Element, nivel: int) -> list[EstructuraFuncional]:
+    estructuras = []
+    for elem in parent:
+        if elem.get("tipo_original") is None:
+            continue
+        estructuras.append(
+            EstructuraFuncional(
+                id_parte=elem.get("id", ""),
+                tipo_parte=elem.get("tipo_original", ""),
+                texto=_texto_ley(elem),
+                nombre_parte=elem.get("numero", ""),
+                titulo_parte=_text(elem.find(_ley("titulo_seccion"))),
+                fecha_version=elem.get("fecha_modificacion", ""),
+                derogado=elem.get("estado", "") == "derogado",
+                transitorio=elem.get("transitorio", "") == "true",
+                materias=_texts(elem, "materias", "materia"),
+                hijos=_estructuras_from_ley(elem, nivel + 1),
+                nivel=nivel,
+            )
+        )
+    return estructuras
+
+
+def _texto_ley(elem: ET.Element) -> str:
+    texto = elem.find(_ley("texto"))
+    if texto is not None:
+        return _text(texto)
+
+    contenido = elem.find(_ley("contenido"))
+    if contenido is None:
+        return ""
+    parrafos = []
+    for parte in contenido:
+        text = _text(parte)
+        if not text:
+            continue
+        if parte.tag == _ley("inciso"):
+            text = f"{parte.get('numero', '')}. {text}"
+        parrafos.append(text)
+    return "\n\n".join(parrafos)
+
+
+# =============================================================================
+# Norma → obtxml
+# =============================================================================
+
+
+def norma_to_bcn_xml(norma: Norma) -> bytes:
+    """Serializa una Norma con el esquema de intercambio de la BCN.
+
+    Args:
+        norma: Norma a serializar.
+
+    Returns:
+        Documento XML (UTF-8, con declaración) como el que entrega ``obtxml``.
+    """
+    ET.register_namespace("", NS["lc"])
+    root = ET.Element(_bcn("Norma"))
+    _set(root, "normaId", norma.norma_id)
+    _set(root, "fechaVersion", norma.fecha_version)
+    _set(root, "SchemaVersion", norma.schema_version)
+    if norma.es_tratado:
+        root.set("esTratado", "tratado")
+    if norma.derogado:
+        root.set("derogado", "derogado")
+
+    ident = ET.SubElement(root, _bcn("Identificador"))
+    _set(ident, "fechaPromulgacion", norma.identificador.fecha_promulgacion)
+    _set(ident, "fechaPublicacion", norma.identificador.fecha_publicacion)
+    tipo_numero = ET.SubElement(ET.SubElement(ident, _bcn("TiposNumeros")), _bcn("TipoNumero"))
+    _sub(tipo_numero, "Tipo", norma.identificador.tipo)
+    _sub(tipo_numero, "Numero", norma.identificador.numero)
+    _list(ident, "Organismos", "Organismo", norma.identificador.organismos)
+
+    meta = ET.SubElement(root, _bcn("Metadatos"))
+    _sub(meta, "TituloNorma", norma.metadatos.titulo)
+    _list(meta, "Materias", "Materia", norma.metadatos.materias)
+    _list(meta, "NombresUsoComun", "NombreUsoComun", norma.metadatos.nombres_uso_comun)
+    _list(meta, "PaisesTratados", "PaisTratado", norma.metadatos.paises_tratado)
+    for tag, value in (
+        ("TipoTratado", norma.metadatos.tipo_tratado),
+        ("FechaTratado", norma.metadatos.fecha_tratado),
+        ("FechaDerogacion", norma.metadatos.fecha_derogacion),
+        ("IdentificacionFuente", norma.metadatos.identificacion_fuente),
+        ("NumeroFuente", norma.metadatos.numero_fuente),
+    ):
+        if value:
+            _sub(meta, tag, value)
+
+    if norma.encabezado_texto or norma.encabezado_derogado:
+        _section(root, "Encabezado", norma.encabezado_texto, norma.encabezado_derogado)
+
+    container = ET.SubElement(root, _bcn("EstructurasFuncionales"))
+    for ef in norma.estructuras:
+        _add_estructura(container, ef)
+
+    if norma.promulgacion_texto or norma.promulgacion_derogado:
+        _section(root, "Promulgacion", norma.promulgacion_texto, norma.promulgacion_derogado)
+
+    if norma.anexos:
+        anexos = ET.SubElement(root, _bcn("Anexos"))
+        for anexo in norma.anexos:
+            elem = ET.SubElement(anexos, _bcn("Anexo"))
+            _set(elem, "idParte", anexo.get("id_parte", ""))
+            _set(elem, "fechaVersion", anexo.get("fecha_version", ""))
+            if anexo.get("derogado"):
+                elem.set("derogado", "derogado")
+            if anexo.get("transitorio"):
+                elem.set("transitorio", "transitorio")
+            anexo_meta = ET.SubElement(elem, _bcn("Metadatos"))
+            _sub(anexo_meta, "Titulo", anexo.get("titulo", ""))
+            _list(anexo_meta, "Materias", "Materia", anexo.get("materias", []))
+            _sub(elem, "Texto", anexo.get("texto", ""))
+
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+
+def ley_xml_to_bcn_xml(path: str | Path) -> bytes:
+    """Convierte un XML ley_v1 de la biblioteca al formato ``obtxml`` de la BCN."""
+    return norma_to_bcn_xml(norma_from_ley_xml(path))
+
+
+def _set(elem: ET.Element, name: str, value: str) -> None:
+    if value:
+        elem.set(name, value)
+
+
+def _sub(parent: ET.Element, tag: str, text: str) -> ET.Element:
+    elem = ET.SubElement(parent, _bcn(tag))
+    elem.text = text
+    return elem
+
+
+def _list(parent: ET.Element, container: str, item: str, values: list[str]) -> None:
+    if not values:
+        return
+    elem = ET.SubElement(parent, _bcn(container))
+    for value in values:
+        _sub(elem, item, value)
+
+
+def _section(root: ET.Element, tag: str, texto: str, derogado: bool) -> None:
+    elem = ET.SubElement(root, _bcn(tag))
+    if derogado:
+        elem.set("derogado", "derogado")
+    _sub(elem, "Texto", texto)
+
+
+def _add_estructura(parent: ET.Element, ef: EstructuraFuncional) -> None:
+    elem = ET.SubElement(parent, _bcn("EstructuraFuncional"))
+    _set(elem, "idParte", ef.id_parte)
+    _set(elem, "tipoParte", ef.tipo_parte)
+    _set(elem, "fechaVersion", ef.fecha_version)
+    if ef.derogado:
+        elem.set("derogado", "derogado")
+    if ef.transitorio:
+        elem.set("transitorio", "transitorio")
+
+    _sub(elem, "Texto", ef.texto)
+
+    meta = ET.SubElement(elem, _bcn("Metadatos"))
+    nombre = _sub(meta, "NombreParte", ef.nombre_parte)
+    nombre.set("presente", "si" if ef.nombre_parte else "no")
+    titulo = _sub(meta, "TituloParte", ef.titulo_parte)
+    titulo.set("presente", "si" if ef.titulo_parte else "no")
+    _list(meta, "Materias", "Materia", ef.materias)
+
+    if ef.hijos:
+        container = ET.SubElement(elem, _bcn("EstructurasFuncionales"))
+        for hijo in ef.hijos:
+            _add_estructura(container, hijo)
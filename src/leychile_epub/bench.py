@@ -0,0 +1,600 @@
+"""
+Benchmarks reproducibles sobre las bibliotecas incluidas en el repositorio.
+
+Corre sin red sobre ``biblioteca_xml/`` (normas ley_v1 y SUPERIR) y
+``biblioteca_suseso/`` (textos y compendio del Compendio SUSESO). Cada caso
+prepara sus entradas fuera de la medición y luego mide cada ítem:
+
+- ``parse``: XML ``obtxml`` de la BCN (convertido desde ley_v1) → Norma.
+- ``epub``: Norma → ePub (:class:`~leychile_epub.generator_v2.EPubGeneratorV2`).
+- ``xml``: Norma → XML ley_v1 (:class:`~leychile_epub.xml_generator.LawXMLGenerator`).
+- ``xsd``: validación de los XML de la biblioteca contra ``schemas/``.
+- ``superir``: texto de las normas SUPERIR → NormaSuperir.
+- ``texto``: textos SUSESO → XML (:class:`~leychile_epub.text_to_xml_parser.NormaTextParser`).
+- ``markdown``: XML ley_v1 → Markdown (``scripts/xml_a_markdown.py``).
+
+De cada ítem se toma el mejor tiempo de ``repeat`` repeticiones. El reporte
+trae throughput (MB/s y artículos/s), percentiles de latencia, el pico de
+memoria (una pasada extra con ``tracemalloc``) y una huella del corpus, de
+modo que los JSON de dos commits se pueden comparar con
+:func:`compare_reports`.
+
+Example:
+    >>> report = run_bench(".", cases=["parse", "epub"], repeat=3)
+    >>> print(report.table())
+    >>> report.save("bench.json")
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import logging
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from lxml import etree
+
+from . import __version__
+from .exceptions import ValidationError
+
+logger = logging.getLogger("leychile_epub.bench")
+
+# Versión del formato del reporte JSON
+REPORT_FORMAT = 1
+
+LEY_NS = b"https://leychile.cl/schema/ley/v1"
+SUPERIR_NS = b"https://superir.cl/schema/norma/v1"
+
+# Casos en el orden en que se corren por defecto
+DEFAULT_CASES = ("parse", "epub", "xml", "xsd", "superir", "texto", "markdown")
+
+
+@dataclass
+class BenchItem:
+    """Entrada ya preparada de un caso.
+
+    Attributes:
+        name: Nombre del ítem (ruta relativa al corpus).
+        payload: Dato que recibe la función del caso.
+        nbytes: Tamaño de la entrada en bytes.
+        articles: Artículos de la norma (0 si no aplica).
+    """
+
+    name: str
+    payload: Any
+    nbytes: int
+    articles: int = 0
+
+
+@dataclass
+class CaseResult:
+    """Resultado de un caso.
+
+    Attributes:
+        name: Nombre del caso.
+        items: Ítems medidos.
+        nbytes: Bytes de entrada.
+        articles: Artículos procesados.
+        seconds: Suma de los mejores tiempos de cada ítem.
+        latencies_ms: Mejor tiempo de cada ítem, en milisegundos.
+        peak_memory: Mayor pico de memoria de un ítem (bytes) o None.
+        notes: Observaciones del caso (p. ej. documentos inválidos).
+    """
+
+    name: str
+    items: int = 0
+    nbytes: int = 0
+    articles: int = 0
+    seconds: float = 0.0
+    latencies_ms: list[float] = field(default_factory=list, repr=False)
+    peak_memory: int | None = None
+    notes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def mb_per_s(self) -> float:
+        """Throughput en MB de entrada por segundo."""
+        return self.nbytes / 1e6 / self.seconds if self.seconds else 0.0
+
+    @property
+    def articles_per_s(self) -> float:
+        """Artículos procesados por segundo."""
+        return self.articles / self.seconds if self.seconds else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Percentil ``q`` (0-100) de la latencia, interpolado."""
+        return percentile(self.latencies_ms, q)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Resultado como diccionario (para JSON)."""
+        return {
+            "items": self.items,
+            "bytes": self.nbytes,
+            "articulos": self.articles,
+            "segundos": round(self.seconds, 6),
+            "mb_s": round(self.mb_per_s, 3),
+            "articulos_s": round(self.articles_per_s, 1),
+            "latencia_ms": {
+                "p50": round(self.percentile(50), 3),
+                "p90": round(self.percentile(90), 3),
+                "p99": round(self.percentile(99), 3),
+                "max": round(max(self.latencies_ms, default=0.0), 3),
+            },
+            "memoria_pico": self.peak_memory,
+            "notas": self.notes,
+        }
+
+
+@dataclass
+class BenchReport:
+    """Reporte de una corrida.
+
+    Attributes:
+        cases: Resultado de cada caso, en orden de ejecución.
+        repeat: Repeticiones por ítem.
+        corpus: Huella del corpus (ver :func:`corpus_fingerprint`).
+        environment: Versión del paquete, de Python, plataforma y commit.
+    """
+
+    cases: list[CaseResult]
+    repeat: int
+    corpus: dict[str, Any]
+    environment: dict[str, str]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Reporte como diccionario (para JSON)."""
+        return {
+            "formato": REPORT_FORMAT,
+            "entorno": self.environment,
+            "corpus": self.corpus,
+            "repeticiones": self.repeat,
+            "casos": {case.name: case.to_dict() for case in self.cases},
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def save(self, path: str | Path) -> Path:
+        """Guarda el reporte como JSON."""
+        path = Path(path)
+        path.write_text(self.to_json() + "\n", encoding="utf-8")
+        return path
+
+    def table(self) -> str:
+        """Tabla legible del reporte."""
+        lines = [
+            f"{'caso':<10} {'ítems':>6} {'MB':>7} {'MB/s':>8} {'art/s':>9} "
+            f"{'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'pico MB':>8}"
+        ]
+        for case in self.cases:
+            pico = f"{case.peak_memory / 1e6:.1f}" if case.peak_memory is not None else "-"
+            lines.append(
+                f"{case.name:<10} {case.items:>6} {case.nbytes / 1e6:>7.2f} "
+                f"{case.mb_per_s:>8.2f} {case.articles_per_s:>9.0f} "
+                f"{case.percentile(50):>9.2f} {case.percentile(90):>9.2f} "
+                f"{case.percentile(99):>9.2f} {pico:>8}"
+            )
+        return "\n".join(lines)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Percentil ``q`` (0-100) con interpolación lineal; 0.0 si no hay valores."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+# =============================================================================
+# Corpus
+# =============================================================================
+
+
+class Corpus:
+    """Archivos de las bibliotecas del repositorio, en orden estable.
+
+    Attributes:
+        root: Raíz del repositorio.
+    """
+
+    def __init__(self, root: str | Path = ".") -> None:
+        self.root = Path(root)
+        self.biblioteca = self.root / "biblioteca_xml"
+        self.suseso = self.root / "biblioteca_suseso"
+        self.schemas = self.root / "schemas"
+        if not self.biblioteca.is_dir() and not self.suseso.is_dir():
+            raise ValidationError(
+                "No se encontraron biblioteca_xml/ ni biblioteca_suseso/",
+                field="root",
+                value=str(self.root),
+            )
+
+    def _xml_con_namespace(self, namespace: bytes) -> list[Path]:
+        if not self.biblioteca.is_dir():
+            return []
+        return [path for path in sorted(self.biblioteca.rglob("*.xml")) if _head(path, namespace)]
+
+    def leyes(self) -> list[Path]:
+        """XML ley_v1 de ``biblioteca_xml``."""
+        return self._xml_con_namespace(LEY_NS)
+
+    def superir(self) -> list[Path]:
+        """XML SUPERIR de ``biblioteca_xml``."""
+        return self._xml_con_namespace(SUPERIR_NS)
+
+    def suseso_textos(self) -> list[Path]:
+        """Textos del Compendio SUSESO."""
+        if not self.suseso.is_dir():
+            return []
+        return sorted(self.suseso.glob("libro_*/*.txt"))
+
+    def compendio(self) -> Path | None:
+        """XML del Compendio SUSESO, si existe."""
+        path = self.suseso / "compendio_suseso.xml"
+        return path if path.exists() else None
+
+    def relative(self, path: Path) -> str:
+        return path.relative_to(self.root).as_posix()
+
+    def fingerprint(self) -> dict[str, Any]:
+        """Huella del corpus: cantidad, bytes y hash de rutas y tamaños."""
+        return corpus_fingerprint(self)
+
+
+def corpus_fingerprint(corpus: Corpus) -> dict[str, Any]:
+    """Huella de los archivos del corpus (cambia si se agrega o modifica uno)."""
+    paths = [*corpus.leyes(), *corpus.superir(), *corpus.suseso_textos()]
+    if (compendio := corpus.compendio()) is not None:
+        paths.append(compendio)
+    digest = hashlib.sha1()
+    total = 0
+    for path in paths:
+        size = path.stat().st_size
+        total += size
+        digest.update(f"{corpus.relative(path)}:{size}\n".encode())
+    return {"archivos": len(paths), "bytes": total, "sha1": digest.hexdigest()}
+
+
+def _head(path: Path, namespace: bytes) -> bool:
+    """Indica si ``namespace`` aparece en el primer KB del archivo."""
+    with open(path, "rb") as f:
+        return namespace in f.read(1024)
+
+
+def _count_articles(path: Path) -> int:
+    tag = "{" + LEY_NS.decode() + "}articulo"
+    return sum(1 for _ in etree.parse(str(path)).getroot().iter(tag))
+
+
+def superir_text(path: Path) -> str:
+    """Texto de una norma SUPERIR reconstruido desde su XML (un bloque por nodo)."""
+    root = etree.parse(str(path)).getroot()
+    return "\n\n".join(text.strip() for text in root.itertext() if text.strip())
+
+
+# =============================================================================
+# Casos
+# =============================================================================
+
+
+@dataclass
+class BenchCase:
+    """Caso de benchmark.
+
+    Attributes:
+        name: Nombre del caso.
+        prepare: Prepara los ítems fuera de la medición (recibe el corpus y
+            el máximo de archivos).
+        run: Procesa un ítem (lo que se mide).
+        notes: Resume las salidas de ``run`` en las notas del resultado.
+    """
+
+    name: str
+    prepare: Callable[[Corpus, int | None], list[BenchItem]]
+    run: Callable[[Any], Any]
+    notes: Callable[[list[Any]], dict[str, Any]] | None = None
+
+
+def _limit(paths: list[Path], limit: int | None) -> list[Path]:
+    return paths[:limit] if limit is not None else paths
+
+
+def _prepare_parse(corpus: Corpus, limit: int | None) -> list[BenchItem]:
+    from .bcn_fixtures import ley_xml_to_bcn_xml
+
+    items = []
+    for path in _limit(corpus.leyes(), limit):
+        blob = ley_xml_to_bcn_xml(path)
+        items.append(BenchItem(corpus.relative(path), blob, len(blob), _count_articles(path)))
+    return items
+
+
+def _parse_items(corpus: Corpus, limit: int | None) -> list[BenchItem]:
+    """Ítems con la Norma ya parseada (entrada de los generadores)."""
+    from .scraper_v2 import create_parser
+
+    parser = create_parser("lxml")
+    items = _prepare_parse(corpus, limit)
+    for item in items:
+        item.payload = parser.parse(parser.fromstring(item.payload))
+    return items
+
+
+def _case_parse(corpus: Corpus, tmp: Path) -> BenchCase:
+    from .scraper_v2 import create_parser
+
+    parser = create_parser("lxml")
+    return BenchCase("parse", _prepare_parse, lambda blob: parser.parse(parser.fromstring(blob)))
+
+
+def _case_epub(corpus: Corpus, tmp: Path) -> BenchCase:
+    from .generator_v2 import EPubGeneratorV2
+
+    generator = EPubGeneratorV2()
+    return BenchCase("epub", _parse_items, lambda norma: generator.generate(norma, tmp / "n.epub"))
+
+
+def _case_xml(corpus: Corpus, tmp: Path) -> BenchCase:
+    from .xml_generator import LawXMLGenerator
+
+    generator = LawXMLGenerator()
+    return BenchCase("xml", _parse_items, lambda norma: generator.generate(norma, str(tmp), "n"))
+
+
+def _prepare_xsd(corpus: Corpus, limit: int | None) -> list[BenchItem]:
+    grupos = [
+        ("ley_v1.xsd", corpus.leyes()),
+        ("superir_v1.xsd", corpus.superir()),
+        ("compendio_v1.xsd", [p for p in [corpus.compendio()] if p is not None]),
+    ]
+    items = []
+    for schema_name, paths in grupos:
+        schema_path = corpus.schemas / schema_name
+        if not schema_path.exists() or not paths:
+            continue
+        schema = etree.XMLSchema(etree.parse(str(schema_path)))
+        for path in _limit(paths, limit):
+            items.append(
+                BenchItem(corpus.relative(path), (schema, path.read_bytes()), path.stat().st_size)
+            )
+    return items
+
+
+def _validate(payload: tuple[etree.XMLSchema, bytes]) -> bool:
+    schema, content = payload
+    return schema.validate(etree.fromstring(content))
+
+
+def _case_xsd(corpus: Corpus, tmp: Path) -> BenchCase:
+    return BenchCase(
+        "xsd", _prepare_xsd, _validate, lambda results: {"invalidos": results.count(False)}
+    )
+
+
+def _prepare_superir(corpus: Corpus, limit: int | None) -> list[BenchItem]:
+    items = []
+    for path in _limit(corpus.superir(), limit):
+        texto = superir_text(path)
+        items.append(BenchItem(corpus.relative(path), texto, len(texto.encode("utf-8"))))
+    return items
+
+
+def _case_superir(corpus: Corpus, tmp: Path) -> BenchCase:
+    from .superir_structured_parser import SuperirStructuredParser
+
+    parser = SuperirStructuredParser()
+    return BenchCase("superir", _prepare_superir, lambda texto: parser.parse(texto))
+
+
+def _prepare_texto(corpus: Corpus, limit: int | None) -> list[BenchItem]:
+    items = []
+    for path in _limit(corpus.suseso_textos(), limit):
+        texto = path.read_text(encoding="utf-8")
+        items.append(BenchItem(corpus.relative(path), texto, len(texto.encode("utf-8"))))
+    return items
+
+
+def _case_texto(corpus: Corpus, tmp: Path) -> BenchCase:
+    from .text_to_xml_parser import NormaTextParser
+
+    parser = NormaTextParser()
+    metadatos = {"tipo": "Circular", "numero": "0", "titulo": "Compendio SUSESO"}
+    return BenchCase("texto", _prepare_texto, lambda texto: parser.parse_text(texto, metadatos))
+
+
+def _prepare_markdown(corpus: Corpus, limit: int | None) -> list[BenchItem]:
+    return [
+        BenchItem(corpus.relative(path), path, path.stat().st_size, _count_articles(path))
+        for path in _limit(corpus.leyes(), limit)
+    ]
+
+
+def _case_markdown(corpus: Corpus, tmp: Path) -> BenchCase | None:
+    script = corpus.root / "scripts" / "xml_a_markdown.py"
+    if not script.exists():
+        return None
+    spec = importlib.util.spec_from_file_location("_bench_xml_a_markdown", script)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return BenchCase("markdown", _prepare_markdown, module.xml_a_markdown)
+
+
+# Casos disponibles: reciben el corpus y un directorio temporal para sus salidas
+_CASES: dict[str, Callable[[Corpus, Path], BenchCase | None]] = {
+    "parse": _case_parse,
+    "epub": _case_epub,
+    "xml": _case_xml,
+    "xsd": _case_xsd,
+    "superir": _case_superir,
+    "texto": _case_texto,
+    "markdown": _case_markdown,
+}
+
+
+# =============================================================================
+# Ejecución
+# =============================================================================
+
+
+@contextmanager
+def _quiet_logs() -> Iterator[None]:
+    """Silencia las advertencias del paquete mientras se mide."""
+    package_logger = logging.getLogger("leychile_epub")
+    previous = package_logger.level
+    package_logger.setLevel(logging.ERROR)
+    try:
+        yield
+    finally:
+        package_logger.setLevel(previous)
+
+
+def _measure(case: BenchCase, items: list[BenchItem], repeat: int, memory: bool) -> CaseResult:
+    result = CaseResult(case.name)
+    # Las salidas sólo se retienen si el caso las resume en notas
+    outputs: list[Any] = []
+    for item in items:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = case.run(item.payload)
+            best = min(best, time.perf_counter() - start)
+        if case.notes is not None:
+            outputs.append(output)
+        result.items += 1
+        result.nbytes += item.nbytes
+        result.articles += item.articles
+        result.seconds += best
+        result.latencies_ms.append(best * 1000)
+
+    if memory and items:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            peak = 0
+            for item in items:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                case.run(item.payload)
+                peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+            result.peak_memory = peak
+        finally:
+            if started:
+                tracemalloc.stop()
+
+    if case.notes is not None:
+        result.notes = case.notes(outputs)
+    return result
+
+
+def _environment(root: Path) -> dict[str, str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "commit": commit,
+    }
+
+
+def run_bench(
+    root: str | Path = ".",
+    cases: list[str] | tuple[str, ...] = DEFAULT_CASES,
+    repeat: int = 3,
+    limit: int | None = None,
+    memory: bool = True,
+    progress: Callable[[str], None] | None = None,
+) -> BenchReport:
+    """Corre los casos indicados sobre el corpus del repositorio.
+
+    Args:
+        root: Raíz del repositorio (con ``biblioteca_xml/`` y ``schemas/``).
+        cases: Casos a correr (ver :data:`DEFAULT_CASES`).
+        repeat: Repeticiones por ítem (se toma la mejor).
+        limit: Máximo de archivos por caso (para corridas rápidas).
+        memory: Medir el pico de memoria con una pasada extra.
+        progress: Función que recibe el nombre de cada caso al empezar.
+
+    Returns:
+        Reporte de la corrida.
+
+    Raises:
+        ValidationError: Si no hay corpus en ``root`` o un caso no existe.
+    """
+    corpus = Corpus(root)
+    for name in cases:
+        if name not in _CASES:
+            raise ValidationError(
+                f"Caso de benchmark desconocido: {name}. Disponibles: {', '.join(_CASES)}",
+                field="cases",
+                value=name,
+            )
+
+    resultados = []
+    with _quiet_logs(), tempfile.TemporaryDirectory(prefix="leychile-bench-") as tmp:
+        for name in cases:
+            case = _CASES[name](corpus, Path(tmp))
+            if case is None:
+                logger.warning(f"Caso {name} omitido: no está disponible en este repositorio")
+                continue
+            if progress:
+                progress(name)
+            items = case.prepare(corpus, limit)
+            resultados.append(_measure(case, items, max(repeat, 1), memory))
+
+    return BenchReport(resultados, max(repeat, 1), corpus.fingerprint(), _environment(corpus.root))
+
+
+def compare_reports(base: dict[str, Any], new: dict[str, Any]) -> dict[str, dict[str, float]]:
+    """Compara dos reportes JSON caso a caso.
+
+    Returns:
+        Por caso presente en ambos: ``mb_s`` (razón nuevo/base del
+        throughput, >1 es más rápido) y ``p50`` (razón de la latencia
+        mediana, <1 es más rápido).
+
+    Raises:
+        ValidationError: Si los reportes son de corpus distintos.
+    """
+    if base.get("corpus", {}).get("sha1") != new.get("corpus", {}).get("sha1"):
+        raise ValidationError(
+            "Los reportes se midieron sobre corpus distintos", field="corpus", value=""
+        )
+    comparacion = {}
+    for name, caso in new.get("casos", {}).items():
+        anterior = base.get("casos", {}).get(name)
+        if not anterior:
+            continue
+        comparacion[name] = {
+            "mb_s": _ratio(caso["mb_s"], anterior["mb_s"]),
+            "p50": _ratio(caso["latencia_ms"]["p50"], anterior["latencia_ms"]["p50"]),
+        }
+    return comparacion
+
+
+def _ratio(new: float, base: float) -> float:
+    return round(new / base, 3) if base else 0.0
@@ -0,0 +1,222 @@
+"""
+Caché de capítulos para regenerar un ePub de forma incremental.
+
+Junto a cada ePub generado con ``EPubConfig.incremental`` se guarda un
+manifiesto (``<epub>.chapters.json``) que asocia cada capítulo con la clave
+de lo que lo produjo: el hash de su rama de ``EstructuraFuncional`` (ver
+:func:`leychile_epub.diff.hash_subarbol`) y de la configuración del
+generador. Al regenerar, los capítulos cuya clave ya está en el ePub
+anterior se copian de ahí tal como están comprimidos (ver
+:meth:`~leychile_epub.epub_writer.StreamingEpubWriter.copy_chapter`) y sólo
+se renderizan los que cambiaron. Las páginas de título y metadatos, el nav,
+el NCX y el OPF se escriben siempre.
+
+La clave no depende del nombre del archivo: si se agrega un capítulo y los
+siguientes cambian de número, igual se copian. Un capítulo partido en varios
+archivos (ver ``EPubConfig.max_chapter_bytes``) tiene una entrada por archivo
+con la misma clave y las anclas que contiene, para armar el TOC sin
+renderizarlo.
+
+Un manifiesto ausente, ilegible o de otra configuración sólo obliga a
+regenerar todo; un capítulo que no se puede copiar sin descomprimir (por
+ejemplo, con extensiones zip64) se vuelve a renderizar.
+
+Example:
+    >>> generator = EPubGeneratorV2(EPubConfig(incremental=True))
+    >>> generator.generate(codigo_civil, "codigo_civil.epub")  # completo
+    >>> generator.generate(codigo_civil_v2, "codigo_civil.epub")  # sólo lo cambiado
+    >>> generator.copied_chapters
+    41
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import zipfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO
+
+from .diff import hash_subarbol
+from .epub_writer import CONTENT_DIR, raw_copy_available, raw_data_offset
+from .exceptions import GeneratorError
+from .scraper_v2 import EstructuraFuncional
+
+logger = logging.getLogger("leychile_epub.chapter_cache")
+
+MANIFEST_SUFFIX = ".chapters.json"
+MANIFEST_VERSION = 2
+
+
+@dataclass
+class ChapterEntry:
+    """Entrada del manifiesto: un archivo de un capítulo.
+
+    Attributes:
+        clave: Clave del capítulo (ver :func:`chapter_key`).
+        parte: Posición del archivo en el capítulo (0 = el primero).
+        anclas: Anclas de las sub-entradas del TOC que están en el archivo.
+    """
+
+    clave: str
+    parte: int = 0
+    anclas: list[str] = field(default_factory=list)
+
+
+@dataclass
+class CachedPart:
+    """Archivo de un capítulo en el ePub anterior.
+
+    Attributes:
+        member: Entrada del ZIP.
+        anchors: Anclas que contiene.
+    """
+
+    member: zipfile.ZipInfo
+    anchors: list[str]
+
+
+def manifest_path(epub_path: str | Path) -> Path:
+    """Ruta del manifiesto de capítulos de un ePub."""
+    epub_path = Path(epub_path)
+    return epub_path.with_name(epub_path.name + MANIFEST_SUFFIX)
+
+
+def chapter_key(config_hash: str, estructura: EstructuraFuncional) -> str:
+    """Clave del capítulo de una estructura de primer nivel.
+
+    Args:
+        config_hash: Hash de la configuración del generador
+            (ver ``EPubGeneratorV2.config_hash``).
+        estructura: Estructura de primer nivel.
+
+    Returns:
+        Hash SHA-256 en hexadecimal.
+    """
+    h = hashlib.sha256(config_hash.encode("ascii"))
+    h.update(hash_subarbol(estructura))
+    return h.hexdigest()
+
+
+def save_manifest(
+    epub_path: str | Path, config_hash: str, chapters: dict[str, ChapterEntry]
+) -> Path:
+    """Escribe el manifiesto de capítulos de un ePub de forma atómica.
+
+    Args:
+        epub_path: Ruta del ePub.
+        config_hash: Hash de la configuración con que se generó.
+        chapters: Entrada de cada archivo de capítulo, en orden de lectura.
+
+    Returns:
+        Ruta del manifiesto.
+    """
+    path = manifest_path(epub_path)
+    data = {
+        "version": MANIFEST_VERSION,
+        "config": config_hash,
+        "capitulos": {href: asdict(entry) for href, entry in chapters.items()},
+    }
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return path
+
+
+class ChapterCache:
+    """Capítulos de un ePub anterior, por clave.
+
+    Attributes:
+        path: ePub anterior.
+        source: El ePub anterior abierto en modo binario.
+    """
+
+    def __init__(self, path: Path, members: dict[str, list[CachedPart]]) -> None:
+        self.path = path
+        self._members = members
+        self.source: BinaryIO = open(path, "rb")
+
+    @classmethod
+    def open(cls, epub_path: str | Path, config_hash: str) -> ChapterCache | None:
+        """Abre el ePub anterior si tiene un manifiesto válido para esta configuración.
+
+        Args:
+            epub_path: Ruta del ePub anterior.
+            config_hash: Hash de la configuración actual del generador.
+
+        Returns:
+            El caché, o None si no hay nada reutilizable.
+        """
+        epub_path = Path(epub_path)
+        manifest = manifest_path(epub_path)
+        if not epub_path.exists() or not manifest.exists():
+            return None
+        if not raw_copy_available():
+            logger.warning("zipfile no permite copiar capítulos comprimidos; se regenera completo")
+            return None
+        try:
+            data = json.loads(manifest.read_text(encoding="utf-8"))
+            if data.get("version") != MANIFEST_VERSION:
+                raise ValueError(f"versión {data.get('version')!r}")
+            if data.get("config") != config_hash:
+                logger.info(f"{epub_path} se generó con otra configuración; se regenera completo")
+                return None
+            members: dict[str, list[CachedPart]] = {}
+            # Capítulos con algún archivo que no se puede copiar (zip64...)
+            renderizar: set[str] = set()
+            # Un capítulo repetido en el libro se guarda una sola vez
+            repetido = False
+            with open(epub_path, "rb") as f, zipfile.ZipFile(f) as zf:
+                for href, raw in data["capitulos"].items():
+                    entry = ChapterEntry(**raw)
+                    if entry.parte == 0:
+                        repetido = entry.clave in members
+                    if repetido:
+                        continue
+                    member = zf.getinfo(f"{CONTENT_DIR}/{href}")
+                    try:
+                        raw_data_offset(f, member)
+                    except GeneratorError as e:
+                        logger.debug(f"{href} se vuelve a renderizar: {e}")
+                        renderizar.add(entry.clave)
+                    members.setdefault(entry.clave, []).append(CachedPart(member, entry.anclas))
+            for clave in renderizar:
+                del members[clave]
+        except (OSError, ValueError, KeyError, TypeError, zipfile.BadZipFile) as e:
+            logger.warning(f"Manifiesto de capítulos inválido para {epub_path}, se ignora: {e}")
+            return None
+        return cls(epub_path, members)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def get(self, key: str) -> list[CachedPart] | None:
+        """Archivos del capítulo con esa clave, en orden, si existe."""
+        return self._members.get(key)
+
+    def close(self) -> None:
+        """Cierra el ePub anterior."""
+        self.source.close()
+
+    def __enter__(self) -> ChapterCache:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -4,18 +4,31 @@ Interfaz de línea de comandos para LeyChile ePub Generator.
 Uso:
     python -m leychile_epub https://www.leychile.cl/Navegar?idNorma=242302
     python -m leychile_epub --batch urls.txt -o ./output
+    python -m leychile_epub --batch urls.txt -o ./output --incremental
+    python -m leychile_epub --batch urls.txt -o ./output --parse-workers 4
+    python -m leychile_epub --batch urls.txt -o ./output --profile perfil.jsonl
+    python -m leychile_epub replay-server --dir biblioteca_xml --port 8765
+    python -m leychile_epub bench --cases parse,epub -o bench.json
 
 Author: Luis Aguilera Arteaga <luis@aguilera.cl>
 """
 
 import argparse
+import json
 import sys
+from contextlib import ExitStack
 from pathlib import Path
 
 from . import __version__
+from .bench import DEFAULT_CASES, compare_reports, run_bench
 from .exceptions import LeyChileError
-from .generator_v2 import EPubGeneratorV2
-from .scraper_v2 import BCNLawScraperV2
+from .generator_v2 import EPubConfig, EPubGeneratorV2
+from .parse_pool import BATCH_PER_WORKER, resolve_workers
+from .planner import plan_fetches
+from .profiling import profile_normas, record_norma
+from .refresh import ESTADO_FALLIDA, MANIFEST_FILENAME, IncrementalRefresher, VersionManifest
+from .replay_server import ERROR_KINDS, ReplayServer
+from .scraper_v2 import BCNLawScraperV2, Norma, ParseResult
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -27,7 +40,9 @@ def create_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="leychile-epub",
         description="🇨🇱 Generador de ePub para legislación chilena",
-        epilog="Ejemplo: %(prog)s https://www.leychile.cl/Navegar?idNorma=242302",
+        epilog="Ejemplo: %(prog)s https://www.leychile.cl/Navegar?idNorma=242302\n"
+        "Subcomandos: replay-server, bench (ver %(prog)s <subcomando> --help)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
     )
 
     parser.add_argument(
@@ -65,6 +80,62 @@ def create_parser() -> argparse.ArgumentParser:
         help="Modo verbose (más información)",
     )
 
+    parser.add_argument(
+        "-i",
+        "--incremental",
+        action="store_true",
+        help="Regenerar sólo las normas cuya versión cambió (usa un manifiesto de versiones)",
+    )
+
+    parser.add_argument(
+        "--manifest",
+        metavar="FILE",
+        help=f"Manifiesto de versiones (default: DIR/{MANIFEST_FILENAME}; implica --incremental)",
+    )
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Con --incremental, regenerar todo aunque la versión no haya cambiado",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--parse-workers",
+        type=int,
+        metavar="N",
+        help="Con --batch, procesos que parsean el XML en paralelo (0 = uno por CPU; "
+        "default: config.scraper.parse_workers)",
+    )
+
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Procesos que renderizan los capítulos del ePub en paralelo "
+        "(0 = uno por CPU; default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="Build reproducible: la misma versión de la norma genera el mismo ePub byte a "
+        "byte (fechas de SOURCE_DATE_EPOCH o de la versión de la norma)",
+    )
+
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="Escribir en FILE una línea JSON por norma con bytes, nodos y ms por etapa",
+    )
+
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Con --profile, medir también el pico de memoria (tracemalloc, más lento)",
+    )
+
     parser.add_argument(
         "--version",
         action="version",
@@ -95,6 +166,11 @@ def process_url(
     output_dir: str,
     quiet: bool = False,
     verbose: bool = False,
+    refresher: IncrementalRefresher | None = None,
+    scraper: BCNLawScraperV2 | None = None,
+    parsed: ParseResult | None = None,
+    render_workers: int = 1,
+    reproducible: bool = False,
 ) -> str | None:
     """Procesa una URL y genera el ePub.
 
@@ -103,12 +179,43 @@ def process_url(
         output_dir: Directorio de salida.
         quiet: Modo silencioso.
         verbose: Modo verbose.
+        refresher: Si se indica, sólo regenera el ePub si la versión de la
+            norma cambió desde la última corrida, y al regenerarlo copia del
+            ePub anterior los capítulos que no cambiaron (salvo con ``force``).
+        scraper: Scraper a reutilizar (en lotes, uno para todas las URLs).
+        parsed: Norma ya descargada y parseada por el lote (no se vuelve a
+            descargar; si trae error, se reporta como el de ``scrape``).
+        render_workers: Procesos que renderizan los capítulos del ePub
+            (ver :mod:`leychile_epub.render_pool`).
+        reproducible: Generar el ePub en modo reproducible
+            (ver ``EPubConfig.reproducible``).
 
     Returns:
-        Ruta al ePub generado o None si hubo error.
+        Ruta al ePub generado (o vigente) o None si hubo error.
     """
-    scraper = BCNLawScraperV2()
-    generator = EPubGeneratorV2()
+    generator = EPubGeneratorV2(
+        EPubConfig(
+            render_workers=render_workers,
+            reproducible=reproducible,
+            incremental=refresher is not None and not refresher.force,
+        )
+    )
+
+    if refresher is not None:
+        if not quiet:
+            print(f"\n📚 Verificando: {url}")
+        result = refresher.refresh(
+            url, lambda norma: [_generate_epub(norma, output_dir, generator, quiet, verbose)]
+        )
+        if result.estado == ESTADO_FALLIDA:
+            if not quiet:
+                print(f"  ❌ Error: {result.error}")
+            return None
+        if not result.regenerada and not quiet:
+            print(f"  ⏭️  Sin cambios (versión {result.fecha_version}): {result.outputs[0]}")
+        return result.outputs[0]
+
+    scraper = scraper or BCNLawScraperV2()
 
     try:
         if not quiet:
@@ -118,35 +225,19 @@ def process_url(
         if verbose and not quiet:
             print("  → Extrayendo datos de la BCN...")
 
-        norma = scraper.scrape(url)
+        if parsed is None:
+            norma = scraper.scrape(url)
+        elif parsed.error is not None:
+            raise parsed.error
+        else:
+            norma = parsed.norma
 
         if not norma:
             if not quiet:
                 print("  ❌ No se pudo obtener datos de la ley")
             return None
 
-        title = f"{norma.identificador.tipo} {norma.identificador.numero}"
-        if verbose and not quiet:
-            print(f"  → Ley encontrada: {title}")
-            print(f"  → Estructuras: {len(norma.estructuras)} capítulos")
-
-        # Generación
-        if verbose and not quiet:
-            print("  → Generando ePub profesional...")
-
-        # Construir nombre de archivo
-        filename = f"{norma.identificador.tipo}_{norma.identificador.numero}.epub"
-        filename = filename.replace(" ", "_")
-        output_path = Path(output_dir) / filename
-
-        epub_path = generator.generate(norma, output_path)
-
-        if not quiet:
-            print(f"  ✅ Generado: {epub_path}")
-            size_kb = epub_path.stat().st_size / 1024
-            print(f"  📦 Tamaño: {size_kb:.1f} KB")
-
-        return str(epub_path)
+        return str(_generate_epub(norma, output_dir, generator, quiet, verbose))
 
     except LeyChileError as e:
         if not quiet:
@@ -162,11 +253,64 @@ def process_url(
         return None
 
 
+def _generate_epub(
+    norma: Norma,
+    output_dir: str,
+    generator: EPubGeneratorV2,
+    quiet: bool,
+    verbose: bool,
+) -> Path:
+    """Genera el ePub de una norma ya descargada."""
+    title = f"{norma.identificador.tipo} {norma.identificador.numero}"
+    if verbose and not quiet:
+        print(f"  → Ley encontrada: {title}")
+        print(f"  → Estructuras: {len(norma.estructuras)} capítulos")
+
+    # Generación
+    if verbose and not quiet:
+        print("  → Generando ePub profesional...")
+
+    # Construir nombre de archivo
+    filename = f"{norma.identificador.tipo}_{norma.identificador.numero}.epub"
+    filename = filename.replace(" ", "_")
+    output_path = Path(output_dir) / filename
+
+    epub_path = generator.generate(norma, output_path)
+
+    if not quiet:
+        print(f"  ✅ Generado: {epub_path}")
+        size_kb = epub_path.stat().st_size / 1024
+        print(f"  📦 Tamaño: {size_kb:.1f} KB")
+
+    return epub_path
+
+
+def create_refresher(
+    output_dir: str, manifest_path: str | None = None, force: bool = False
+) -> IncrementalRefresher:
+    """Crea el actualizador incremental con el manifiesto de versiones.
+
+    Args:
+        output_dir: Directorio de salida (ubicación por defecto del manifiesto).
+        manifest_path: Ruta explícita del manifiesto.
+        force: Regenerar todo aunque la versión no haya cambiado.
+
+    Returns:
+        Actualizador listo para usar con :func:`process_url`.
+    """
+    path = Path(manifest_path) if manifest_path else Path(output_dir) / MANIFEST_FILENAME
+    return IncrementalRefresher(BCNLawScraperV2(), VersionManifest(path), force=force)
+
+
 def process_batch(
     batch_file: str,
     output_dir: str,
     quiet: bool = False,
     verbose: bool = False,
+    refresher: IncrementalRefresher | None = None,
+    parse_workers: int | None = None,
+    render_workers: int = 1,
+    reproducible: bool = False,
 ) -> tuple[int, int]:
     """Procesa un archivo con múltiples URLs.
 
@@ -175,6 +319,12 @@ def process_batch(
         output_dir: Directorio de salida.
         quiet: Modo silencioso.
         verbose: Modo verbose.
+        refresher: Actualizador incremental (ver :func:`process_url`).
+        parse_workers: Procesos de parseo. Si es distinto de 1 (y no hay
+            ``refresher``), las normas se descargan por grupos y cada grupo
+            se parsea en paralelo. Por defecto ``config.scraper.parse_workers``.
+        render_workers: Procesos que renderizan los capítulos de cada ePub.
+        reproducible: Generar los ePubs en modo reproducible.
 
     Returns:
         Tupla (exitosos, fallidos).
@@ -196,24 +346,223 @@ def process_batch(
         print("❌ No se encontraron URLs en el archivo")
         return 0, 0
 
+    # Un solo scraper (y su sesión HTTP) para todo el lote
+    scraper = refresher.scraper if refresher is not None else BCNLawScraperV2()
+
+    # Una descarga por norma aunque aparezca con varias URLs
+    plan = plan_fetches(urls, scraper=scraper)
+
     if not quiet:
         print(f"\n📋 Procesando {len(urls)} URLs...")
+        print(f"   Plan: {plan.summary()}")
+        for url, error in plan.invalid:
+            print(f"   ❌ {url}: {error}")
 
     success = 0
-    failed = 0
+    failed = len(plan.invalid)
+
+    scraper_config = scraper.config.scraper
+    if parse_workers is None:
+        parse_workers = scraper_config.parse_workers
+    workers = resolve_workers(parse_workers, len(plan.fetches))
+    en_lote = refresher is None and parse_workers != 1 and not scraper_config.streaming
+    grupo_size = workers * BATCH_PER_WORKER if en_lote else max(len(plan.fetches), 1)
+
+    for inicio in range(0, len(plan.fetches), grupo_size):
+        grupo = plan.fetches[inicio : inicio + grupo_size]
+        parseadas: list[ParseResult | None] = (
+            list(scraper.scrape_batch([f.url for f in grupo], workers))
+            if en_lote
+            else [None] * len(grupo)
+        )
+
+        for i, (fetch, parsed) in enumerate(zip(grupo, parseadas, strict=True), inicio + 1):
+            if not quiet:
+                print(f"\n[{i}/{len(plan.fetches)}]", end="")
+                if len(fetch.outputs) > 1:
+                    print(f" ({len(fetch.outputs)} URLs → norma {fetch.ref.key})", end="")
+
+            with record_norma(fetch.url):
+                result = process_url(
+                    fetch.url,
+                    output_dir,
+                    quiet,
+                    verbose,
+                    refresher,
+                    scraper,
+                    parsed,
+                    render_workers,
+                    reproducible,
+                )
+
+            # Todas las URLs de la misma norma comparten el resultado
+            if result:
+                success += len(fetch.outputs)
+            else:
+                failed += len(fetch.outputs)
 
-    for i, url in enumerate(urls, 1):
-        if not quiet:
-            print(f"\n[{i}/{len(urls)}]", end="")
+    return success, failed
 
-        result = process_url(url, output_dir, quiet, verbose)
 
-        if result:
-            success += 1
-        else:
-            failed += 1
+def create_replay_parser() -> argparse.ArgumentParser:
+    """Crea el parser de argumentos del subcomando ``replay-server``.
 
-    return success, failed
+    Returns:
+        Parser configurado.
+    """
+    parser = argparse.ArgumentParser(
+        prog="leychile-epub replay-server",
+        description="Servidor local que imita la API obtxml de la BCN con respuestas grabadas",
+        epilog="Apunte ScraperConfig.base_url a la URL que se muestra al iniciar.",
+    )
+    parser.add_argument(
+        "--dir",
+        default="biblioteca_xml",
+        help="Directorio de fixtures: XML de la BCN, biblioteca ley_v1 o caché (default: %(default)s)",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interfaz (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8765, help="Puerto (default: %(default)s)")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Latencia artificial en segundos"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Variación aleatoria máxima de la latencia"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Probabilidad de inyectar un error (0-1)"
+    )
+    parser.add_argument(
+        "--errors",
+        default=",".join(ERROR_KINDS),
+        help="Tipos de error a inyectar, separados por coma (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--timeout-delay",
+        type=float,
+        default=60.0,
+        help="Demora de las respuestas con error 'timeout' (default: %(default)s)",
+    )
+    parser.add_argument("--seed", type=int, help="Semilla para errores reproducibles")
+    return parser
+
+
+def run_replay_server(argv: list[str]) -> int:
+    """Ejecuta el subcomando ``replay-server`` hasta Ctrl+C.
+
+    Args:
+        argv: Argumentos posteriores al nombre del subcomando.
+
+    Returns:
+        Código de salida.
+    """
+    args = create_replay_parser().parse_args(argv)
+
+    try:
+        server = ReplayServer(
+            args.dir,
+            host=args.host,
+            port=args.port,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            error_kinds=tuple(k.strip() for k in args.errors.split(",") if k.strip()),
+            timeout_delay=args.timeout_delay,
+            seed=args.seed,
+        )
+    except (OSError, ValueError) as e:
+        print(f"❌ No se pudo iniciar el servidor: {e}")
+        return 1
+
+    print(f"🔁 Servidor de réplica en {server.url} ({len(server.store)} normas)")
+    print(f"   base_url = {server.url}   estadísticas: {server.url}/_stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n📊 " + json.dumps(server.stats.to_dict(), ensure_ascii=False))
+    finally:
+        server.stop()
+    return 0
+
+
+def create_bench_parser() -> argparse.ArgumentParser:
+    """Crea el parser de argumentos del subcomando ``bench``.
+
+    Returns:
+        Parser configurado.
+    """
+    parser = argparse.ArgumentParser(
+        prog="leychile-epub bench",
+        description="Benchmarks sin red sobre biblioteca_xml/ y biblioteca_suseso/",
+    )
+    parser.add_argument(
+        "--root", default=".", help="Raíz del repositorio con los corpus (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--cases",
+        default=",".join(DEFAULT_CASES),
+        help="Casos a correr, separados por coma (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Repeticiones por ítem (default: %(default)s)"
+    )
+    parser.add_argument("--limit", type=int, help="Máximo de archivos por caso")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="No medir el pico de memoria (más rápido)"
+    )
+    parser.add_argument("-o", "--output", metavar="FILE", help="Guardar el reporte JSON en FILE")
+    parser.add_argument(
+        "--baseline", metavar="FILE", help="Reporte JSON anterior con el cual comparar"
+    )
+    return parser
+
+
+def run_bench_command(argv: list[str]) -> int:
+    """Ejecuta el subcomando ``bench``.
+
+    Args:
+        argv: Argumentos posteriores al nombre del subcomando.
+
+    Returns:
+        Código de salida.
+    """
+    args = create_bench_parser().parse_args(argv)
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+
+    try:
+        report = run_bench(
+            args.root,
+            cases,
+            repeat=args.repeat,
+            limit=args.limit,
+            memory=not args.no_memory,
+            progress=lambda name: print(f"⏱️  {name}...", flush=True),
+        )
+        comparacion = None
+        if args.baseline:
+            base = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+            comparacion = compare_reports(base, report.to_dict())
+    except LeyChileError as e:
+        print(f"❌ {e.message}")
+        return 1
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"❌ No se pudo leer el reporte base: {e}")
+        return 1
+
+    print(report.table())
+    if comparacion is not None:
+        print(f"\nRespecto de {args.baseline} (MB/s nuevo/base, p50 nuevo/base):")
+        for name, razones in comparacion.items():
+            print(f"  {name:<10} {razones['mb_s']:>6.2f}x  {razones['p50']:>6.2f}x")
+    if args.output:
+        print(f"\n📄 Reporte: {report.save(args.output)}")
+    return 0
+
+
+# Subcomandos: se reconocen por el primer argumento
+SUBCOMMANDS = {
+    "replay-server": run_replay_server,
+    "bench": run_bench_command,
+}
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -225,6 +574,11 @@ def main(argv: list[str] | None = None) -> int:
     Returns:
         Código de salida (0 = éxito, 1 = error).
     """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+
     parser = create_parser()
     args = parser.parse_args(argv)
 
@@ -244,6 +598,19 @@ def main(argv: list[str] | None = None) -> int:
         print("   Autor: Luis Aguilera Arteaga")
         print("=" * 50)
 
+    refresher = None
+    if args.incremental or args.manifest:
+        refresher = create_refresher(str(output_dir), args.manifest, args.force)
+
+    with ExitStack() as stack:
+        if args.profile:
+            sink = stack.enter_context(open(args.profile, "w", encoding="utf-8"))
+            stack.enter_context(profile_normas(sink, args.profile_memory))
+        return _run(args, output_dir, refresher)
+
+
+def _run(args: argparse.Namespace, output_dir: Path, refresher: IncrementalRefresher | None) -> int:
+    """Ejecuta el modo individual o batch ya validados los argumentos."""
     try:
         if args.batch:
             # Modo batch
@@ -252,6 +619,10 @@ def main(argv: list[str] | None = None) -> int:
                 str(output_dir),
                 args.quiet,
                 args.verbose,
+                refresher,
+                args.parse_workers,
+                args.render_workers,
+                args.reproducible,
             )
 
             if not args.quiet:
@@ -263,12 +634,16 @@ def main(argv: list[str] | None = None) -> int:
 
         else:
             # Modo individual
-            result = process_url(
-                args.url,
-                str(output_dir),
-                args.quiet,
-                args.verbose,
-            )
+            with record_norma(args.url):
+                result = process_url(
+                    args.url,
+                    str(output_dir),
+                    args.quiet,
+                    args.verbose,
+                    refresher,
+                    render_workers=args.render_workers,
+                    reproducible=args.reproducible,
+                )
 
             return 0 if result else 1
 
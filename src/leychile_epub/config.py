@@ -28,6 +28,25 @@ class ScraperConfig:
         retry_delay: Segundos de espera entre reintentos.
         user_agent: User-Agent para las solicitudes HTTP.
         rate_limit_delay: Segundos entre solicitudes para evitar rate limiting.
+            Si ``requests_per_second`` es None, la tasa es ``1 / rate_limit_delay``.
+        requests_per_second: Tasa sostenida del limitador token bucket.
+        burst: Solicitudes que pueden salir seguidas sin esperar.
+        max_concurrency: Máximo de solicitudes simultáneas del scraper asíncrono.
+        cache_dir: Directorio del caché en disco de XML (None desactiva el caché).
+        cache_ttl: Segundos durante los cuales una entrada del caché se usa sin revalidar.
+        cache_max_bytes: Tamaño máximo del caché en bytes.
+        cache_max_age: Segundos sin uso tras los cuales se elimina una entrada.
+        streaming: Parsear el XML a medida que se descarga, sin construir el
+            árbol completo (menor memoria en normas muy grandes).
+        parser_backend: Backend del parser XML: "etree" (estándar) o "lxml" (más rápido).
+        text_buffer: Guardar los textos de los artículos de cada norma en un
+            único buffer UTF-8 y materializarlos sólo al leerlos.
+        parse_workers: Procesos que parsean XML en paralelo en los lotes
+            (1 = en el proceso actual, 0 = uno por CPU).
+        pool_maxsize: Conexiones reutilizables por host en la sesión HTTP
+            compartida (nunca menos que ``max_concurrency``).
+        keep_alive: Mantener abiertas las conexiones entre solicitudes.
+        accept_encoding: Codificaciones de contenido aceptadas (compresión).
     """
 
     base_url: str = "https://www.leychile.cl"
@@ -37,6 +56,20 @@ class ScraperConfig:
     retry_delay: float = 1.0
     user_agent: str = "LeyChile-ePub-Generator/1.1.0 (https://github.com/laguileracl/leychile-epub)"
     rate_limit_delay: float = 0.5
+    requests_per_second: float | None = None
+    burst: int = 1
+    max_concurrency: int = 4
+    cache_dir: str | None = None
+    cache_ttl: float = 86400.0
+    cache_max_bytes: int = 512 * 1024 * 1024
+    cache_max_age: float = 30 * 86400.0
+    streaming: bool = False
+    parser_backend: str = "etree"
+    text_buffer: bool = False
+    parse_workers: int = 1
+    pool_maxsize: int = 10
+    keep_alive: bool = True
+    accept_encoding: str = "gzip, deflate"
 
 
 @dataclass
@@ -52,6 +85,8 @@ class EpubConfig:
         language: Idioma del ePub (código ISO).
         creator: Nombre del creador por defecto.
         publisher: Editorial por defecto.
+        reproducible: Build reproducible (identificador derivado de la ley y
+            fechas fijas; ver ``epub_writer.reproducible_timestamp``).
     """
 
     output_dir: str = "."
@@ -62,6 +97,7 @@ class EpubConfig:
     language: str = "es"
     creator: str = "Luis Aguilera Arteaga"
     publisher: str = "LeyChile ePub Generator"
+    reproducible: bool = False
 
 
 @dataclass
@@ -159,6 +195,12 @@ class Config:
 
         Variables de entorno soportadas:
             - LEYCHILE_TIMEOUT: Timeout del scraper
+            - LEYCHILE_MAX_CONCURRENCY: Solicitudes simultáneas del scraper asíncrono
+            - LEYCHILE_CACHE_DIR: Directorio del caché de XML
+            - LEYCHILE_REQUESTS_PER_SECOND: Tasa máxima de solicitudes a la BCN
+            - LEYCHILE_PARSER_BACKEND: Backend del parser XML (etree o lxml)
+            - LEYCHILE_POOL_MAXSIZE: Conexiones HTTP reutilizables por host
+            - LEYCHILE_PARSE_WORKERS: Procesos de parseo en lotes (0 = uno por CPU)
             - LEYCHILE_OUTPUT_DIR: Directorio de salida
             - LEYCHILE_LOG_LEVEL: Nivel de logging
             - LEYCHILE_LOG_FILE: Archivo de log
@@ -173,6 +215,18 @@ class Config:
             config.scraper.timeout = int(timeout)
         if max_retries := os.getenv("LEYCHILE_MAX_RETRIES"):
             config.scraper.max_retries = int(max_retries)
+        if max_concurrency := os.getenv("LEYCHILE_MAX_CONCURRENCY"):
+            config.scraper.max_concurrency = int(max_concurrency)
+        if cache_dir := os.getenv("LEYCHILE_CACHE_DIR"):
+            config.scraper.cache_dir = cache_dir
+        if requests_per_second := os.getenv("LEYCHILE_REQUESTS_PER_SECOND"):
+            config.scraper.requests_per_second = float(requests_per_second)
+        if parser_backend := os.getenv("LEYCHILE_PARSER_BACKEND"):
+            config.scraper.parser_backend = parser_backend
+        if pool_maxsize := os.getenv("LEYCHILE_POOL_MAXSIZE"):
+            config.scraper.pool_maxsize = int(pool_maxsize)
+        if parse_workers := os.getenv("LEYCHILE_PARSE_WORKERS"):
+            config.scraper.parse_workers = int(parse_workers)
 
         # ePub config
         if output_dir := os.getenv("LEYCHILE_OUTPUT_DIR"):
@@ -203,6 +257,20 @@ class Config:
                 "retry_delay": self.scraper.retry_delay,
                 "user_agent": self.scraper.user_agent,
                 "rate_limit_delay": self.scraper.rate_limit_delay,
+                "requests_per_second": self.scraper.requests_per_second,
+                "burst": self.scraper.burst,
+                "max_concurrency": self.scraper.max_concurrency,
+                "cache_dir": self.scraper.cache_dir,
+                "cache_ttl": self.scraper.cache_ttl,
+                "cache_max_bytes": self.scraper.cache_max_bytes,
+                "cache_max_age": self.scraper.cache_max_age,
+                "streaming": self.scraper.streaming,
+                "parser_backend": self.scraper.parser_backend,
+                "text_buffer": self.scraper.text_buffer,
+                "parse_workers": self.scraper.parse_workers,
+                "pool_maxsize": self.scraper.pool_maxsize,
+                "keep_alive": self.scraper.keep_alive,
+                "accept_encoding": self.scraper.accept_encoding,
             },
             "epub": {
                 "output_dir": self.epub.output_dir,
@@ -213,6 +281,7 @@ class Config:
                 "language": self.epub.language,
                 "creator": self.epub.creator,
                 "publisher": self.epub.publisher,
+                "reproducible": self.epub.reproducible,
             },
             "logging": {
                 "level": self.logging.level,
@@ -0,0 +1,462 @@
+"""
+Diferencias estructurales entre dos versiones de una Norma.
+
+Alinea los árboles de ``EstructuraFuncional`` por ``id_parte`` y reporta las
+estructuras agregadas, eliminadas, modificadas, derogadas y restablecidas,
+con el diff de texto (por palabras) de cada una. Cada subárbol se resume en
+un hash calculado de abajo hacia arriba: si el hash de una rama coincide en
+ambas versiones se omite completa, por lo que el costo es lineal en el
+tamaño de los árboles.
+
+El resultado se puede serializar como JSON o como XML anotado; cada cambio
+indica la estructura de primer nivel (el capítulo del ePub) que lo contiene.
+
+Example:
+    >>> diff = diff_normas(norma_anterior, norma_nueva)
+    >>> diff.resumen()
+    {'agregada': 1, 'eliminada': 0, 'modificada': 3, 'derogada': 1, 'restablecida': 0}
+    >>> Path("cambios.json").write_text(diff.to_json())
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from difflib import SequenceMatcher
+from xml.etree import ElementTree as ET
+
+from .scraper_v2 import EstructuraFuncional, Norma, texto_utf8
+
+# Namespace del XML de diferencias
+DIFF_NS = "https://leychile.cl/schema/diff/v1"
+
+# Tipos de cambio
+AGREGADA = "agregada"
+ELIMINADA = "eliminada"
+MODIFICADA = "modificada"
+DEROGADA = "derogada"
+RESTABLECIDA = "restablecida"
+TIPOS_CAMBIO = (AGREGADA, ELIMINADA, MODIFICADA, DEROGADA, RESTABLECIDA)
+
+# Campos propios de una estructura que se comparan (sin contar los hijos)
+_CAMPOS = (
+    "tipo_parte",
+    "texto",
+    "nombre_parte",
+    "titulo_parte",
+    "fecha_version",
+    "derogado",
+    "transitorio",
+    "materias",
+)
+
+# Campos de la Norma que se reportan como metadatos
+_CAMPOS_NORMA = (
+    ("fecha_version", lambda n: n.fecha_version),
+    ("derogado", lambda n: n.derogado),
+    ("titulo", lambda n: n.metadatos.titulo),
+    ("materias", lambda n: n.metadatos.materias),
+    ("fecha_derogacion", lambda n: n.metadatos.fecha_derogacion),
+    ("encabezado", lambda n: n.encabezado_texto),
+    ("promulgacion", lambda n: n.promulgacion_texto),
+    ("anexos", lambda n: n.anexos),
+)
+
+
+@dataclass
+class CambioEstructura:
+    """Cambio en una estructura funcional.
+
+    Attributes:
+        tipo: Uno de ``TIPOS_CAMBIO``.
+        id_parte: Clave de alineación (``id_parte`` o ruta posicional).
+        tipo_parte: Tipo de estructura (Artículo, Capítulo...).
+        nombre_parte: Número o nombre de la estructura.
+        capitulo: Clave de la estructura de primer nivel que la contiene.
+        ruta: Claves de los ancestros, desde el primer nivel.
+        campos: Campos propios que cambiaron (``"ubicacion"`` si cambió de
+            padre, ``"orden_hijos"`` si se reordenaron sus hijos).
+        fecha_version_anterior: ``fecha_version`` en la versión anterior.
+        fecha_version_nueva: ``fecha_version`` en la versión nueva.
+        texto: Diff por palabras como lista de ``{"op", "texto"}`` con ``op``
+            ``"="``, ``"-"`` o ``"+"`` (sólo si cambió el texto).
+    """
+
+    tipo: str
+    id_parte: str
+    tipo_parte: str = ""
+    nombre_parte: str = ""
+    capitulo: str = ""
+    ruta: list[str] = field(default_factory=list)
+    campos: list[str] = field(default_factory=list)
+    fecha_version_anterior: str = ""
+    fecha_version_nueva: str = ""
+    texto: list[dict[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class NormaDiff:
+    """Diferencias entre dos versiones de una norma.
+
+    Attributes:
+        norma_id: ID de la norma (de la versión nueva).
+        version_anterior: ``fecha_version`` de la versión anterior.
+        version_nueva: ``fecha_version`` de la versión nueva.
+        metadatos: Campos de la norma que cambiaron, ``{campo: [antes, después]}``.
+        cambios: Cambios en las estructuras, en orden de documento.
+        comparadas: Estructuras comparadas campo a campo.
+        omitidas: Estructuras omitidas por tener el mismo hash de subárbol.
+    """
+
+    norma_id: str = ""
+    version_anterior: str = ""
+    version_nueva: str = ""
+    metadatos: dict[str, list] = field(default_factory=dict)
+    cambios: list[CambioEstructura] = field(default_factory=list)
+    comparadas: int = 0
+    omitidas: int = 0
+
+    @property
+    def vacio(self) -> bool:
+        """Indica si ambas versiones tienen el mismo contenido."""
+        return not self.cambios and not self.metadatos
+
+    def resumen(self) -> dict[str, int]:
+        """Cantidad de cambios por tipo."""
+        conteo = dict.fromkeys(TIPOS_CAMBIO, 0)
+        for cambio in self.cambios:
+            conteo[cambio.tipo] += 1
+        return conteo
+
+    def to_dict(self) -> dict:
+        """Convierte el diff a diccionario."""
+        data = asdict(self)
+        data["resumen"] = self.resumen()
+        return data
+
+    def to_json(self, indent: int | None = 2) -> str:
+        """Serializa el diff como JSON."""
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def to_xml(self) -> bytes:
+        """Serializa el diff como XML anotado.
+
+        Cada ``<cambio>`` lleva como atributos el tipo, la estructura y las
+        versiones, y su ``<texto>`` intercala los fragmentos ``<igual>``,
+        ``<eliminado>`` y ``<agregado>`` del diff por palabras.
+
+        Returns:
+            Documento XML en UTF-8, con declaración.
+        """
+        ET.register_namespace("", DIFF_NS)
+        root = ET.Element(_tag("diff"))
+        root.set("id_norma", self.norma_id)
+        root.set("version_anterior", self.version_anterior)
+        root.set("version_nueva", self.version_nueva)
+
+        resumen = ET.SubElement(root, _tag("resumen"))
+        for tipo, cantidad in self.resumen().items():
+            resumen.set(tipo, str(cantidad))
+
+        if self.metadatos:
+            metadatos = ET.SubElement(root, _tag("metadatos"))
+            for nombre, (antes, despues) in self.metadatos.items():
+                campo = ET.SubElement(metadatos, _tag("campo"), nombre=nombre)
+                ET.SubElement(campo, _tag("antes")).text = _xml_value(antes)
+                ET.SubElement(campo, _tag("despues")).text = _xml_value(despues)
+
+        cambios = ET.SubElement(root, _tag("cambios"))
+        for cambio in self.cambios:
+            elem = ET.SubElement(cambios, _tag("cambio"), tipo=cambio.tipo)
+            for attr in (
+                "id_parte",
+                "tipo_parte",
+                "nombre_parte",
+                "capitulo",
+                "fecha_version_anterior",
+                "fecha_version_nueva",
+            ):
+                value = getattr(cambio, attr)
+                if value:
+                    elem.set(attr, value)
+            if cambio.ruta:
+                elem.set("ruta", "/".join(cambio.ruta))
+            if cambio.campos:
+                elem.set("campos", " ".join(cambio.campos))
+            if cambio.texto:
+                texto = ET.SubElement(elem, _tag("texto"))
+                for fragmento in cambio.texto:
+                    nombre = _OP_TAGS[fragmento["op"]]
+                    ET.SubElement(texto, _tag(nombre)).text = fragmento["texto"]
+
+        return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+
+_OP_TAGS = {"=": "igual", "-": "eliminado", "+": "agregado"}
+
+
+def _tag(local: str) -> str:
+    return f"{{{DIFF_NS}}}{local}"
+
+
+def _xml_value(value: object) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+# =============================================================================
+# Indexación y hashes
+# =============================================================================
+
+
+@dataclass
+class _Nodo:
+    """Estructura indexada con su posición y hashes."""
+
+    ef: EstructuraFuncional
+    clave: str
+    padre: str
+    capitulo: str
+    ruta: list[str]
+    propio: bytes = b""
+    subarbol: bytes = b""
+
+
+def _hash_propio(ef: EstructuraFuncional) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    for campo in _CAMPOS:
+        if campo == "texto":
+            # Sin materializar el texto si la norma usa text_buffer
+            h.update(texto_utf8(ef))
+        else:
+            h.update(repr(getattr(ef, campo)).encode("utf-8"))
+        h.update(b"\x00")
+    return h.digest()
+
+
+def _hash_nodo(ef: EstructuraFuncional, propio: bytes, hijos: Iterable[bytes]) -> bytes:
+    """Hash de un subárbol a partir del hash propio y los de sus hijos.
+
+    Incluye el ``id_parte`` del nodo, de modo que el hash que recibe el padre
+    cambia si a un hijo le cambian el id aunque su texto sea el mismo
+    (``tipo_parte`` ya va en el hash propio).
+    """
+    h = hashlib.blake2b(ef.id_parte.encode("utf-8"), digest_size=16)
+    h.update(b"\x00")
+    h.update(propio)
+    for hijo in hijos:
+        h.update(hijo)
+    return h.digest()
+
+
+def hash_subarbol(ef: EstructuraFuncional) -> bytes:
+    """Hash de una estructura y toda su rama.
+
+    Es el mismo hash de subárbol que usa el diff: cambia con cualquier dato
+    que se renderiza, incluidos los ``id_parte`` de toda la rama, así que
+    sirve como clave de un capítulo ya generado (ver
+    :mod:`leychile_epub.chapter_cache`).
+
+    Args:
+        ef: Estructura raíz de la rama.
+
+    Returns:
+        Digest de 16 bytes.
+    """
+    return _hash_nodo(ef, _hash_propio(ef), map(hash_subarbol, ef.hijos))
+
+
+def _indexar(estructuras: list[EstructuraFuncional]) -> tuple[dict[str, _Nodo], list[str]]:
+    """Indexa el árbol por clave y calcula los hashes de cada subárbol.
+
+    Las estructuras sin ``id_parte`` (o con uno repetido) se identifican por
+    su ruta posicional dentro del padre.
+
+    Returns:
+        Tupla (índice por clave, claves de primer nivel en orden).
+    """
+    indice: dict[str, _Nodo] = {}
+
+    def visitar(ef: EstructuraFuncional, padre: str, pos: int, ruta: list[str]) -> _Nodo:
+        clave = ef.id_parte
+        if not clave or clave in indice:
+            clave = f"{padre}/{pos}"
+        nodo = _Nodo(ef, clave, padre, ruta[0] if ruta else clave, ruta)
+        indice[clave] = nodo
+
+        nodo.propio = _hash_propio(ef)
+        hijos_ruta = [*ruta, clave]
+        nodo.subarbol = _hash_nodo(
+            ef,
+            nodo.propio,
+            [visitar(hijo, clave, i, hijos_ruta).subarbol for i, hijo in enumerate(ef.hijos)],
+        )
+        return nodo
+
+    raices = [visitar(ef, "", i, []).clave for i, ef in enumerate(estructuras)]
+    return indice, raices
+
+
+# =============================================================================
+# Diff
+# =============================================================================
+
+
+def diff_texto(anterior: str, nuevo: str) -> list[dict[str, str]]:
+    """Diff por palabras entre dos textos.
+
+    Returns:
+        Fragmentos ``{"op": "=" | "-" | "+", "texto": ...}`` en orden.
+    """
+    a = anterior.split()
+    b = nuevo.split()
+    fragmentos: list[dict[str, str]] = []
+    for op, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if op == "equal":
+            fragmentos.append({"op": "=", "texto": " ".join(a[i1:i2])})
+            continue
+        if i2 > i1:
+            fragmentos.append({"op": "-", "texto": " ".join(a[i1:i2])})
+        if j2 > j1:
+            fragmentos.append({"op": "+", "texto": " ".join(b[j1:j2])})
+    return fragmentos
+
+
+def diff_normas(anterior: Norma, nueva: Norma) -> NormaDiff:
+    """Compara dos versiones de una norma.
+
+    Args:
+        anterior: Versión anterior.
+        nueva: Versión nueva.
+
+    Returns:
+        Diferencias encontradas.
+    """
+    diff = NormaDiff(
+        norma_id=nueva.norma_id or anterior.norma_id,
+        version_anterior=anterior.fecha_version,
+        version_nueva=nueva.fecha_version,
+    )
+    for nombre, getter in _CAMPOS_NORMA:
+        antes, despues = getter(anterior), getter(nueva)
+        if antes != despues:
+            diff.metadatos[nombre] = [antes, despues]
+
+    viejo, raices_viejas = _indexar(anterior.estructuras)
+    nuevo, raices_nuevas = _indexar(nueva.estructuras)
+    # Claves de la versión anterior cuyo subárbol completo es idéntico
+    identicos: set[str] = set()
+
+    def comparar(clave: str) -> None:
+        nodo = nuevo[clave]
+        previo = viejo.get(clave)
+        if previo is None:
+            _agregar_subarbol(diff, nuevo, clave)
+            return
+        if previo.subarbol == nodo.subarbol and previo.padre == nodo.padre:
+            identicos.add(clave)
+            diff.omitidas += _tamano(nodo.ef)
+            return
+
+        diff.comparadas += 1
+        cambio = _comparar_nodo(previo, nodo)
+        if cambio is not None:
+            diff.cambios.append(cambio)
+        for i, hijo in enumerate(nodo.ef.hijos):
+            comparar(_clave_hijo(nuevo, clave, hijo, i))
+
+    for clave in raices_nuevas:
+        comparar(clave)
+
+    # Eliminadas: claves viejas ausentes en la versión nueva
+    def eliminar(clave: str) -> None:
+        if clave in identicos:
+            return
+        nodo = viejo[clave]
+        if clave not in nuevo:
+            diff.cambios.append(
+                CambioEstructura(
+                    tipo=ELIMINADA,
+                    id_parte=clave,
+                    tipo_parte=nodo.ef.tipo_parte,
+                    nombre_parte=nodo.ef.nombre_parte,
+                    capitulo=nodo.capitulo,
+                    ruta=nodo.ruta,
+                    fecha_version_anterior=nodo.ef.fecha_version,
+                )
+            )
+        for i, hijo in enumerate(nodo.ef.hijos):
+            eliminar(_clave_hijo(viejo, clave, hijo, i))
+
+    for clave in raices_viejas:
+        eliminar(clave)
+
+    return diff
+
+
+def _clave_hijo(indice: dict[str, _Nodo], padre: str, hijo: EstructuraFuncional, pos: int) -> str:
+    clave = hijo.id_parte
+    nodo = indice.get(clave) if clave else None
+    if nodo is None or nodo.ef is not hijo:
+        clave = f"{padre}/{pos}"
+    return clave
+
+
+def _tamano(ef: EstructuraFuncional) -> int:
+    return 1 + sum(_tamano(hijo) for hijo in ef.hijos)
+
+
+def _agregar_subarbol(diff: NormaDiff, indice: dict[str, _Nodo], clave: str) -> None:
+    nodo = indice[clave]
+    diff.cambios.append(
+        CambioEstructura(
+            tipo=AGREGADA,
+            id_parte=clave,
+            tipo_parte=nodo.ef.tipo_parte,
+            nombre_parte=nodo.ef.nombre_parte,
+            capitulo=nodo.capitulo,
+            ruta=nodo.ruta,
+            fecha_version_nueva=nodo.ef.fecha_version,
+        )
+    )
+    for i, hijo in enumerate(nodo.ef.hijos):
+        _agregar_subarbol(diff, indice, _clave_hijo(indice, clave, hijo, i))
+
+
+def _comparar_nodo(previo: _Nodo, nodo: _Nodo) -> CambioEstructura | None:
+    """Compara los campos propios de una estructura presente en ambas versiones."""
+    antes, despues = previo.ef, nodo.ef
+    campos: list[str] = []
+    if previo.propio != nodo.propio:
+        campos = [c for c in _CAMPOS if getattr(antes, c) != getattr(despues, c)]
+    if previo.padre != nodo.padre:
+        campos.append("ubicacion")
+    hijos_antes = [h.id_parte for h in antes.hijos]
+    hijos_despues = [h.id_parte for h in despues.hijos]
+    if hijos_antes != hijos_despues and sorted(hijos_antes) == sorted(hijos_despues):
+        campos.append("orden_hijos")
+    if not campos:
+        return None
+
+    if "derogado" in campos:
+        tipo = DEROGADA if despues.derogado else RESTABLECIDA
+    else:
+        tipo = MODIFICADA
+
+    return CambioEstructura(
+        tipo=tipo,
+        id_parte=nodo.clave,
+        tipo_parte=despues.tipo_parte,
+        nombre_parte=despues.nombre_parte,
+        capitulo=nodo.capitulo,
+        ruta=nodo.ruta,
+        campos=campos,
+        fecha_version_anterior=antes.fecha_version,
+        fecha_version_nueva=despues.fecha_version,
+        texto=diff_texto(antes.texto, despues.texto) if "texto" in campos else [],
+    )
@@ -0,0 +1,542 @@
+"""
+Escritor de ePub 3 en streaming.
+
+``ebooklib`` acumula todos los capítulos en un ``EpubBook`` y recién al
+final los vuelve a parsear con lxml (para el nav y los ``<head>``) y los
+escribe. :class:`StreamingEpubWriter` escribe cada capítulo en el ZIP en
+cuanto se le entrega, así que en memoria sólo queda el capítulo en curso y
+el manifiesto (nombre, id y tipo de cada archivo). Al cerrar escribe el
+documento de navegación (``nav.xhtml``), el NCX (para lectores ePub 2) y el
+``content.opf``.
+
+La estructura del contenedor es la misma que generaba ``ebooklib``::
+
+    mimetype                  (primero y sin comprimir)
+    META-INF/container.xml
+    EPUB/<archivos>           (CSS y capítulos, en orden de llegada)
+    EPUB/nav.xhtml
+    EPUB/toc.ncx
+    EPUB/content.opf
+
+El cuerpo de cada capítulo debe ser XHTML bien formado (``<br/>``, no
+``<br>``): el escritor no lo vuelve a parsear.
+
+Con ``EpubMetadata.modified`` fijo (ver :func:`reproducible_timestamp`) el
+ePub es reproducible: las fechas de los archivos del ZIP salen de
+``modified`` y el orden de los archivos, del orden de escritura, así que la
+misma entrada produce los mismos bytes.
+
+Example:
+    >>> metadata = EpubMetadata("leychile-172986", "Código Civil", creators=["MINISTERIO DE JUSTICIA"])
+    >>> with StreamingEpubWriter("codigo_civil.epub", metadata) as writer:
+    ...     writer.add_file("styles/main.css", css, "text/css")
+    ...     writer.add_chapter("titulo.xhtml", "Código Civil", "<h1>Código Civil</h1>")
+    ...     writer.toc.append(NavPoint("Código Civil", "titulo.xhtml"))
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import struct
+import zipfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from html import escape
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO
+
+from .exceptions import GeneratorError
+
+logger = logging.getLogger("leychile_epub.epub_writer")
+
+# Directorio de los archivos de la publicación dentro del ZIP
+CONTENT_DIR = "EPUB"
+XHTML_MEDIA_TYPE = "application/xhtml+xml"
+
+# Fecha mínima que admite el formato ZIP
+ZIP_EPOCH = datetime(1980, 1, 1, tzinfo=timezone.utc)
+
+# Cabecera local de un archivo del ZIP (hasta los largos de nombre y extra)
+_LOCAL_HEADER = struct.Struct("<4s22xHH")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+# Campo extra de un ZIP (id y largo) y el id de las extensiones zip64
+_EXTRA_FIELD = struct.Struct("<HH")
+_ZIP64_EXTRA_ID = 0x0001
+
+# Estado interno de zipfile.ZipFile del que depende _append_raw_entry
+_ZIPFILE_INTERNALS = ("fp", "start_dir", "filelist", "NameToInfo", "_didModify")
+
+_CONTAINER_XML = """<?xml version="1.0" encoding="utf-8"?>
+<container xmlns="urn:oasis:names:tc:opendocument:xmlns:container" version="1.0">
+  <rootfiles>
+    <rootfile media-type="application/oebps-package+xml" full-path="EPUB/content.opf"/>
+  </rootfiles>
+</container>
+"""
+
+_XHTML_TEMPLATE = """<?xml version='1.0' encoding='utf-8'?>
+<!DOCTYPE html>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" \
+lang="{lang}" xml:lang="{lang}">
+<head>
+<title>{title}</title>
+{links}</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+@dataclass
+class NavPoint:
+    """Entrada de la tabla de contenidos.
+
+    Attributes:
+        title: Texto de la entrada.
+        href: Destino relativo a ``EPUB/`` (``capitulo.xhtml#ancla``).
+        children: Sub-entradas.
+    """
+
+    title: str
+    href: str
+    children: list[NavPoint] = field(default_factory=list)
+
+
+@dataclass
+class EpubMetadata:
+    """Metadatos Dublin Core del ``content.opf``.
+
+    Attributes:
+        identifier: Identificador único de la publicación.
+        title: Título.
+        language: Código de idioma (``es``).
+        creators: Autores u organismos (``dc:creator``).
+        extra: Otros elementos ``dc:`` como pares (nombre, valor); los
+            valores vacíos se omiten.
+        modified: Fecha de ``dcterms:modified`` y de los archivos del ZIP
+            (por defecto, ahora).
+    """
+
+    identifier: str
+    title: str
+    language: str = "es"
+    creators: list[str] = field(default_factory=list)
+    extra: list[tuple[str, str]] = field(default_factory=list)
+    modified: datetime | None = None
+
+
+@dataclass
+class _ManifestItem:
+    item_id: str
+    href: str
+    media_type: str
+
+
+def raw_copy_available() -> bool:
+    """Indica si ``zipfile`` tiene el estado interno que usa :func:`_append_raw_entry`."""
+    with zipfile.ZipFile(io.BytesIO(), "w") as zf:
+        return all(hasattr(zf, name) for name in _ZIPFILE_INTERNALS)
+
+
+def raw_data_offset(source: BinaryIO, member: zipfile.ZipInfo) -> int:
+    """Posición de los datos comprimidos de una entrada que se puede copiar tal cual.
+
+    Sólo se copian entradas sin cifrar, guardadas o comprimidas con deflate
+    y sin extensiones zip64 (ni en el directorio central ni en la cabecera
+    local): la cabecera que escribe :func:`_append_raw_entry` no las lleva.
+
+    Args:
+        source: Archivo binario del ZIP de origen.
+        member: Entrada en el ZIP de origen.
+
+    Returns:
+        Posición en ``source`` del primer byte de datos.
+
+    Raises:
+        GeneratorError: Si la entrada no se puede copiar sin descomprimirla.
+    """
+    if (
+        member.flag_bits & 0x1
+        or member.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+        or max(member.file_size, member.compress_size) >= zipfile.ZIP64_LIMIT
+        or _has_zip64_extra(member.extra)
+    ):
+        raise GeneratorError(f"La entrada {member.filename} no se puede copiar sin descomprimir")
+    source.seek(member.header_offset)
+    header = source.read(_LOCAL_HEADER.size)
+    if len(header) != _LOCAL_HEADER.size:
+        raise GeneratorError(f"Entrada inválida en el ePub de origen: {member.filename}")
+    signature, name_len, extra_len = _LOCAL_HEADER.unpack(header)
+    if signature != _LOCAL_HEADER_SIGNATURE:
+        raise GeneratorError(f"Entrada inválida en el ePub de origen: {member.filename}")
+    source.seek(name_len, os.SEEK_CUR)
+    if _has_zip64_extra(source.read(extra_len)):
+        raise GeneratorError(f"La entrada {member.filename} no se puede copiar sin descomprimir")
+    return member.header_offset + _LOCAL_HEADER.size + name_len + extra_len
+
+
+def _has_zip64_extra(extra: bytes) -> bool:
+    pos = 0
+    while pos + _EXTRA_FIELD.size <= len(extra):
+        field_id, size = _EXTRA_FIELD.unpack_from(extra, pos)
+        if field_id == _ZIP64_EXTRA_ID:
+            return True
+        pos += _EXTRA_FIELD.size + size
+    return False
+
+
+def _append_raw_entry(zf: zipfile.ZipFile, info: zipfile.ZipInfo, data: bytes) -> None:
+    """Agrega a ``zf`` una entrada con sus datos ya comprimidos.
+
+    ``zipfile`` no tiene API para esto, así que se hace lo mismo que
+    ``ZipFile.writestr`` tras comprimir: escribir la cabecera local y los
+    datos donde empieza el directorio central y registrar la entrada en
+    ``filelist``/``NameToInfo`` para que ``close()`` la incluya. Es el único
+    lugar que toca el estado interno de ``ZipFile`` (probado con CPython
+    3.10 a 3.13; ver ``TestZipInternals``). ``info`` no debe requerir zip64.
+
+    Raises:
+        GeneratorError: Si este ``zipfile`` no tiene el estado esperado.
+    """
+    if not all(hasattr(zf, name) for name in _ZIPFILE_INTERNALS) or zf.fp is None:
+        raise GeneratorError("Esta versión de zipfile no permite copiar entradas comprimidas")
+    fp = zf.fp
+    fp.seek(zf.start_dir)
+    info.header_offset = fp.tell()
+    fp.write(info.FileHeader(zip64=False))
+    fp.write(data)
+    zf.start_dir = fp.tell()
+    zf.filelist.append(info)
+    zf.NameToInfo[info.filename] = info
+    zf._didModify = True  # type: ignore[attr-defined]
+
+
+class StreamingEpubWriter:
+    """Escribe un ePub 3 archivo por archivo, sin retener el contenido.
+
+    Attributes:
+        path: Ruta del ePub.
+        metadata: Metadatos del libro.
+        toc: Tabla de contenidos; se escribe al cerrar, así que puede
+            completarse mientras se agregan capítulos.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        metadata: EpubMetadata,
+        compresslevel: int | None = None,
+    ) -> None:
+        """Crea el ZIP y escribe ``mimetype`` y ``META-INF/container.xml``.
+
+        Args:
+            path: Ruta del ePub (se sobrescribe si existe; se crean los
+                directorios que falten).
+            metadata: Metadatos del libro.
+            compresslevel: Nivel de compresión deflate (``None`` = zlib por defecto).
+        """
+        self.path = Path(path)
+        self.metadata = metadata
+        self.toc: list[NavPoint] = []
+        self._manifest: list[_ManifestItem] = []
+        self._spine: list[str] = ["nav"]
+        self._hrefs: set[str] = set()
+        self._closed = False
+        stamp = (metadata.modified or datetime.now()).timetuple()[:6]
+        self._date_time = max(stamp, ZIP_EPOCH.timetuple()[:6])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._zip = zipfile.ZipFile(
+            self.path, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel
+        )
+        # El OCF exige que mimetype sea el primer archivo y vaya sin comprimir
+        self._write("mimetype", b"application/epub+zip", zipfile.ZIP_STORED)
+        self._write("META-INF/container.xml", _CONTAINER_XML.encode("utf-8"))
+
+    def __enter__(self) -> StreamingEpubWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _write(self, name: str, data: bytes, compress_type: int | None = None) -> None:
+        info = zipfile.ZipInfo(name, date_time=self._date_time)
+        info.compress_type = zipfile.ZIP_DEFLATED if compress_type is None else compress_type
+        self._zip.writestr(info, data)
+
+    def _register(self, href: str, media_type: str, item_id: str | None) -> str:
+        if self._closed:
+            raise GeneratorError(f"El ePub {self.path} ya fue cerrado")
+        if href in self._hrefs:
+            raise GeneratorError(f"Archivo duplicado en el ePub: {href}")
+        self._hrefs.add(href)
+        item_id = item_id or f"item_{len(self._manifest)}"
+        self._manifest.append(_ManifestItem(item_id, href, media_type))
+        return item_id
+
+    def add_file(
+        self,
+        href: str,
+        content: str | bytes,
+        media_type: str,
+        item_id: str | None = None,
+    ) -> str:
+        """Escribe un recurso (CSS, imagen, fuente) y lo agrega al manifiesto.
+
+        Args:
+            href: Ruta relativa a ``EPUB/``.
+            content: Contenido (las cadenas se codifican en UTF-8).
+            media_type: Tipo MIME.
+            item_id: Id en el manifiesto (por defecto ``item_<n>``).
+
+        Returns:
+            Id del recurso en el manifiesto.
+        """
+        item_id = self._register(href, media_type, item_id)
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        self._write(f"{CONTENT_DIR}/{href}", data)
+        return item_id
+
+    def add_chapter(
+        self,
+        href: str,
+        title: str,
+        body: str,
+        stylesheets: Iterable[str] = (),
+        item_id: str | None = None,
+    ) -> str:
+        """Escribe un capítulo XHTML y lo agrega al manifiesto y al spine.
+
+        Args:
+            href: Nombre del archivo, relativo a ``EPUB/``.
+            title: Título del documento (``<title>``).
+            body: Contenido del ``<body>`` (XHTML bien formado).
+            stylesheets: Hojas de estilo a enlazar desde el ``<head>``.
+            item_id: Id en el manifiesto (por defecto ``chapter_<n>``).
+
+        Returns:
+            Id del capítulo en el manifiesto.
+        """
+        item_id = self._register(
+            href, XHTML_MEDIA_TYPE, item_id or f"chapter_{len(self._spine) - 1}"
+        )
+        self._spine.append(item_id)
+        links = "".join(
+            f'<link href="{escape(css)}" rel="stylesheet" type="text/css"/>\n'
+            for css in stylesheets
+        )
+        document = _XHTML_TEMPLATE.format(
+            lang=escape(self.metadata.language),
+            title=escape(title, quote=False),
+            links=links,
+            body=body,
+        )
+        self._write(f"{CONTENT_DIR}/{href}", document.encode("utf-8"))
+        return item_id
+
+    def copy_chapter(
+        self,
+        href: str,
+        source: BinaryIO,
+        member: zipfile.ZipInfo,
+        item_id: str | None = None,
+    ) -> str:
+        """Copia un capítulo de otro ePub tal como está comprimido.
+
+        Los datos comprimidos de ``member`` se copian sin descomprimir ni
+        volver a comprimir; sólo se escribe una cabecera nueva con ``href``
+        y la fecha de este ePub. El capítulo debe haberse escrito con el
+        mismo título y hojas de estilo que :meth:`add_chapter` le daría.
+        Las entradas que no se pueden copiar así (ver :func:`raw_data_offset`)
+        hay que volver a renderizarlas.
+
+        Args:
+            href: Nombre del archivo en este ePub, relativo a ``EPUB/``.
+            source: Archivo binario del ePub de origen.
+            member: Entrada del capítulo en el ePub de origen.
+            item_id: Id en el manifiesto (por defecto ``chapter_<n>``).
+
+        Returns:
+            Id del capítulo en el manifiesto.
+
+        Raises:
+            GeneratorError: Si la entrada no es válida en el ePub de origen
+                o no se puede copiar sin descomprimirla.
+        """
+        source.seek(raw_data_offset(source, member))
+        data = source.read(member.compress_size)
+        if len(data) != member.compress_size:
+            raise GeneratorError(f"Entrada truncada en el ePub de origen: {member.filename}")
+
+        item_id = self._register(
+            href, XHTML_MEDIA_TYPE, item_id or f"chapter_{len(self._spine) - 1}"
+        )
+        self._spine.append(item_id)
+        info = zipfile.ZipInfo(f"{CONTENT_DIR}/{href}", date_time=self._date_time)
+        info.compress_type = member.compress_type
+        info.CRC = member.CRC
+        info.compress_size = member.compress_size
+        info.file_size = member.file_size
+        info.external_attr = member.external_attr
+        _append_raw_entry(self._zip, info, data)
+        return item_id
+
+    def close(self) -> None:
+        """Escribe ``nav.xhtml``, ``toc.ncx`` y ``content.opf`` y cierra el ZIP."""
+        if self._closed:
+            return
+        try:
+            self._write(f"{CONTENT_DIR}/nav.xhtml", self._nav_xhtml().encode("utf-8"))
+            self._write(f"{CONTENT_DIR}/toc.ncx", self._ncx().encode("utf-8"))
+            self._write(f"{CONTENT_DIR}/content.opf", self._opf().encode("utf-8"))
+        finally:
+            self._closed = True
+            self._zip.close()
+        logger.debug(f"ePub escrito: {self.path} ({len(self._spine) - 1} capítulos)")
+
+    def abort(self) -> None:
+        """Cierra el ZIP y borra el ePub incompleto."""
+        if not self._closed:
+            self._closed = True
+            self._zip.close()
+        self.path.unlink(missing_ok=True)
+
+    # =========================================================================
+    # Navegación y paquete
+    # =========================================================================
+
+    def _nav_xhtml(self) -> str:
+        title = escape(self.metadata.title, quote=False)
+        parts = [
+            f'<nav epub:type="toc" id="id" role="doc-toc">\n<h2>{title}</h2>\n',
+            *self._nav_list(self.toc),
+            "</nav>",
+        ]
+        return _XHTML_TEMPLATE.format(
+            lang=escape(self.metadata.language), title=title, links="", body="".join(parts)
+        )
+
+    def _nav_list(self, points: list[NavPoint]) -> Iterator[str]:
+        yield "<ol>\n"
+        for point in points:
+            yield f'<li><a href="{escape(point.href)}">{escape(point.title, quote=False)}</a>'
+            if point.children:
+                yield "\n"
+                yield from self._nav_list(point.children)
+            yield "</li>\n"
+        yield "</ol>\n"
+
+    def _ncx(self) -> str:
+        counter = 0
+
+        def nav_points(points: list[NavPoint], indent: str) -> Iterator[str]:
+            nonlocal counter
+            for point in points:
+                counter += 1
+                yield (
+                    f'{indent}<navPoint id="navpoint_{counter}" playOrder="{counter}">\n'
+                    f"{indent}  <navLabel><text>{escape(point.title, quote=False)}</text>"
+                    f"</navLabel>\n"
+                    f'{indent}  <content src="{escape(point.href)}"/>\n'
+                )
+                yield from nav_points(point.children, indent + "  ")
+                yield f"{indent}</navPoint>\n"
+
+        nav_map = "".join(nav_points(self.toc, "    "))
+        return (
+            "<?xml version='1.0' encoding='utf-8'?>\n"
+            '<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">\n'
+            "  <head>\n"
+            f'    <meta name="dtb:uid" content="{escape(self.metadata.identifier)}"/>\n'
+            f'    <meta name="dtb:depth" content="{_depth(self.toc)}"/>\n'
+            '    <meta name="dtb:totalPageCount" content="0"/>\n'
+            '    <meta name="dtb:maxPageNumber" content="0"/>\n'
+            "  </head>\n"
+            f"  <docTitle><text>{escape(self.metadata.title, quote=False)}</text></docTitle>\n"
+            f"  <navMap>\n{nav_map}  </navMap>\n"
+            "</ncx>\n"
+        )
+
+    def _opf(self) -> str:
+        meta = self.metadata
+        modified = (meta.modified or datetime.now(timezone.utc)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        dc = [
+            f'    <dc:identifier id="id">{escape(meta.identifier, quote=False)}</dc:identifier>',
+            f"    <dc:title>{escape(meta.title, quote=False)}</dc:title>",
+            f"    <dc:language>{escape(meta.language, quote=False)}</dc:language>",
+        ]
+        dc += [
+            f'    <dc:creator id="creator_{i}">{escape(creator, quote=False)}</dc:creator>'
+            for i, creator in enumerate(meta.creators)
+        ]
+        dc += [
+            f"    <dc:{name}>{escape(value, quote=False)}</dc:{name}>"
+            for name, value in meta.extra
+            if value
+        ]
+        items = [
+            '    <item href="nav.xhtml" id="nav" media-type="application/xhtml+xml" '
+            'properties="nav"/>',
+            '    <item href="toc.ncx" id="ncx" media-type="application/x-dtbncx+xml"/>',
+        ]
+        items += [
+            f'    <item href="{escape(item.href)}" id="{escape(item.item_id)}" '
+            f'media-type="{item.media_type}"/>'
+            for item in self._manifest
+        ]
+        spine = [f'    <itemref idref="{escape(item_id)}"/>' for item_id in self._spine]
+        return (
+            "<?xml version='1.0' encoding='utf-8'?>\n"
+            '<package xmlns="http://www.idpf.org/2007/opf" unique-identifier="id" '
+            'version="3.0">\n'
+            '  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+            f'    <meta property="dcterms:modified">{modified}</meta>\n'
+            + "\n".join(dc)
+            + "\n  </metadata>\n  <manifest>\n"
+            + "\n".join(items)
+            + '\n  </manifest>\n  <spine toc="ncx">\n'
+            + "\n".join(spine)
+            + "\n  </spine>\n</package>\n"
+        )
+
+
+def reproducible_timestamp(fecha: str = "") -> datetime:
+    """Fecha fija para un build reproducible.
+
+    Usa ``SOURCE_DATE_EPOCH`` si está definida (convención de
+    reproducible-builds.org); si no, ``fecha`` (ISO ``AAAA-MM-DD``, p. ej.
+    la fecha de versión de la norma), y si tampoco es válida, ``ZIP_EPOCH``.
+
+    Args:
+        fecha: Fecha de respaldo en formato ISO.
+
+    Returns:
+        Fecha en UTC.
+    """
+    epoch = os.environ.get("SOURCE_DATE_EPOCH", "")
+    if epoch.isdigit():
+        return datetime.fromtimestamp(int(epoch), timezone.utc)
+    try:
+        return datetime.fromisoformat(fecha).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return ZIP_EPOCH
+
+
+def _depth(points: list[NavPoint]) -> int:
+    """Profundidad máxima de la tabla de contenidos."""
+    return max((1 + _depth(point.children) for point in points), default=0)
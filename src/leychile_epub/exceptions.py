@@ -120,11 +120,13 @@ class RateLimitError(NetworkError):
     def __init__(
         self,
         message: str = "Rate limit excedido",
-        retry_after: int | None = None,
+        retry_after: float | None = None,
         details: dict | None = None,
+        url: str | None = None,
+        status_code: int | None = None,
     ) -> None:
         self.retry_after = retry_after
         details = details or {}
         if retry_after:
             details["retry_after"] = retry_after
-        super().__init__(message, details=details)
+        super().__init__(message, url=url, status_code=status_code, details=details)
@@ -0,0 +1,461 @@
+"""
+Representación plana (por columnas) del árbol de una norma.
+
+:class:`FlatNorma` guarda las ``EstructuraFuncional`` de una norma en
+preorden como arreglos paralelos (``array.array``): tipo (código en un
+vocabulario), padre, fin del subárbol, nivel y marcas de derogado/transitorio;
+los textos van concatenados en una sola cadena con un arreglo de offsets
+(:class:`StringColumn`). En lugar de un objeto Python por estructura hay un
+puñado de arreglos por norma, por lo que recorrer o analizar la biblioteca
+completa no crea millones de objetos.
+
+Con el preorden y el fin de cada subárbol, la navegación es O(1): el padre
+es ``padre[i]``, el primer hijo es ``i + 1`` y el siguiente hermano es
+``fin[i]``. Los conteos y filtros operan sobre los arreglos (que además
+exponen el protocolo de buffer, p. ej. para ``numpy.frombuffer``).
+
+La conversión es sin pérdida: ``FlatNorma.from_norma(norma).to_norma() ==
+norma``. :func:`parse_flat` construye la representación directamente desde el
+XML de la BCN, sin mantener el árbol de objetos.
+
+Example:
+    >>> flat = FlatNorma.from_norma(norma)
+    >>> flat.contar_por_tipo()
+    {'Libro': 4, 'Título': 45, 'Artículo': 2524, ...}
+    >>> [flat.nombre_parte[i] for i in flat.indices(tipo="Artículo", derogado=True)]
+    ['59', '60', ...]
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import bisect
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field, fields
+
+from .scraper_v2 import (
+    EMPTY,
+    BCNXMLParser,
+    EstructuraFuncional,
+    Norma,
+    _qname,
+)
+
+# Marcas del arreglo ``flags``
+DEROGADO = 1
+TRANSITORIO = 2
+
+# Índice de "sin padre" / "sin nodo"
+NINGUNO = -1
+
+
+class StringColumn:
+    """Secuencia de cadenas guardadas en un único buffer con offsets.
+
+    La cadena ``i`` es ``data[offsets[i]:offsets[i + 1]]`` y sólo se
+    materializa al pedirla; su largo se obtiene sin copiarla.
+    """
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self, data: str = "", offsets: array | None = None) -> None:
+        self.data = data
+        self.offsets = offsets if offsets is not None else array("q", [0])
+
+    @classmethod
+    def from_strings(cls, strings: Iterable[str]) -> StringColumn:
+        """Construye la columna a partir de cadenas sueltas."""
+        offsets = array("q", [0])
+        partes = []
+        total = 0
+        for s in strings:
+            partes.append(s)
+            total += len(s)
+            offsets.append(total)
+        return cls("".join(partes), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += len(self)
+        return self.data[self.offsets[i] : self.offsets[i + 1]]
+
+    def __iter__(self) -> Iterator[str]:
+        data, offsets = self.data, self.offsets
+        for i in range(len(self)):
+            yield data[offsets[i] : offsets[i + 1]]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, StringColumn):
+            return NotImplemented
+        return self.data == other.data and self.offsets == other.offsets
+
+    def length(self, i: int) -> int:
+        """Largo de la cadena ``i`` sin materializarla."""
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def search(self, needle: str) -> list[int]:
+        """Índices de las cadenas que contienen ``needle``.
+
+        Busca sobre el buffer completo, sin materializar cada cadena.
+        """
+        if not needle:
+            return list(range(len(self)))
+        hits: list[int] = []
+        data, offsets = self.data, self.offsets
+        pos = data.find(needle)
+        while pos != -1:
+            i = bisect.bisect_right(offsets, pos) - 1
+            end = offsets[i + 1]
+            if pos + len(needle) <= end:
+                hits.append(i)
+                pos = data.find(needle, end)
+            else:
+                # La coincidencia cruza el límite con la siguiente cadena
+                pos = data.find(needle, pos + 1)
+        return hits
+
+
+def _campos_cabecera() -> tuple[str, ...]:
+    return tuple(f.name for f in fields(Norma) if f.name != "estructuras")
+
+
+@dataclass
+class FlatNorma:
+    """Norma con sus estructuras en arreglos paralelos (preorden).
+
+    Attributes:
+        cabecera: Norma sin estructuras (identificador, metadatos, encabezado,
+            promulgación, anexos...).
+        tipos: Vocabulario de ``tipo_parte``.
+        tipo: Código en ``tipos`` de cada estructura.
+        padre: Índice del padre (``-1`` en las de primer nivel).
+        fin: Índice siguiente al último descendiente (fin del subárbol).
+        nivel: ``nivel`` de cada estructura.
+        flags: Marcas ``DEROGADO`` / ``TRANSITORIO``.
+        fechas: Vocabulario de ``fecha_version``.
+        fecha: Código en ``fechas`` de cada estructura.
+        id_parte: Columna de ``id_parte``.
+        nombre_parte: Columna de ``nombre_parte``.
+        titulo_parte: Columna de ``titulo_parte``.
+        texto: Columna de ``texto``.
+        materias: Materias de las estructuras que tienen (índice → lista).
+    """
+
+    cabecera: Norma = field(default_factory=Norma)
+    tipos: list[str] = field(default_factory=list)
+    tipo: array = field(default_factory=lambda: array("H"))
+    padre: array = field(default_factory=lambda: array("i"))
+    fin: array = field(default_factory=lambda: array("i"))
+    nivel: array = field(default_factory=lambda: array("H"))
+    flags: array = field(default_factory=lambda: array("B"))
+    fechas: list[str] = field(default_factory=list)
+    fecha: array = field(default_factory=lambda: array("I"))
+    id_parte: StringColumn = field(default_factory=StringColumn)
+    nombre_parte: StringColumn = field(default_factory=StringColumn)
+    titulo_parte: StringColumn = field(default_factory=StringColumn)
+    texto: StringColumn = field(default_factory=StringColumn)
+    materias: dict[int, list[str]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.tipo)
+
+    # -------------------------------------------------------------------------
+    # Conversión
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_norma(cls, norma: Norma) -> FlatNorma:
+        """Aplana una Norma (la Norma original no se modifica)."""
+        builder = _FlatBuilder(norma)
+        pendientes: list[tuple[EstructuraFuncional, int, bool]] = [
+            (ef, NINGUNO, False) for ef in reversed(norma.estructuras)
+        ]
+        abiertos: list[int] = []
+        while pendientes:
+            ef, padre, cerrar = pendientes.pop()
+            if cerrar:
+                builder.close(abiertos.pop())
+                continue
+            i = builder.reserve(padre)
+            builder.fill(i, ef)
+            abiertos.append(i)
+            pendientes.append((ef, padre, True))
+            pendientes.extend((h, i, False) for h in reversed(ef.hijos))
+        return builder.build()
+
+    def to_norma(self) -> Norma:
+        """Reconstruye la Norma completa."""
+        valores = {name: getattr(self.cabecera, name) for name in _campos_cabecera()}
+        return Norma(**valores, estructuras=self.estructuras())
+
+    def estructuras(self) -> list[EstructuraFuncional]:
+        """Materializa las estructuras de primer nivel con todo su subárbol.
+
+        Recorre las columnas una sola vez, sin recursión, y enlaza cada nodo
+        con su padre usando ``padre``; para el árbol completo es bastante más
+        rápido que llamar a :meth:`estructura` por cada raíz.
+        """
+        tipos, fechas = self.tipos, self.fechas
+        nodos = [
+            EstructuraFuncional(
+                id_parte=id_parte,
+                tipo_parte=tipos[tipo],
+                texto=texto,
+                nombre_parte=nombre,
+                titulo_parte=titulo,
+                fecha_version=fechas[fecha],
+                derogado=bool(flags & DEROGADO),
+                transitorio=bool(flags & TRANSITORIO),
+                materias=EMPTY,
+                hijos=EMPTY,
+                nivel=nivel,
+            )
+            for id_parte, tipo, texto, nombre, titulo, fecha, flags, nivel in zip(
+                self.id_parte,
+                self.tipo,
+                self.texto,
+                self.nombre_parte,
+                self.titulo_parte,
+                self.fecha,
+                self.flags,
+                self.nivel,
+                strict=True,
+            )
+        ]
+        for i, materias in self.materias.items():
+            if materias:
+                nodos[i].materias = list(materias)
+        hijos: dict[int, list[EstructuraFuncional]] = {}
+        for nodo, padre in zip(nodos, self.padre, strict=True):
+            if padre != NINGUNO:
+                hijos.setdefault(padre, []).append(nodo)
+        for padre, lista in hijos.items():
+            nodos[padre].hijos = lista
+        return [nodos[i] for i in self.raices()]
+
+    def estructura(self, i: int) -> EstructuraFuncional:
+        """Materializa la estructura ``i`` con todo su subárbol."""
+        hijos = [self.estructura(j) for j in self.hijos(i)]
+        flags = self.flags[i]
+        return EstructuraFuncional(
+            id_parte=self.id_parte[i],
+            tipo_parte=self.tipos[self.tipo[i]],
+            texto=self.texto[i],
+            nombre_parte=self.nombre_parte[i],
+            titulo_parte=self.titulo_parte[i],
+            fecha_version=self.fechas[self.fecha[i]],
+            derogado=bool(flags & DEROGADO),
+            transitorio=bool(flags & TRANSITORIO),
+            materias=list(self.materias.get(i, EMPTY)) or EMPTY,
+            hijos=hijos or EMPTY,
+            nivel=self.nivel[i],
+        )
+
+    # -------------------------------------------------------------------------
+    # Navegación
+    # -------------------------------------------------------------------------
+
+    def raices(self) -> Iterator[int]:
+        """Índices de las estructuras de primer nivel."""
+        i, n = 0, len(self)
+        while i < n:
+            yield i
+            i = self.fin[i]
+
+    def hijos(self, i: int) -> Iterator[int]:
+        """Índices de los hijos directos de ``i``."""
+        j, fin = i + 1, self.fin[i]
+        while j < fin:
+            yield j
+            j = self.fin[j]
+
+    def primer_hijo(self, i: int) -> int:
+        """Primer hijo de ``i`` o ``-1``."""
+        return i + 1 if self.fin[i] > i + 1 else NINGUNO
+
+    def siguiente_hermano(self, i: int) -> int:
+        """Siguiente hermano de ``i`` o ``-1``."""
+        padre = self.padre[i]
+        limite = self.fin[padre] if padre != NINGUNO else len(self)
+        j = self.fin[i]
+        return j if j < limite else NINGUNO
+
+    def ancestros(self, i: int) -> list[int]:
+        """Índices de los ancestros de ``i``, del padre a la raíz."""
+        resultado = []
+        i = self.padre[i]
+        while i != NINGUNO:
+            resultado.append(i)
+            i = self.padre[i]
+        return resultado
+
+    def subarbol(self, i: int) -> range:
+        """Índices de ``i`` y todos sus descendientes."""
+        return range(i, self.fin[i])
+
+    # -------------------------------------------------------------------------
+    # Análisis
+    # -------------------------------------------------------------------------
+
+    def contar_por_tipo(self) -> dict[str, int]:
+        """Cantidad de estructuras por ``tipo_parte``."""
+        return {self.tipos[codigo]: n for codigo, n in Counter(self.tipo).items()}
+
+    def indices(
+        self,
+        tipo: str | Iterable[str] | None = None,
+        derogado: bool | None = None,
+        transitorio: bool | None = None,
+        nivel: int | None = None,
+    ) -> list[int]:
+        """Índices de las estructuras que cumplen todos los filtros dados.
+
+        Args:
+            tipo: ``tipo_parte`` exacto o conjunto de ellos.
+            derogado: Filtra por marca de derogado.
+            transitorio: Filtra por marca de transitorio.
+            nivel: Filtra por ``nivel``.
+        """
+        candidatos: Iterable[int] = range(len(self))
+        if tipo is not None:
+            buscados = {tipo} if isinstance(tipo, str) else set(tipo)
+            codigos = {c for c, t in enumerate(self.tipos) if t in buscados}
+            candidatos = [i for i, c in enumerate(self.tipo) if c in codigos]
+        if nivel is not None:
+            niveles = self.nivel
+            candidatos = [i for i in candidatos if niveles[i] == nivel]
+        for marca, valor in ((DEROGADO, derogado), (TRANSITORIO, transitorio)):
+            if valor is not None:
+                flags = self.flags
+                candidatos = [i for i in candidatos if bool(flags[i] & marca) == valor]
+        return list(candidatos)
+
+
+class _FlatBuilder:
+    """Acumula las columnas de una FlatNorma en preorden."""
+
+    def __init__(self, cabecera: Norma) -> None:
+        valores = {name: getattr(cabecera, name) for name in _campos_cabecera()}
+        self.flat = FlatNorma(cabecera=Norma(**valores))
+        self._tipos: dict[str, int] = {}
+        self._fechas: dict[str, int] = {}
+        self._textos: list[list[str]] = [[], [], [], []]
+
+    def reserve(self, padre: int) -> int:
+        """Reserva el índice de la siguiente estructura en preorden."""
+        flat = self.flat
+        i = len(flat.padre)
+        flat.padre.append(padre)
+        flat.fin.append(i + 1)
+        flat.tipo.append(0)
+        flat.nivel.append(0)
+        flat.flags.append(0)
+        flat.fecha.append(0)
+        for columna in self._textos:
+            columna.append("")
+        return i
+
+    def fill(self, i: int, ef: EstructuraFuncional) -> None:
+        """Guarda los campos propios (sin hijos) de la estructura ``i``."""
+        flat = self.flat
+        flat.tipo[i] = _codigo(self._tipos, flat.tipos, ef.tipo_parte)
+        flat.fecha[i] = _codigo(self._fechas, flat.fechas, ef.fecha_version)
+        flat.nivel[i] = ef.nivel
+        flat.flags[i] = (DEROGADO if ef.derogado else 0) | (TRANSITORIO if ef.transitorio else 0)
+        id_parte, nombre, titulo, texto = self._textos
+        id_parte[i] = ef.id_parte
+        nombre[i] = ef.nombre_parte
+        titulo[i] = ef.titulo_parte
+        texto[i] = ef.texto
+        if ef.materias:
+            flat.materias[i] = list(ef.materias)
+
+    def close(self, i: int) -> None:
+        """Cierra el subárbol de ``i`` (ya se agregaron todos sus descendientes)."""
+        self.flat.fin[i] = len(self.flat.padre)
+
+    def build(self) -> FlatNorma:
+        flat = self.flat
+        id_parte, nombre, titulo, texto = self._textos
+        flat.id_parte = StringColumn.from_strings(id_parte)
+        flat.nombre_parte = StringColumn.from_strings(nombre)
+        flat.titulo_parte = StringColumn.from_strings(titulo)
+        flat.texto = StringColumn.from_strings(texto)
+        self._textos = [[], [], [], []]
+        return flat
+
+
+def _codigo(indice: dict[str, int], vocabulario: list[str], valor: str) -> int:
+    codigo = indice.get(valor)
+    if codigo is None:
+        codigo = indice[valor] = len(vocabulario)
+        vocabulario.append(valor)
+    return codigo
+
+
+def parse_flat(chunks: Iterable[bytes], parser: BCNXMLParser | None = None) -> FlatNorma:
+    """Parsea el XML de la BCN directamente a una FlatNorma.
+
+    Cada ``EstructuraFuncional`` se convierte con las mismas reglas que
+    :meth:`BCNXMLParser.parse_stream` y se descarta apenas se copian sus
+    campos a las columnas; nunca se mantiene el árbol de objetos.
+
+    Args:
+        chunks: Trozos consecutivos del documento.
+        parser: Parser (backend) a usar; por defecto ``BCNXMLParser()``.
+
+    Returns:
+        FlatNorma equivalente a ``FlatNorma.from_norma(parser.parse(...))``.
+
+    Raises:
+        xml.etree.ElementTree.ParseError: Si el XML no es válido (ver
+            ``parser.parse_errors`` para otros backends).
+    """
+    parser = parser or BCNXMLParser()
+    norma = Norma()
+    builder = _FlatBuilder(norma)
+    pull = parser._pull_parser()
+    ef_tag = _qname("EstructuraFuncional")
+    open_elems: list = []
+    # Índices (preorden) de las EstructuraFuncional abiertas
+    abiertas: list[int] = []
+
+    def handle(event: str, elem) -> None:
+        if event == "start":
+            if not open_elems:
+                parser._parse_root_attributes(norma, elem)
+            elif elem.tag == ef_tag:
+                abiertas.append(builder.reserve(abiertas[-1] if abiertas else NINGUNO))
+            open_elems.append(elem)
+            return
+
+        open_elems.pop()
+        if not open_elems:
+            return
+        parent = open_elems[-1]
+
+        if elem.tag == ef_tag:
+            i = abiertas.pop()
+            builder.fill(i, parser._build_estructura(elem, len(abiertas), EMPTY))
+            builder.close(i)
+            parent.remove(elem)
+        elif len(open_elems) == 1:
+            parser._parse_root_section(norma, elem)
+            parent.remove(elem)
+
+    for chunk in chunks:
+        pull.feed(chunk)
+        for event, elem in pull.read_events():
+            handle(event, elem)
+    pull.close()
+    for event, elem in pull.read_events():
+        handle(event, elem)
+
+    builder.flat.cabecera = norma
+    return builder.build()
@@ -7,20 +7,24 @@ profesionales a partir de datos de leyes extraídos de la BCN.
 Author: Luis Aguilera Arteaga <luis@aguilera.cl>
 """
 
+import hashlib
+import json
 import logging
 import re
 import uuid
 import warnings
 from collections.abc import Callable
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from ebooklib import epub
-
+from . import __version__
 from .config import Config, get_config
+from .epub_writer import EpubMetadata, NavPoint, StreamingEpubWriter, reproducible_timestamp
 from .exceptions import GeneratorError, ValidationError
 from .styles import get_premium_css
+from .text_normalize import escape_html, escape_html_preserve_links
 
 # Logger del módulo
 logger = logging.getLogger("leychile_epub.generator")
@@ -116,6 +120,9 @@ class LawEpubGenerator:
         (re.compile(r"^(CAPITULO\s+[IVXLCDM]+)\s+(.+)$", re.IGNORECASE), r"\1<br/>\2"),
     ]
 
+    # Hoja de estilos de todos los capítulos
+    STYLESHEET = "style/premium.css"
+
     # Regex precompilado para referencias cruzadas
     _CROSS_REF_PATTERN = re.compile(
         r"art[íi]culo\s+(\d+(?:\s*(?:bis|ter|qu[aá]ter|quinquies|"
@@ -144,13 +151,14 @@ class LawEpubGenerator:
 
     def _reset_state(self) -> None:
         """Reinicia el estado interno del generador."""
-        self.book: epub.EpubBook | None = None
-        self.chapters: list[epub.EpubHtml] = []
-        self.toc: list[Any] = []
-        self.toc_sections: list[tuple[epub.EpubHtml, list[dict]]] = []
+        self.book: StreamingEpubWriter | None = None
+        self.chapters: list[NavPoint] = []
+        self.toc: list[NavPoint] = []
+        self.toc_sections: list[tuple[NavPoint, list[dict]]] = []
         self.article_ids: dict[str, str] = {}
         self.article_list: list[dict[str, Any]] = []
         self.keyword_index: dict[str, list[dict[str, str]]] = {}
+        self.build_time: datetime = datetime.now()
 
     def generate(
         self,
@@ -185,14 +193,16 @@ class LawEpubGenerator:
 
         # Reiniciar estado
         self._reset_state()
+        if self.config.epub.reproducible:
+            self.build_time = reproducible_timestamp(law_data.get("id_version") or "")
 
-        try:
-            # Crear libro
-            self.book = epub.EpubBook()
+        metadata = law_data.get("metadata", {})
+        content = law_data.get("content", [])
 
-            metadata = law_data.get("metadata", {})
-            content = law_data.get("content", [])
+        # Generar ruta de salida
+        output_path = self._get_output_path(metadata, output_dir, filename)
 
+        try:
             if progress_callback:
                 progress_callback(0.1, "Construyendo índices...")
 
@@ -203,8 +213,8 @@ class LawEpubGenerator:
             if progress_callback:
                 progress_callback(0.2, "Configurando metadatos...")
 
-            # Metadatos
-            self._set_metadata(metadata, law_data)
+            # Crear libro: cada capítulo se escribe en el archivo al crearlo
+            self.book = StreamingEpubWriter(output_path, self._build_metadata(metadata, law_data))
 
             if progress_callback:
                 progress_callback(0.3, "Aplicando estilos...")
@@ -240,18 +250,14 @@ class LawEpubGenerator:
             if progress_callback:
                 progress_callback(0.85, "Finalizando estructura...")
 
-            # TOC y spine
+            # TOC (el spine sigue el orden de creación de los capítulos)
             self._build_toc()
-            self._set_spine()
 
             if progress_callback:
                 progress_callback(0.9, "Escribiendo archivo...")
 
-            # Generar ruta de salida
-            output_path = self._get_output_path(metadata, output_dir, filename)
-
-            # Escribir archivo
-            epub.write_epub(str(output_path), self.book, {})
+            # Escribir navegación y paquete
+            self.book.close()
 
             if progress_callback:
                 progress_callback(1.0, "¡Completado!")
@@ -261,6 +267,8 @@ class LawEpubGenerator:
 
         except Exception as e:
             logger.error(f"Error generando ePub: {e}")
+            if self.book is not None:
+                self.book.abort()
             raise GeneratorError(f"Error al generar ePub: {e}") from e
 
     # Alias para compatibilidad
@@ -338,14 +346,7 @@ class LawEpubGenerator:
         Returns:
             Texto con caracteres escapados.
         """
-        if not text:
-            return ""
-        return (
-            text.replace("&", "&amp;")
-            .replace("<", "&lt;")
-            .replace(">", "&gt;")
-            .replace('"', "&quot;")
-        )
+        return escape_html(text)
 
     def _escape_html_preserve_links(self, text: str) -> str:
         """Escapa HTML pero preserva los links.
@@ -356,23 +357,7 @@ class LawEpubGenerator:
         Returns:
             Texto escapado con links preservados.
         """
-        if not text:
-            return ""
-
-        link_pattern = r'(<a\s+href="[^"]*"\s+class="cross-ref">)(.*?)(</a>)'
-        parts = []
-        last_end = 0
-
-        for match in re.finditer(link_pattern, text):
-            before = text[last_end : match.start()]
-            parts.append(self._escape_html(before))
-            parts.append(match.group(1))
-            parts.append(self._escape_html(match.group(2)))
-            parts.append(match.group(3))
-            last_end = match.end()
-
-        parts.append(self._escape_html(text[last_end:]))
-        return "".join(parts)
+        return escape_html_preserve_links(text)
 
     def _format_section_title(self, text: str) -> str:
         """Formatea títulos de sección con separadores apropiados.
@@ -521,57 +506,68 @@ class LawEpubGenerator:
                 if len(word) > 4 and word not in self.keyword_index:
                     self.keyword_index[word] = []
 
-    def _set_metadata(self, metadata: dict[str, Any], law_data: dict[str, Any]) -> None:
-        """Configura los metadatos del ePub.
+    def _build_metadata(self, metadata: dict[str, Any], law_data: dict[str, Any]) -> EpubMetadata:
+        """Construye los metadatos del ePub.
 
         Args:
             metadata: Metadatos de la ley.
             law_data: Datos completos de la ley.
+
+        Returns:
+            Metadatos para el ``content.opf``.
         """
         title = metadata.get("title", "Ley Chile")
         law_type = metadata.get("type", "Ley")
         law_number = metadata.get("number", "")
 
         full_title = f"{law_type} N° {law_number} - {title}" if law_number else title
-
-        self.book.set_identifier(f"bcn-chile-{uuid.uuid4().hex[:8]}")
-        self.book.set_title(full_title)
-        self.book.set_language(self.config.epub.language)
-
-        self.book.add_author("Biblioteca del Congreso Nacional de Chile")
-
-        if organism := metadata.get("organism"):
-            self.book.add_metadata("DC", "contributor", organism)
-
-        self.book.add_metadata("DC", "publisher", self.config.epub.publisher)
-        self.book.add_metadata("DC", "source", law_data.get("url", ""))
-        self.book.add_metadata("DC", "date", datetime.now().strftime("%Y-%m-%d"))
-        self.book.add_metadata("DC", "rights", "Documento publico - Republica de Chile")
-        self.book.add_metadata("DC", "type", "Legislacion")
-        self.book.add_metadata("DC", "format", "application/epub+zip")
-
         description = f"{law_type} {law_number}: {title}. Texto oficial de la Republica de Chile."
-        self.book.add_metadata("DC", "description", description)
 
         subjects = metadata.get("subjects", [])
         unique_subjects = list(dict.fromkeys(subjects))[:5]
-        for subject in unique_subjects:
-            self.book.add_metadata("DC", "subject", subject)
 
-        self.book.add_metadata("DC", "subject", "Legislacion chilena")
-        self.book.add_metadata("DC", "subject", "Derecho")
+        return EpubMetadata(
+            identifier=self._build_identifier(law_data),
+            title=full_title,
+            language=self.config.epub.language,
+            creators=["Biblioteca del Congreso Nacional de Chile"],
+            extra=[
+                ("contributor", metadata.get("organism", "")),
+                ("publisher", self.config.epub.publisher),
+                ("source", law_data.get("url", "")),
+                ("date", self.build_time.strftime("%Y-%m-%d")),
+                ("rights", "Documento publico - Republica de Chile"),
+                ("type", "Legislacion"),
+                ("format", "application/epub+zip"),
+                ("description", description),
+                *(("subject", subject) for subject in unique_subjects),
+                ("subject", "Legislacion chilena"),
+                ("subject", "Derecho"),
+            ],
+            modified=self.build_time if self.config.epub.reproducible else None,
+        )
 
-    def _add_css(self) -> None:
-        """Agrega los estilos CSS al ePub."""
-        css_content = get_premium_css()
+    def _build_identifier(self, law_data: dict[str, Any]) -> str:
+        """Identificador del libro; en un build reproducible, hash de la ley y la configuración.
+
+        Args:
+            law_data: Datos completos de la ley.
 
-        nav_css = epub.EpubItem(
-            uid="style_premium",
-            file_name="style/premium.css",
-            media_type="text/css",
-            content=css_content.encode("utf-8"),
+        Returns:
+            Identificador para ``dc:identifier``.
+        """
+        if not self.config.epub.reproducible:
+            return f"bcn-chile-{uuid.uuid4().hex[:8]}"
+        opciones = asdict(self.config.epub)
+        del opciones["output_dir"]
+        data = json.dumps(
+            [__version__, opciones, law_data], sort_keys=True, ensure_ascii=False, default=str
         )
-        self.book.add_item(nav_css)
+        return f"bcn-chile-{hashlib.sha256(data.encode('utf-8')).hexdigest()[:8]}"
+
+    def _add_css(self) -> None:
+        """Agrega los estilos CSS al ePub."""
+        self.book.add_file(self.STYLESHEET, get_premium_css(), "text/css", item_id="style_premium")
 
     def _create_chapter(
         self,
@@ -579,8 +575,8 @@ class LawEpubGenerator:
         filename: str,
         content: str,
         add_to_toc: bool = True,
-    ) -> epub.EpubHtml:
-        """Crea un capítulo del ePub.
+    ) -> NavPoint:
+        """Crea un capítulo del ePub y lo escribe en el archivo.
 
         Args:
             title: Título del capítulo.
@@ -589,13 +585,10 @@ class LawEpubGenerator:
             add_to_toc: Si se agrega a la tabla de contenidos.
 
         Returns:
-            Capítulo creado.
+            Entrada de TOC del capítulo creado.
         """
-        chapter = epub.EpubHtml(title=title, file_name=filename, lang="es")
-        chapter.add_link(href="style/premium.css", rel="stylesheet", type="text/css")
-        chapter.set_content(content)
-
-        self.book.add_item(chapter)
+        self.book.add_chapter(filename, title, content, stylesheets=(self.STYLESHEET,))
+        chapter = NavPoint(title, filename)
         self.chapters.append(chapter)
 
         if add_to_toc:
@@ -637,7 +630,7 @@ class LawEpubGenerator:
             source_html = f'<p class="cover-source">Publicado en: {self._escape_html(source)}</p>'
 
         creator = self.config.epub.creator
-        date_str = datetime.now().strftime("%d de %B de %Y")
+        date_str = self.build_time.strftime("%d de %B de %Y")
 
         content = f"""
 <div class="cover">
@@ -775,7 +768,7 @@ class LawEpubGenerator:
             chapter = self._create_general_chapter(pre_titulo_content, metadata)
             self.toc.append(chapter)
 
-    def _create_encabezado_chapter(self, item: dict[str, Any]) -> epub.EpubHtml:
+    def _create_encabezado_chapter(self, item: dict[str, Any]) -> NavPoint:
         """Crea el capítulo de encabezado.
 
         Args:
@@ -794,7 +787,7 @@ class LawEpubGenerator:
 
     def _create_intro_chapter(
         self, content: list[dict[str, Any]], metadata: dict[str, Any]
-    ) -> epub.EpubHtml:
+    ) -> NavPoint:
         """Crea el capítulo introductorio.
 
         Args:
@@ -815,25 +808,16 @@ class LawEpubGenerator:
 
         html_parts.append("</main>\n")
 
-        chapter = epub.EpubHtml(
-            title="Disposiciones Preliminares",
-            file_name="intro.xhtml",
-            lang="es",
+        return self._create_chapter(
+            "Disposiciones Preliminares", "intro.xhtml", "".join(html_parts), add_to_toc=False
         )
-        chapter.add_link(href="style/premium.css", rel="stylesheet", type="text/css")
-        chapter.set_content("".join(html_parts))
-
-        self.book.add_item(chapter)
-        self.chapters.append(chapter)
-
-        return chapter
 
     def _create_titulo_chapter(
         self,
         titulo: dict[str, Any],
         content: list[dict[str, Any]],
         index: int,
-    ) -> epub.EpubHtml:
+    ) -> NavPoint:
         """Crea un capítulo de título.
 
         Args:
@@ -864,24 +848,15 @@ class LawEpubGenerator:
         html_parts.append("</article>\n")
         html_parts.append("</main>\n")
 
-        chapter = epub.EpubHtml(
-            title=short_title,
-            file_name=f"titulo_{index + 1}.xhtml",
-            lang="es",
+        return self._create_chapter(
+            short_title, f"titulo_{index + 1}.xhtml", "".join(html_parts), add_to_toc=False
         )
-        chapter.add_link(href="style/premium.css", rel="stylesheet", type="text/css")
-        chapter.set_content("".join(html_parts))
-
-        self.book.add_item(chapter)
-        self.chapters.append(chapter)
-
-        return chapter
 
     def _create_general_chapter(
         self,
         content: list[dict[str, Any]],
         metadata: dict[str, Any],
-    ) -> epub.EpubHtml:
+    ) -> NavPoint:
         """Crea un capítulo general.
 
         Args:
@@ -904,18 +879,9 @@ class LawEpubGenerator:
 
         html_parts.append("</main>\n")
 
-        chapter = epub.EpubHtml(
-            title=title[:50],
-            file_name="contenido.xhtml",
-            lang="es",
+        return self._create_chapter(
+            title[:50], "contenido.xhtml", "".join(html_parts), add_to_toc=False
         )
-        chapter.add_link(href="style/premium.css", rel="stylesheet", type="text/css")
-        chapter.set_content("".join(html_parts))
-
-        self.book.add_item(chapter)
-        self.chapters.append(chapter)
-
-        return chapter
 
     def _create_empty_chapter(self, metadata: dict[str, Any]) -> None:
         """Crea un capítulo vacío cuando no hay contenido.
@@ -1134,7 +1100,8 @@ class LawEpubGenerator:
 
             refs_html = ", ".join([f'<a href="{r["ref"]}">Art. {r["art"]}</a>' for r in refs[:8]])
             sections_html.append(
-                f'<p class="keyword-entry"><strong>{keyword.capitalize()}</strong>: {refs_html}</p>'
+                f'<p class="keyword-entry"><strong>{self._escape_html(keyword.capitalize())}</strong>: '
+                f"{refs_html}</p>"
             )
 
         if sections_html:
@@ -1173,7 +1140,7 @@ class LawEpubGenerator:
         toc_items = list(self.toc)
 
         for chapter, content in self.toc_sections:
-            sub_items: list[Any] = []
+            sub_items: list[NavPoint] = []
             for item in content:
                 if item.get("type") == "parrafo":
                     parrafo_text = item.get("text", "")
@@ -1181,26 +1148,11 @@ class LawEpubGenerator:
                         short_text = (
                             parrafo_text[:40] + "..." if len(parrafo_text) > 40 else parrafo_text
                         )
-                        sub_items.append(
-                            epub.Link(
-                                chapter.file_name,
-                                short_text,
-                                f"{chapter.id}_{len(sub_items)}",
-                            )
-                        )
-
-            if sub_items:
-                toc_items.append((chapter, sub_items))
-            else:
-                toc_items.append(chapter)
+                        sub_items.append(NavPoint(short_text, chapter.href))
 
-        self.book.toc = tuple(toc_items)
-        self.book.add_item(epub.EpubNcx())
-        self.book.add_item(epub.EpubNav())
+            toc_items.append(NavPoint(chapter.title, chapter.href, sub_items))
 
-    def _set_spine(self) -> None:
-        """Configura el spine del ePub."""
-        self.book.spine = ["nav"] + self.chapters
+        self.book.toc = toc_items
 
 
 def generate_law_epub(
@@ -7,16 +7,31 @@ oficial del XSD de la BCN: Capítulo → Título → Párrafo → Artículo.
 
 from __future__ import annotations
 
+import hashlib
 import html
+import json
+import os
 import re
 import uuid
-from dataclasses import dataclass
+import zipfile
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
 
-from ebooklib import epub
-
+from . import __version__
+from .chapter_cache import (
+    CachedPart,
+    ChapterCache,
+    ChapterEntry,
+    chapter_key,
+    manifest_path,
+    save_manifest,
+)
+from .epub_writer import EpubMetadata, NavPoint, StreamingEpubWriter, reproducible_timestamp
+from .profiling import ESCRITURA, RENDER, span
 from .scraper_v2 import EstructuraFuncional, Norma
+from .snapshot import as_norma, dumps_snapshot
 
 
 @dataclass
@@ -35,6 +50,25 @@ class EPubConfig:
     include_transitorio_markers: bool = True
     include_version_info: bool = True
 
+    # Procesos que renderizan capítulos en paralelo (1 = en el proceso
+    # actual, 0 = uno por CPU; ver leychile_epub.render_pool)
+    render_workers: int = 1
+
+    # Build reproducible: identificador derivado de la norma y de esta
+    # configuración, y fechas fijas (ver reproducible_timestamp), para que
+    # la misma norma produzca siempre el mismo ePub byte a byte
+    reproducible: bool = False
+
+    # Regenerar copiando del ePub anterior los capítulos que no cambiaron
+    # (ver leychile_epub.chapter_cache)
+    incremental: bool = False
+
+    # Partir en varios archivos los capítulos que superan estos límites
+    # (0 = sin límite). Los cortes caen entre estructuras (artículos,
+    # párrafos...); un artículo nunca se parte
+    max_chapter_bytes: int = 256 * 1024
+    max_chapter_articles: int = 0
+
     # CSS personalizado (None usa el predeterminado)
     custom_css: str | None = None
 
@@ -367,6 +401,47 @@ p.no-indent {
 """
 
 
+# Hoja de estilos compartida por todas las páginas
+STYLESHEET = "styles/main.css"
+
+
+@dataclass
+class _Page:
+    """Página renderizada, lista para escribirse en el ePub."""
+
+    file_name: str
+    title: str
+    body: str
+    toc: NavPoint | None = None
+    # Entrada del ePub anterior de la que se copia (en vez de ``body``)
+    source: zipfile.ZipInfo | None = None
+
+
+@dataclass
+class _RenderedChapter:
+    """HTML de una estructura de primer nivel, partido en archivos."""
+
+    parts: list[str]
+    # Parte que contiene cada ancla (ver EPubGeneratorV2._make_anchor)
+    anchors: dict[str, int]
+
+
+@dataclass(slots=True)
+class _Fragment:
+    """Trozo del HTML de un capítulo (ver EPubGeneratorV2._render_fragments)."""
+
+    html: str
+    # Se puede partir el capítulo antes de este fragmento
+    breakable: bool = False
+    article: bool = False
+    heading: bool = False
+    anchor: str = ""
+    # Cierre del <section> que abre este fragmento
+    closing_tag: str = ""
+    # El fragmento cierra el último <section> abierto
+    closes: bool = False
+
+
 class EPubGeneratorV2:
     """Generador de ePub v2 con soporte para estructura jerárquica."""
 
@@ -378,6 +453,10 @@ class EPubGeneratorV2:
         "Artículo": "h5",
     }
 
+    # Incisos ("a) ...") y numerales ("1. ...", "2) ...") de _format_texto
+    _LITERAL_PATTERN = re.compile(r"[a-z]\)\s")
+    _NUMERAL_PATTERN = re.compile(r"\d+[\.\)]\s")
+
     # Mapeo de tipos de parte a clases CSS para TOC
     TOC_CLASSES = {
         "Capítulo": "toc-capitulo",
@@ -394,129 +473,209 @@ class EPubGeneratorV2:
             config: Configuración del ePub. Si es None, usa valores predeterminados.
         """
         self.config = config or EPubConfig()
-        self._book: epub.EpubBook | None = None
-        self._chapters: list[epub.EpubHtml] = []
-        self._toc_items: list[tuple | epub.Link | epub.EpubHtml] = []
-        self._spine: list[str | epub.EpubHtml] = ["nav"]
         self._chapter_counter = 0
+        # Capítulos del ePub anterior y clave de cada capítulo (modo incremental)
+        self._cache: ChapterCache | None = None
+        self._config_digest = ""
+        self._chapter_keys: dict[str, ChapterEntry] = {}
+        self.copied_chapters = 0
 
-    def generate(self, norma: Norma, output_path: str | Path) -> Path:
+    def generate(
+        self,
+        norma: Norma | str | Path,
+        output_path: str | Path,
+    ) -> Path:
         """
         Genera el ePub a partir de los datos de la norma.
 
+        Cada página se renderiza y se escribe en el ePub antes de pasar a la
+        siguiente (ver :class:`~leychile_epub.epub_writer.StreamingEpubWriter`),
+        así que no se acumula el libro completo en memoria.
+
         Args:
-            norma: Datos de la norma parseada.
+            norma: Datos de la norma parseada o ruta de un snapshot
+                (ver :mod:`leychile_epub.snapshot`).
             output_path: Ruta donde guardar el ePub.
 
+        Con ``EPubConfig.incremental``, si ``output_path`` ya existe con su
+        manifiesto de capítulos, los capítulos que no cambiaron se copian de
+        ahí sin renderizarlos (ver :mod:`leychile_epub.chapter_cache`).
+
         Returns:
             Path del archivo generado.
         """
+        norma = as_norma(norma)
         output_path = Path(output_path)
 
-        # Inicializar libro
-        self._init_book(norma)
-
-        # Agregar CSS
-        self._add_styles()
-
-        # Generar páginas
-        self._add_title_page(norma)
-
-        if self.config.include_metadata_page:
-            self._add_metadata_page(norma)
-
-        # Agregar encabezado si existe
-        if norma.encabezado_texto:
-            self._add_encabezado(norma)
-
-        # Agregar contenido estructurado
-        self._add_estructuras(norma.estructuras)
-
-        # Agregar promulgación si existe
-        if norma.promulgacion_texto:
-            self._add_promulgacion(norma)
-
-        # Configurar TOC y spine
-        self._finalize_book()
-
-        # Guardar
-        epub.write_epub(str(output_path), self._book, {})
-
-        return output_path
-
-    def _init_book(self, norma: Norma) -> None:
-        """Inicializa el libro ePub con metadatos."""
-        self._book = epub.EpubBook()
-        self._chapters = []
-        self._toc_items = []
-        self._spine = ["nav"]
+        self.copied_chapters = 0
         self._chapter_counter = 0
+        self._chapter_keys = {}
+        self._config_digest = self.config_hash() if self.config.incremental else ""
+
+        if not self.config.incremental:
+            self._write_epub(norma, output_path)
+            return output_path
+
+        # El ePub anterior es la fuente de los capítulos copiados: el nuevo se
+        # escribe al lado y lo reemplaza al terminar
+        tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+        with span(ESCRITURA):
+            self._cache = ChapterCache.open(output_path, self._config_digest)
+        try:
+            self._write_epub(norma, tmp_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        finally:
+            if self._cache is not None:
+                self._cache.close()
+                self._cache = None
+        with span(ESCRITURA):
+            # El manifiesto anterior describe el ePub que se reemplaza: se borra
+            # antes, para que una interrupción entre ambos pasos deje un ePub
+            # sin manifiesto (se regenera completo) y no uno con el ajeno
+            manifest_path(output_path).unlink(missing_ok=True)
+            os.replace(tmp_path, output_path)
+            save_manifest(output_path, self._config_digest, self._chapter_keys)
+        return output_path
 
-        # Identificador único
-        book_id = f"leychile-{norma.norma_id}-{uuid.uuid4().hex[:8]}"
-        self._book.set_identifier(book_id)
+    def _write_epub(self, norma: Norma, path: Path) -> None:
+        """Renderiza la norma y escribe el ePub en ``path``."""
+        with span(ESCRITURA):
+            writer = StreamingEpubWriter(path, self._metadata(norma))
+        with writer:
+            with span(ESCRITURA):
+                css_content = self.config.custom_css or DEFAULT_CSS
+                writer.add_file(STYLESHEET, css_content, "text/css", item_id="style_main")
+
+            # Cada página se renderiza recién al pedirla al iterador
+            pages = self._iter_pages(norma)
+            while True:
+                with span(RENDER):
+                    page = next(pages, None)
+                if page is None:
+                    break
+                with span(ESCRITURA):
+                    if page.source is not None and self._cache is not None:
+                        writer.copy_chapter(page.file_name, self._cache.source, page.source)
+                    else:
+                        writer.add_chapter(
+                            page.file_name, page.title, page.body, stylesheets=(STYLESHEET,)
+                        )
+                if page.toc is not None:
+                    writer.toc.append(page.toc)
+
+            # nav, NCX y OPF se escriben al cerrar
+            with span(ESCRITURA):
+                writer.close()
+
+    def config_hash(self) -> str:
+        """Hash de todo lo que, además de la norma, determina el ePub.
+
+        Incluye la versión del paquete y la configuración (salvo
+        ``render_workers`` e ``incremental``, que no cambian el resultado).
+        """
+        opciones = asdict(self.config)
+        del opciones["render_workers"], opciones["incremental"]
+        data = json.dumps(opciones, sort_keys=True, ensure_ascii=False)
+        key = f"{type(self).__qualname__}\0{__version__}\0{data}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
 
-        # Título
-        titulo = f"{norma.identificador.tipo} {norma.identificador.numero}"
-        self._book.set_title(titulo)
+    def build_key(self, norma: Norma | str | Path) -> str:
+        """Clave de caché del ePub de ``norma`` con este generador.
 
-        # Idioma
-        self._book.set_language(self.config.language)
+        Es el hash del contenido de la norma (su snapshot) y de
+        :meth:`config_hash`. Con ``EPubConfig.reproducible``, dos builds con la
+        misma clave producen los mismos bytes, así que un ePub ya generado se
+        puede servir sin regenerarlo.
 
-        # Autores/Organismos
-        for org in norma.identificador.organismos:
-            self._book.add_author(org)
+        Args:
+            norma: Norma parseada o ruta de un snapshot.
 
-        # Metadatos adicionales
-        self._book.add_metadata("DC", "publisher", self.config.publisher)
-        self._book.add_metadata("DC", "rights", self.config.rights)
-        self._book.add_metadata("DC", "date", norma.fecha_version or "")
-        self._book.add_metadata("DC", "description", norma.titulo_completo)
+        Returns:
+            Hash SHA-256 en hexadecimal.
+        """
+        digest = hashlib.sha256(dumps_snapshot(as_norma(norma)))
+        digest.update(self.config_hash().encode("ascii"))
+        return digest.hexdigest()
+
+    def _identifier(self, norma: Norma) -> str:
+        """Identificador del libro (estable si el build es reproducible)."""
+        if not self.config.reproducible:
+            return f"leychile-{norma.norma_id}-{uuid.uuid4().hex[:8]}"
+        key = f"{norma.norma_id}\0{norma.fecha_version}\0{self.config_hash()}"
+        return f"leychile-{norma.norma_id}-{hashlib.sha256(key.encode('utf-8')).hexdigest()[:8]}"
+
+    def _metadata(self, norma: Norma) -> EpubMetadata:
+        """Metadatos del libro."""
+        return EpubMetadata(
+            # Identificador único
+            identifier=self._identifier(norma),
+            title=f"{norma.identificador.tipo} {norma.identificador.numero}",
+            language=self.config.language,
+            # Autores/Organismos
+            creators=list(norma.identificador.organismos),
+            extra=[
+                ("publisher", self.config.publisher),
+                ("rights", self.config.rights),
+                ("date", norma.fecha_version or ""),
+                ("description", norma.titulo_completo),
+                # Materias como subjects
+                *(("subject", materia) for materia in norma.metadatos.materias),
+            ],
+            modified=(
+                reproducible_timestamp(norma.fecha_version) if self.config.reproducible else None
+            ),
+        )
 
-        # Materias como subjects
-        for materia in norma.metadatos.materias:
-            self._book.add_metadata("DC", "subject", materia)
+    def _iter_pages(self, norma: Norma) -> Iterator[_Page]:
+        """Renderiza las páginas del libro en orden de lectura, una a la vez."""
+        # Página de título
+        yield self._add_title_page(norma)
 
-    def _add_styles(self) -> None:
-        """Agrega los estilos CSS al libro."""
-        css_content = self.config.custom_css or DEFAULT_CSS
+        if self.config.include_metadata_page:
+            yield self._add_metadata_page(norma)
 
-        css_item = epub.EpubItem(
-            uid="style_main",
-            file_name="styles/main.css",
-            media_type="text/css",
-            content=css_content.encode("utf-8"),
+        # Agregar encabezado si existe
+        if norma.encabezado_texto:
+            yield self._add_encabezado(norma)
+
+        # Contenido estructurado: un capítulo por estructura de nivel superior
+        # (típicamente Capítulos)
+        # Los capítulos copiados del ePub anterior no se renderizan
+        keys = [self._chapter_key(ef) for ef in norma.estructuras]
+        chapters = self._render_chapters(
+            [
+                ef
+                for ef, key in zip(norma.estructuras, keys, strict=True)
+                if self._copied(key) is None
+            ]
         )
-        self._book.add_item(css_item)
+        for estructura, key in zip(norma.estructuras, keys, strict=True):
+            yield from self._add_estructura_capitulo(estructura, chapters, key)
+
+        # Agregar promulgación si existe
+        if norma.promulgacion_texto:
+            yield self._add_promulgacion(norma)
 
     def _create_chapter(
         self,
         title: str,
         content: str,
         filename: str | None = None,
-    ) -> epub.EpubHtml:
-        """Crea un capítulo HTML."""
+        in_toc: bool = True,
+    ) -> _Page:
+        """Crea una página con el cuerpo HTML ``content``."""
         self._chapter_counter += 1
 
         if filename is None:
             filename = f"chapter_{self._chapter_counter:03d}.xhtml"
 
-        chapter = epub.EpubHtml(
-            title=title,
-            file_name=filename,
-            lang=self.config.language,
-        )
-        chapter.set_content(content)
-        chapter.add_item(self._book.get_item_with_id("style_main"))
-
-        self._book.add_item(chapter)
-        self._chapters.append(chapter)
-        self._spine.append(chapter)
+        toc = NavPoint(title, filename) if in_toc else None
+        return _Page(filename, title, content, toc)
 
-        return chapter
-
-    def _add_title_page(self, norma: Norma) -> None:
-        """Agrega la página de título."""
+    def _add_title_page(self, norma: Norma) -> _Page:
+        """Renderiza la página de título."""
         tipo_numero = f"{norma.identificador.tipo} {norma.identificador.numero}"
         organismos = "<br/>".join(html.escape(o) for o in norma.identificador.organismos)
 
@@ -538,29 +697,19 @@ class EPubGeneratorV2:
                 '<p style="color: #cc0000; font-weight: bold; margin-top: 1em;">NORMA DEROGADA</p>'
             )
 
-        content = f"""
-
-<html xmlns="http://www.w3.org/1999/xhtml" lang="es">
-<head>
-    <title>{html.escape(tipo_numero)}</title>
-    <link rel="stylesheet" type="text/css" href="styles/main.css"/>
-</head>
-<body>
+        content = f"""\
     <div class="titulo-pagina">
         <p class="tipo-norma">{html.escape(tipo_numero)}</p>
         <h1>{html.escape(norma.titulo_completo)}</h1>
         <p class="organismos">{organismos}</p>
         {fechas_html}
         {estado}
-    </div>
-</body>
-</html>"""
+    </div>"""
 
-        chapter = self._create_chapter(tipo_numero, content, "titulo.xhtml")
-        self._toc_items.append(chapter)
+        return self._create_chapter(tipo_numero, content, "titulo.xhtml")
 
-    def _add_metadata_page(self, norma: Norma) -> None:
-        """Agrega la página de metadatos."""
+    def _add_metadata_page(self, norma: Norma) -> _Page:
+        """Renderiza la página de metadatos."""
         materias_html = ""
         if norma.metadatos.materias:
             materias_items = "\n".join(
@@ -588,14 +737,13 @@ class EPubGeneratorV2:
         </ul>
     </dd>"""
 
-        content = f"""
+        # La hora de generación cambiaría los bytes de un build reproducible
+        generado = ""
+        if not self.config.reproducible:
+            fecha = datetime.now().strftime("%Y-%m-%d %H:%M")
+            generado = f"<br/>\n            <em>Generado: {fecha}</em>"
 
-<html xmlns="http://www.w3.org/1999/xhtml" lang="es">
-<head>
-    <title>Información de la Norma</title>
-    <link rel="stylesheet" type="text/css" href="styles/main.css"/>
-</head>
-<body>
+        content = f"""\
     <div class="metadatos-pagina">
         <h2>Información de la Norma</h2>
         
@@ -640,66 +788,108 @@ class EPubGeneratorV2:
         </dl>
         
         <p class="no-indent" style="margin-top: 2em; font-size: 0.8em; color: #666;">
-            <em>Fuente: Biblioteca del Congreso Nacional de Chile (www.leychile.cl)</em><br>
-            <em>Generado: {datetime.now().strftime("%Y-%m-%d %H:%M")}</em>
+            <em>Fuente: Biblioteca del Congreso Nacional de Chile (www.leychile.cl)</em>{generado}
         </p>
-    </div>
-</body>
-</html>"""
-
-        chapter = self._create_chapter("Información de la Norma", content, "metadatos.xhtml")
-        self._toc_items.append(chapter)
-
-    def _add_encabezado(self, norma: Norma) -> None:
-        """Agrega el encabezado de la norma."""
-        content = f"""
-
-<html xmlns="http://www.w3.org/1999/xhtml" lang="es">
-<head>
-    <title>Encabezado</title>
-    <link rel="stylesheet" type="text/css" href="styles/main.css"/>
-</head>
-<body>
+    </div>"""
+
+        return self._create_chapter("Información de la Norma", content, "metadatos.xhtml")
+
+    def _add_encabezado(self, norma: Norma) -> _Page:
+        """Renderiza el encabezado de la norma."""
+        content = f"""\
     <div class="encabezado-norma">
         {self._format_texto(norma.encabezado_texto)}
-    </div>
-</body>
-</html>"""
+    </div>"""
 
-        self._create_chapter("Encabezado", content, "encabezado.xhtml")
+        return self._create_chapter("Encabezado", content, "encabezado.xhtml", in_toc=False)
 
-    def _add_estructuras(self, estructuras: list[EstructuraFuncional]) -> None:
-        """Agrega las estructuras funcionales al ePub."""
-        # Crear un capítulo para cada estructura de nivel superior (típicamente Capítulos)
-        for estructura in estructuras:
-            self._add_estructura_capitulo(estructura)
+    def _chapter_key(self, estructura: EstructuraFuncional) -> str:
+        """Clave del capítulo en el caché (vacía si no es incremental)."""
+        if not self._config_digest:
+            return ""
+        return chapter_key(self._config_digest, estructura)
 
-    def _add_estructura_capitulo(self, estructura: EstructuraFuncional) -> None:
-        """Agrega una estructura de nivel superior como capítulo."""
-        titulo = self._get_titulo_estructura(estructura)
-        content_body = self._render_estructura(estructura, is_root=True)
+    def _copied(self, key: str) -> list[CachedPart] | None:
+        """Partes del ePub anterior con el capítulo de esa clave, si existe."""
+        if self._cache is None or not key:
+            return None
+        return self._cache.get(key)
+
+    def _render_chapters(
+        self, estructuras: list[EstructuraFuncional]
+    ) -> Iterator[_RenderedChapter]:
+        """Capítulos de las estructuras de primer nivel a renderizar, en orden."""
+        if self.config.render_workers == 1:
+            return (self._render_chapter(ef) for ef in estructuras)
+
+        from .render_pool import render_chapters
 
-        # Asegurar que siempre haya contenido
-        if not content_body.strip():
-            content_body = "<p><em>(Sin contenido)</em></p>"
+        return render_chapters(self, estructuras, self.config.render_workers)
 
-        content = f"""
+    def _add_estructura_capitulo(
+        self,
+        estructura: EstructuraFuncional,
+        chapters: Iterator[_RenderedChapter] | None = None,
+        key: str = "",
+    ) -> list[_Page]:
+        """Renderiza una estructura de nivel superior como capítulo.
 
-<html xmlns="http://www.w3.org/1999/xhtml" lang="es">
-<head>
-    <title>{html.escape(titulo)}</title>
-    <link rel="stylesheet" type="text/css" href="styles/main.css"/>
-</head>
-<body>
-{content_body}
-</body>
-</html>"""
+        Un capítulo que supera ``max_chapter_bytes`` o
+        ``max_chapter_articles`` se escribe en varios archivos
+        (``chapter_005.xhtml``, ``chapter_005_02.xhtml``...); su entrada del
+        TOC apunta al primero y cada sub-entrada, al archivo con su ancla.
 
-        chapter = self._create_chapter(titulo, content)
+        Args:
+            estructura: Estructura de primer nivel.
+            chapters: Capítulos ya renderizados de las estructuras que no se
+                copian (ver :meth:`_render_chapters`); si es None se renderiza
+                aquí.
+            key: Clave del capítulo en el caché del modo incremental.
+
+        Returns:
+            Las páginas del capítulo, en orden.
+        """
+        titulo = self._get_titulo_estructura(estructura)
+        copied = self._copied(key)
+        if copied is not None:
+            # Se copia comprimido del ePub anterior
+            chapter = _RenderedChapter(
+                [""] * len(copied),
+                {anchor: i for i, part in enumerate(copied) for anchor in part.anchors},
+            )
+            self.copied_chapters += 1
+        elif chapters is not None:
+            chapter = next(chapters)
+        else:
+            chapter = self._render_chapter(estructura)
+
+        n_parts = len(chapter.parts)
+        pages: list[_Page] = []
+        for i, body in enumerate(chapter.parts):
+            # Asegurar que siempre haya contenido
+            if copied is None and not body.strip():
+                body = "<p><em>(Sin contenido)</em></p>"
+            title = f"{titulo} ({i + 1}/{n_parts})" if n_parts > 1 else titulo
+            if i == 0:
+                page = self._create_chapter(title, body)
+            else:
+                stem = pages[0].file_name.removesuffix(".xhtml")
+                page = _Page(f"{stem}_{i + 1:02d}.xhtml", title, body)
+            if copied is not None:
+                page.source = copied[i].member
+            pages.append(page)
+
+        if key:
+            part_anchors: list[list[str]] = [[] for _ in pages]
+            for anchor, i in chapter.anchors.items():
+                part_anchors[i].append(anchor)
+            for i, (page, anchors) in enumerate(zip(pages, part_anchors, strict=True)):
+                self._chapter_keys[page.file_name] = ChapterEntry(key, i, anchors)
 
         # Construir TOC jerárquico
-        toc_entry = self._build_toc_entry(estructura, chapter)
-        self._toc_items.append(toc_entry)
+        anchor_files = {anchor: pages[i].file_name for anchor, i in chapter.anchors.items()}
+        pages[0].toc = self._build_toc_entry(estructura, pages[0].file_name, anchor_files)
+        return pages
 
     def _render_estructura(
         self,
@@ -707,8 +897,71 @@ class EPubGeneratorV2:
         is_root: bool = False,
     ) -> str:
         """Renderiza una estructura funcional a HTML."""
-        html_parts: list[str] = []
+        return "\n".join(fragment.html for fragment in self._render_fragments(estructura, is_root))
+
+    def _render_chapter(self, estructura: EstructuraFuncional) -> _RenderedChapter:
+        """Renderiza una estructura de primer nivel, partida según los límites de tamaño.
+
+        Se parte antes de una estructura (nunca dentro de un artículo) cuando
+        agregarla superaría ``max_chapter_bytes`` o ``max_chapter_articles``,
+        salvo justo después de un encabezado, para no dejarlo solo al final
+        de un archivo. Los ``<section>`` abiertos se cierran al final de
+        cada parte y se vuelven a abrir al comienzo de la siguiente.
+        """
+        max_bytes = self.config.max_chapter_bytes
+        max_articles = self.config.max_chapter_articles
+        parts: list[str] = []
+        anchors: dict[str, int] = {}
+        current: list[str] = []
+        open_sections: list[_Fragment] = []
+        size = articles = 0
+        has_content = after_heading = False
+
+        for fragment in self._render_fragments(estructura, is_root=True):
+            n_bytes = len(fragment.html.encode("utf-8")) if max_bytes else 0
+            if (
+                fragment.breakable
+                and has_content
+                and not after_heading
+                and (
+                    (max_bytes and size + n_bytes > max_bytes)
+                    or (max_articles and articles >= max_articles)
+                )
+            ):
+                current.extend(section.closing_tag for section in reversed(open_sections))
+                parts.append("\n".join(current))
+                current = [section.html for section in open_sections]
+                size = sum(len(html_.encode("utf-8")) for html_ in current) if max_bytes else 0
+                articles = 0
+                has_content = False
+
+            current.append(fragment.html)
+            size += n_bytes
+            if fragment.closing_tag:
+                open_sections.append(fragment)
+            elif fragment.closes:
+                open_sections.pop()
+            else:
+                has_content = True
+            if fragment.anchor:
+                anchors[fragment.anchor] = len(parts)
+            articles += fragment.article
+            after_heading = fragment.heading or bool(fragment.closing_tag)
+
+        parts.append("\n".join(current))
+        return _RenderedChapter(parts, anchors)
 
+    def _render_fragments(
+        self,
+        estructura: EstructuraFuncional,
+        is_root: bool = False,
+    ) -> Iterator[_Fragment]:
+        """Renderiza una estructura funcional como fragmentos de HTML, en orden.
+
+        Unidos con saltos de línea forman el HTML de la estructura (ver
+        :meth:`_render_estructura`); cada estructura que no es la raíz marca
+        un punto donde se puede partir el capítulo.
+        """
         # Determinar clase CSS adicional
         css_classes: list[str] = []
         if self.config.include_derogado_markers and estructura.derogado:
@@ -724,7 +977,8 @@ class EPubGeneratorV2:
 
         if estructura.tipo_parte == "Artículo":
             # Formato especial para artículos
-            html_parts.append(f'<div class="articulo"{class_attr}>')
+            html_parts: list[str] = []
+            html_parts.append(f'<div class="{" ".join(["articulo", *css_classes])}">')
             html_parts.append(
                 f'<p><span class="articulo-numero">Artículo {html.escape(estructura.nombre_parte or "")}</span></p>'
             )
@@ -742,27 +996,34 @@ class EPubGeneratorV2:
                 )
 
             html_parts.append("</div>")
-        else:
-            # Formato para capítulos, títulos, párrafos
-            wrapper_start = f"<section{class_attr}>" if css_classes else ""
-            wrapper_end = "</section>" if css_classes else ""
-
-            if wrapper_start:
-                html_parts.append(wrapper_start)
+            yield _Fragment("\n".join(html_parts), breakable=not is_root, article=True)
+            return
 
-            html_parts.append(f"<{heading}>{html.escape(titulo)}</{heading}>")
+        # Formato para capítulos, títulos, párrafos
+        if css_classes:
+            yield _Fragment(
+                f"<section{class_attr}>", breakable=not is_root, closing_tag="</section>"
+            )
 
-            if estructura.texto:
-                html_parts.append(self._format_texto(estructura.texto))
+        # Destino de las sub-entradas del TOC (ver _build_toc_entry)
+        anchor = self._make_anchor(estructura) if estructura.id_parte else ""
+        id_attr = f' id="{html.escape(anchor)}"' if anchor else ""
+        yield _Fragment(
+            f"<{heading}{id_attr}>{html.escape(titulo)}</{heading}>",
+            breakable=not is_root and not css_classes,
+            heading=True,
+            anchor=anchor,
+        )
 
-            # Renderizar hijos
-            for hijo in estructura.hijos:
-                html_parts.append(self._render_estructura(hijo))
+        if estructura.texto:
+            yield _Fragment(self._format_texto(estructura.texto))
 
-            if wrapper_end:
-                html_parts.append(wrapper_end)
+        # Renderizar hijos
+        for hijo in estructura.hijos:
+            yield from self._render_fragments(hijo)
 
-        return "\n".join(html_parts)
+        if css_classes:
+            yield _Fragment("</section>", closes=True)
 
     def _get_titulo_estructura(self, estructura: EstructuraFuncional) -> str:
         """Obtiene el título formateado de una estructura."""
@@ -796,10 +1057,10 @@ class EPubGeneratorV2:
                 continue
 
             # Detectar incisos (comienzan con letras minúsculas seguidas de .)
-            if re.match(r"^[a-z]\)\s", parrafo):
+            if self._LITERAL_PATTERN.match(parrafo):
                 html_parts.append(f'<p class="literal">{parrafo}</p>')
             # Detectar numerales (comienzan con números seguidos de . o ))
-            elif re.match(r"^\d+[\.\)]\s", parrafo):
+            elif self._NUMERAL_PATTERN.match(parrafo):
                 html_parts.append(f'<p class="numero">{parrafo}</p>')
             # Detectar incisos con guión
             elif parrafo.startswith("-"):
@@ -814,67 +1075,42 @@ class EPubGeneratorV2:
     def _build_toc_entry(
         self,
         estructura: EstructuraFuncional,
-        chapter: epub.EpubHtml,
-    ) -> tuple | epub.Link:
-        """Construye una entrada de TOC con sub-items."""
-        titulo = self._get_titulo_estructura(estructura)
+        file_name: str,
+        anchor_files: dict[str, str] | None = None,
+    ) -> NavPoint:
+        """Construye una entrada de TOC con sub-items.
 
-        # Si no tiene hijos, retornar link simple
-        if not estructura.hijos:
-            return epub.Link(chapter.file_name, titulo, chapter.id)
+        Args:
+            estructura: Estructura de primer nivel.
+            file_name: Archivo (o primer archivo) del capítulo.
+            anchor_files: Archivo de cada ancla si el capítulo está partido.
+        """
+        titulo = self._get_titulo_estructura(estructura)
+        anchor_files = anchor_files or {}
 
         # Filtrar hijos que aparecerán en TOC (no artículos individuales si son muchos)
         hijos_toc = []
         for hijo in estructura.hijos:
-            if hijo.tipo_parte in ("Capítulo", "Título", "Párrafo"):
-                # Crear sub-entrada
-                hijo_titulo = self._get_titulo_estructura(hijo)
-                hijo_anchor = f"{chapter.file_name}#{self._make_anchor(hijo)}"
-                hijos_toc.append(epub.Link(hijo_anchor, hijo_titulo, f"toc_{hijo.id_parte}"))
-
-        # Si hay sub-items, crear sección con hijos
-        if hijos_toc:
-            section = epub.Section(titulo)
-            return (section, [epub.Link(chapter.file_name, titulo, chapter.id)] + hijos_toc)
-
-        return epub.Link(chapter.file_name, titulo, chapter.id)
+            if hijo.tipo_parte in ("Capítulo", "Título", "Párrafo") and hijo.id_parte:
+                anchor = self._make_anchor(hijo)
+                href = f"{anchor_files.get(anchor, file_name)}#{anchor}"
+                hijos_toc.append(NavPoint(self._get_titulo_estructura(hijo), href))
+        return NavPoint(titulo, file_name, hijos_toc)
 
     def _make_anchor(self, estructura: EstructuraFuncional) -> str:
         """Crea un anchor ID para una estructura."""
         tipo = estructura.tipo_parte.lower().replace("á", "a").replace("í", "i")
         return f"{tipo}_{estructura.id_parte}"
 
-    def _add_promulgacion(self, norma: Norma) -> None:
-        """Agrega la página de promulgación."""
-        content = f"""
-
-<html xmlns="http://www.w3.org/1999/xhtml" lang="es">
-<head>
-    <title>Promulgación</title>
-    <link rel="stylesheet" type="text/css" href="styles/main.css"/>
-</head>
-<body>
+    def _add_promulgacion(self, norma: Norma) -> _Page:
+        """Renderiza la página de promulgación."""
+        content = f"""\
     <div class="promulgacion">
         <h2>Promulgación</h2>
         {self._format_texto(norma.promulgacion_texto)}
-    </div>
-</body>
-</html>"""
-
-        chapter = self._create_chapter("Promulgación", content, "promulgacion.xhtml")
-        self._toc_items.append(chapter)
-
-    def _finalize_book(self) -> None:
-        """Finaliza la configuración del libro."""
-        # Configurar TOC
-        self._book.toc = self._toc_items
-
-        # Agregar navegación
-        self._book.add_item(epub.EpubNcx())
-        self._book.add_item(epub.EpubNav())
+    </div>"""
 
-        # Configurar spine
-        self._book.spine = self._spine
+        return self._create_chapter("Promulgación", content, "promulgacion.xhtml")
 
 
 def generate_epub(
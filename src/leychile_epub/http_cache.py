@@ -0,0 +1,515 @@
+"""
+Caché persistente en disco para el XML de LeyChile.
+
+Cada respuesta de ``obtxml`` se guarda una sola vez bajo el hash SHA-256 de su
+contenido (``objects/ab/abcdef....xml``) y un índice JSON asocia cada norma
+(``idNorma`` + ``idVersion``) con ese objeto y con los validadores HTTP
+(``ETag`` / ``Last-Modified``) de la respuesta original.
+
+Política:
+    - Dentro de ``ttl`` la entrada se sirve sin tocar la red.
+    - Pasado ``ttl`` se revalida con ``If-None-Match`` / ``If-Modified-Since``;
+      un ``304 Not Modified`` reutiliza los bytes guardados.
+    - Las entradas no usadas durante ``max_age`` se eliminan y, si el caché
+      supera ``max_bytes``, se descartan las menos usadas recientemente.
+
+El índice se protege con un lock, por lo que una misma instancia puede
+compartirse entre hilos (ver :func:`get_cache`). No está pensado para ser
+escrito por varios procesos a la vez. Las escrituras (``store``, revalidación,
+expiración) guardan el índice de inmediato; un acierto sólo actualiza el
+último uso en memoria, que se guarda con :meth:`XMLCache.flush` (cada
+``FLUSH_INTERVAL`` segundos, al cerrar y al salir del proceso).
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from .config import ScraperConfig
+from .rate_limiter import TokenBucket, throttled_get
+
+logger = logging.getLogger("leychile_epub.cache")
+
+_INDEX_FILE = "index.json"
+_OBJECTS_DIR = "objects"
+
+# Segundos máximos que el último uso de una entrada leída queda sin guardar
+FLUSH_INTERVAL = 30.0
+
+
+@dataclass
+class CacheEntry:
+    """Entrada del índice del caché.
+
+    Attributes:
+        key: Clave de la norma (``idNorma`` y opcionalmente ``idVersion``).
+        url: URL desde la que se descargó el contenido.
+        digest: SHA-256 del contenido (nombre del objeto en disco).
+        size: Tamaño del contenido en bytes.
+        etag: Cabecera ETag de la respuesta (si existía).
+        last_modified: Cabecera Last-Modified de la respuesta (si existía).
+        stored_at: Momento (epoch) de la última descarga o revalidación.
+        last_access: Momento (epoch) del último uso.
+    """
+
+    key: str
+    url: str
+    digest: str
+    size: int
+    etag: str = ""
+    last_modified: str = ""
+    stored_at: float = 0.0
+    last_access: float = 0.0
+
+
+@dataclass
+class CacheStats:
+    """Contadores de uso del caché.
+
+    Attributes:
+        hits: Entradas servidas sin tocar la red.
+        revalidated: Entradas confirmadas por la BCN con ``304 Not Modified``.
+        misses: Descargas completas (sin entrada o con contenido nuevo).
+        stores: Objetos nuevos escritos en disco.
+        evictions: Entradas eliminadas por antigüedad o tamaño.
+    """
+
+    hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        """Convierte los contadores a diccionario."""
+        return asdict(self)
+
+
+class XMLCache:
+    """Caché en disco direccionado por contenido para respuestas XML.
+
+    Example:
+        >>> cache = XMLCache("~/.cache/leychile")
+        >>> content = fetch_with_cache(session, url, cache, timeout=30)
+        >>> cache.stats.hits, cache.stats.misses
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        ttl: float = 86400.0,
+        max_bytes: int = 512 * 1024 * 1024,
+        max_age: float = 30 * 86400.0,
+    ) -> None:
+        """Inicializa el caché.
+
+        Args:
+            directory: Directorio raíz del caché (se crea si no existe).
+            ttl: Segundos durante los cuales una entrada se sirve sin revalidar.
+            max_bytes: Tamaño máximo total de los objetos guardados.
+            max_age: Segundos sin uso tras los cuales una entrada se elimina.
+        """
+        self.directory = Path(directory).expanduser()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stats = CacheStats()
+        self._lock = threading.RLock()
+
+        (self.directory / _OBJECTS_DIR).mkdir(parents=True, exist_ok=True)
+        self._entries: dict[str, CacheEntry] = self._load_index()
+        # Hay cambios del índice en memoria sin guardar (sólo últimos usos)
+        self._dirty = False
+        self._flushed_at = time.monotonic()
+        atexit.register(self._flush_at_exit)
+
+    @classmethod
+    def from_config(cls, config: ScraperConfig) -> XMLCache | None:
+        """Crea (o reutiliza) el caché definido en la configuración.
+
+        Returns:
+            Instancia compartida de XMLCache o None si ``cache_dir`` no está definido.
+        """
+        if not config.cache_dir:
+            return None
+        return get_cache(
+            config.cache_dir,
+            ttl=config.cache_ttl,
+            max_bytes=config.cache_max_bytes,
+            max_age=config.cache_max_age,
+        )
+
+    # ------------------------------------------------------------------
+    # Claves
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def key_for_url(url: str) -> str:
+        """Calcula la clave de caché de una URL de la BCN.
+
+        Usa ``idNorma`` (y ``idVersion`` si está presente); para URLs sin
+        ``idNorma`` usa un hash de la URL completa.
+
+        Example:
+            >>> XMLCache.key_for_url("https://www.leychile.cl/Consulta/obtxml?opt=7&idNorma=1")
+            'norma-1'
+        """
+        params = parse_qs(urlparse(url).query)
+        id_norma = params.get("idNorma", [""])[0]
+        if not id_norma:
+            return "url-" + hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        id_version = params.get("idVersion", [""])[0]
+        return f"norma-{id_norma}@{id_version}" if id_version else f"norma-{id_norma}"
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    def lookup(self, key: str) -> CacheEntry | None:
+        """Retorna la entrada de una clave si su objeto sigue en disco."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._object_path(entry.digest).exists():
+                del self._entries[key]
+                self._save_index()
+                return None
+            return entry
+
+    def record(self, counter: str) -> None:
+        """Incrementa uno de los contadores de :class:`CacheStats`."""
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Indica si la entrada puede servirse sin revalidar."""
+        return time.time() - entry.stored_at < self.ttl
+
+    def conditional_headers(self, entry: CacheEntry) -> dict[str, str]:
+        """Cabeceras para revalidar una entrada con la BCN."""
+        headers: dict[str, str] = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def read(self, entry: CacheEntry) -> bytes:
+        """Lee el contenido de una entrada y actualiza su último uso.
+
+        El último uso se guarda en disco a lo más cada ``FLUSH_INTERVAL``
+        segundos (ver :meth:`flush`), no en cada lectura.
+        """
+        content = self._object_path(entry.digest).read_bytes()
+        with self._lock:
+            entry.last_access = time.time()
+            self._dirty = True
+            if time.monotonic() - self._flushed_at >= FLUSH_INTERVAL:
+                self._save_index()
+        return content
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+
+    def store(
+        self,
+        key: str,
+        url: str,
+        content: bytes,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> CacheEntry:
+        """Guarda una respuesta y la asocia a la clave.
+
+        Args:
+            key: Clave de la norma.
+            url: URL de origen.
+            content: Cuerpo de la respuesta.
+            etag: Cabecera ETag recibida.
+            last_modified: Cabecera Last-Modified recibida.
+
+        Returns:
+            La entrada creada o actualizada.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        now = time.time()
+
+        with self._lock:
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._atomic_write(path, content)
+                self.stats.stores += 1
+
+            previous = self._entries.get(key)
+            entry = CacheEntry(
+                key=key,
+                url=url,
+                digest=digest,
+                size=len(content),
+                etag=etag or "",
+                last_modified=last_modified or "",
+                stored_at=now,
+                last_access=now,
+            )
+            self._entries[key] = entry
+            if previous is not None and previous.digest != digest:
+                self._drop_object_if_unused(previous.digest)
+            self.evict()
+            self._save_index()
+            return entry
+
+    def mark_revalidated(
+        self, entry: CacheEntry, etag: str | None, last_modified: str | None
+    ) -> None:
+        """Registra un ``304 Not Modified`` renovando la frescura de la entrada."""
+        with self._lock:
+            entry.stored_at = time.time()
+            if etag:
+                entry.etag = etag
+            if last_modified:
+                entry.last_modified = last_modified
+            self._save_index()
+
+    def expire(self, key: str) -> None:
+        """Marca una entrada para revalidarse en la próxima descarga.
+
+        Se usa cuando se sabe que la BCN puede tener una versión más nueva
+        que la guardada; si no cambió, la revalidación es un ``304``.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.stored_at:
+                # Si no llega a guardarse, la próxima consulta de versión vuelve a marcarla
+                entry.stored_at = 0.0
+                self._dirty = True
+
+    def evict(self) -> int:
+        """Aplica la política de expiración y tamaño máximo.
+
+        Returns:
+            Número de entradas eliminadas.
+        """
+        removed = 0
+        now = time.time()
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if now - entry.last_access > self.max_age:
+                    self._remove(key)
+                    removed += 1
+
+            total = self.total_bytes()
+            if total > self.max_bytes:
+                for entry in sorted(self._entries.values(), key=lambda e: e.last_access):
+                    if total <= self.max_bytes:
+                        break
+                    if self._remove(entry.key):
+                        total -= entry.size
+                    removed += 1
+
+            if removed:
+                self.stats.evictions += removed
+                self._save_index()
+        return removed
+
+    def clear(self) -> None:
+        """Elimina todas las entradas y objetos del caché."""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+            self._save_index()
+
+    def flush(self) -> None:
+        """Guarda el índice si tiene cambios pendientes (últimos usos)."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def close(self) -> None:
+        """Guarda los cambios pendientes del índice."""
+        self.flush()
+
+    def total_bytes(self) -> int:
+        """Tamaño total de los objetos referenciados por el índice."""
+        with self._lock:
+            return sum({e.digest: e.size for e in self._entries.values()}.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+
+    def _object_path(self, digest: str) -> Path:
+        return self.directory / _OBJECTS_DIR / digest[:2] / f"{digest}.xml"
+
+    def _remove(self, key: str) -> bool:
+        """Elimina una clave; retorna True si además se borró su objeto."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        return self._drop_object_if_unused(entry.digest)
+
+    def _drop_object_if_unused(self, digest: str) -> bool:
+        if any(e.digest == digest for e in self._entries.values()):
+            return False
+        try:
+            self._object_path(digest).unlink()
+        except FileNotFoundError:
+            pass
+        return True
+
+    def _load_index(self) -> dict[str, CacheEntry]:
+        path = self.directory / _INDEX_FILE
+        if not path.exists():
+            return {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            return {key: CacheEntry(**value) for key, value in data.get("entries", {}).items()}
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Índice de caché inválido en {path}, se reinicia: {e}")
+            return {}
+
+    def _save_index(self) -> None:
+        data = {"version": 1, "entries": {k: asdict(v) for k, v in self._entries.items()}}
+        payload = json.dumps(data, ensure_ascii=False, indent=1).encode("utf-8")
+        self._atomic_write(self.directory / _INDEX_FILE, payload)
+        self._dirty = False
+        self._flushed_at = time.monotonic()
+
+    def _flush_at_exit(self) -> None:
+        try:
+            self.flush()
+        except OSError as e:
+            # El directorio pudo haberse borrado; sólo se pierden últimos usos
+            logger.debug(f"No se pudo guardar el índice de {self.directory}: {e}")
+
+    @staticmethod
+    def _atomic_write(path: Path, content: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+_caches: dict[Path, XMLCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(directory: str | Path, **kwargs: float) -> XMLCache:
+    """Obtiene la instancia compartida del caché para un directorio.
+
+    Todos los scrapers de un proceso que apunten al mismo directorio
+    comparten índice y contadores.
+
+    Args:
+        directory: Directorio raíz del caché.
+        **kwargs: Parámetros de :class:`XMLCache` (``ttl``, ``max_bytes``, ``max_age``).
+
+    Returns:
+        Instancia de XMLCache.
+    """
+    path = Path(directory).expanduser().resolve()
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = XMLCache(path, **kwargs)  # type: ignore[arg-type]
+            _caches[path] = cache
+        else:
+            for name, value in kwargs.items():
+                setattr(cache, name, value)
+        return cache
+
+
+def fetch_with_cache(
+    session: requests.Session,
+    url: str,
+    cache: XMLCache | None,
+    timeout: float,
+    limiter: TokenBucket | None = None,
+    max_retries: int = 0,
+    backoff: float = 1.0,
+) -> bytes:
+    """Ejecuta un GET usando el caché (si existe) y revalidación condicional.
+
+    El limitador sólo se consume cuando la solicitud sale a la red; los
+    aciertos frescos del caché no esperan. Las excepciones de ``requests``
+    (timeout, conexión, ``raise_for_status``) se propagan sin cambios para
+    que cada scraper las traduzca.
+
+    Args:
+        session: Sesión HTTP.
+        url: URL a descargar.
+        cache: Caché a usar, o None para descargar siempre.
+        timeout: Timeout de la solicitud en segundos.
+        limiter: Limitador de tasa compartido (None = sin límite).
+        max_retries: Reintentos ante 429/503 (ver :func:`throttled_get`).
+        backoff: Espera base de esos reintentos sin ``Retry-After``.
+
+    Returns:
+        Cuerpo de la respuesta (propio o desde el caché).
+    """
+    if cache is None:
+        response = throttled_get(
+            session, url, limiter, timeout=timeout, max_retries=max_retries, backoff=backoff
+        )
+        response.raise_for_status()
+        return response.content
+
+    key = cache.key_for_url(url)
+    entry = cache.lookup(key)
+
+    if entry is not None and cache.is_fresh(entry):
+        cache.record("hits")
+        logger.debug(f"Caché fresco para {key}")
+        return cache.read(entry)
+
+    headers = cache.conditional_headers(entry) if entry is not None else {}
+    response = throttled_get(
+        session,
+        url,
+        limiter,
+        timeout=timeout,
+        headers=headers,
+        max_retries=max_retries,
+        backoff=backoff,
+    )
+
+    if entry is not None and response.status_code == 304:
+        cache.record("revalidated")
+        cache.mark_revalidated(
+            entry, response.headers.get("ETag"), response.headers.get("Last-Modified")
+        )
+        logger.debug(f"Caché revalidado (304) para {key}")
+        return cache.read(entry)
+
+    response.raise_for_status()
+    cache.record("misses")
+    cache.store(
+        key,
+        url,
+        response.content,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+    return response.content
@@ -0,0 +1,157 @@
+"""
+Sesiones HTTP compartidas con pool de conexiones.
+
+Todos los scrapers del proceso que usan la misma configuración HTTP
+comparten una única ``requests.Session`` (ver :func:`get_session`): en una
+corrida por lotes las conexiones TCP/TLS con la BCN se abren una vez y se
+reutilizan (keep-alive), en lugar de negociarse de nuevo para cada norma.
+
+La sesión define el tamaño del pool, el keep-alive, la compresión aceptada
+(gzip/deflate) y la política de reintentos ante errores 5xx transitorios.
+Los 429/503 no se reintentan aquí sino en
+:func:`~leychile_epub.rate_limiter.throttled_get`, que respeta ``Retry-After``.
+
+Example:
+    >>> settings = SessionSettings.from_config(config.scraper)
+    >>> session = get_session(settings)   # misma instancia en todo el proceso
+    >>> session is get_session(settings)
+    True
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import ScraperConfig
+
+logger = logging.getLogger("leychile_epub.http_session")
+
+# Errores transitorios que reintenta urllib3 (429/503 van por throttled_get)
+RETRY_STATUSES = (500, 502, 504)
+
+# Accept por defecto: el XML de la API obtxml
+XML_ACCEPT = "application/xml, text/xml, */*"
+
+
+@dataclass(frozen=True)
+class SessionSettings:
+    """Parámetros de una sesión HTTP; sesiones con iguales parámetros se comparten.
+
+    Attributes:
+        user_agent: User-Agent de las solicitudes.
+        accept: Cabecera Accept.
+        accept_language: Cabecera Accept-Language.
+        accept_encoding: Codificaciones de contenido aceptadas.
+        max_retries: Reintentos ante errores de conexión y 5xx transitorios.
+        backoff: Factor de espera exponencial entre reintentos.
+        pool_connections: Hosts distintos cuyos pools se mantienen.
+        pool_maxsize: Conexiones reutilizables por host.
+        keep_alive: Si es False, se pide cerrar la conexión tras cada respuesta.
+    """
+
+    user_agent: str = ScraperConfig.user_agent
+    accept: str = XML_ACCEPT
+    accept_language: str = "es-CL,es;q=0.9"
+    accept_encoding: str = "gzip, deflate"
+    max_retries: int = 3
+    backoff: float = 1.0
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    keep_alive: bool = True
+
+    @classmethod
+    def from_config(cls, config: ScraperConfig, accept: str = XML_ACCEPT) -> SessionSettings:
+        """Obtiene los parámetros de sesión de la configuración del scraper."""
+        return cls(
+            user_agent=config.user_agent,
+            accept=accept,
+            accept_encoding=config.accept_encoding,
+            max_retries=config.max_retries,
+            backoff=config.retry_delay,
+            pool_maxsize=max(config.pool_maxsize, config.max_concurrency, 1),
+            keep_alive=config.keep_alive,
+        )
+
+
+def create_session(settings: SessionSettings) -> requests.Session:
+    """Crea una sesión HTTP nueva (no compartida).
+
+    Args:
+        settings: Parámetros de la sesión.
+
+    Returns:
+        Sesión configurada.
+    """
+    session = requests.Session()
+
+    retry_strategy = Retry(
+        total=settings.max_retries,
+        backoff_factor=settings.backoff,
+        status_forcelist=list(RETRY_STATUSES),
+        allowed_methods=["GET", "HEAD"],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=settings.pool_connections,
+        pool_maxsize=settings.pool_maxsize,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    session.headers.update(
+        {
+            "User-Agent": settings.user_agent,
+            "Accept": settings.accept,
+            "Accept-Language": settings.accept_language,
+            "Accept-Encoding": settings.accept_encoding,
+            "Connection": "keep-alive" if settings.keep_alive else "close",
+        }
+    )
+    return session
+
+
+_sessions: dict[SessionSettings, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(settings: SessionSettings) -> requests.Session:
+    """Obtiene la sesión compartida del proceso para unos parámetros.
+
+    La sesión no debe cerrarse desde quien la usa: se cierra al terminar el
+    proceso o con :func:`close_sessions`.
+
+    Args:
+        settings: Parámetros de la sesión.
+
+    Returns:
+        Sesión compartida.
+    """
+    with _sessions_lock:
+        session = _sessions.get(settings)
+        if session is None:
+            session = create_session(settings)
+            _sessions[settings] = session
+            logger.debug(f"Sesión HTTP creada (pool={settings.pool_maxsize})")
+        return session
+
+
+def close_sessions() -> None:
+    """Cierra todas las sesiones compartidas y sus conexiones."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+atexit.register(close_sessions)
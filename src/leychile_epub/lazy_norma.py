@@ -0,0 +1,235 @@
+"""
+Vista perezosa de una norma para consultas puntuales de artículos.
+
+:meth:`BCNXMLParser.parse` construye el árbol completo de
+``EstructuraFuncional`` (más anexos y promulgación) aunque sólo se necesite
+un artículo. :class:`LazyNorma` recorre una vez los elementos
+``<EstructuraFuncional>`` del documento y guarda su posición por ``idParte``
+y por ``nombre_parte``, sin parsear su contenido; cada estructura se parsea
+recién al pedirla (y queda en caché). El encabezado, la promulgación y los
+anexos también se parsean al leerlos.
+
+Sobre el XML ya en caché (:mod:`leychile_epub.http_cache`) una consulta
+cuesta lo que cuesta parsear el subárbol pedido, sin importar el tamaño de
+la norma. Las estructuras entregadas son idénticas a las de
+:meth:`BCNXMLParser.parse`.
+
+Example:
+    >>> norma = scraper.scrape_lazy("https://www.leychile.cl/Navegar?idNorma=172986")
+    >>> norma.articulo("Art. 1545").texto
+    'Art. 1545. Todo contrato legalmente celebrado es una ley para ...'
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+from lxml import etree
+
+from .scraper_v2 import (
+    NS,
+    EstructuraFuncional,
+    LxmlBCNXMLParser,
+    Norma,
+    NormaIdentificador,
+    NormaMetadatos,
+    _tipo_parte,
+)
+
+logger = logging.getLogger("leychile_epub.lazy_norma")
+
+# "Art. 1545", "Artículo 1545°", "art 1545" → "1545"
+_RE_PREFIJO_ARTICULO = re.compile(r"^art(?:[íi]culo|\.)?\s*", re.IGNORECASE)
+_RE_ESPACIOS = re.compile(r"\s+")
+
+_Q_EF = f"{{{NS['lc']}}}EstructuraFuncional"
+_Q_CONTENEDOR = f"{{{NS['lc']}}}EstructurasFuncionales"
+_X_NOMBRES = etree.XPath(
+    "//lc:EstructuraFuncional/lc:Metadatos[1]/lc:NombreParte[1][@presente='si']", namespaces=NS
+)
+
+
+def _clave(nombre: str) -> str:
+    """Normaliza un ``nombre_parte`` para buscarlo."""
+    nombre = _RE_ESPACIOS.sub(" ", nombre.strip()).casefold()
+    return _RE_PREFIJO_ARTICULO.sub("", nombre).rstrip(" .°º")
+
+
+class LazyNorma:
+    """Norma cuyas estructuras se parsean sólo al consultarlas.
+
+    Usa el backend lxml: el índice se arma con un recorrido en C de los
+    elementos ``<EstructuraFuncional>`` y ``getparent()``.
+
+    Attributes:
+        root: Elemento raíz ``<Norma>`` del documento.
+        parser: Parser usado para cada subárbol.
+        norma_id: ``normaId`` de la raíz.
+        fecha_version: ``fechaVersion`` de la raíz.
+        derogado: Si la norma completa está derogada.
+        identificador: Identificador (se parsea de inmediato, es pequeño).
+        metadatos: Metadatos (se parsean de inmediato, son pequeños).
+        url_original: URL de LeyChile con que se pidió.
+        id_version: ``idVersion`` fijado en la URL.
+    """
+
+    def __init__(self, root: etree._Element, parser: LxmlBCNXMLParser | None = None) -> None:
+        self.root = root
+        self.parser = parser or LxmlBCNXMLParser()
+        self.url_original = ""
+        self.id_version = ""
+
+        cabecera = Norma()
+        self.parser._parse_root_attributes(cabecera, root)
+        self.norma_id = cabecera.norma_id
+        self.fecha_version = cabecera.fecha_version
+        self.derogado = cabecera.derogado
+        ns = self.parser.ns
+        self.identificador: NormaIdentificador = self.parser._parse_identificador(
+            root.find("lc:Identificador", ns)
+        )
+        self.metadatos: NormaMetadatos = self.parser._parse_metadatos(root.find("lc:Metadatos", ns))
+
+        # idParte → (elemento, nivel); nombre normalizado → idParte
+        self._elementos: dict[str, tuple[etree._Element, int]] = {}
+        self._por_nombre: dict[str, list[str]] = {}
+        self._orden: list[str] = []
+        self._parseadas: dict[str, EstructuraFuncional] = {}
+        self._indexar()
+
+    @classmethod
+    def from_bytes(cls, content: bytes, parser: LxmlBCNXMLParser | None = None) -> LazyNorma:
+        """Crea la vista a partir del XML (``obtxml``) de la norma.
+
+        Raises:
+            lxml.etree.XMLSyntaxError: Si el XML no es válido.
+        """
+        parser = parser or LxmlBCNXMLParser()
+        return cls(parser.fromstring(content), parser)
+
+    @classmethod
+    def from_file(cls, path: str | Path, parser: LxmlBCNXMLParser | None = None) -> LazyNorma:
+        """Crea la vista a partir de un archivo XML de la BCN."""
+        return cls.from_bytes(Path(path).read_bytes(), parser)
+
+    # -------------------------------------------------------------------------
+    # Índice
+    # -------------------------------------------------------------------------
+
+    def _indexar(self) -> None:
+        """Recorre las estructuras en preorden sin parsear su contenido.
+
+        Sólo cuentan las estructuras que :meth:`BCNXMLParser.parse` visitaría:
+        las del primer ``<EstructurasFuncionales>`` de la raíz o de otra
+        estructura indexada.
+        """
+        nombres = {elem.getparent().getparent(): elem for elem in _X_NOMBRES(self.root)}
+        niveles: dict[etree._Element, int] = {self.root: -1}
+        contenedores: dict[etree._Element, int | None] = {}
+
+        for elem in self.root.iter(_Q_EF):
+            contenedor = elem.getparent()
+            if contenedor not in contenedores:
+                dueno = contenedor.getparent()
+                valido = dueno in niveles and dueno.find(_Q_CONTENEDOR) is contenedor
+                contenedores[contenedor] = niveles[dueno] + 1 if valido else None
+            nivel = contenedores[contenedor]
+            if nivel is None:
+                continue
+
+            niveles[elem] = nivel
+            id_parte = elem.get("idParte", "")
+            self._orden.append(id_parte)
+            self._elementos.setdefault(id_parte, (elem, nivel))
+            nombre_elem = nombres.get(elem)
+            if nombre_elem is not None:
+                if nombre := self.parser._get_text(nombre_elem).strip():
+                    self._por_nombre.setdefault(_clave(nombre), []).append(id_parte)
+
+        logger.debug(f"LazyNorma {self.norma_id}: {len(self._orden)} estructuras indexadas")
+
+    def __len__(self) -> int:
+        """Cantidad de estructuras (todos los niveles)."""
+        return len(self._orden)
+
+    def __contains__(self, id_parte: object) -> bool:
+        return id_parte in self._elementos
+
+    @property
+    def ids(self) -> list[str]:
+        """``idParte`` de todas las estructuras, en orden del documento."""
+        return list(self._orden)
+
+    # -------------------------------------------------------------------------
+    # Consultas
+    # -------------------------------------------------------------------------
+
+    def estructura(self, id_parte: str) -> EstructuraFuncional | None:
+        """Parsea (una sola vez) la estructura ``id_parte`` con su subárbol."""
+        ef = self._parseadas.get(id_parte)
+        if ef is None:
+            entrada = self._elementos.get(id_parte)
+            if entrada is None:
+                return None
+            ef = self.parser._parse_estructura_funcional(*entrada)
+            self._parseadas[id_parte] = ef
+        return ef
+
+    def buscar(self, nombre_parte: str, tipo_parte: str | None = None) -> list[EstructuraFuncional]:
+        """Estructuras cuyo ``nombre_parte`` coincide, en orden del documento.
+
+        Args:
+            nombre_parte: Nombre a buscar ("1545", "Art. 1545", "1 bis"...).
+            tipo_parte: Si se indica, sólo estructuras de ese tipo
+                (sin distinguir mayúsculas).
+        """
+        encontradas = []
+        tipo = tipo_parte.casefold() if tipo_parte else None
+        for id_parte in dict.fromkeys(self._por_nombre.get(_clave(nombre_parte), ())):
+            elem, _nivel = self._elementos[id_parte]
+            if tipo is not None and _tipo_parte(elem.get("tipoParte", "")).casefold() != tipo:
+                continue
+            ef = self.estructura(id_parte)
+            if ef is not None:
+                encontradas.append(ef)
+        return encontradas
+
+    def articulo(self, numero: str, transitorio: bool = False) -> EstructuraFuncional | None:
+        """Artículo por su número ("1545", "Art. 1545", "Artículo 1545°").
+
+        Args:
+            numero: Número o nombre del artículo.
+            transitorio: Buscar entre los artículos transitorios.
+        """
+        for ef in self.buscar(numero, "Artículo"):
+            if ef.transitorio == transitorio:
+                return ef
+        return None
+
+    @cached_property
+    def encabezado(self) -> tuple[str, bool]:
+        """(texto, derogado) del encabezado."""
+        return self.parser._parse_encabezado(self.root.find("lc:Encabezado", self.parser.ns))
+
+    @cached_property
+    def promulgacion(self) -> tuple[str, bool]:
+        """(texto, derogado) de la promulgación."""
+        return self.parser._parse_promulgacion(self.root.find("lc:Promulgacion", self.parser.ns))
+
+    @cached_property
+    def anexos(self) -> list[dict[str, Any]]:
+        """Anexos de la norma."""
+        return self.parser._parse_anexos(self.root.find("lc:Anexos", self.parser.ns))
+
+    def to_norma(self) -> Norma:
+        """Parsea la norma completa (igual que :meth:`BCNXMLParser.parse`)."""
+        norma = self.parser.parse(self.root)
+        norma.url_original = self.url_original
+        norma.id_version = self.id_version
+        return norma
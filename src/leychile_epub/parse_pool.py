@@ -0,0 +1,129 @@
+"""
+Parseo de varias normas en paralelo con un pool de procesos.
+
+El parseo de una norma es Python puro y está limitado por CPU, así que con
+las descargas resueltas la generación de una biblioteca queda atada a un
+núcleo. :func:`parse_many` reparte los XML entre procesos de un
+``ProcessPoolExecutor``:
+
+- Cada proceso crea una vez su propio parser (de la misma clase que el del
+  llamador) y parsea los XML que recibe.
+- La norma vuelve al proceso principal como snapshot binario
+  (:mod:`leychile_epub.snapshot`): un solo bloque de ``bytes`` con cadenas
+  deduplicadas y el árbol en columnas, en lugar del pickle recursivo de
+  miles de objetos anidados.
+- Los resultados se entregan en el orden de entrada, y un XML inválido sólo
+  marca su propio :class:`~leychile_epub.scraper_v2.ParseResult` con un
+  ``ParsingError``.
+
+Example:
+    >>> parser = create_parser("lxml")
+    >>> for r in parser.parse_many(blobs, max_workers=4):
+    ...     print(r.index, r.norma.titulo_completo if r.ok else r.error)
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+
+from .exceptions import ParsingError
+from .scraper_v2 import BCNXMLParser, ParseResult
+from .snapshot import dumps_snapshot, loads_snapshot
+
+logger = logging.getLogger("leychile_epub.parse_pool")
+
+# Normas por proceso en cada grupo de un lote: acota los XML que se
+# mantienen en memoria entre la descarga y el parseo
+BATCH_PER_WORKER = 4
+
+# Parser de cada proceso del pool (lo crea _init_worker)
+_worker_parser: BCNXMLParser | None = None
+
+
+def resolve_workers(max_workers: int | None, jobs: int) -> int:
+    """Cantidad de procesos a usar para ``jobs`` normas.
+
+    ``None`` o ``0`` significan uno por CPU; nunca más procesos que normas.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    return max(min(workers, jobs), 1)
+
+
+def _invalid(index: int, error: str) -> ParsingError:
+    return ParsingError(
+        "El XML de la BCN no es válido", details={"index": index, "original_error": error}
+    )
+
+
+def _init_worker(parser_cls: type[BCNXMLParser]) -> None:
+    global _worker_parser
+    _worker_parser = parser_cls()
+
+
+def _parse_to_snapshot(content: bytes) -> tuple[bytes, str]:
+    """Parsea un XML en el proceso de trabajo y retorna (snapshot, error)."""
+    parser = _worker_parser
+    assert parser is not None
+    try:
+        norma = parser.parse(parser.fromstring(content))
+    except parser.parse_errors as e:
+        return b"", str(e)
+    return dumps_snapshot(norma), ""
+
+
+def _parse_local(parser: BCNXMLParser, index: int, content: bytes) -> ParseResult:
+    try:
+        norma = parser.parse(parser.fromstring(content))
+    except parser.parse_errors as e:
+        return ParseResult(index, error=_invalid(index, str(e)))
+    return ParseResult(index, norma=norma)
+
+
+def parse_many(
+    blobs: Iterable[bytes],
+    parser: BCNXMLParser | None = None,
+    max_workers: int | None = None,
+) -> list[ParseResult]:
+    """Parsea varios XML de normas, en paralelo si hay más de un proceso.
+
+    Con un solo proceso (``max_workers=1`` o una sola norma) se parsea en el
+    proceso actual, sin pool. En el pool las normas vuelven sin
+    ``text_buffer`` (los snapshots guardan los textos ya materializados).
+
+    Args:
+        blobs: Contenido XML (``obtxml``) de cada norma.
+        parser: Parser cuya clase se usa (por defecto ``BCNXMLParser``).
+        max_workers: Procesos del pool (``None``/``0`` = uno por CPU).
+
+    Returns:
+        Un ParseResult por XML, en el orden de ``blobs``.
+
+    Raises:
+        BrokenProcessPool: Si un proceso de trabajo termina abruptamente.
+    """
+    parser = parser or BCNXMLParser()
+    blobs = list(blobs)
+    workers = resolve_workers(max_workers, len(blobs))
+
+    if workers == 1:
+        return [_parse_local(parser, i, content) for i, content in enumerate(blobs)]
+
+    logger.info(f"Parseando {len(blobs)} normas con {workers} procesos")
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(type(parser),)
+    ) as pool:
+        futures = [pool.submit(_parse_to_snapshot, content) for content in blobs]
+        resultados = []
+        for i, future in enumerate(futures):
+            data, error = future.result()
+            if error:
+                logger.warning(f"XML inválido en la posición {i}: {error}")
+                resultados.append(ParseResult(i, error=_invalid(i, error)))
+            else:
+                resultados.append(ParseResult(i, norma=loads_snapshot(data)))
+    return resultados
@@ -0,0 +1,164 @@
+"""
+Planificación de descargas por lotes.
+
+Un lote (archivo de URLs, ``BIBLIOTECAS`` de ``generar_biblioteca_xml.py``)
+puede nombrar la misma norma con URLs distintas: ``leychile.cl/Navegar``,
+``bcn.cl/leychile/navegar``, parámetros en otro orden, etc. Antes de
+descargar, :func:`plan_fetches` normaliza cada entrada a su
+``(idNorma, idVersion)`` con :meth:`BCNLawScraperV2.extract_id_norma` y
+:meth:`BCNLawScraperV2.extract_id_version`, agrupa las repetidas y deja una
+sola descarga por norma con todas las salidas que la pidieron.
+
+Example:
+    >>> plan = plan_fetches(urls)
+    >>> print(plan.summary())
+    5 solicitudes → 3 descargas únicas (1 duplicada, 1 inválida)
+    >>> for fetch in plan.fetches:
+    ...     norma = scraper.scrape(fetch.url)
+    ...     for salida in fetch.outputs:
+    ...         ...
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+from .exceptions import LeyChileError
+from .scraper_v2 import BCNLawScraperV2
+
+logger = logging.getLogger("leychile_epub.planner")
+
+T = TypeVar("T")
+
+# URL canónica de una norma en LeyChile
+CANONICAL_URL = "https://www.leychile.cl/Navegar?idNorma={id_norma}"
+
+
+@dataclass(frozen=True)
+class NormaRef:
+    """Identidad de una norma a descargar.
+
+    Attributes:
+        id_norma: ID de la norma en la BCN.
+        id_version: Versión fijada en la URL (vacío = versión vigente).
+    """
+
+    id_norma: str
+    id_version: str = ""
+
+    @property
+    def key(self) -> str:
+        """Clave ``idNorma`` o ``idNorma@idVersion``."""
+        return f"{self.id_norma}@{self.id_version}" if self.id_version else self.id_norma
+
+    @property
+    def url(self) -> str:
+        """URL canónica de LeyChile."""
+        url = CANONICAL_URL.format(id_norma=self.id_norma)
+        return f"{url}&idVersion={self.id_version}" if self.id_version else url
+
+
+@dataclass
+class PlannedFetch(Generic[T]):
+    """Una descarga única y las salidas que la pidieron.
+
+    Attributes:
+        ref: Norma a descargar.
+        url: Primera URL con que se pidió (se usa para descargar, de modo que
+            ``Norma.url_original`` conserve la forma que escribió el usuario).
+        outputs: Entradas del lote que piden esta norma, en orden.
+    """
+
+    ref: NormaRef
+    url: str
+    outputs: list[T] = field(default_factory=list)
+
+
+@dataclass
+class FetchPlan(Generic[T]):
+    """Plan de descargas de un lote.
+
+    Attributes:
+        fetches: Descargas únicas, en el orden de su primera aparición.
+        invalid: Entradas sin idNorma válido, con el motivo.
+    """
+
+    fetches: list[PlannedFetch[T]] = field(default_factory=list)
+    invalid: list[tuple[T, str]] = field(default_factory=list)
+
+    @property
+    def requested(self) -> int:
+        """Cantidad de entradas del lote."""
+        return sum(len(f.outputs) for f in self.fetches) + len(self.invalid)
+
+    @property
+    def duplicates(self) -> int:
+        """Entradas que reutilizan la descarga de otra."""
+        return self.requested - len(self.fetches) - len(self.invalid)
+
+    def summary(self) -> str:
+        """Resumen legible del plan."""
+        detalles = []
+        if self.duplicates:
+            detalles.append(f"{self.duplicates} duplicada{'s' if self.duplicates != 1 else ''}")
+        if self.invalid:
+            detalles.append(f"{len(self.invalid)} inválida{'s' if len(self.invalid) != 1 else ''}")
+        extra = f" ({', '.join(detalles)})" if detalles else ""
+        return f"{self.requested} solicitudes → {len(self.fetches)} descargas únicas{extra}"
+
+    def to_dict(self) -> dict[str, int]:
+        """Contadores del plan."""
+        return {
+            "solicitudes": self.requested,
+            "descargas": len(self.fetches),
+            "duplicadas": self.duplicates,
+            "invalidas": len(self.invalid),
+        }
+
+
+def plan_fetches(
+    items: Iterable[T],
+    url_of: Callable[[T], str] | None = None,
+    scraper: BCNLawScraperV2 | None = None,
+) -> FetchPlan[T]:
+    """Agrupa las entradas de un lote por norma.
+
+    Args:
+        items: Entradas del lote (URLs u objetos que las contienen).
+        url_of: Obtiene la URL de una entrada (por defecto, la entrada misma).
+        scraper: Scraper cuyas reglas de extracción y dominios se usan.
+
+    Returns:
+        Plan con una descarga por ``(idNorma, idVersion)``.
+    """
+    scraper = scraper or BCNLawScraperV2()
+    get_url = url_of or (lambda item: item)
+    plan: FetchPlan[T] = FetchPlan()
+    by_ref: dict[NormaRef, PlannedFetch[T]] = {}
+
+    for item in items:
+        url = get_url(item).strip()
+        try:
+            id_norma = scraper.extract_id_norma(url)
+        except LeyChileError as e:
+            plan.invalid.append((item, e.message))
+            continue
+        if not id_norma:
+            plan.invalid.append((item, "No se pudo extraer el ID de la norma de la URL"))
+            continue
+
+        ref = NormaRef(id_norma, scraper.extract_id_version(url) or "")
+        fetch = by_ref.get(ref)
+        if fetch is None:
+            fetch = PlannedFetch(ref, url)
+            by_ref[ref] = fetch
+            plan.fetches.append(fetch)
+        fetch.outputs.append(item)
+
+    logger.info(f"Plan de descargas: {plan.summary()}")
+    return plan
@@ -0,0 +1,211 @@
+"""
+Perfilado por norma de las etapas de descarga, parseo, render y escritura.
+
+El scraper, los parsers y los generadores marcan sus etapas con
+:func:`span`. Fuera de un perfilado cada marca sólo compara una variable
+con ``None``, así que el perfilado puede quedar activo en producción. Dentro
+de :func:`profile_normas`, cada bloque :func:`record_norma` acumula:
+
+- ``bytes``: bytes descargados (de la red o del caché en disco).
+- ``nodos``: ``EstructuraFuncional`` parseadas.
+- ``ms``: milisegundos por etapa (``descarga``, ``parseo``, ``render``,
+  ``escritura``), medidos con ``time.perf_counter``.
+- ``memoria_pico``: pico de memoria asignada en bytes, sólo con
+  ``trace_memory=True`` (usa ``tracemalloc``, que sí tiene un costo).
+
+Al cerrar cada norma su registro se escribe como una línea JSON en el
+destino indicado (JSON Lines).
+
+Example:
+    >>> with profile_normas(open("perfil.jsonl", "w")) as profiler:
+    ...     with record_norma(url):
+    ...         generator.generate(scraper.scrape(url), "ley.epub")
+    >>> profiler.records[0].ms["parseo"]
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import tracemalloc
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import IO, TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .scraper_v2 import EstructuraFuncional
+
+# Etapas que marcan el scraper, los parsers y los generadores
+DESCARGA = "descarga"
+PARSEO = "parseo"
+RENDER = "render"
+ESCRITURA = "escritura"
+
+# Contexto vacío compartido que entregan las marcas fuera de un perfilado
+_NULL = nullcontext()
+
+
+@dataclass
+class NormaTiming:
+    """Mediciones de una norma.
+
+    Attributes:
+        norma: Etiqueta de la norma (normalmente su URL).
+        bytes: Bytes descargados.
+        nodos: Estructuras funcionales parseadas.
+        ms: Milisegundos acumulados por etapa.
+        total_ms: Duración total del bloque :func:`record_norma`.
+        memoria_pico: Pico de memoria asignada (bytes) o None si no se midió.
+    """
+
+    norma: str
+    bytes: int = 0
+    nodos: int = 0
+    ms: dict[str, float] = field(default_factory=dict)
+    total_ms: float = 0.0
+    memoria_pico: int | None = None
+    # Etapas abiertas (una etapa anidada en sí misma no se cuenta dos veces)
+    _abiertas: set[str] = field(default_factory=set, repr=False, compare=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Registro como diccionario (para JSON)."""
+        data: dict[str, Any] = {
+            "norma": self.norma,
+            "bytes": self.bytes,
+            "nodos": self.nodos,
+            "ms": {name: round(ms, 3) for name, ms in self.ms.items()},
+            "total_ms": round(self.total_ms, 3),
+        }
+        if self.memoria_pico is not None:
+            data["memoria_pico"] = self.memoria_pico
+        return data
+
+    def to_json(self) -> str:
+        """Registro como una línea JSON."""
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Acumula en ``ms[name]`` la duración del bloque."""
+        if name in self._abiertas:
+            yield
+            return
+        self._abiertas.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.ms[name] = self.ms.get(name, 0.0) + (time.perf_counter() - start) * 1000
+            self._abiertas.discard(name)
+
+
+class Profiler:
+    """Registros de un perfilado y su destino JSON Lines.
+
+    Attributes:
+        sink: Archivo de texto donde se escribe una línea por norma (opcional).
+        trace_memory: Medir el pico de memoria de cada norma con ``tracemalloc``.
+        records: Registros de las normas ya cerradas.
+    """
+
+    def __init__(self, sink: IO[str] | None = None, trace_memory: bool = False) -> None:
+        self.sink = sink
+        self.trace_memory = trace_memory
+        self.records: list[NormaTiming] = []
+        self.current: NormaTiming | None = None
+
+    @contextmanager
+    def norma(self, label: str) -> Iterator[NormaTiming]:
+        """Abre el registro de una norma; al salir lo guarda y lo escribe."""
+        previous = self.current
+        record = NormaTiming(label)
+        self.current = record
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.total_ms = (time.perf_counter() - start) * 1000
+            if self.trace_memory:
+                record.memoria_pico = tracemalloc.get_traced_memory()[1]
+            self.current = previous
+            self.records.append(record)
+            if self.sink is not None:
+                self.sink.write(record.to_json() + "\n")
+                self.sink.flush()
+
+
+# Perfilado activo (None = sin perfilar; las marcas sólo comparan con None)
+_profiler: Profiler | None = None
+
+
+@contextmanager
+def profile_normas(sink: IO[str] | None = None, trace_memory: bool = False) -> Iterator[Profiler]:
+    """Activa el perfilado por norma dentro del bloque ``with``.
+
+    Los perfilados no se anidan: el interior reemplaza al exterior mientras
+    dura. Las marcas hechas fuera de un bloque :func:`record_norma` se ignoran. En
+    un pool de procesos (:mod:`leychile_epub.parse_pool`) el parseo ocurre
+    en otros procesos y no queda registrado.
+
+    Args:
+        sink: Archivo de texto donde escribir una línea JSON por norma.
+        trace_memory: Medir el pico de memoria con ``tracemalloc`` (lo inicia
+            si no estaba activo y lo detiene al salir).
+    """
+    global _profiler
+    previous = _profiler
+    profiler = Profiler(sink, trace_memory)
+    started = trace_memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    _profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _profiler = previous
+        if started:
+            tracemalloc.stop()
+
+
+def record_norma(label: str) -> Any:
+    """Registro de una norma en el perfilado activo (o un contexto vacío)."""
+    if _profiler is None:
+        return _NULL
+    return _profiler.norma(label)
+
+
+def _current() -> NormaTiming | None:
+    return _profiler.current if _profiler is not None else None
+
+
+def span(name: str) -> Any:
+    """Marca una etapa de la norma en curso (contexto vacío si no se perfila)."""
+    if _profiler is None or _profiler.current is None:
+        return _NULL
+    return _profiler.current.span(name)
+
+
+def add_bytes(count: int) -> None:
+    """Suma bytes descargados a la norma en curso."""
+    record = _current()
+    if record is not None:
+        record.bytes += count
+
+
+def add_nodes(estructuras: Iterable[EstructuraFuncional]) -> None:
+    """Suma a la norma en curso las estructuras del árbol (si se perfila)."""
+    record = _current()
+    if record is None:
+        return
+    pendientes = list(estructuras)
+    count = 0
+    while pendientes:
+        ef = pendientes.pop()
+        count += 1
+        pendientes.extend(ef.hijos)
+    record.nodos += count
@@ -0,0 +1,235 @@
+"""
+Limitador de tasa (token bucket) compartido para las solicitudes a la BCN.
+
+Reemplaza la pausa fija de ``rate_limit_delay`` después de cada respuesta:
+el limitador sólo se consume antes de una solicitud que realmente sale a la
+red (no en los aciertos del caché) y descuenta el tiempo que ya tomó la
+solicitud anterior. Un mismo limitador se comparte entre todos los scrapers
+e hilos del proceso que usen la misma tasa (ver :func:`get_rate_limiter`).
+
+Las respuestas ``429 Too Many Requests`` y ``503 Service Unavailable`` se
+reintentan respetando ``Retry-After``: la espera se aplica al limitador,
+de modo que *todos* los hilos se detienen, no sólo el que recibió la
+respuesta.
+
+Example:
+    >>> limiter = TokenBucket(rate=2.0, burst=4)
+    >>> limiter.acquire()          # bloquea el hilo si no hay tokens
+    >>> await limiter.acquire_async()  # variante para asyncio
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from .config import ScraperConfig
+
+logger = logging.getLogger("leychile_epub.rate_limiter")
+
+# Códigos HTTP que indican que la BCN pide bajar el ritmo.
+RETRY_AFTER_STATUSES = frozenset({429, 503})
+
+# Tope para un Retry-After anómalo (segundos).
+MAX_RETRY_AFTER = 300.0
+
+
+class TokenBucket:
+    """Limitador token bucket seguro para hilos y asyncio.
+
+    El balde se llena a ``rate`` tokens por segundo hasta ``burst`` tokens.
+    Cada solicitud consume un token; si no hay, la solicitud espera su turno.
+    Los turnos se reservan bajo un lock, por lo que el orden de llegada se
+    respeta entre hilos y corrutinas.
+
+    Attributes:
+        rate: Solicitudes por segundo en régimen sostenido.
+        burst: Solicitudes que pueden salir seguidas sin esperar.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Inicializa el limitador.
+
+        Args:
+            rate: Solicitudes por segundo (debe ser positivo).
+            burst: Tamaño máximo del balde.
+            clock: Reloj monotónico (inyectable para tests).
+
+        Raises:
+            ValueError: Si ``rate`` no es positivo.
+        """
+        if rate <= 0:
+            raise ValueError("rate debe ser positivo")
+        self.rate = float(rate)
+        self.burst = max(int(burst), 1)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: ScraperConfig) -> TokenBucket | None:
+        """Obtiene el limitador compartido definido en la configuración.
+
+        Usa ``requests_per_second`` si está definido; si no, lo deriva de
+        ``rate_limit_delay`` (una solicitud cada ``rate_limit_delay`` segundos).
+
+        Returns:
+            Limitador compartido o None si no hay límite.
+        """
+        rate = config.requests_per_second
+        if rate is None:
+            rate = 1.0 / config.rate_limit_delay if config.rate_limit_delay > 0 else 0.0
+        if rate <= 0:
+            return None
+        return get_rate_limiter(rate, config.burst)
+
+    def reserve(self) -> float:
+        """Reserva un token y retorna los segundos que hay que esperar para usarlo."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self) -> float:
+        """Espera (bloqueando el hilo) hasta poder hacer una solicitud.
+
+        Returns:
+            Segundos esperados.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Como :meth:`acquire`, pero cede el event loop mientras espera.
+
+        Es para corrutinas que hacen sus propias solicitudes. El scraper
+        asíncrono no la usa: descarga desde un pool de hilos con
+        :func:`throttled_get`, que ya consume el token.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def penalize(self, seconds: float) -> None:
+        """Detiene todas las solicitudes durante ``seconds`` (p. ej. por Retry-After)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+        logger.info(f"Solicitudes a la BCN pausadas {seconds:.1f}s")
+
+
+_limiters: dict[tuple[float, int], TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(rate: float, burst: int = 1) -> TokenBucket:
+    """Obtiene el limitador compartido del proceso para una tasa y ráfaga.
+
+    Args:
+        rate: Solicitudes por segundo.
+        burst: Tamaño máximo del balde.
+
+    Returns:
+        Instancia de TokenBucket compartida.
+    """
+    key = (float(rate), max(int(burst), 1))
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = TokenBucket(*key)
+            _limiters[key] = limiter
+        return limiter
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Interpreta una cabecera ``Retry-After`` (segundos o fecha HTTP).
+
+    Returns:
+        Segundos a esperar (acotados a :data:`MAX_RETRY_AFTER`) o None.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def throttled_get(
+    session: requests.Session,
+    url: str,
+    limiter: TokenBucket | None,
+    *,
+    timeout: float,
+    headers: dict[str, str] | None = None,
+    max_retries: int = 0,
+    backoff: float = 1.0,
+    stream: bool = False,
+) -> requests.Response:
+    """Ejecuta un GET respetando el limitador y ``Retry-After``.
+
+    Ante un 429/503 se espera lo indicado por ``Retry-After`` (o
+    ``backoff * 2**intento`` si no viene) y se reintenta hasta
+    ``max_retries`` veces. Si se agotan los reintentos se retorna la última
+    respuesta para que el llamador decida (normalmente ``raise_for_status``).
+
+    Args:
+        session: Sesión HTTP.
+        url: URL a descargar.
+        limiter: Limitador a consumir antes de cada intento (None = sin límite).
+        timeout: Timeout de cada intento en segundos.
+        headers: Cabeceras adicionales.
+        max_retries: Reintentos ante 429/503.
+        backoff: Espera base cuando la respuesta no trae ``Retry-After``.
+        stream: Si es True, el cuerpo no se descarga hasta que se consuma.
+
+    Returns:
+        Respuesta HTTP.
+    """
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        response = session.get(url, timeout=timeout, headers=headers, stream=stream)
+        if response.status_code not in RETRY_AFTER_STATUSES or attempt >= max_retries:
+            return response
+
+        delay = parse_retry_after(response.headers.get("Retry-After"))
+        if delay is None:
+            delay = backoff * 2**attempt
+        attempt += 1
+        logger.warning(
+            f"HTTP {response.status_code} en {url}; reintento {attempt}/{max_retries} "
+            f"en {delay:.1f}s"
+        )
+        response.close()
+        if limiter is not None:
+            limiter.penalize(delay)
+        else:
+            time.sleep(delay)
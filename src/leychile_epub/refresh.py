@@ -0,0 +1,306 @@
+"""
+Actualización incremental de normas según su versión.
+
+Guarda en un manifiesto JSON la última versión vista de cada norma
+(``fechaVersion`` de la BCN, e ``idVersion`` si la URL la fija) junto con
+los archivos generados a partir de ella. En la siguiente corrida se consulta
+primero la versión vigente leyendo sólo la etiqueta raíz del XML (ver
+:meth:`~leychile_epub.scraper_v2.BCNLawScraperV2.probe_version`) y se omiten
+la descarga, el parseo y la generación de las normas que no cambiaron.
+
+Example:
+    >>> manifest = VersionManifest("salida/.leychile-manifest.json")
+    >>> refresher = IncrementalRefresher(BCNLawScraperV2(), manifest)
+    >>> resultado = refresher.refresh(url, lambda norma: [generator.generate(norma)])
+    >>> resultado.estado
+    'sin_cambios'
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+from .exceptions import LeyChileError, ValidationError
+from .scraper_v2 import BCNLawScraperV2, Norma
+
+logger = logging.getLogger("leychile_epub.refresh")
+
+# Nombre del manifiesto cuando se guarda junto a las salidas
+MANIFEST_FILENAME = ".leychile-manifest.json"
+
+MANIFEST_VERSION = 1
+
+# Estados de RefreshResult
+ESTADO_SIN_CAMBIOS = "sin_cambios"
+ESTADO_ACTUALIZADA = "actualizada"
+ESTADO_NUEVA = "nueva"
+ESTADO_FALLIDA = "fallida"
+
+
+@dataclass
+class ManifestEntry:
+    """Versión vista y archivos generados de una norma.
+
+    Attributes:
+        id_norma: ID de la norma en la BCN.
+        fecha_version: ``fechaVersion`` del XML con el que se generó.
+        id_version: ``idVersion`` fijado en la URL (vacío = última versión).
+        outputs: Rutas de los archivos generados.
+        actualizado: Momento (ISO 8601) de la última generación.
+    """
+
+    id_norma: str
+    fecha_version: str
+    id_version: str = ""
+    outputs: list[str] = field(default_factory=list)
+    actualizado: str = ""
+
+    def outputs_exist(self) -> bool:
+        """Indica si todos los archivos generados siguen en disco."""
+        return bool(self.outputs) and all(Path(p).exists() for p in self.outputs)
+
+
+class VersionManifest:
+    """Manifiesto persistente de versiones por norma.
+
+    Attributes:
+        path: Ruta del archivo JSON.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Carga el manifiesto (si no existe, parte vacío).
+
+        Args:
+            path: Ruta del archivo JSON.
+        """
+        self.path = Path(path)
+        self._entries: dict[str, ManifestEntry] = {}
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    @staticmethod
+    def key(id_norma: str, id_version: str = "") -> str:
+        """Clave de una norma (``idNorma`` o ``idNorma@idVersion``)."""
+        return f"{id_norma}@{id_version}" if id_version else id_norma
+
+    def get(self, id_norma: str, id_version: str = "") -> ManifestEntry | None:
+        """Retorna la entrada de una norma o None si nunca se generó."""
+        return self._entries.get(self.key(id_norma, id_version))
+
+    def update(self, norma: Norma, outputs: Iterable[str | Path]) -> ManifestEntry:
+        """Registra la versión de una norma recién generada.
+
+        Args:
+            norma: Norma generada (completa).
+            outputs: Archivos generados a partir de ella.
+
+        Returns:
+            Entrada registrada (aún no guardada en disco, ver :meth:`save`).
+        """
+        entry = ManifestEntry(
+            id_norma=norma.norma_id,
+            fecha_version=norma.fecha_version,
+            id_version=norma.id_version,
+            outputs=[str(p) for p in outputs],
+            actualizado=datetime.now().isoformat(timespec="seconds"),
+        )
+        self._entries[self.key(entry.id_norma, entry.id_version)] = entry
+        return entry
+
+    def save(self) -> None:
+        """Escribe el manifiesto de forma atómica."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "normas": {key: asdict(entry) for key, entry in sorted(self._entries.items())},
+        }
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION:
+                raise ValueError(f"versión {data.get('version')!r}")
+            # Los campos que ya no existen (p. ej. ``estructuras``) se descartan
+            campos = {f.name for f in fields(ManifestEntry)}
+            self._entries = {
+                key: ManifestEntry(**{k: v for k, v in entry.items() if k in campos})
+                for key, entry in data.get("normas", {}).items()
+            }
+        except (OSError, ValueError, TypeError) as e:
+            # Un manifiesto ilegible sólo obliga a regenerar todo
+            logger.warning(f"Manifiesto inválido en {self.path}, se ignora: {e}")
+            self._entries = {}
+
+
+@dataclass
+class RefreshResult:
+    """Resultado de actualizar una norma.
+
+    Attributes:
+        url: URL de LeyChile.
+        estado: ``"sin_cambios"``, ``"nueva"``, ``"actualizada"`` o ``"fallida"``.
+        id_norma: ID de la norma.
+        fecha_version: Versión vigente (la consultada o la descargada).
+        version_anterior: Versión registrada en el manifiesto, si había.
+        outputs: Archivos vigentes de la norma.
+        error: Mensaje de error si falló.
+    """
+
+    url: str
+    estado: str
+    id_norma: str = ""
+    fecha_version: str = ""
+    version_anterior: str = ""
+    outputs: list[str] = field(default_factory=list)
+    error: str = ""
+
+    @property
+    def regenerada(self) -> bool:
+        """Indica si se descargó y generó la norma en esta corrida."""
+        return self.estado in (ESTADO_NUEVA, ESTADO_ACTUALIZADA)
+
+
+class IncrementalRefresher:
+    """Regenera sólo las normas cuya versión en la BCN cambió.
+
+    Attributes:
+        scraper: Scraper usado para consultar versiones y descargar.
+        manifest: Manifiesto de versiones.
+        force: Si es True, regenera todo (pero igual actualiza el manifiesto).
+    """
+
+    def __init__(
+        self,
+        scraper: BCNLawScraperV2,
+        manifest: VersionManifest,
+        force: bool = False,
+    ) -> None:
+        self.scraper = scraper
+        self.manifest = manifest
+        self.force = force
+
+    def is_current(
+        self, url: str, outputs: Iterable[str | Path] | None = None
+    ) -> tuple[bool, ManifestEntry | None, str]:
+        """Decide si las salidas registradas de una norma siguen vigentes.
+
+        Si la URL fija ``idVersion`` y ya se generó esa versión, no hace falta
+        consultar a la BCN: una versión publicada no cambia.
+
+        Args:
+            url: URL de LeyChile.
+            outputs: Archivos que se esperan de la norma, si se conocen de
+                antemano. Si no son los registrados (por ejemplo, se pidió
+                un alias nuevo de una norma ya generada), la entrada no está
+                vigente.
+
+        Returns:
+            Tupla ``(vigente, entrada, fecha_version_consultada)``.
+
+        Raises:
+            ValidationError: Si la URL no contiene idNorma válido.
+            NetworkError: Si falla la consulta de versión.
+            ParsingError: Si la respuesta no es XML válido.
+        """
+        id_norma = self.scraper.extract_id_norma(url)
+        if not id_norma:
+            raise ValidationError(
+                "No se pudo extraer el ID de la norma de la URL", field="url", value=url
+            )
+        id_version = self.scraper.extract_id_version(url) or ""
+        entry = self.manifest.get(id_norma, id_version)
+
+        if self.force or entry is None or not entry.outputs_exist():
+            return False, entry, ""
+        if outputs is not None and [str(p) for p in outputs] != entry.outputs:
+            return False, entry, ""
+        if id_version:
+            return True, entry, entry.fecha_version
+
+        probe = self.scraper.probe_version(url)
+        vigente = bool(probe.fecha_version) and probe.fecha_version == entry.fecha_version
+        return vigente, entry, probe.fecha_version
+
+    def refresh(
+        self,
+        url: str,
+        generate: Callable[[Norma], Iterable[str | Path]],
+        outputs: Iterable[str | Path] | None = None,
+    ) -> RefreshResult:
+        """Actualiza una norma si su versión cambió.
+
+        El manifiesto se guarda después de cada norma regenerada, de modo que
+        una corrida interrumpida no repite el trabajo ya hecho.
+
+        Args:
+            url: URL de LeyChile.
+            generate: Función que genera las salidas de una Norma y retorna
+                sus rutas.
+            outputs: Archivos que ``generate`` va a producir, si se conocen
+                de antemano (ver :meth:`is_current`).
+
+        Returns:
+            Resultado de la actualización. Los errores del paquete, de red y
+            de escritura en disco se reportan en el resultado; cualquier otra
+            excepción (un error de programación en ``generate``) se propaga.
+        """
+        try:
+            vigente, entry, fecha_version = self.is_current(url, outputs)
+            anterior = entry.fecha_version if entry else ""
+            if vigente and entry is not None:
+                logger.info(f"Sin cambios: {url} (versión {anterior})")
+                return RefreshResult(
+                    url=url,
+                    estado=ESTADO_SIN_CAMBIOS,
+                    id_norma=entry.id_norma,
+                    fecha_version=anterior,
+                    version_anterior=anterior,
+                    outputs=list(entry.outputs),
+                )
+
+            norma = self.scraper.scrape(url)
+            outputs = list(generate(norma))
+            nueva = self.manifest.update(norma, outputs)
+            self.manifest.save()
+        except (LeyChileError, requests.RequestException, OSError) as e:
+            logger.error(f"Error actualizando {url}: {e}")
+            return RefreshResult(url=url, estado=ESTADO_FALLIDA, error=str(e))
+
+        logger.info(
+            f"Regenerada: {url} ({anterior or 'sin versión previa'} → {nueva.fecha_version})"
+        )
+        return RefreshResult(
+            url=url,
+            estado=ESTADO_ACTUALIZADA if entry is not None else ESTADO_NUEVA,
+            id_norma=nueva.id_norma,
+            fecha_version=nueva.fecha_version or fecha_version,
+            version_anterior=anterior,
+            outputs=nueva.outputs,
+        )
@@ -0,0 +1,130 @@
+"""
+Render en paralelo de los capítulos del ePub.
+
+:class:`~leychile_epub.generator_v2.EPubGeneratorV2` crea un capítulo por
+cada estructura de primer nivel, y renderizar su HTML es Python puro sin
+dependencias entre capítulos: los nombres de archivo y las entradas del TOC
+se asignan después, en orden. :func:`render_chapters` reparte las
+estructuras entre los procesos de un ``ProcessPoolExecutor`` (o los hilos de
+un ``ThreadPoolExecutor`` en un intérprete sin GIL):
+
+- Cada proceso crea una vez su propio generador (de la misma clase y con la
+  misma configuración que el del llamador).
+- Las estructuras viajan como pickle; las de un ``text_buffer`` llegan con
+  el texto ya materializado, sin el buffer completo de la norma.
+- El HTML vuelve en el orden de entrada, con a lo sumo
+  ``IN_FLIGHT_PER_WORKER`` capítulos por proceso pendientes o esperando su
+  turno, para que la memoria no crezca con el tamaño de la norma.
+
+Sólo conviene en normas con muchos capítulos grandes (códigos): en una ley
+corta, levantar el pool cuesta más que renderizarla.
+
+Example:
+    >>> generator = EPubGeneratorV2(EPubConfig(render_workers=4))
+    >>> generator.generate(codigo_civil, "codigo_civil.epub")
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING
+
+from .parse_pool import resolve_workers
+
+if TYPE_CHECKING:
+    from .generator_v2 import EPubConfig, EPubGeneratorV2, _RenderedChapter
+    from .scraper_v2 import EstructuraFuncional
+
+logger = logging.getLogger("leychile_epub.render_pool")
+
+# Capítulos encargados por proceso que aún no se entregan al escritor
+IN_FLIGHT_PER_WORKER = 2
+
+# Generador de cada proceso del pool (lo crea _init_worker)
+_worker_generator: EPubGeneratorV2 | None = None
+
+
+def free_threaded() -> bool:
+    """True si el intérprete corre sin GIL (build free-threaded de Python 3.13+)."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _init_worker(generator_cls: type[EPubGeneratorV2], config: EPubConfig) -> None:
+    global _worker_generator
+    _worker_generator = generator_cls(config)
+
+
+def _render_in_worker(estructura: EstructuraFuncional) -> _RenderedChapter:
+    """Renderiza un capítulo en el proceso de trabajo."""
+    generator = _worker_generator
+    assert generator is not None
+    return generator._render_chapter(estructura)
+
+
+def render_chapters(
+    generator: EPubGeneratorV2,
+    estructuras: Iterable[EstructuraFuncional],
+    max_workers: int | None = None,
+) -> Iterator[_RenderedChapter]:
+    """Entrega el capítulo de cada estructura, en orden, renderizado en paralelo.
+
+    Con un solo proceso (``max_workers=1`` o un solo capítulo) se renderiza
+    en el proceso actual a medida que se pide cada capítulo.
+
+    Args:
+        generator: Generador cuya clase y configuración se usan.
+        estructuras: Estructuras de primer nivel (una por capítulo).
+        max_workers: Procesos del pool (``None``/``0`` = uno por CPU).
+
+    Yields:
+        El capítulo de cada estructura (su HTML, partido según los límites
+        de tamaño), en el orden de ``estructuras``.
+
+    Raises:
+        BrokenProcessPool: Si un proceso de trabajo termina abruptamente.
+    """
+    estructuras = list(estructuras)
+    workers = resolve_workers(max_workers, len(estructuras))
+
+    if workers == 1:
+        for estructura in estructuras:
+            yield generator._render_chapter(estructura)
+        return
+
+    pool: Executor
+    if free_threaded():
+        logger.info(f"Renderizando {len(estructuras)} capítulos con {workers} hilos")
+        pool = ThreadPoolExecutor(max_workers=workers)
+        submit = partial(pool.submit, generator._render_chapter)
+    else:
+        logger.info(f"Renderizando {len(estructuras)} capítulos con {workers} procesos")
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(type(generator), generator.config),
+        )
+        submit = partial(pool.submit, _render_in_worker)
+
+    pendientes = iter(estructuras)
+    futures: deque[Future[_RenderedChapter]] = deque()
+    try:
+        for estructura in pendientes:
+            futures.append(submit(estructura))
+            if len(futures) >= workers * IN_FLIGHT_PER_WORKER:
+                break
+        while futures:
+            chapter = futures.popleft().result()
+            siguiente = next(pendientes, None)
+            if siguiente is not None:
+                futures.append(submit(siguiente))
+            yield chapter
+    finally:
+        pool.shutdown(cancel_futures=True)
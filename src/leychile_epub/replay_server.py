@@ -0,0 +1,392 @@
+"""
+Servidor local que reemplaza a la API ``obtxml`` de la BCN.
+
+Sirve respuestas grabadas desde un directorio para probar y medir el camino
+completo descarga → parseo → generación sin red y de forma determinista.
+Basta apuntar ``ScraperConfig.base_url`` a :attr:`ReplayServer.url`.
+
+Fuentes de fixtures (se detectan automáticamente, recursivamente):
+    - XML de la BCN (raíz ``<Norma>``): se sirven tal cual, por ``normaId``.
+    - XML ley_v1 de ``biblioteca_xml/``: se convierten al vuelo al formato
+      de la BCN (ver :mod:`leychile_epub.bcn_fixtures`), por ``id_norma``.
+    - Un directorio de caché de :class:`~leychile_epub.http_cache.XMLCache`
+      (``index.json``): las respuestas reales que grabó el scraper.
+
+Además permite simular latencia, inyectar errores (timeouts, 5xx, 429 con
+``Retry-After`` y XML truncado) y expone contadores en ``GET /_stats``.
+
+Example:
+    >>> with ReplayServer("biblioteca_xml", latency=0.05) as server:
+    ...     config = Config()
+    ...     config.scraper.base_url = server.url
+    ...     norma = BCNLawScraperV2(config).scrape(
+    ...         "https://www.leychile.cl/Navegar?idNorma=172986")
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+from xml.etree import ElementTree as ET
+
+from .bcn_fixtures import LEY_NS, ley_xml_to_bcn_xml
+from .scraper_v2 import NS
+
+logger = logging.getLogger("leychile_epub.replay_server")
+
+# Tipos de error que se pueden inyectar
+ERROR_KINDS = ("timeout", "500", "503", "429", "malformed")
+
+
+@dataclass
+class ReplayStats:
+    """Contadores de tráfico del servidor.
+
+    Attributes:
+        requests: Solicitudes recibidas (sin contar ``/_stats``).
+        connections: Conexiones TCP aceptadas (menos que ``requests`` si los
+            clientes reutilizan conexiones).
+        bytes_sent: Bytes de cuerpo enviados.
+        status: Respuestas por código HTTP.
+        injected: Errores inyectados por tipo.
+        started_at: Momento (epoch) de inicio del servidor.
+    """
+
+    requests: int = 0
+    connections: int = 0
+    bytes_sent: int = 0
+    status: dict[str, int] = field(default_factory=dict)
+    injected: dict[str, int] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict:
+        """Convierte los contadores a diccionario, con tasas calculadas."""
+        data = asdict(self)
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        data["elapsed"] = round(elapsed, 3)
+        data["requests_per_second"] = round(self.requests / elapsed, 2)
+        data["mb_per_second"] = round(self.bytes_sent / 2**20 / elapsed, 3)
+        return data
+
+
+@dataclass
+class _Fixture:
+    path: Path
+    kind: str  # "bcn" o "ley"
+    content: bytes | None = None
+    etag: str = ""
+
+
+class FixtureStore:
+    """Índice de respuestas grabadas por ``idNorma`` (y opcionalmente ``idVersion``)."""
+
+    def __init__(self, directory: str | Path) -> None:
+        """Indexa el directorio leyendo sólo la etiqueta raíz de cada XML.
+
+        Args:
+            directory: Directorio con fixtures (se recorre recursivamente).
+        """
+        self.directory = Path(directory)
+        self._fixtures: dict[str, _Fixture] = {}
+        self._lock = threading.Lock()
+        self._index()
+
+    def __len__(self) -> int:
+        return len(self._fixtures)
+
+    def ids(self) -> list[str]:
+        """Claves disponibles (``idNorma`` o ``idNorma@idVersion``)."""
+        return sorted(self._fixtures)
+
+    def get(self, id_norma: str, id_version: str | None = None) -> tuple[bytes, str] | None:
+        """Retorna ``(contenido, etag)`` de una norma o None si no existe."""
+        key = f"{id_norma}@{id_version}" if id_version else id_norma
+        fixture = self._fixtures.get(key) or self._fixtures.get(id_norma)
+        if fixture is None:
+            return None
+        with self._lock:
+            if fixture.content is None:
+                if fixture.kind == "ley":
+                    fixture.content = ley_xml_to_bcn_xml(fixture.path)
+                else:
+                    fixture.content = fixture.path.read_bytes()
+                fixture.etag = '"' + hashlib.sha256(fixture.content).hexdigest()[:32] + '"'
+            return fixture.content, fixture.etag
+
+    def _index(self) -> None:
+        cache_index = self.directory / "index.json"
+        if cache_index.exists():
+            self._index_cache(cache_index)
+
+        for path in sorted(self.directory.rglob("*.xml")):
+            root = _root_start(path)
+            if root is None:
+                continue
+            if root.tag == f"{{{NS['lc']}}}Norma" and root.get("normaId"):
+                self._fixtures.setdefault(root.get("normaId", ""), _Fixture(path, "bcn"))
+            elif root.tag == f"{{{LEY_NS}}}ley" and root.get("id_norma"):
+                self._fixtures.setdefault(root.get("id_norma", ""), _Fixture(path, "ley"))
+
+        logger.info(f"{len(self._fixtures)} normas disponibles en {self.directory}")
+
+    def _index_cache(self, index_path: Path) -> None:
+        with open(index_path, encoding="utf-8") as f:
+            entries = json.load(f).get("entries", {})
+        for key, entry in entries.items():
+            if not key.startswith("norma-"):
+                continue
+            digest = entry["digest"]
+            path = self.directory / "objects" / digest[:2] / f"{digest}.xml"
+            if path.exists():
+                self._fixtures[key.removeprefix("norma-")] = _Fixture(path, "bcn")
+
+
+def _root_start(path: Path) -> ET.Element | None:
+    """Lee sólo la etiqueta de apertura del elemento raíz."""
+    try:
+        with open(path, "rb") as f:
+            for _event, elem in ET.iterparse(f, events=("start",)):
+                return elem
+    except (OSError, ET.ParseError):
+        return None
+    return None
+
+
+class ReplayServer:
+    """Servidor HTTP local que imita ``/Consulta/obtxml`` de la BCN.
+
+    Attributes:
+        store: Fixtures disponibles.
+        stats: Contadores de tráfico.
+        latency: Latencia artificial por respuesta (segundos).
+        jitter: Variación aleatoria máxima que se suma a ``latency``.
+        error_rate: Probabilidad (0-1) de inyectar un error en cada solicitud.
+        error_kinds: Tipos de error entre los que se elige (ver ``ERROR_KINDS``).
+        forced_errors: Error fijo por ``idNorma`` (útil en tests).
+        timeout_delay: Segundos que se demora una respuesta con error "timeout".
+        retry_after: Valor de ``Retry-After`` en las respuestas 429/503.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_kinds: tuple[str, ...] = ERROR_KINDS,
+        forced_errors: dict[str, str] | None = None,
+        timeout_delay: float = 60.0,
+        retry_after: int = 1,
+        xml_endpoint: str = "/Consulta/obtxml",
+        seed: int | None = None,
+    ) -> None:
+        """Inicializa el servidor (no empieza a escuchar hasta :meth:`start`).
+
+        Args:
+            directory: Directorio de fixtures.
+            host: Interfaz de escucha.
+            port: Puerto (0 = elegir uno libre).
+            latency: Latencia artificial por respuesta.
+            jitter: Variación aleatoria máxima de la latencia.
+            error_rate: Probabilidad de inyectar un error.
+            error_kinds: Tipos de error posibles.
+            forced_errors: Error fijo por ``idNorma``.
+            timeout_delay: Demora de las respuestas "timeout".
+            retry_after: ``Retry-After`` de las respuestas 429/503.
+            xml_endpoint: Ruta que imita a ``obtxml``.
+            seed: Semilla para que la inyección de errores sea reproducible.
+
+        Raises:
+            ValueError: Si algún tipo de error no es válido.
+        """
+        unknown = set(error_kinds) - set(ERROR_KINDS)
+        if unknown:
+            raise ValueError(f"Tipos de error desconocidos: {', '.join(sorted(unknown))}")
+
+        self.store = FixtureStore(directory)
+        self.stats = ReplayStats()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_kinds = tuple(error_kinds)
+        self.forced_errors = dict(forced_errors or {})
+        self.timeout_delay = timeout_delay
+        self.retry_after = retry_after
+        self.xml_endpoint = xml_endpoint
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """URL base para ``ScraperConfig.base_url``."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> ReplayServer:
+        """Empieza a atender solicitudes en un hilo en segundo plano."""
+        self.stats.started_at = time.time()
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="leychile-replay", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Servidor de réplica escuchando en {self.url}")
+        return self
+
+    def serve_forever(self) -> None:
+        """Atiende solicitudes en el hilo actual hasta una interrupción."""
+        self.stats.started_at = time.time()
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        """Detiene el servidor y libera el puerto."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> ReplayServer:
+        return self.start()
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+    def _count(self, status: int, sent: int, injected: str | None = None) -> None:
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.bytes_sent += sent
+            self.stats.status[str(status)] = self.stats.status.get(str(status), 0) + 1
+            if injected:
+                self.stats.injected[injected] = self.stats.injected.get(injected, 0) + 1
+
+    def _choose_error(self, id_norma: str) -> str | None:
+        if id_norma in self.forced_errors:
+            return self.forced_errors[id_norma]
+        with self._lock:
+            if self.error_rate > 0 and self._random.random() < self.error_rate:
+                return self._random.choice(self.error_kinds)
+        return None
+
+    def _delay(self) -> float:
+        with self._lock:
+            extra = self._random.uniform(0, self.jitter) if self.jitter else 0.0
+        return self.latency + extra
+
+
+def _make_handler(server: ReplayServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        server_version = "LeyChileReplay/1.0"
+
+        def setup(self) -> None:
+            super().setup()
+            with server._lock:
+                server.stats.connections += 1
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            logger.debug("%s - " + format, self.address_string(), *args)
+
+        def do_GET(self) -> None:  # noqa: N802
+            parsed = urlparse(self.path)
+            if parsed.path == "/_stats":
+                self._send(200, json.dumps(server.stats.to_dict()).encode(), "application/json")
+                return
+            if parsed.path != server.xml_endpoint:
+                self._reply(404, b"Not Found")
+                return
+
+            params = parse_qs(parsed.query)
+            id_norma = params.get("idNorma", [""])[0]
+            id_version = params.get("idVersion", [None])[0]
+
+            delay = server._delay()
+            if delay > 0:
+                time.sleep(delay)
+
+            error = self._inject(id_norma)
+            if error is not None:
+                return
+
+            found = server.store.get(id_norma, id_version) if id_norma else None
+            if found is None:
+                self._reply(404, b"Norma no encontrada")
+                return
+
+            content, etag = found
+            if self.headers.get("If-None-Match") == etag:
+                self._reply(304, b"", headers={"ETag": etag})
+                return
+            self._reply(200, content, "application/xml; charset=utf-8", {"ETag": etag})
+
+        def _inject(self, id_norma: str) -> str | None:
+            error = server._choose_error(id_norma)
+            if error is None:
+                return None
+            if error == "timeout":
+                time.sleep(server.timeout_delay)
+                self._reply(504, b"Gateway Timeout", injected=error)
+            elif error in ("429", "503"):
+                self._reply(
+                    int(error),
+                    b"Demasiadas solicitudes",
+                    headers={"Retry-After": str(server.retry_after)},
+                    injected=error,
+                )
+            elif error == "malformed":
+                self._reply(
+                    200,
+                    b'<?xml version="1.0"?><Norma><Texto>trunc',
+                    "application/xml",
+                    injected=error,
+                )
+            else:
+                self._reply(int(error), b"Error interno", injected=error)
+            return error
+
+        def _reply(
+            self,
+            status: int,
+            body: bytes,
+            content_type: str = "text/plain; charset=utf-8",
+            headers: dict[str, str] | None = None,
+            injected: str | None = None,
+        ) -> None:
+            server._count(status, len(body), injected)
+            self._send(status, body, content_type, headers)
+
+        def _send(
+            self,
+            status: int,
+            body: bytes,
+            content_type: str,
+            headers: dict[str, str] | None = None,
+        ) -> None:
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if body and status != 304:
+                    self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # El cliente abandonó la solicitud (p. ej. por su propio timeout)
+                pass
+
+    return Handler
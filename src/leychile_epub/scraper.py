@@ -10,7 +10,6 @@ Author: Luis Aguilera Arteaga <luis@aguilera.cl>
 import html
 import logging
 import re
-import time
 import warnings
 from collections.abc import Callable
 from typing import Any
@@ -18,11 +17,12 @@ from urllib.parse import parse_qs, urlparse
 from xml.etree import ElementTree as ET
 
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from .config import Config, get_config
-from .exceptions import NetworkError, ParsingError, ValidationError
+from .exceptions import NetworkError, ParsingError, RateLimitError, ValidationError
+from .http_cache import XMLCache, fetch_with_cache
+from .http_session import SessionSettings, get_session
+from .rate_limiter import RETRY_AFTER_STATUSES, TokenBucket, parse_retry_after
 
 # Logger del módulo
 logger = logging.getLogger("leychile_epub.scraper")
@@ -40,6 +40,8 @@ class BCNLawScraper:
     Attributes:
         config: Configuración del scraper.
         session: Sesión HTTP con reintentos configurados.
+        cache: Caché en disco de XML (None si no está configurado).
+        limiter: Limitador de tasa compartido (None si no hay límite).
 
     Example:
         >>> scraper = BCNLawScraper()
@@ -82,6 +84,8 @@ class BCNLawScraper:
         )
         self.config = config or get_config()
         self.session = self._create_session()
+        self.cache = XMLCache.from_config(self.config.scraper)
+        self.limiter = TokenBucket.from_config(self.config.scraper)
         logger.debug("BCNLawScraper inicializado")
 
     def __enter__(self) -> "BCNLawScraper":
@@ -91,40 +95,23 @@ class BCNLawScraper:
         self.close()
 
     def close(self) -> None:
-        """Cierra la sesión HTTP y libera recursos."""
-        if self.session:
-            self.session.close()
+        """Libera los recursos del scraper.
+
+        La sesión HTTP es compartida por todos los scrapers del proceso (ver
+        :mod:`leychile_epub.http_session`) y no se cierra aquí, para que las
+        conexiones se sigan reutilizando. El caché (también compartido) sólo
+        guarda su índice.
+        """
+        if self.cache is not None:
+            self.cache.flush()
 
     def _create_session(self) -> requests.Session:
-        """Crea una sesión HTTP con reintentos configurados.
+        """Obtiene la sesión HTTP compartida para esta configuración.
 
         Returns:
-            Sesión HTTP configurada.
+            Sesión con pool de conexiones, keep-alive y reintentos configurados.
         """
-        session = requests.Session()
-
-        # Configurar reintentos
-        retry_strategy = Retry(
-            total=self.config.scraper.max_retries,
-            backoff_factor=self.config.scraper.retry_delay,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"],
-        )
-
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-
-        # Headers
-        session.headers.update(
-            {
-                "User-Agent": self.config.scraper.user_agent,
-                "Accept": "application/xml, text/xml, */*",
-                "Accept-Language": "es-CL,es;q=0.9",
-            }
-        )
-
-        return session
+        return get_session(SessionSettings.from_config(self.config.scraper))
 
     def _validate_url(self, url: str) -> None:
         """Valida que la URL pertenezca a un dominio permitido.
@@ -188,18 +175,20 @@ class BCNLawScraper:
         except Exception:
             return None
 
-    def get_api_url(self, id_norma: str) -> str:
+    def get_api_url(self, id_norma: str, id_version: str | None = None) -> str:
         """Construye la URL de la API XML para una norma.
 
         Args:
             id_norma: ID de la norma.
+            id_version: ``idVersion`` a pedir (None = última versión).
 
         Returns:
             URL completa de la API.
         """
         base = self.config.scraper.base_url.rstrip("/")
         endpoint = self.config.scraper.xml_endpoint
-        return f"{base}{endpoint}?opt=7&idNorma={id_norma}"
+        url = f"{base}{endpoint}?opt=7&idNorma={id_norma}"
+        return f"{url}&idVersion={id_version}" if id_version else url
 
     def fetch_xml(self, url: str) -> ET.Element:
         """Obtiene y parsea el XML desde una URL.
@@ -211,19 +200,24 @@ class BCNLawScraper:
             Elemento raíz del XML parseado.
 
         Raises:
+            RateLimitError: Si la BCN sigue respondiendo 429/503 tras los reintentos.
             NetworkError: Si hay problemas de conexión.
             ParsingError: Si el XML no es válido.
         """
         logger.debug(f"Fetching XML from: {url}")
 
         try:
-            response = self.session.get(url, timeout=self.config.scraper.timeout)
-            response.raise_for_status()
-
-            # Rate limiting
-            time.sleep(self.config.scraper.rate_limit_delay)
-
-            return ET.fromstring(response.content)
+            # El limitador de tasa sólo actúa cuando la solicitud sale a la red
+            content = fetch_with_cache(
+                self.session,
+                url,
+                self.cache,
+                self.config.scraper.timeout,
+                limiter=self.limiter,
+                max_retries=self.config.scraper.max_retries,
+                backoff=self.config.scraper.retry_delay,
+            )
+            return ET.fromstring(content)
 
         except requests.exceptions.Timeout as e:
             logger.error(f"Timeout al conectar con {url}")
@@ -237,6 +231,14 @@ class BCNLawScraper:
             ) from e
         except requests.exceptions.HTTPError as e:
             logger.error(f"Error HTTP {e.response.status_code}: {url}")
+            if e.response.status_code in RETRY_AFTER_STATUSES:
+                raise RateLimitError(
+                    "La BCN rechazó la solicitud por exceso de tráfico",
+                    retry_after=parse_retry_after(e.response.headers.get("Retry-After")),
+                    details={"original_error": str(e)},
+                    url=url,
+                    status_code=e.response.status_code,
+                ) from e
             raise NetworkError(
                 "Error HTTP al acceder a la BCN",
                 url=url,
@@ -546,7 +548,7 @@ class BCNLawScraper:
             progress_callback(0.1, "Conectando con la API de LeyChile...")
 
         # Obtener XML
-        api_url = self.get_api_url(id_norma)
+        api_url = self.get_api_url(id_norma, id_version)
         root = self.fetch_xml(api_url)
 
         if progress_callback:
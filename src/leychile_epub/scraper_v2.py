@@ -20,33 +20,89 @@ Estructura del XML según el esquema:
 Author: Luis Aguilera Arteaga <luis@aguilera.cl>
 """
 
+import copy
 import html
 import logging
-import re
-import time
-from collections.abc import Callable
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import closing, contextmanager
 from dataclasses import dataclass, field
-from typing import Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Final, SupportsIndex
 from urllib.parse import parse_qs, urlparse
 from xml.etree import ElementTree as ET
 
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from lxml import etree
 
 from .config import Config, get_config
-from .exceptions import NetworkError, ParsingError, ValidationError
+from .exceptions import (
+    LeyChileError,
+    NetworkError,
+    ParsingError,
+    RateLimitError,
+    ValidationError,
+)
+from .http_cache import XMLCache, fetch_with_cache
+from .http_session import SessionSettings, get_session
+from .profiling import DESCARGA, PARSEO, add_bytes, add_nodes, span
+from .rate_limiter import RETRY_AFTER_STATUSES, TokenBucket, parse_retry_after, throttled_get
+from .text_buffer import TextBuffer
+from .text_normalize import normalize_short, normalize_text
+
+if TYPE_CHECKING:
+    from .lazy_norma import LazyNorma
 
 logger = logging.getLogger("leychile_epub.scraper")
 
 # Namespace XML oficial de LeyChile
 NS = {"lc": "http://www.leychile.cl/esquemas"}
 
+# Tamaño de los trozos leídos en modo streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+
 # Dominios permitidos para scraping
 _ALLOWED_DOMAINS = {"www.leychile.cl", "leychile.cl", "www.bcn.cl", "bcn.cl"}
 
 
-@dataclass
+def _qname(local: str) -> str:
+    """Nombre calificado ``{namespace}local`` de un elemento de LeyChile."""
+    return f"{{{NS['lc']}}}{local}"
+
+
+class _EmptyList(list):
+    """Lista vacía de sólo lectura.
+
+    Es una ``list`` para que un nodo parseado y uno creado a mano tengan el
+    mismo tipo de contenedor: se comparan, se imprimen y se serializan igual.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args: object) -> None:
+        raise TypeError("EMPTY es de sólo lectura")
+
+    append = extend = insert = remove = pop = clear = _readonly  # type: ignore[assignment]
+    sort = reverse = _readonly  # type: ignore[assignment]
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly  # type: ignore[assignment]
+
+    def __reduce__(self) -> str:
+        # Al copiarse a otro proceso sigue siendo el mismo EMPTY
+        return "EMPTY"
+
+
+# Lista vacía compartida que los parsers dejan en lugar de una lista propia en
+# los nodos sin materias o sin hijos
+EMPTY: Final = _EmptyList()
+
+
+@lru_cache(maxsize=256)
+def _tipo_parte(raw: str) -> str:
+    """``tipoParte`` decodificado e internado (hay pocos valores distintos)."""
+    return sys.intern(html.unescape(raw))
+
+
+@dataclass(slots=True)
 class NormaIdentificador:
     """Identificación de la norma según el esquema XSD."""
 
@@ -57,7 +113,7 @@ class NormaIdentificador:
     fecha_publicacion: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class NormaMetadatos:
     """Metadatos de la norma según el esquema XSD."""
 
@@ -74,10 +130,17 @@ class NormaMetadatos:
     leyes_referenciadas: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class EstructuraFuncional:
     """Representa una estructura funcional (artículo o agrupador) según el esquema XSD.
 
+    Una norma extensa tiene miles de estas estructuras, por lo que la clase
+    usa ``__slots__`` y los parsers guardan en los nodos sin materias o sin
+    hijos la lista vacía compartida :data:`EMPTY` en lugar de una lista
+    propia. Al leer ``materias`` o ``hijos`` de un nodo así se obtiene una
+    lista vacía que se incorpora al nodo al agregarle el primer elemento, de
+    modo que ``ef.hijos.append(hijo)`` funciona igual en todos los nodos.
+
     Attributes:
         id_parte: Identificador único de la BCN
         tipo_parte: Tipo de estructura (Artículo, Capítulo, Título, Párrafo, etc.)
@@ -104,8 +167,177 @@ class EstructuraFuncional:
     hijos: list["EstructuraFuncional"] = field(default_factory=list)
     nivel: int = 0
 
+    def __eq__(self, other: object) -> bool:
+        # Igualdad por campos, sin distinguir texto en buffer de texto propio
+        if not isinstance(other, EstructuraFuncional):
+            return NotImplemented
+        return (
+            self.id_parte == other.id_parte
+            and self.tipo_parte == other.tipo_parte
+            and self.texto == other.texto
+            and self.nombre_parte == other.nombre_parte
+            and self.titulo_parte == other.titulo_parte
+            and self.fecha_version == other.fecha_version
+            and self.derogado == other.derogado
+            and self.transitorio == other.transitorio
+            and self.nivel == other.nivel
+            and self.materias == other.materias
+            and self.hijos == other.hijos
+        )
 
-@dataclass
+
+# Descriptor del slot ``texto`` (BufferedEstructura lo reemplaza por una propiedad)
+_TEXTO_SLOT = EstructuraFuncional.texto
+
+
+class _EmptyView(list):
+    """Lista vacía de un nodo que guarda :data:`EMPTY`.
+
+    Al recibir su primer elemento se guarda en el nodo en lugar de
+    :data:`EMPTY`, así que se usa como la lista propia del nodo.
+    """
+
+    __slots__ = ("_owner", "_slot")
+
+    def __init__(self, owner: EstructuraFuncional | None, slot: Any):
+        self._owner = owner
+        self._slot = slot
+
+    def _attach(self) -> None:
+        owner = self._owner
+        if owner is not None:
+            if self._slot.__get__(owner) is EMPTY:
+                self._slot.__set__(owner, self)
+            self._owner = None
+
+    def append(self, item: Any) -> None:
+        self._attach()
+        super().append(item)
+
+    def extend(self, items: Iterable[Any]) -> None:
+        self._attach()
+        super().extend(items)
+
+    def insert(self, index: SupportsIndex, item: Any) -> None:
+        self._attach()
+        super().insert(index, item)
+
+    def __iadd__(self, items: Iterable[Any]) -> "_EmptyView":  # type: ignore[override]
+        self._attach()
+        return super().__iadd__(items)
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        self._attach()
+        super().__setitem__(index, value)
+
+    def __reduce__(self) -> Any:
+        # Sin incorporar sigue siendo el EMPTY del nodo (el pickle no lo copia)
+        if self._owner is not None and not self:
+            return _shared_empty, ()
+        return list, (list(self),)
+
+    def __copy__(self) -> list[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        return copy.deepcopy(list(self), memo)
+
+
+def _shared_empty() -> list[Any]:
+    return EMPTY
+
+
+def _empty_aware(slot: Any) -> property:
+    """Propiedad sobre ``slot`` que entrega un :class:`_EmptyView` en vez de EMPTY."""
+
+    def get(self: EstructuraFuncional) -> list[Any]:
+        value = slot.__get__(self)
+        return _EmptyView(self, slot) if value is EMPTY else value
+
+    def set(self: EstructuraFuncional, value: list[Any]) -> None:
+        slot.__set__(self, value)
+
+    return property(get, set)
+
+
+# Descriptores de los slots ``materias`` e ``hijos`` (guardan EMPTY o la lista del nodo)
+_MATERIAS_SLOT = EstructuraFuncional.materias
+_HIJOS_SLOT = EstructuraFuncional.hijos
+EstructuraFuncional.materias = _empty_aware(_MATERIAS_SLOT)  # type: ignore[assignment]
+EstructuraFuncional.hijos = _empty_aware(_HIJOS_SLOT)  # type: ignore[assignment]
+
+
+class BufferedEstructura(EstructuraFuncional):
+    """EstructuraFuncional cuyo texto vive en el :class:`TextBuffer` de la norma.
+
+    Sólo guarda el número de su texto en el buffer; ``texto`` lo materializa
+    en cada acceso. Asignar ``texto`` lo deja como una cadena propia.
+    """
+
+    __slots__ = ("_buffer", "_index")
+
+    @classmethod
+    def from_buffer(cls, buffer: TextBuffer, texto: str, **campos: Any) -> "BufferedEstructura":
+        """Crea la estructura guardando ``texto`` en ``buffer``."""
+        ef = cls(**campos)
+        ef._buffer = buffer
+        ef._index = buffer.append(texto)
+        return ef
+
+    @property  # type: ignore[override]
+    def texto(self) -> str:
+        if self._buffer is None:
+            return _TEXTO_SLOT.__get__(self)
+        return self._buffer.text(self._index)
+
+    @texto.setter
+    def texto(self, value: str) -> None:
+        _TEXTO_SLOT.__set__(self, value)
+        self._buffer = None
+
+    @property
+    def text_ref(self) -> tuple[TextBuffer, int] | None:
+        """``(buffer, número)`` del texto o None si es una cadena propia."""
+        if self._buffer is None:
+            return None
+        return self._buffer, self._index
+
+
+def texto_utf8(ef: EstructuraFuncional) -> bytes | memoryview:
+    """Texto de una estructura en UTF-8, sin materializar el ``str`` si está en buffer.
+
+    Sirve para hashes y largos: ``hashlib.blake2b(texto_utf8(ef))``.
+    """
+    ref = ef.text_ref if isinstance(ef, BufferedEstructura) else None
+    if ref is None:
+        return ef.texto.encode("utf-8")
+    buffer, i = ref
+    return buffer.view(i)
+
+
+def buscar_texto(norma: "Norma", needle: str) -> list[EstructuraFuncional]:
+    """Estructuras de la norma cuyo texto contiene ``needle``, en preorden.
+
+    Si la norma usa ``text_buffer`` la búsqueda se hace sobre el buffer y no
+    se materializa el texto de ninguna estructura.
+    """
+    buffer = norma.text_buffer
+    hits = set(buffer.search(needle)) if buffer is not None else None
+    encontradas: list[EstructuraFuncional] = []
+    pendientes = list(reversed(norma.estructuras))
+    while pendientes:
+        ef = pendientes.pop()
+        ref = ef.text_ref if hits is not None and isinstance(ef, BufferedEstructura) else None
+        if ref is not None and ref[0] is buffer:
+            if ref[1] in hits:
+                encontradas.append(ef)
+        elif needle in ef.texto:
+            encontradas.append(ef)
+        pendientes.extend(reversed(ef.hijos))
+    return encontradas
+
+
+@dataclass(slots=True)
 class Norma:
     """Representa una norma completa según el esquema XSD de LeyChile.
 
@@ -137,6 +369,9 @@ class Norma:
     url_original: str = ""
     id_version: str = ""
 
+    # Buffer con los textos de las estructuras (modo ``text_buffer``)
+    text_buffer: TextBuffer | None = field(default=None, compare=False, repr=False)
+
     @property
     def titulo_completo(self) -> str:
         """Genera el título completo de la norma."""
@@ -152,15 +387,52 @@ class Norma:
         return f"{tipo}_{numero}"
 
 
+@dataclass
+class ParseResult:
+    """Resultado de parsear (o descargar y parsear) una norma de un lote.
+
+    Attributes:
+        index: Posición de la norma en la entrada.
+        norma: Norma parseada (None si hubo error).
+        error: Excepción del paquete que impidió obtener la norma.
+    """
+
+    index: int
+    norma: Norma | None = None
+    error: LeyChileError | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Indica si la norma se obtuvo correctamente."""
+        return self.error is None
+
+
 class BCNXMLParser:
     """Parser XML que sigue el esquema XSD oficial de LeyChile.
 
     Este parser implementa la especificación completa del esquema
     EsquemaIntercambioNorma-v1-0.xsd para extraer datos estructurados.
+
+    Attributes:
+        parse_errors: Excepciones que lanza el backend ante XML inválido.
+        text_buffer: Si es True, los textos de las estructuras se guardan en
+            un único :class:`TextBuffer` por norma (ver
+            :class:`BufferedEstructura`).
     """
 
-    def __init__(self) -> None:
+    parse_errors: tuple[type[Exception], ...] = (ET.ParseError,)
+
+    def __init__(self, text_buffer: bool = False) -> None:
         self.ns = NS
+        self.text_buffer = text_buffer
+
+    def fromstring(self, content: bytes) -> ET.Element:
+        """Construye el árbol del documento con el backend del parser."""
+        return ET.fromstring(content)
+
+    def _pull_parser(self) -> ET.XMLPullParser:
+        """Crea el parser incremental usado por :meth:`parse_stream`."""
+        return ET.XMLPullParser(events=("start", "end"))
 
     def parse(self, root: ET.Element) -> Norma:
         """Parsea el elemento raíz XML y retorna una Norma completa.
@@ -171,26 +443,186 @@ class BCNXMLParser:
         Returns:
             Objeto Norma con todos los datos estructurados.
         """
+        with span(PARSEO):
+            norma = Norma()
+            buffer = TextBuffer() if self.text_buffer else None
+
+            self._parse_root_attributes(norma, root)
+
+            # Parsear componentes
+            norma.identificador = self._parse_identificador(root.find("lc:Identificador", self.ns))
+            norma.metadatos = self._parse_metadatos(root.find("lc:Metadatos", self.ns))
+            norma.encabezado_texto, norma.encabezado_derogado = self._parse_encabezado(
+                root.find("lc:Encabezado", self.ns)
+            )
+            norma.estructuras = self._parse_estructuras_funcionales(root, 0, buffer)
+            norma.promulgacion_texto, norma.promulgacion_derogado = self._parse_promulgacion(
+                root.find("lc:Promulgacion", self.ns)
+            )
+            norma.anexos = self._parse_anexos(root.find("lc:Anexos", self.ns))
+
+            self._attach_buffer(norma, buffer)
+        add_nodes(norma.estructuras)
+        return norma
+
+    def parse_stream(self, chunks: Iterable[bytes]) -> Norma:
+        """Parsea una norma de forma incremental a partir de trozos de bytes.
+
+        A diferencia de :meth:`parse`, nunca se construye el árbol completo:
+        cada ``EstructuraFuncional`` se convierte en su dataclass al llegar su
+        etiqueta de cierre y el elemento se elimina del árbol parcial. La
+        memoria usada por el XML crece con la profundidad de anidamiento y no
+        con el tamaño del documento. El resultado es idéntico al de
+        :meth:`parse`.
+
+        Args:
+            chunks: Trozos consecutivos del documento (p. ej.
+                ``response.iter_content()`` o un archivo leído por bloques).
+
+        Returns:
+            Objeto Norma con todos los datos estructurados.
+
+        Raises:
+            xml.etree.ElementTree.ParseError: Si el XML no es válido (ver
+                ``parse_errors`` para otros backends).
+        """
+        norma = Norma()
+        buffer = TextBuffer() if self.text_buffer else None
+        pull = self._pull_parser()
+        # Pila de elementos abiertos y, en paralelo, de listas de hijos de
+        # cada EstructuraFuncional abierta (la base recibe las de primer nivel).
+        open_elems: list[ET.Element] = []
+        hijos_stack: list[list[EstructuraFuncional]] = [norma.estructuras]
+        ef_tag = _qname("EstructuraFuncional")
+
+        def handle(event: str, elem: ET.Element) -> None:
+            if event == "start":
+                if not open_elems:
+                    self._parse_root_attributes(norma, elem)
+                elif elem.tag == ef_tag:
+                    hijos_stack.append([])
+                open_elems.append(elem)
+                return
+
+            open_elems.pop()
+            if not open_elems:
+                return
+            parent = open_elems[-1]
+
+            if elem.tag == ef_tag:
+                hijos = hijos_stack.pop()
+                nivel = len(hijos_stack) - 1
+                hijos_stack[-1].append(self._build_estructura(elem, nivel, hijos, buffer))
+                parent.remove(elem)
+            elif len(open_elems) == 1:
+                self._parse_root_section(norma, elem)
+                parent.remove(elem)
+
+        # La etapa incluye la espera de cada trozo (descarga y parseo se intercalan)
+        with span(PARSEO):
+            for chunk in chunks:
+                pull.feed(chunk)
+                for event, elem in pull.read_events():
+                    handle(event, elem)
+            pull.close()
+            for event, elem in pull.read_events():
+                handle(event, elem)
+
+        self._attach_buffer(norma, buffer)
+        add_nodes(norma.estructuras)
+        return norma
+
+    def parse_root(self, chunks: Iterable[bytes]) -> Norma:
+        """Lee sólo los atributos del elemento raíz ``<Norma>``.
+
+        Deja de consumir ``chunks`` apenas llega la etiqueta de apertura de la
+        raíz, por lo que basta con el primer trozo del documento. Sirve para
+        conocer ``fecha_version`` sin descargar la norma completa.
+
+        Args:
+            chunks: Trozos consecutivos del documento.
+
+        Returns:
+            Norma con sólo los atributos de la raíz (``norma_id``,
+            ``fecha_version``, ``derogado``...).
+
+        Raises:
+            xml.etree.ElementTree.ParseError: Si el XML no es válido o termina
+                antes de la raíz.
+        """
         norma = Norma()
+        pull = self._pull_parser()
+        for chunk in chunks:
+            pull.feed(chunk)
+            for event, elem in pull.read_events():
+                if event == "start":
+                    self._parse_root_attributes(norma, elem)
+                    return norma
+        # Documento sin raíz: close() levanta el error del backend
+        pull.close()
+        raise ET.ParseError("El documento no tiene elemento raíz")
+
+    def parse_many(
+        self, blobs: Iterable[bytes], max_workers: int | None = None
+    ) -> list[ParseResult]:
+        """Parsea varios XML repartiéndolos en un pool de procesos.
+
+        Ver :func:`leychile_epub.parse_pool.parse_many`.
+
+        Args:
+            blobs: Contenido XML (``obtxml``) de cada norma.
+            max_workers: Procesos del pool (1 = en este proceso, ``None``/``0``
+                = uno por CPU).
 
-        # Atributos de la raíz
+        Returns:
+            Un ParseResult por XML, en el orden de entrada. Los XML inválidos
+            traen un ``ParsingError`` en ``error``.
+        """
+        from .parse_pool import parse_many
+
+        return parse_many(blobs, self, max_workers)
+
+    @staticmethod
+    def _attach_buffer(norma: Norma, buffer: TextBuffer | None) -> None:
+        """Congela el buffer de textos y lo deja en la norma."""
+        if buffer is not None:
+            buffer.freeze()
+            norma.text_buffer = buffer
+
+    @staticmethod
+    def _new_estructura(
+        buffer: TextBuffer | None, texto: str, **campos: Any
+    ) -> EstructuraFuncional:
+        """Crea una estructura con el texto propio o en el buffer de la norma."""
+        if buffer is None:
+            return EstructuraFuncional(texto=texto, **campos)
+        return BufferedEstructura.from_buffer(buffer, texto, **campos)
+
+    def _parse_root_attributes(self, norma: Norma, root: ET.Element) -> None:
+        """Copia los atributos del elemento raíz <Norma>."""
         norma.norma_id = root.get("normaId", "")
         norma.es_tratado = root.get("esTratado", "") == "tratado"
         norma.fecha_version = root.get("fechaVersion", "")
         norma.schema_version = root.get("SchemaVersion", "")
         norma.derogado = root.get("derogado", "") == "derogado"
 
-        # Parsear componentes
-        norma.identificador = self._parse_identificador(root)
-        norma.metadatos = self._parse_metadatos(root)
-        norma.encabezado_texto, norma.encabezado_derogado = self._parse_encabezado(root)
-        norma.estructuras = self._parse_estructuras_funcionales(root)
-        norma.promulgacion_texto, norma.promulgacion_derogado = self._parse_promulgacion(root)
-        norma.anexos = self._parse_anexos(root)
-
-        return norma
-
-    def _get_text(self, element: ET.Element | None) -> str:
+    def _parse_root_section(self, norma: Norma, elem: ET.Element) -> None:
+        """Procesa un hijo directo de <Norma> ya completo (modo streaming)."""
+        tag = elem.tag
+        if tag == _qname("Identificador"):
+            norma.identificador = self._parse_identificador(elem)
+        elif tag == _qname("Metadatos"):
+            norma.metadatos = self._parse_metadatos(elem)
+        elif tag == _qname("Encabezado"):
+            norma.encabezado_texto, norma.encabezado_derogado = self._parse_encabezado(elem)
+        elif tag == _qname("Promulgacion"):
+            norma.promulgacion_texto, norma.promulgacion_derogado = self._parse_promulgacion(elem)
+        elif tag == _qname("Anexos"):
+            norma.anexos = self._parse_anexos(elem)
+
+    def _get_text(
+        self, element: ET.Element | None, normalize: Callable[[str], str] = normalize_text
+    ) -> str:
         """Extrae y limpia el texto de un elemento."""
         if element is None:
             return ""
@@ -204,24 +636,27 @@ class BCNXMLParser:
             # Saltar elementos binarios (imágenes)
             if "ArchivoBinario" in child.tag:
                 continue
-            child_text = self._get_text(child)
+            child_text = self._get_text(child, normalize)
             if child_text:
                 parts.append(child_text)
             if child.tail:
                 parts.append(child.tail)
 
-        text = "".join(parts)
-        text = html.unescape(text)
         # Normalizar espacios pero preservar saltos de línea significativos
-        text = re.sub(r"[ \t]+", " ", text)
-        text = re.sub(r"\n\s*\n", "\n\n", text)
-        return text.strip()
+        return normalize("".join(parts))
+
+    def _get_short_text(self, element: ET.Element | None) -> str:
+        """Como :meth:`_get_text`, con caché para valores cortos y repetidos.
 
-    def _parse_identificador(self, root: ET.Element) -> NormaIdentificador:
+        Se usa en metadatos, materias y nombres de parte, que se repiten
+        dentro de una norma y entre normas de un mismo lote.
+        """
+        return self._get_text(element, normalize_short)
+
+    def _parse_identificador(self, id_elem: ET.Element | None) -> NormaIdentificador:
         """Parsea el elemento Identificador."""
         ident = NormaIdentificador()
 
-        id_elem = root.find("lc:Identificador", self.ns)
         if id_elem is None:
             return ident
 
@@ -234,22 +669,21 @@ class BCNXMLParser:
         if tipo_numero is not None:
             tipo_elem = tipo_numero.find("lc:Tipo", self.ns)
             numero_elem = tipo_numero.find("lc:Numero", self.ns)
-            ident.tipo = self._get_text(tipo_elem)
-            ident.numero = self._get_text(numero_elem)
+            ident.tipo = self._get_short_text(tipo_elem)
+            ident.numero = self._get_short_text(numero_elem)
 
         # Organismos
         for org in id_elem.findall(".//lc:Organismo", self.ns):
-            org_text = self._get_text(org)
+            org_text = self._get_short_text(org)
             if org_text:
                 ident.organismos.append(org_text)
 
         return ident
 
-    def _parse_metadatos(self, root: ET.Element) -> NormaMetadatos:
+    def _parse_metadatos(self, meta_elem: ET.Element | None) -> NormaMetadatos:
         """Parsea el elemento Metadatos de la norma."""
         meta = NormaMetadatos()
 
-        meta_elem = root.find("lc:Metadatos", self.ns)
         if meta_elem is None:
             return meta
 
@@ -259,44 +693,43 @@ class BCNXMLParser:
 
         # Materias
         for materia in meta_elem.findall(".//lc:Materia", self.ns):
-            mat_text = self._get_text(materia)
+            mat_text = self._get_short_text(materia)
             if mat_text:
                 meta.materias.append(mat_text)
 
         # Nombres de uso común
         for nombre in meta_elem.findall(".//lc:NombreUsoComun", self.ns):
-            nom_text = self._get_text(nombre)
+            nom_text = self._get_short_text(nombre)
             if nom_text:
                 meta.nombres_uso_comun.append(nom_text)
 
         # Tratados
         for pais in meta_elem.findall(".//lc:PaisTratado", self.ns):
-            pais_text = self._get_text(pais)
+            pais_text = self._get_short_text(pais)
             if pais_text:
                 meta.paises_tratado.append(pais_text)
 
         tipo_tratado = meta_elem.find("lc:TipoTratado", self.ns)
-        meta.tipo_tratado = self._get_text(tipo_tratado)
+        meta.tipo_tratado = self._get_short_text(tipo_tratado)
 
         fecha_tratado = meta_elem.find("lc:FechaTratado", self.ns)
-        meta.fecha_tratado = self._get_text(fecha_tratado)
+        meta.fecha_tratado = self._get_short_text(fecha_tratado)
 
         # Derogación
         fecha_derog = meta_elem.find("lc:FechaDerogacion", self.ns)
-        meta.fecha_derogacion = self._get_text(fecha_derog)
+        meta.fecha_derogacion = self._get_short_text(fecha_derog)
 
         # Fuente
         fuente = meta_elem.find("lc:IdentificacionFuente", self.ns)
-        meta.identificacion_fuente = self._get_text(fuente)
+        meta.identificacion_fuente = self._get_short_text(fuente)
 
         num_fuente = meta_elem.find("lc:NumeroFuente", self.ns)
-        meta.numero_fuente = self._get_text(num_fuente)
+        meta.numero_fuente = self._get_short_text(num_fuente)
 
         return meta
 
-    def _parse_encabezado(self, root: ET.Element) -> tuple[str, bool]:
+    def _parse_encabezado(self, enc_elem: ET.Element | None) -> tuple[str, bool]:
         """Parsea el elemento Encabezado."""
-        enc_elem = root.find("lc:Encabezado", self.ns)
         if enc_elem is None:
             return "", False
 
@@ -307,7 +740,7 @@ class BCNXMLParser:
         return texto, derogado
 
     def _parse_estructuras_funcionales(
-        self, root: ET.Element, nivel: int = 0
+        self, root: ET.Element, nivel: int = 0, buffer: TextBuffer | None = None
     ) -> list[EstructuraFuncional]:
         """Parsea recursivamente las EstructurasFuncionales.
 
@@ -324,27 +757,40 @@ class BCNXMLParser:
 
         # Iterar sobre cada EstructuraFuncional
         for ef_elem in container.findall("lc:EstructuraFuncional", self.ns):
-            ef = self._parse_estructura_funcional(ef_elem, nivel)
+            ef = self._parse_estructura_funcional(ef_elem, nivel, buffer)
             estructuras.append(ef)
 
         return estructuras
 
-    def _parse_estructura_funcional(self, ef_elem: ET.Element, nivel: int) -> EstructuraFuncional:
+    def _parse_estructura_funcional(
+        self, ef_elem: ET.Element, nivel: int, buffer: TextBuffer | None = None
+    ) -> EstructuraFuncional:
         """Parsea una única EstructuraFuncional y sus hijos."""
-        ef = EstructuraFuncional()
+        hijos = self._parse_estructuras_funcionales(ef_elem, nivel + 1, buffer)
+        return self._build_estructura(ef_elem, nivel, hijos, buffer)
+
+    def _build_estructura(
+        self,
+        ef_elem: ET.Element,
+        nivel: int,
+        hijos: list[EstructuraFuncional],
+        buffer: TextBuffer | None = None,
+    ) -> EstructuraFuncional:
+        """Construye una EstructuraFuncional con sus hijos ya parseados."""
+        # Texto
+        texto_elem = ef_elem.find("lc:Texto", self.ns)
+        ef = self._new_estructura(
+            buffer, self._get_text(texto_elem), materias=EMPTY, hijos=hijos or EMPTY
+        )
         ef.nivel = nivel
 
         # Atributos
         ef.id_parte = ef_elem.get("idParte", "")
-        ef.tipo_parte = html.unescape(ef_elem.get("tipoParte", ""))
-        ef.fecha_version = ef_elem.get("fechaVersion", "")
+        ef.tipo_parte = _tipo_parte(ef_elem.get("tipoParte", ""))
+        ef.fecha_version = sys.intern(ef_elem.get("fechaVersion", ""))
         ef.derogado = ef_elem.get("derogado", "") == "derogado"
         ef.transitorio = ef_elem.get("transitorio", "") == "transitorio"
 
-        # Texto
-        texto_elem = ef_elem.find("lc:Texto", self.ns)
-        ef.texto = self._get_text(texto_elem)
-
         # Metadatos de la parte
         meta_elem = ef_elem.find("lc:Metadatos", self.ns)
         if meta_elem is not None:
@@ -357,19 +803,20 @@ class BCNXMLParser:
                 ef.titulo_parte = self._get_text(titulo_elem).strip()
 
             # Materias específicas de esta parte
-            for materia in meta_elem.findall(".//lc:Materia", self.ns):
-                mat_text = self._get_text(materia)
-                if mat_text:
-                    ef.materias.append(mat_text)
-
-        # Parsear hijos recursivamente
-        ef.hijos = self._parse_estructuras_funcionales(ef_elem, nivel + 1)
+            materias = [
+                mat_text
+                for mat_text in map(
+                    self._get_short_text, meta_elem.findall(".//lc:Materia", self.ns)
+                )
+                if mat_text
+            ]
+            if materias:
+                ef.materias = materias
 
         return ef
 
-    def _parse_promulgacion(self, root: ET.Element) -> tuple[str, bool]:
+    def _parse_promulgacion(self, prom_elem: ET.Element | None) -> tuple[str, bool]:
         """Parsea el elemento Promulgacion."""
-        prom_elem = root.find("lc:Promulgacion", self.ns)
         if prom_elem is None:
             return "", False
 
@@ -379,11 +826,10 @@ class BCNXMLParser:
 
         return texto, derogado
 
-    def _parse_anexos(self, root: ET.Element) -> list[dict[str, Any]]:
+    def _parse_anexos(self, anexos_container: ET.Element | None) -> list[dict[str, Any]]:
         """Parsea los Anexos de la norma."""
         anexos: list[dict[str, Any]] = []
 
-        anexos_container = root.find("lc:Anexos", self.ns)
         if anexos_container is None:
             return anexos
 
@@ -405,7 +851,7 @@ class BCNXMLParser:
                 anexo["titulo"] = self._get_text(titulo_elem)
 
                 for materia in meta_elem.findall(".//lc:Materia", self.ns):
-                    mat_text = self._get_text(materia)
+                    mat_text = self._get_short_text(materia)
                     if mat_text:
                         anexo["materias"].append(mat_text)
 
@@ -418,6 +864,147 @@ class BCNXMLParser:
         return anexos
 
 
+# Consultas XPath precompiladas del backend lxml
+_X_EF_HIJAS = etree.XPath("lc:EstructurasFuncionales[1]/lc:EstructuraFuncional", namespaces=NS)
+_X_MATERIAS = etree.XPath(".//lc:Materia", namespaces=NS)
+
+
+class LxmlBCNXMLParser(BCNXMLParser):
+    """Backend lxml de :class:`BCNXMLParser` con la misma salida, más rápido.
+
+    - El documento se construye con lxml (C) y las búsquedas frecuentes usan
+      objetos ``etree.XPath`` precompilados.
+    - Cada ``EstructuraFuncional`` recorre sus hijos una sola vez en lugar de
+      hacer un ``find`` por campo.
+    - El texto de los elementos hoja (la inmensa mayoría de ``<Texto>``) se
+      normaliza en una sola pasada y sólo se aplican los reemplazos que
+      pueden cambiar algo. El contenido mixto usa el algoritmo recursivo
+      original, porque normaliza cada nivel por separado y una pasada única
+      no daría el mismo resultado.
+
+    La Norma producida es idéntica a la de :class:`BCNXMLParser`.
+    """
+
+    parse_errors = (ET.ParseError, etree.XMLSyntaxError)
+
+    def __init__(self, text_buffer: bool = False) -> None:
+        super().__init__(text_buffer)
+        self._lxml_parser = etree.XMLParser(
+            remove_comments=True,
+            remove_pis=True,
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=True,
+        )
+        self._q_texto = _qname("Texto")
+        self._q_metadatos = _qname("Metadatos")
+        self._q_nombre = _qname("NombreParte")
+        self._q_titulo = _qname("TituloParte")
+
+    def fromstring(self, content: bytes) -> ET.Element:
+        return etree.fromstring(content, self._lxml_parser)
+
+    def _pull_parser(self) -> etree.XMLPullParser:
+        return etree.XMLPullParser(
+            events=("start", "end"),
+            remove_comments=True,
+            remove_pis=True,
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=True,
+        )
+
+    def _get_text(
+        self, element: ET.Element | None, normalize: Callable[[str], str] = normalize_text
+    ) -> str:
+        if element is None:
+            return ""
+        if len(element) == 0:
+            return normalize(element.text or "")
+        return super()._get_text(element, normalize)
+
+    def _parse_estructuras_funcionales(
+        self, root: ET.Element, nivel: int = 0, buffer: TextBuffer | None = None
+    ) -> list[EstructuraFuncional]:
+        return [self._parse_estructura_funcional(ef, nivel, buffer) for ef in _X_EF_HIJAS(root)]
+
+    def _build_estructura(
+        self,
+        ef_elem: ET.Element,
+        nivel: int,
+        hijos: list[EstructuraFuncional],
+        buffer: TextBuffer | None = None,
+    ) -> EstructuraFuncional:
+        texto_elem = meta_elem = None
+        for child in ef_elem:
+            if child.tag == self._q_texto and texto_elem is None:
+                texto_elem = child
+            elif child.tag == self._q_metadatos and meta_elem is None:
+                meta_elem = child
+
+        get = ef_elem.get
+        ef = self._new_estructura(
+            buffer,
+            self._get_text(texto_elem),
+            id_parte=get("idParte", ""),
+            tipo_parte=_tipo_parte(get("tipoParte", "")),
+            fecha_version=sys.intern(get("fechaVersion", "")),
+            derogado=get("derogado", "") == "derogado",
+            transitorio=get("transitorio", "") == "transitorio",
+            materias=EMPTY,
+            hijos=hijos or EMPTY,
+            nivel=nivel,
+        )
+
+        if meta_elem is not None:
+            nombre_elem = titulo_elem = None
+            for child in meta_elem:
+                if child.tag == self._q_nombre and nombre_elem is None:
+                    nombre_elem = child
+                elif child.tag == self._q_titulo and titulo_elem is None:
+                    titulo_elem = child
+            if nombre_elem is not None and nombre_elem.get("presente", "") == "si":
+                ef.nombre_parte = self._get_text(nombre_elem).strip()
+            if titulo_elem is not None and titulo_elem.get("presente", "") == "si":
+                ef.titulo_parte = self._get_text(titulo_elem).strip()
+            materias = [t for t in map(self._get_short_text, _X_MATERIAS(meta_elem)) if t]
+            if materias:
+                ef.materias = materias
+
+        return ef
+
+
+# Backends de parser disponibles (ScraperConfig.parser_backend)
+PARSER_BACKENDS: dict[str, type[BCNXMLParser]] = {
+    "etree": BCNXMLParser,
+    "lxml": LxmlBCNXMLParser,
+}
+
+
+def create_parser(backend: str = "etree", text_buffer: bool = False) -> BCNXMLParser:
+    """Crea el parser BCN para el backend indicado.
+
+    Args:
+        backend: ``"etree"`` (biblioteca estándar) o ``"lxml"``.
+        text_buffer: Guardar los textos de cada norma en un único buffer.
+
+    Returns:
+        Instancia del parser.
+
+    Raises:
+        ValidationError: Si el backend no existe.
+    """
+    try:
+        return PARSER_BACKENDS[backend](text_buffer)
+    except KeyError:
+        raise ValidationError(
+            f"Backend de parser desconocido: {backend}. "
+            f"Disponibles: {', '.join(sorted(PARSER_BACKENDS))}",
+            field="parser_backend",
+            value=backend,
+        ) from None
+
+
 class BCNLawScraperV2:
     """Scraper v2 para la API XML de la Biblioteca del Congreso Nacional.
 
@@ -438,7 +1025,11 @@ class BCNLawScraperV2:
         """
         self.config = config or get_config()
         self.session = self._create_session()
-        self.parser = BCNXMLParser()
+        self.cache = XMLCache.from_config(self.config.scraper)
+        self.limiter = TokenBucket.from_config(self.config.scraper)
+        self.parser = create_parser(
+            self.config.scraper.parser_backend, self.config.scraper.text_buffer
+        )
         logger.debug("BCNLawScraperV2 inicializado")
 
     def __enter__(self) -> "BCNLawScraperV2":
@@ -448,34 +1039,23 @@ class BCNLawScraperV2:
         self.close()
 
     def close(self) -> None:
-        """Cierra la sesión HTTP y libera recursos."""
-        if self.session:
-            self.session.close()
+        """Libera los recursos del scraper.
 
-    def _create_session(self) -> requests.Session:
-        """Crea una sesión HTTP con reintentos configurados."""
-        session = requests.Session()
-
-        retry_strategy = Retry(
-            total=self.config.scraper.max_retries,
-            backoff_factor=self.config.scraper.retry_delay,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"],
-        )
-
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        La sesión HTTP es compartida por todos los scrapers del proceso (ver
+        :mod:`leychile_epub.http_session`) y no se cierra aquí, para que las
+        conexiones se sigan reutilizando. El caché (también compartido) sólo
+        guarda su índice.
+        """
+        if self.cache is not None:
+            self.cache.flush()
 
-        session.headers.update(
-            {
-                "User-Agent": self.config.scraper.user_agent,
-                "Accept": "application/xml, text/xml, */*",
-                "Accept-Language": "es-CL,es;q=0.9",
-            }
-        )
+    def _create_session(self) -> requests.Session:
+        """Obtiene la sesión HTTP compartida para esta configuración.
 
-        return session
+        Returns:
+            Sesión con pool de conexiones, keep-alive y reintentos configurados.
+        """
+        return get_session(SessionSettings.from_config(self.config.scraper))
 
     def _validate_url(self, url: str) -> None:
         """Valida que la URL pertenezca a un dominio permitido.
@@ -530,11 +1110,12 @@ class BCNLawScraperV2:
         except Exception:
             return None
 
-    def get_xml_url(self, id_norma: str) -> str:
-        """Construye la URL del XML para una norma."""
+    def get_xml_url(self, id_norma: str, id_version: str | None = None) -> str:
+        """Construye la URL del XML para una norma (y versión, si se indica)."""
         base = self.config.scraper.base_url.rstrip("/")
         endpoint = self.config.scraper.xml_endpoint
-        return f"{base}{endpoint}?opt=7&idNorma={id_norma}"
+        url = f"{base}{endpoint}?opt=7&idNorma={id_norma}"
+        return f"{url}&idVersion={id_version}" if id_version else url
 
     def fetch_xml(self, url: str) -> ET.Element:
         """Obtiene y parsea el XML desde la API.
@@ -543,14 +1124,90 @@ class BCNLawScraperV2:
             NetworkError: Si hay problemas de conexión.
             ParsingError: Si el XML no es válido.
         """
+        content = self._download(url)
+        return self._parse_xml(content, url)
+
+    def _fetch(self, url: str) -> bytes:
+        """GET con caché, limitador de tasa y reintentos ante 429/503."""
+        scraper_config = self.config.scraper
+        return fetch_with_cache(
+            self.session,
+            url,
+            self.cache,
+            scraper_config.timeout,
+            limiter=self.limiter,
+            max_retries=scraper_config.max_retries,
+            backoff=scraper_config.retry_delay,
+        )
+
+    def _download(self, url: str) -> bytes:
+        """Descarga el cuerpo de la respuesta sin parsearlo.
+
+        Si ``config.scraper.cache_dir`` está definido, usa el caché en disco
+        con revalidación condicional (ver :mod:`leychile_epub.http_cache`).
+        Sólo las solicitudes que salen a la red consumen el limitador de tasa.
+
+        Raises:
+            RateLimitError: Si la BCN sigue respondiendo 429/503 tras los reintentos.
+            NetworkError: Si hay problemas de conexión.
+        """
         logger.debug(f"Obteniendo XML: {url}")
 
-        try:
-            response = self.session.get(url, timeout=self.config.scraper.timeout)
-            response.raise_for_status()
-            time.sleep(self.config.scraper.rate_limit_delay)
-            return ET.fromstring(response.content)
+        with span(DESCARGA), self._network_errors(url):
+            content = self._fetch(url)
+        add_bytes(len(content))
+        return content
+
+    def _iter_download(self, url: str) -> Iterator[bytes]:
+        """Descarga el cuerpo de la respuesta por trozos (modo streaming).
 
+        Sin caché, el cuerpo se lee de la red a medida que se consume. Con
+        caché, el contenido ya está en disco y se entrega de una vez.
+
+        Raises:
+            RateLimitError: Si la BCN sigue respondiendo 429/503 tras los reintentos.
+            NetworkError: Si hay problemas de conexión.
+        """
+        if self.cache is not None:
+            yield self._download(url)
+            return
+        yield from self._iter_network(url)
+
+    def _iter_network(self, url: str) -> Iterator[bytes]:
+        """Lee el cuerpo de la respuesta de la red por trozos, sin pasar por el caché.
+
+        La conexión se cierra al cerrar el generador, aunque no se haya
+        consumido el cuerpo completo.
+
+        Raises:
+            RateLimitError: Si la BCN sigue respondiendo 429/503 tras los reintentos.
+            NetworkError: Si hay problemas de conexión.
+        """
+        logger.debug(f"Obteniendo XML en streaming: {url}")
+        scraper_config = self.config.scraper
+        with self._network_errors(url):
+            response = throttled_get(
+                self.session,
+                url,
+                self.limiter,
+                timeout=scraper_config.timeout,
+                max_retries=scraper_config.max_retries,
+                backoff=scraper_config.retry_delay,
+                stream=True,
+            )
+            try:
+                response.raise_for_status()
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    add_bytes(len(chunk))
+                    yield chunk
+            finally:
+                response.close()
+
+    @contextmanager
+    def _network_errors(self, url: str) -> Iterator[None]:
+        """Traduce las excepciones de ``requests`` a las del paquete."""
+        try:
+            yield
         except requests.exceptions.Timeout as e:
             raise NetworkError(
                 "Timeout al conectar con la BCN", url=url, details={"original_error": str(e)}
@@ -560,13 +1217,91 @@ class BCNLawScraperV2:
                 "No se pudo conectar con la BCN", url=url, details={"original_error": str(e)}
             ) from e
         except requests.exceptions.HTTPError as e:
+            if e.response.status_code in RETRY_AFTER_STATUSES:
+                raise RateLimitError(
+                    "La BCN rechazó la solicitud por exceso de tráfico",
+                    retry_after=parse_retry_after(e.response.headers.get("Retry-After")),
+                    details={"original_error": str(e)},
+                    url=url,
+                    status_code=e.response.status_code,
+                ) from e
             raise NetworkError(
                 "Error HTTP al acceder a la BCN",
                 url=url,
                 status_code=e.response.status_code,
                 details={"original_error": str(e)},
             ) from e
-        except ET.ParseError as e:
+
+    def fetch_norma_stream(self, url: str) -> Norma:
+        """Descarga y parsea una norma sin construir el árbol XML completo.
+
+        Ver :meth:`BCNXMLParser.parse_stream`.
+
+        Raises:
+            NetworkError: Si hay problemas de conexión.
+            ParsingError: Si el XML no es válido.
+        """
+        try:
+            return self.parser.parse_stream(self._iter_download(url))
+        except self.parser.parse_errors as e:
+            raise ParsingError(
+                "El XML de la BCN no es válido", details={"url": url, "original_error": str(e)}
+            ) from e
+
+    def probe_version(self, url: str) -> Norma:
+        """Consulta la versión vigente de una norma sin descargarla completa.
+
+        Lee la respuesta de ``obtxml`` en streaming y corta la conexión
+        apenas llega la etiqueta raíz (ver :meth:`BCNXMLParser.parse_root`).
+        Siempre va a la red, aunque haya caché: el cuerpo guardado puede ser
+        de una versión anterior. Por lo mismo, la entrada del caché queda
+        marcada para revalidarse en la siguiente descarga.
+
+        Args:
+            url: URL de LeyChile con el parámetro idNorma.
+
+        Returns:
+            Norma con sólo los atributos de la raíz (``fecha_version``...).
+
+        Raises:
+            ValidationError: Si la URL no contiene idNorma válido.
+            NetworkError: Si hay problemas de conexión.
+            ParsingError: Si el XML no es válido.
+        """
+        id_norma = self.extract_id_norma(url)
+        if not id_norma:
+            raise ValidationError(
+                "No se pudo extraer el ID de la norma de la URL", field="url", value=url
+            )
+
+        id_version = self.extract_id_version(url)
+        xml_url = self.get_xml_url(id_norma, id_version)
+        logger.debug(f"Consultando versión: {xml_url}")
+        # closing() cierra la respuesta aunque no se consuma el cuerpo completo
+        with closing(self._iter_network(xml_url)) as chunks:
+            try:
+                norma = self.parser.parse_root(chunks)
+            except self.parser.parse_errors as e:
+                raise ParsingError(
+                    "El XML de la BCN no es válido",
+                    details={"url": xml_url, "original_error": str(e)},
+                ) from e
+        if self.cache is not None:
+            self.cache.expire(self.cache.key_for_url(xml_url))
+        norma.url_original = url
+        norma.id_version = id_version or ""
+        return norma
+
+    def _parse_xml(self, content: bytes, url: str) -> ET.Element:
+        """Convierte los bytes descargados en el elemento raíz.
+
+        Raises:
+            ParsingError: Si el XML no es válido.
+        """
+        try:
+            with span(PARSEO):
+                return self.parser.fromstring(content)
+        except self.parser.parse_errors as e:
             raise ParsingError(
                 "El XML de la BCN no es válido", details={"url": url, "original_error": str(e)}
             ) from e
@@ -603,16 +1338,20 @@ class BCNLawScraperV2:
             progress_callback(0.1, "Conectando con LeyChile...")
 
         # Obtener XML
-        xml_url = self.get_xml_url(id_norma)
-        root = self.fetch_xml(xml_url)
+        xml_url = self.get_xml_url(id_norma, id_version)
+        if self.config.scraper.streaming:
+            # Descarga y parseo intercalados: nunca existe el árbol completo
+            norma = self.fetch_norma_stream(xml_url)
+            norma.url_original = url
+            norma.id_version = id_version or ""
+        else:
+            root = self.fetch_xml(xml_url)
 
-        if progress_callback:
-            progress_callback(0.3, "Parseando estructura XML...")
+            if progress_callback:
+                progress_callback(0.3, "Parseando estructura XML...")
 
-        # Parsear
-        norma = self.parser.parse(root)
-        norma.url_original = url
-        norma.id_version = id_version or ""
+            # Parsear
+            norma = self._build_norma(root, url, id_version)
 
         if progress_callback:
             progress_callback(1.0, "Completado")
@@ -620,6 +1359,109 @@ class BCNLawScraperV2:
         logger.info(f"Scraping completado: {norma.titulo_completo}")
         return norma
 
+    def scrape_batch(
+        self, urls: Iterable[str], max_workers: int | None = None
+    ) -> list[ParseResult]:
+        """Descarga varias normas y las parsea en paralelo.
+
+        Las descargas son secuenciales (pasan por el caché y el limitador de
+        tasa como en :meth:`scrape`); el parseo se reparte en procesos con
+        :meth:`BCNXMLParser.parse_many`. Los errores de una URL no
+        interrumpen el lote: quedan en ``ParseResult.error`` con la misma
+        excepción que lanzaría :meth:`scrape`. Todos los XML del lote se
+        mantienen en memoria hasta parsearlos, así que conviene pasar lotes
+        acotados.
+
+        Args:
+            urls: URLs de LeyChile.
+            max_workers: Procesos de parseo. Por defecto
+                ``config.scraper.parse_workers``.
+
+        Returns:
+            Un ParseResult por URL, en el orden de ``urls``.
+        """
+        urls = list(urls)
+        if max_workers is None:
+            max_workers = self.config.scraper.parse_workers
+
+        resultados: list[ParseResult] = [ParseResult(i) for i in range(len(urls))]
+        pendientes: list[tuple[int, str, str]] = []
+        blobs: list[bytes] = []
+        for i, url in enumerate(urls):
+            try:
+                id_norma = self.extract_id_norma(url)
+                if not id_norma:
+                    raise ValidationError(
+                        "No se pudo extraer el ID de la norma de la URL", field="url", value=url
+                    )
+                xml_url = self.get_xml_url(id_norma, self.extract_id_version(url))
+                blobs.append(self._download(xml_url))
+            except LeyChileError as e:
+                logger.warning(f"Error obteniendo {url}: {e}")
+                resultados[i].error = e
+                continue
+            pendientes.append((i, url, xml_url))
+
+        parsed = self.parser.parse_many(blobs, max_workers)
+        for (i, url, xml_url), resultado in zip(pendientes, parsed, strict=True):
+            if resultado.norma is None:
+                original = resultado.error.details.get("original_error") if resultado.error else ""
+                resultados[i].error = ParsingError(
+                    "El XML de la BCN no es válido",
+                    details={"url": xml_url, "original_error": original},
+                )
+                continue
+            resultado.norma.url_original = url
+            resultado.norma.id_version = self.extract_id_version(url) or ""
+            resultados[i].norma = resultado.norma
+            logger.info(f"Scraping completado: {resultado.norma.titulo_completo}")
+        return resultados
+
+    def scrape_lazy(self, url: str) -> "LazyNorma":
+        """Obtiene una norma como vista perezosa, para consultas puntuales.
+
+        A diferencia de :meth:`scrape`, no se parsea el árbol completo: las
+        estructuras se parsean al consultarlas (ver
+        :class:`~leychile_epub.lazy_norma.LazyNorma`). Siempre usa el
+        backend lxml.
+
+        Args:
+            url: URL de LeyChile con el parámetro idNorma.
+
+        Raises:
+            ValidationError: Si la URL no contiene idNorma válido.
+            NetworkError: Si hay problemas de conexión.
+            ParsingError: Si el XML no se puede procesar.
+        """
+        from .lazy_norma import LazyNorma
+
+        id_norma = self.extract_id_norma(url)
+        if not id_norma:
+            raise ValidationError(
+                "No se pudo extraer el ID de la norma de la URL", field="url", value=url
+            )
+
+        id_version = self.extract_id_version(url)
+        xml_url = self.get_xml_url(id_norma, id_version)
+        parser = self.parser if isinstance(self.parser, LxmlBCNXMLParser) else LxmlBCNXMLParser()
+        try:
+            norma = LazyNorma.from_bytes(self._download(xml_url), parser)
+        except parser.parse_errors as e:
+            raise ParsingError(
+                "El XML de la BCN no es válido", details={"url": xml_url, "original_error": str(e)}
+            ) from e
+        norma.url_original = url
+        norma.id_version = id_version or ""
+        logger.info(f"Norma {norma.norma_id} indexada: {len(norma)} estructuras")
+        return norma
+
+    def _build_norma(self, root: ET.Element, url: str, id_version: str | None) -> Norma:
+        """Parsea el XML y completa los datos que provienen de la URL original."""
+        norma = self.parser.parse(root)
+        norma.url_original = url
+        norma.id_version = id_version or ""
+        return norma
+
     def scrape_to_dict(
         self, url: str, progress_callback: Callable[[float, str], None] | None = None
     ) -> dict[str, Any]:
@@ -729,7 +1571,7 @@ class BCNLawScraperV2:
                 "fecha_version": ef.fecha_version,
                 "derogado": ef.derogado,
                 "transitorio": ef.transitorio,
-                "materias": ef.materias,
+                "materias": list(ef.materias),
                 "parent_chain": list(parent_chain),
                 "tiene_hijos": len(ef.hijos) > 0,
             }
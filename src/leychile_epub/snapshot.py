@@ -0,0 +1,418 @@
+"""
+Snapshots binarios de normas ya parseadas.
+
+Volver a generar una norma con otro estilo o formato no debería obligar a
+descargar y parsear de nuevo su XML. :func:`save_snapshot` guarda una
+:class:`~leychile_epub.scraper_v2.Norma` o una
+:class:`~leychile_epub.superir_models.NormaSuperir` en un archivo binario
+compacto y :func:`load_snapshot` la reconstruye en milisegundos.
+
+Formato (versión 1, enteros little-endian)::
+
+    cabecera   "LCSNAP" | u16 versión | u8 tipo | u8 reservado | u32 crc32 | u64 largo
+    strings    tabla de cadenas: u32 n | offsets (u64, en caracteres) | UTF-8
+    árboles    u32 n | por árbol: columnas de FlatNorma (arreglos crudos)
+    valor      la norma codificada con etiquetas; las cadenas son índices
+               de la tabla y cada lista de EstructuraFuncional es una
+               referencia a un árbol
+
+Los árboles de ``EstructuraFuncional`` se guardan con el layout plano de
+:class:`~leychile_epub.flat_tree.FlatNorma` (preorden, padre, fin, nivel,
+marcas y los textos de cada columna como una sola cadena), de modo que
+cargarlos no exige decodificar un objeto por campo.
+
+Los generadores (ePub v2, XML de leyes y XML SUPERIR) aceptan una norma o la
+ruta de un snapshot (ver :func:`as_norma`).
+
+Example:
+    >>> save_snapshot(norma, "codigo_civil.lcsnap")
+    >>> norma = load_snapshot("codigo_civil.lcsnap")
+    >>> EPubGeneratorV2().generate("codigo_civil.lcsnap", "codigo_civil.epub")
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any
+
+from .exceptions import ParsingError
+from .flat_tree import FlatNorma, StringColumn
+from .scraper_v2 import (
+    EstructuraFuncional,
+    Norma,
+    NormaIdentificador,
+    NormaMetadatos,
+)
+from .superir_models import (
+    ActoAdministrativo,
+    AnexoStandalone,
+    CierreSuperir,
+    ConsiderandoItem,
+    ContenidoArticulo,
+    Firmante,
+    ItemContentBlock,
+    ItemListado,
+    NormaSuperir,
+    PuntoResolutivo,
+    RequisitoItemModel,
+    RequisitoModel,
+    SubitemModel,
+)
+
+logger = logging.getLogger("leychile_epub.snapshot")
+
+# Extensión recomendada para los snapshots
+SNAPSHOT_SUFFIX = ".lcsnap"
+
+MAGIC = b"LCSNAP"
+FORMAT_VERSION = 1
+
+# Tipo de norma guardada
+KIND_NORMA = 1
+KIND_SUPERIR = 2
+
+_HEADER = struct.Struct("<6sHBBIQ")
+
+# Etiquetas de los valores codificados
+_T_NONE, _T_FALSE, _T_TRUE, _T_INT, _T_FLOAT, _T_STR = range(6)
+_T_LIST, _T_DICT, _T_OBJ, _T_TREE = range(6, 10)
+
+# Dataclasses que pueden aparecer en un snapshot (nunca se instancia otra cosa)
+_CLASSES: dict[str, type] = {
+    cls.__name__: cls
+    for cls in (
+        Norma,
+        NormaIdentificador,
+        NormaMetadatos,
+        EstructuraFuncional,
+        NormaSuperir,
+        ConsiderandoItem,
+        Firmante,
+        CierreSuperir,
+        ActoAdministrativo,
+        PuntoResolutivo,
+        SubitemModel,
+        ItemContentBlock,
+        ItemListado,
+        RequisitoItemModel,
+        RequisitoModel,
+        AnexoStandalone,
+        ContenidoArticulo,
+    )
+}
+
+# Campos que no se guardan (se reconstruyen vacíos)
+_SKIP_FIELDS = {("Norma", "text_buffer")}
+
+# Columnas numéricas de FlatNorma, en orden de escritura
+_ARRAY_COLUMNS = ("tipo", "padre", "fin", "nivel", "flags", "fecha")
+_TEXT_COLUMNS = ("id_parte", "nombre_parte", "titulo_parte", "texto")
+
+
+# =============================================================================
+# Escritura
+# =============================================================================
+
+
+class _Writer:
+    """Acumula la tabla de cadenas, los árboles y el valor codificado."""
+
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self._ids: dict[str, int] = {}
+        self.trees: list[FlatNorma] = []
+
+    def string(self, s: str) -> int:
+        i = self._ids.get(s)
+        if i is None:
+            i = self._ids[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+    def encode(self, value: Any, out: bytearray) -> None:
+        if value is None:
+            out.append(_T_NONE)
+        elif value is True or value is False:
+            out.append(_T_TRUE if value else _T_FALSE)
+        elif isinstance(value, int):
+            out.append(_T_INT)
+            out += struct.pack("<q", value)
+        elif isinstance(value, float):
+            out.append(_T_FLOAT)
+            out += struct.pack("<d", value)
+        elif isinstance(value, str):
+            out.append(_T_STR)
+            out += struct.pack("<I", self.string(value))
+        elif isinstance(value, (list, tuple)):
+            if value and all(isinstance(v, EstructuraFuncional) for v in value):
+                out.append(_T_TREE)
+                out += struct.pack("<I", len(self.trees))
+                self.trees.append(FlatNorma.from_norma(Norma(estructuras=list(value))))
+                return
+            out.append(_T_LIST)
+            out += struct.pack("<I", len(value))
+            for item in value:
+                self.encode(item, out)
+        elif isinstance(value, dict):
+            out.append(_T_DICT)
+            out += struct.pack("<I", len(value))
+            for key, item in value.items():
+                self.encode(key, out)
+                self.encode(item, out)
+        elif type(value).__name__ in _CLASSES and dataclasses.is_dataclass(value):
+            name = type(value).__name__
+            campos = [
+                f.name for f in dataclasses.fields(value) if (name, f.name) not in _SKIP_FIELDS
+            ]
+            out.append(_T_OBJ)
+            out += struct.pack("<II", self.string(name), len(campos))
+            for campo in campos:
+                out += struct.pack("<I", self.string(campo))
+                self.encode(getattr(value, campo), out)
+        else:
+            raise TypeError(f"Tipo no soportado en snapshot: {type(value).__name__}")
+
+    def payload(self, value: Any) -> bytes:
+        main = bytearray()
+        self.encode(value, main)
+
+        # Los vocabularios y textos de los árboles van a la tabla de cadenas
+        # antes de serializarla
+        trees = bytearray(struct.pack("<I", len(self.trees)))
+        for flat in self.trees:
+            trees += struct.pack("<I", len(flat))
+            for vocab in (flat.tipos, flat.fechas):
+                _write_array(trees, array("I", (self.string(s) for s in vocab)))
+            for name in _ARRAY_COLUMNS:
+                _write_array(trees, getattr(flat, name))
+            for name in _TEXT_COLUMNS:
+                column: StringColumn = getattr(flat, name)
+                trees += struct.pack("<I", self.string(column.data))
+                _write_array(trees, column.offsets)
+            self.encode(flat.materias, trees)
+
+        data = "".join(self.strings)
+        offsets = array("Q", [0])
+        total = 0
+        for s in self.strings:
+            total += len(s)
+            offsets.append(total)
+        strings = bytearray(struct.pack("<I", len(self.strings)))
+        _write_array(strings, offsets)
+        blob = data.encode("utf-8", "surrogatepass")
+        strings += struct.pack("<Q", len(blob))
+        strings += blob
+
+        return bytes(strings) + bytes(trees) + bytes(main)
+
+
+def _write_array(out: bytearray, arr: array) -> None:
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    out += struct.pack("<cI", arr.typecode.encode("ascii"), len(arr))
+    out += arr.tobytes()
+
+
+def dumps_snapshot(norma: Norma | NormaSuperir) -> bytes:
+    """Serializa una norma al formato de snapshot.
+
+    Args:
+        norma: Norma o NormaSuperir.
+
+    Returns:
+        Bytes del snapshot.
+    """
+    if isinstance(norma, NormaSuperir):
+        kind = KIND_SUPERIR
+    elif isinstance(norma, Norma):
+        kind = KIND_NORMA
+    else:
+        raise TypeError(f"Se esperaba Norma o NormaSuperir, no {type(norma).__name__}")
+
+    payload = _Writer().payload(norma)
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, kind, 0, zlib.crc32(payload), len(payload))
+    return header + payload
+
+
+def save_snapshot(norma: Norma | NormaSuperir, path: str | Path) -> Path:
+    """Guarda una norma como snapshot (escritura atómica).
+
+    Args:
+        norma: Norma o NormaSuperir ya parseada.
+        path: Ruta del archivo (se recomienda la extensión ``.lcsnap``).
+
+    Returns:
+        Ruta del snapshot.
+    """
+    path = Path(path)
+    data = dumps_snapshot(norma)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    logger.debug(f"Snapshot guardado: {path} ({len(data)} bytes)")
+    return path
+
+
+# =============================================================================
+# Lectura
+# =============================================================================
+
+
+class _Reader:
+    """Decodifica el payload de un snapshot."""
+
+    def __init__(self, payload: bytes) -> None:
+        self.buf = memoryview(payload)
+        self.pos = 0
+        self.strings = self._read_strings()
+        self.trees = self._read_trees_raw()
+
+    def unpack(self, fmt: str) -> tuple:
+        values = struct.unpack_from(fmt, self.buf, self.pos)
+        self.pos += struct.calcsize(fmt)
+        return values
+
+    def read_array(self) -> array:
+        typecode, n = self.unpack("<cI")
+        arr = array(typecode.decode("ascii"))
+        size = arr.itemsize * n
+        arr.frombytes(self.buf[self.pos : self.pos + size])
+        self.pos += size
+        if sys.byteorder == "big":
+            arr.byteswap()
+        return arr
+
+    def _read_strings(self) -> list[str]:
+        (n,) = self.unpack("<I")
+        offsets = self.read_array()
+        (size,) = self.unpack("<Q")
+        data = str(self.buf[self.pos : self.pos + size], "utf-8", "surrogatepass")
+        self.pos += size
+        if len(offsets) != n + 1 or offsets[-1] != len(data):
+            raise ValueError("tabla de cadenas inconsistente")
+        return [data[offsets[i] : offsets[i + 1]] for i in range(n)]
+
+    def _read_trees_raw(self) -> list[FlatNorma]:
+        (n,) = self.unpack("<I")
+        trees = []
+        for _ in range(n):
+            (size,) = self.unpack("<I")
+            flat = FlatNorma()
+            flat.tipos = [self.strings[i] for i in self.read_array()]
+            flat.fechas = [self.strings[i] for i in self.read_array()]
+            for name in _ARRAY_COLUMNS:
+                setattr(flat, name, self.read_array())
+            for name in _TEXT_COLUMNS:
+                (data_id,) = self.unpack("<I")
+                setattr(flat, name, StringColumn(self.strings[data_id], self.read_array()))
+            if len(flat) != size or any(len(c) != size for c in self._columns(flat)):
+                raise ValueError("árbol inconsistente")
+            flat.materias = self.decode()
+            trees.append(flat)
+        return trees
+
+    @staticmethod
+    def _columns(flat: FlatNorma) -> list:
+        return [getattr(flat, name) for name in (*_ARRAY_COLUMNS, *_TEXT_COLUMNS)]
+
+    def decode(self) -> Any:
+        (tag,) = self.unpack("<B")
+        if tag == _T_NONE:
+            return None
+        if tag == _T_FALSE:
+            return False
+        if tag == _T_TRUE:
+            return True
+        if tag == _T_INT:
+            return self.unpack("<q")[0]
+        if tag == _T_FLOAT:
+            return self.unpack("<d")[0]
+        if tag == _T_STR:
+            return self.strings[self.unpack("<I")[0]]
+        if tag == _T_LIST:
+            (n,) = self.unpack("<I")
+            return [self.decode() for _ in range(n)]
+        if tag == _T_DICT:
+            (n,) = self.unpack("<I")
+            return {self.decode(): self.decode() for _ in range(n)}
+        if tag == _T_OBJ:
+            name_id, n = self.unpack("<II")
+            cls = _CLASSES[self.strings[name_id]]
+            valores = {}
+            for _ in range(n):
+                (campo_id,) = self.unpack("<I")
+                valores[self.strings[campo_id]] = self.decode()
+            return cls(**valores)
+        if tag == _T_TREE:
+            flat = self.trees[self.unpack("<I")[0]]
+            return flat.estructuras()
+        raise ValueError(f"etiqueta desconocida {tag}")
+
+
+def loads_snapshot(data: bytes) -> Norma | NormaSuperir:
+    """Reconstruye una norma desde los bytes de un snapshot.
+
+    Raises:
+        ParsingError: Si los datos no son un snapshot válido de esta versión.
+    """
+    if len(data) < _HEADER.size:
+        raise ParsingError("Snapshot inválido: archivo truncado")
+    magic, version, kind, _reserved, crc, size = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ParsingError("Snapshot inválido: no es un snapshot de leychile-epub")
+    if version != FORMAT_VERSION:
+        raise ParsingError(
+            f"Versión de snapshot no soportada: {version} (se esperaba {FORMAT_VERSION})"
+        )
+    payload = data[_HEADER.size : _HEADER.size + size]
+    if len(payload) != size or zlib.crc32(payload) != crc:
+        raise ParsingError("Snapshot inválido: datos corruptos (crc32)")
+
+    try:
+        norma = _Reader(payload).decode()
+    except (ValueError, KeyError, IndexError, TypeError, struct.error) as e:
+        raise ParsingError(f"Snapshot inválido: {e}") from e
+
+    expected = NormaSuperir if kind == KIND_SUPERIR else Norma
+    if not isinstance(norma, expected):
+        raise ParsingError("Snapshot inválido: tipo de norma inconsistente")
+    return norma
+
+
+def load_snapshot(path: str | Path) -> Norma | NormaSuperir:
+    """Carga una norma guardada con :func:`save_snapshot`.
+
+    Args:
+        path: Ruta del snapshot.
+
+    Returns:
+        Norma o NormaSuperir, igual a la guardada.
+
+    Raises:
+        ParsingError: Si el archivo no es un snapshot válido.
+    """
+    return loads_snapshot(Path(path).read_bytes())
+
+
+def as_norma(norma: Norma | NormaSuperir | str | Path) -> Any:
+    """Retorna la norma dada o la carga si es la ruta de un snapshot."""
+    if isinstance(norma, (str, os.PathLike)):
+        return load_snapshot(norma)
+    return norma
@@ -27,6 +27,7 @@ from .scraper_v2 import (
     NormaIdentificador,
     NormaMetadatos,
 )
+from .text_normalize import unwrap_pdf_lines
 
 logger = logging.getLogger("leychile_epub.superir_parser")
 
@@ -604,56 +605,7 @@ class SuperirBaseParser:
         3. Inserta líneas vacías entre párrafos detectados (. + Mayúscula)
            para que el XML generator los separe en <parrafo> distintos.
         """
-        if not text:
-            return text
-
-        lines = text.split("\n")
-        result: list[str] = []
-
-        for line in lines:
-            stripped = line.strip()
-
-            # Línea vacía = quiebre de párrafo
-            if not stripped:
-                result.append("")
-                continue
-
-            # Si hay línea previa no vacía, decidir si unir o separar
-            if result and result[-1]:
-                prev = result[-1].rstrip()
-
-                starts_new_para = False
-
-                # Nuevo elemento estructural → siempre separar
-                # SALVO que la línea previa termine en preposición/artículo
-                # (referencia inline: "contemplados en el\nCapítulo IV...")
-                if cls._is_new_unit_start(stripped):
-                    if prev and re.search(
-                        r"\b(?:el|la|los|las|del|al|en|de|un|una)\s*$",
-                        prev,
-                        re.IGNORECASE,
-                    ):
-                        result[-1] = prev + " " + stripped
-                        continue
-                    starts_new_para = True
-                # Terminador de oración + mayúscula → nuevo párrafo
-                elif prev and prev[-1] in ".;:" and stripped[0].isupper():
-                    starts_new_para = True
-
-                if starts_new_para:
-                    # Insertar línea vacía si no hay una ya
-                    if result[-1] != "":
-                        result.append("")
-                    result.append(stripped)
-                    continue
-
-                # Continuación: unir con la línea anterior
-                result[-1] = prev + " " + stripped
-                continue
-
-            result.append(stripped)
-
-        return "\n".join(result)
+        return unwrap_pdf_lines(text, cls._is_new_unit_start)
 
     @staticmethod
     def _clean_closing(raw: str) -> str:
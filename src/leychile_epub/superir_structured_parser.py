@@ -33,6 +33,7 @@ from .superir_models import (
     RequisitoItemModel,
     RequisitoModel,
 )
+from .text_normalize import split_parrafos
 
 logger = logging.getLogger(__name__)
 
@@ -663,7 +664,7 @@ class SuperirStructuredParser:
             )
 
         # 5. Sin estructura especial: solo párrafos
-        for parrafo in _split_parrafos(texto):
+        for parrafo in split_parrafos(texto):
             contenido.parrafos.append(parrafo)
         return contenido
 
@@ -681,7 +682,7 @@ class SuperirStructuredParser:
         # Texto antes del primer item → párrafos
         pre_text = texto[: items[0].start()].strip()
         if pre_text:
-            for parrafo in _split_parrafos(pre_text):
+            for parrafo in split_parrafos(pre_text):
                 contenido.parrafos.append(parrafo)
 
         # Items del listado
@@ -702,7 +703,7 @@ class SuperirStructuredParser:
                 item_texto, post_text = _split_last_item_post_listado(item_texto)
 
                 if post_text:
-                    for parrafo in _split_parrafos(post_text):
+                    for parrafo in split_parrafos(post_text):
                         contenido.parrafos_post.append(parrafo)
 
             if item_texto:
@@ -731,7 +732,7 @@ class SuperirStructuredParser:
         # Texto antes del primer item letrado → párrafos
         pre_text = texto[: lettered[0].start()].strip()
         if pre_text:
-            for parrafo in _split_parrafos(pre_text):
+            for parrafo in split_parrafos(pre_text):
                 contenido.parrafos.append(parrafo)
 
         for i, let_match in enumerate(lettered):
@@ -821,7 +822,7 @@ class SuperirStructuredParser:
         # Texto antes del primer item → párrafos
         pre_text = texto[: items[0].start()].strip()
         if pre_text:
-            for parrafo in _split_parrafos(pre_text):
+            for parrafo in split_parrafos(pre_text):
                 contenido.parrafos.append(parrafo)
 
         for i, match in enumerate(items):
@@ -859,7 +860,7 @@ class SuperirStructuredParser:
                 intro_text = item_block[: sub_matches[0].start()].strip()
                 item_parrafos = []
                 if intro_text:
-                    item_parrafos = _split_parrafos(intro_text)
+                    item_parrafos = split_parrafos(intro_text)
 
                 # Calcular fin del último subitem real.
                 # Buscamos el primer \n\n después del último subitem para
@@ -898,7 +899,7 @@ class SuperirStructuredParser:
                 # Parsear párrafos post-sublistado
                 parrafos_post = []
                 if post_text:
-                    parrafos_post = _split_parrafos(post_text)
+                    parrafos_post = split_parrafos(post_text)
 
                 contenido.listado.append(
                     ItemListado(
@@ -910,7 +911,7 @@ class SuperirStructuredParser:
                 )
             else:
                 # Item simple o multi-párrafo
-                parrafos = _split_parrafos(item_block)
+                parrafos = split_parrafos(item_block)
                 if len(parrafos) == 1:
                     contenido.listado.append(
                         ItemListado(letra=letra, texto=parrafos[0])
@@ -938,7 +939,7 @@ class SuperirStructuredParser:
         # Texto antes del primer requisito → párrafos de intro
         pre_text = texto[: req_matches[0].start()].strip()
         if pre_text:
-            for parrafo in _split_parrafos(pre_text):
+            for parrafo in split_parrafos(pre_text):
                 contenido.parrafos.append(parrafo)
 
         # Parsear cada requisito
@@ -980,7 +981,7 @@ class SuperirStructuredParser:
                         requisito.items.append(req_item)
             else:
                 # Sin items: solo párrafos
-                for p in _split_parrafos(full_text):
+                for p in split_parrafos(full_text):
                     requisito.parrafos.append(p)
 
             contenido.requisitos.append(requisito)
@@ -1240,60 +1241,6 @@ def _extract_firmante(texto: str) -> Firmante | None:
     return None
 
 
-def _split_parrafos(texto: str) -> list[str]:
-    """Divide texto en párrafos por líneas en blanco o doble espacio.
-
-    Dos modos (igual que _split_into_paragraphs del generador):
-    1. Texto con newlines → split por líneas en blanco.
-    2. Texto colapsado (sin newlines) → split por ". " + doble espacio + mayúscula.
-
-    Args:
-        texto: Texto con posibles líneas en blanco.
-
-    Returns:
-        Lista de párrafos no vacíos.
-    """
-    if not texto or not texto.strip():
-        return []
-
-    # Modo 1: split por líneas en blanco
-    parrafos: list[str] = []
-    current: list[str] = []
-
-    for line in texto.split("\n"):
-        stripped = line.strip()
-        if not stripped:
-            if current:
-                parrafos.append(" ".join(current))
-                current = []
-        else:
-            current.append(stripped)
-
-    if current:
-        parrafos.append(" ".join(current))
-
-    if len(parrafos) > 1:
-        # Post-procesamiento: fusionar párrafos espurios de page breaks del PDF.
-        # Si un párrafo NO termina en puntuación de cierre (.;:)) y el siguiente
-        # existe, son probablemente un corte de página, no párrafos reales.
-        merged: list[str] = [parrafos[0]]
-        for p in parrafos[1:]:
-            prev = merged[-1]
-            if prev and prev.rstrip()[-1:] not in ".;:)":
-                merged[-1] = prev + " " + p
-            else:
-                merged.append(p)
-        return merged
-
-    # Modo 2: texto colapsado → split por ". " + doble espacio + mayúscula
-    full_text = parrafos[0] if parrafos else texto.strip()
-    parts = re.split(r"(?<=\.)\s{2}(?=[A-ZÁÉÍÓÚÑ])", full_text)
-    if len(parts) > 1:
-        return [p.strip() for p in parts if p.strip()]
-
-    return [full_text] if full_text else []
-
-
 def _parse_item_with_alfanum_subitems(
     letra: str,
     item_block: str,
@@ -1325,7 +1272,7 @@ def _parse_item_with_alfanum_subitems(
     intro_text = item_block[: alfanum_subs[0].start()].strip()
     intro_parrafos: list[str] = []
     if intro_text:
-        intro_parrafos = _split_parrafos(intro_text)
+        intro_parrafos = split_parrafos(intro_text)
 
     # Procesar cada subitem y los párrafos intermedios
     for j, sm in enumerate(alfanum_subs):
@@ -1365,7 +1312,7 @@ def _parse_item_with_alfanum_subitems(
 
         # Emitir párrafos intermedios
         if mid_text:
-            for p in _split_parrafos(mid_text):
+            for p in split_parrafos(mid_text):
                 content_blocks.append(
                     ItemContentBlock(tipo="parrafo", texto=p)
                 )
@@ -1429,7 +1376,7 @@ def _assign_requisito_intro(requisito: RequisitoModel, pre_item: str) -> None:
     ):
         requisito.nombre = pre_item.rstrip(":").strip()
     else:
-        for p in _split_parrafos(pre_item):
+        for p in split_parrafos(pre_item):
             requisito.parrafos.append(p)
 
 
@@ -1454,7 +1401,7 @@ def _parse_requisito_item(letra: str, item_texto: str) -> RequisitoItemModel:
             nombre = potential
             texto_para_parsear = nombre_match.group(2).strip()
 
-    item_parrafos = _split_parrafos(texto_para_parsear)
+    item_parrafos = split_parrafos(texto_para_parsear)
     req_item = RequisitoItemModel(letra=letra, nombre=nombre)
 
     if len(item_parrafos) > 1:
@@ -18,7 +18,9 @@ from xml.dom.minidom import parseString
 
 from lxml import etree
 
+from .profiling import RENDER, span
 from .scraper_v2 import EstructuraFuncional
+from .snapshot import as_norma
 from .superir_models import NormaSuperir
 
 logger = logging.getLogger(__name__)
@@ -58,34 +60,37 @@ class SuperirXMLGenerator:
                 logger.warning(f"Schema no encontrado: {self._schema_path}")
         return self._schema
 
-    def generate(self, norma: NormaSuperir) -> str:
+    def generate(self, norma: NormaSuperir | str | Path) -> str:
         """Genera XML string desde NormaSuperir.
 
         Args:
-            norma: NormaSuperir con datos estructurados.
+            norma: NormaSuperir con datos estructurados o ruta de un snapshot
+                (ver :mod:`leychile_epub.snapshot`).
 
         Returns:
             XML string validado contra superir_v1.xsd.
         """
-        root = self._create_root(norma)
-        self._add_acto_administrativo(root, norma)
-        self._add_encabezado(root, norma)
-        self._add_metadatos(root, norma)
-        self._add_vistos(root, norma)
-        self._add_considerandos(root, norma)
-        self._add_formula_dictacion(root, norma)
-        self._add_resolutivo(root, norma)
-        self._add_preambulo_ncg(root, norma)
-        self._add_cuerpo_normativo(root, norma)
-        self._add_resolutivo_final(root, norma)
-        self._add_cierre(root, norma)
-        self._add_anexos(root, norma)
-        self._add_standalone_anexos(root, norma)
-
-        xml_str = self._serialize(root)
-
-        # Validar
-        self._validate(xml_str)
+        norma = as_norma(norma)
+        with span(RENDER):
+            root = self._create_root(norma)
+            self._add_acto_administrativo(root, norma)
+            self._add_encabezado(root, norma)
+            self._add_metadatos(root, norma)
+            self._add_vistos(root, norma)
+            self._add_considerandos(root, norma)
+            self._add_formula_dictacion(root, norma)
+            self._add_resolutivo(root, norma)
+            self._add_preambulo_ncg(root, norma)
+            self._add_cuerpo_normativo(root, norma)
+            self._add_resolutivo_final(root, norma)
+            self._add_cierre(root, norma)
+            self._add_anexos(root, norma)
+            self._add_standalone_anexos(root, norma)
+
+            xml_str = self._serialize(root)
+
+            # Validar
+            self._validate(xml_str)
 
         return xml_str
 
@@ -0,0 +1,122 @@
+"""
+Buffer único de texto para los artículos de una norma.
+
+En el modo ``text_buffer`` del parser (ver
+:attr:`~leychile_epub.config.ScraperConfig.text_buffer`) los textos ya
+normalizados de todas las ``EstructuraFuncional`` de una norma se guardan
+codificados en UTF-8, uno tras otro, en un solo :class:`TextBuffer`, y cada
+estructura sólo recuerda el número de su texto en el buffer. El ``str`` de
+un artículo se crea al leer ``ef.texto`` y no se retiene.
+
+Quien sólo necesita largos, hashes o búsquedas trabaja sobre el buffer sin
+materializar cadenas: :meth:`TextBuffer.view` entrega un ``memoryview`` del
+texto (sin copia), que se puede pasar directo a ``hashlib``, y
+:meth:`TextBuffer.search` busca en el buffer completo.
+
+Example:
+    >>> buffer = TextBuffer()
+    >>> i = buffer.append("Artículo 1.- Texto.")
+    >>> buffer.freeze()
+    >>> buffer.text(i)
+    'Artículo 1.- Texto.'
+    >>> hashlib.sha1(buffer.view(i)).hexdigest()
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+from array import array
+
+
+class TextBuffer:
+    """Textos de una norma concatenados en UTF-8, con sus offsets.
+
+    El texto ``i`` ocupa los bytes ``offsets[i]:offsets[i + 1]``. Se llena
+    con :meth:`append` mientras se parsea y se congela con :meth:`freeze` al
+    terminar; desde entonces es inmutable y sus vistas no copian datos.
+    """
+
+    __slots__ = ("_data", "_offsets")
+
+    def __init__(self) -> None:
+        self._data: bytearray | bytes = bytearray()
+        self._offsets = array("q", [0])
+
+    def __len__(self) -> int:
+        """Cantidad de textos."""
+        return len(self._offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """Tamaño del buffer en bytes."""
+        return len(self._data)
+
+    @property
+    def frozen(self) -> bool:
+        """Indica si el buffer ya no admite más textos."""
+        return isinstance(self._data, bytes)
+
+    def append(self, text: str) -> int:
+        """Agrega un texto y retorna su número.
+
+        Raises:
+            ValueError: Si el buffer ya está congelado.
+        """
+        if self.frozen:
+            raise ValueError("El buffer de texto está congelado")
+        self._data += text.encode("utf-8")
+        self._offsets.append(len(self._data))
+        return len(self._offsets) - 2
+
+    def freeze(self) -> None:
+        """Congela el buffer (los textos ya no cambian de lugar)."""
+        if not self.frozen:
+            self._data = bytes(self._data)
+
+    def span(self, i: int) -> tuple[int, int]:
+        """Bytes ``(inicio, fin)`` del texto ``i``."""
+        return self._offsets[i], self._offsets[i + 1]
+
+    def length(self, i: int) -> int:
+        """Largo en bytes UTF-8 del texto ``i``."""
+        return self._offsets[i + 1] - self._offsets[i]
+
+    def view(self, i: int) -> memoryview:
+        """Bytes UTF-8 del texto ``i``, sin copiarlos (usar tras :meth:`freeze`)."""
+        return memoryview(self._data)[self._offsets[i] : self._offsets[i + 1]]
+
+    def text(self, i: int) -> str:
+        """Materializa el texto ``i``."""
+        with memoryview(self._data) as view:
+            return str(view[self._offsets[i] : self._offsets[i + 1]], "utf-8")
+
+    def digest(self, i: int, digest_size: int = 16) -> bytes:
+        """Hash BLAKE2b del texto ``i``, calculado sobre la vista."""
+        with memoryview(self._data) as view:
+            chunk = view[self._offsets[i] : self._offsets[i + 1]]
+            return hashlib.blake2b(chunk, digest_size=digest_size).digest()
+
+    def search(self, needle: str) -> list[int]:
+        """Números de los textos que contienen ``needle``.
+
+        Busca sobre el buffer completo, sin materializar cada texto.
+        """
+        pattern = needle.encode("utf-8")
+        if not pattern:
+            return list(range(len(self)))
+        hits: list[int] = []
+        data, offsets = self._data, self._offsets
+        pos = data.find(pattern)
+        while pos != -1:
+            i = bisect.bisect_right(offsets, pos) - 1
+            end = offsets[i + 1]
+            if pos + len(pattern) <= end:
+                hits.append(i)
+                pos = data.find(pattern, end)
+            else:
+                # La coincidencia cruza el límite con el texto siguiente
+                pos = data.find(pattern, pos + 1)
+        return hits
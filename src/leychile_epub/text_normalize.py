@@ -0,0 +1,385 @@
+"""
+Normalización de texto compartida por parsers y generadores.
+
+Reúne en un solo lugar las limpiezas de texto que antes estaban repartidas:
+
+- :func:`normalize_text`: la limpieza de ``BCNXMLParser._get_text``
+  (entidades HTML, espacios repetidos, líneas en blanco múltiples).
+- :func:`normalize_short`: lo mismo, con un LRU acotado para cadenas cortas
+  que se repiten mucho (organismos, materias, nombres de parte).
+- :func:`escape_html` y :func:`escape_html_preserve_links`: el escape de
+  ``LawEpubGenerator``.
+- :func:`unwrap_pdf_lines` y :func:`split_parrafos`: la reconstrucción de
+  párrafos de los parsers SUPERIR.
+
+Todos los patrones están precompilados y cada función sale temprano cuando
+el texto no tiene nada que cambiar (sin ``&``, sin espacios repetidos, sin
+caracteres especiales de HTML).
+
+Las funciones calientes pueden perfilarse con :func:`profile_text`, que
+cuenta llamadas, salidas por el camino rápido y tiempo acumulado:
+
+Example:
+    >>> with profile_text() as perfil:
+    ...     norma = parser.parse(root)
+    >>> print(perfil.report())
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from __future__ import annotations
+
+import functools
+import html
+import re
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+# Largo máximo de las cadenas que pasan por el LRU de normalize_short
+SHORT_MAX = 64
+DEFAULT_CACHE_SIZE = 4096
+
+_RE_ESPACIOS = re.compile(r"[ \t]+")
+_RE_LINEAS_VACIAS = re.compile(r"\n\s*\n")
+_RE_CROSS_REF = re.compile(r'(<a\s+href="[^"]*"\s+class="cross-ref">)(.*?)(</a>)')
+_RE_PREPOSICION_FINAL = re.compile(r"\b(?:el|la|los|las|del|al|en|de|un|una)\s*$", re.IGNORECASE)
+_RE_DOBLE_ESPACIO = re.compile(r"\s{2}")
+_RE_PARRAFO_COLAPSADO = re.compile(r"(?<=\.)\s{2}(?=[A-ZÁÉÍÓÚÑ])")
+
+
+# =============================================================================
+# Perfilado
+# =============================================================================
+
+
+@dataclass
+class TextProfile:
+    """Contadores de las funciones de normalización durante un perfilado.
+
+    Attributes:
+        calls: Llamadas por función.
+        unchanged: Llamadas en que el texto salió igual (salvo ``strip``),
+            es decir, las que aprovecharon el camino rápido.
+        seconds: Tiempo acumulado por función.
+        cache_hits: Aciertos del LRU de :func:`normalize_short`.
+        cache_misses: Fallos del LRU de :func:`normalize_short`.
+    """
+
+    calls: Counter[str] = field(default_factory=Counter)
+    unchanged: Counter[str] = field(default_factory=Counter)
+    seconds: dict[str, float] = field(default_factory=dict)
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Contadores como diccionario (para JSON)."""
+        return {
+            "funciones": {
+                name: {
+                    "llamadas": self.calls[name],
+                    "sin_cambios": self.unchanged[name],
+                    "segundos": round(self.seconds.get(name, 0.0), 6),
+                }
+                for name in sorted(self.calls)
+            },
+            "cache": {"aciertos": self.cache_hits, "fallos": self.cache_misses},
+        }
+
+    def report(self) -> str:
+        """Tabla legible de los contadores."""
+        lines = [f"{'función':<28} {'llamadas':>9} {'sin cambio':>10} {'ms':>9}"]
+        for name in sorted(self.calls, key=lambda n: -self.seconds.get(n, 0.0)):
+            lines.append(
+                f"{name:<28} {self.calls[name]:>9} {self.unchanged[name]:>10} "
+                f"{self.seconds.get(name, 0.0) * 1000:>9.2f}"
+            )
+        total = self.cache_hits + self.cache_misses
+        if total:
+            lines.append(
+                f"LRU normalize_short: {self.cache_hits}/{total} aciertos "
+                f"({100 * self.cache_hits / total:.0f}%)"
+            )
+        return "\n".join(lines)
+
+    def timed(self, name: str, func: Callable[..., Any], text: str, *args: Any) -> Any:
+        """Llama ``func(text, *args)`` registrando tiempo y si el texto cambió."""
+        start = time.perf_counter()
+        result = func(text, *args)
+        self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+        self.calls[name] += 1
+        stripped = text.strip()
+        if result == text or result == stripped or result == [stripped]:
+            self.unchanged[name] += 1
+        return result
+
+
+# Perfilado activo (None = sin perfilar; las funciones sólo comparan con None)
+_profile: TextProfile | None = None
+
+
+@contextmanager
+def profile_text() -> Iterator[TextProfile]:
+    """Perfila las funciones de normalización dentro del bloque ``with``.
+
+    Fuera de un perfilado las funciones sólo pagan una comparación con
+    ``None`` por llamada. Los perfilados no se anidan: el interior reemplaza
+    al exterior mientras dura.
+    """
+    global _profile
+    previous = _profile
+    profile = TextProfile()
+    info = _normalize_cached.cache_info() if _cache_enabled else None
+    _profile = profile
+    try:
+        yield profile
+    finally:
+        _profile = previous
+        if info is not None and _cache_enabled:
+            after = _normalize_cached.cache_info()
+            profile.cache_hits = max(after.hits - info.hits, 0)
+            profile.cache_misses = max(after.misses - info.misses, 0)
+
+
+# =============================================================================
+# Texto de los XML de la BCN
+# =============================================================================
+
+
+def _normalize(text: str) -> str:
+    if "&" in text:
+        text = html.unescape(text)
+    if "\t" in text or "  " in text:
+        text = _RE_ESPACIOS.sub(" ", text)
+    if text.count("\n") > 1:
+        text = _RE_LINEAS_VACIAS.sub("\n\n", text)
+    return text.strip()
+
+
+_normalize_cached = functools.lru_cache(maxsize=DEFAULT_CACHE_SIZE)(_normalize)
+_cache_enabled = True
+
+
+def _normalize_short(text: str) -> str:
+    if len(text) <= SHORT_MAX and _cache_enabled:
+        return _normalize_cached(text)
+    return _normalize(text)
+
+
+def normalize_text(text: str) -> str:
+    """Decodifica entidades HTML y normaliza espacios y líneas en blanco.
+
+    Colapsa espacios y tabs repetidos en un espacio y las líneas en blanco
+    múltiples en una sola, y recorta los extremos. Cada paso se salta si el
+    texto no tiene nada que cambiar.
+    """
+    if _profile is not None:
+        return _profile.timed("normalize_text", _normalize, text)
+    return _normalize(text)
+
+
+def normalize_short(text: str) -> str:
+    """Como :func:`normalize_text`, con LRU para cadenas de hasta ``SHORT_MAX``.
+
+    Pensada para valores que se repiten entre normas (organismos, materias,
+    tipo de norma). Los textos largos se normalizan sin pasar por el caché.
+    """
+    if _profile is not None:
+        return _profile.timed("normalize_short", _normalize_short, text)
+    return _normalize_short(text)
+
+
+def set_cache_size(maxsize: int) -> None:
+    """Redimensiona (o con ``0`` desactiva) el LRU de :func:`normalize_short`."""
+    global _normalize_cached, _cache_enabled
+    if maxsize < 0:
+        raise ValueError("El tamaño del caché no puede ser negativo")
+    _cache_enabled = maxsize > 0
+    _normalize_cached = functools.lru_cache(maxsize=maxsize)(_normalize)
+
+
+def clear_cache() -> None:
+    """Vacía el LRU de :func:`normalize_short`."""
+    _normalize_cached.cache_clear()
+
+
+# =============================================================================
+# Escape HTML para el ePub
+# =============================================================================
+
+
+def _escape_html(text: str) -> str:
+    if "&" not in text and "<" not in text and ">" not in text and '"' not in text:
+        return text
+    return (
+        text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+    )
+
+
+def _escape_html_preserve_links(text: str) -> str:
+    if "<a" not in text:
+        return _escape_html(text)
+    parts = []
+    last_end = 0
+    for match in _RE_CROSS_REF.finditer(text):
+        parts.append(_escape_html(text[last_end : match.start()]))
+        parts.append(match.group(1))
+        parts.append(_escape_html(match.group(2)))
+        parts.append(match.group(3))
+        last_end = match.end()
+    parts.append(_escape_html(text[last_end:]))
+    return "".join(parts)
+
+
+def escape_html(text: str) -> str:
+    """Escapa ``&``, ``<``, ``>`` y ``"`` (no toca el apóstrofo)."""
+    if not text:
+        return ""
+    if _profile is not None:
+        return _profile.timed("escape_html", _escape_html, text)
+    return _escape_html(text)
+
+
+def escape_html_preserve_links(text: str) -> str:
+    """Escapa HTML pero conserva los ``<a class="cross-ref">`` ya insertados."""
+    if not text:
+        return ""
+    if _profile is not None:
+        return _profile.timed("escape_html_preserve_links", _escape_html_preserve_links, text)
+    return _escape_html_preserve_links(text)
+
+
+# =============================================================================
+# Texto extraído de PDF (SUPERIR)
+# =============================================================================
+
+
+def unwrap_pdf_lines(text: str, is_new_unit: Callable[[str], bool]) -> str:
+    """Une líneas cortadas por el formato de columna del PDF.
+
+    Los PDFs legales tienen ancho de columna fijo (~70-80 chars), lo que
+    produce saltos de línea en medio de oraciones. Esta función:
+    1. Une líneas consecutivas que forman parte del mismo párrafo.
+    2. Preserva quiebres intencionales: líneas vacías y las líneas para las
+       que ``is_new_unit`` es verdadero (ítems, encabezados, artículos).
+    3. Inserta líneas vacías entre párrafos detectados (. + Mayúscula)
+       para que el XML generator los separe en <parrafo> distintos.
+    """
+    if not text:
+        return text
+    if _profile is not None:
+        return _profile.timed("unwrap_pdf_lines", _unwrap_pdf_lines, text, is_new_unit)
+    return _unwrap_pdf_lines(text, is_new_unit)
+
+
+def _unwrap_pdf_lines(text: str, is_new_unit: Callable[[str], bool]) -> str:
+    if "\n" not in text:
+        return text.strip()
+
+    result: list[str] = []
+
+    for line in text.split("\n"):
+        stripped = line.strip()
+
+        # Línea vacía = quiebre de párrafo
+        if not stripped:
+            result.append("")
+            continue
+
+        # Si hay línea previa no vacía, decidir si unir o separar
+        if result and result[-1]:
+            prev = result[-1].rstrip()
+
+            starts_new_para = False
+
+            # Nuevo elemento estructural → siempre separar
+            # SALVO que la línea previa termine en preposición/artículo
+            # (referencia inline: "contemplados en el\nCapítulo IV...")
+            if is_new_unit(stripped):
+                if prev and _RE_PREPOSICION_FINAL.search(prev):
+                    result[-1] = prev + " " + stripped
+                    continue
+                starts_new_para = True
+            # Terminador de oración + mayúscula → nuevo párrafo
+            elif prev and prev[-1] in ".;:" and stripped[0].isupper():
+                starts_new_para = True
+
+            if starts_new_para:
+                # Insertar línea vacía si no hay una ya
+                if result[-1] != "":
+                    result.append("")
+                result.append(stripped)
+                continue
+
+            # Continuación: unir con la línea anterior
+            result[-1] = prev + " " + stripped
+            continue
+
+        result.append(stripped)
+
+    return "\n".join(result)
+
+
+def split_parrafos(texto: str) -> list[str]:
+    """Divide texto en párrafos por líneas en blanco o doble espacio.
+
+    Dos modos (igual que _split_into_paragraphs del generador):
+    1. Texto con newlines → split por líneas en blanco.
+    2. Texto colapsado (sin newlines) → split por ". " + doble espacio + mayúscula.
+
+    Args:
+        texto: Texto con posibles líneas en blanco.
+
+    Returns:
+        Lista de párrafos no vacíos.
+    """
+    if not texto or not texto.strip():
+        return []
+    if _profile is not None:
+        return _profile.timed("split_parrafos", _split_parrafos, texto)
+    return _split_parrafos(texto)
+
+
+def _split_parrafos(texto: str) -> list[str]:
+    if "\n" not in texto and not _RE_DOBLE_ESPACIO.search(texto):
+        return [texto.strip()]
+
+    # Modo 1: split por líneas en blanco
+    parrafos: list[str] = []
+    current: list[str] = []
+
+    for line in texto.split("\n"):
+        stripped = line.strip()
+        if not stripped:
+            if current:
+                parrafos.append(" ".join(current))
+                current = []
+        else:
+            current.append(stripped)
+
+    if current:
+        parrafos.append(" ".join(current))
+
+    if len(parrafos) > 1:
+        # Post-procesamiento: fusionar párrafos espurios de page breaks del PDF.
+        # Si un párrafo NO termina en puntuación de cierre (.;:)) y el siguiente
+        # existe, son probablemente un corte de página, no párrafos reales.
+        merged: list[str] = [parrafos[0]]
+        for p in parrafos[1:]:
+            prev = merged[-1]
+            if prev and prev.rstrip()[-1:] not in ".;:)":
+                merged[-1] = prev + " " + p
+            else:
+                merged.append(p)
+        return merged
+
+    # Modo 2: texto colapsado → split por ". " + doble espacio + mayúscula
+    full_text = parrafos[0] if parrafos else texto.strip()
+    parts = _RE_PARRAFO_COLAPSADO.split(full_text)
+    if len(parts) > 1:
+        return [p.strip() for p in parts if p.strip()]
+
+    return [full_text] if full_text else []
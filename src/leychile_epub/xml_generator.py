@@ -23,7 +23,17 @@ from xml.etree import ElementTree as ET
 
 from lxml import etree
 
+from .parse_pool import BATCH_PER_WORKER, resolve_workers
+from .planner import PlannedFetch, plan_fetches
+from .profiling import ESCRITURA, RENDER, record_norma, span
+from .refresh import (
+    ESTADO_FALLIDA,
+    MANIFEST_FILENAME,
+    IncrementalRefresher,
+    VersionManifest,
+)
 from .scraper_v2 import BCNLawScraperV2, EstructuraFuncional, Norma
+from .snapshot import as_norma
 
 logger = logging.getLogger("leychile_epub.xml_generator")
 
@@ -94,48 +104,53 @@ class LawXMLGenerator:
 
     def generate(
         self,
-        norma: Norma,
+        norma: Norma | str | Path,
         output_dir: str = ".",
         filename: str | None = None,
     ) -> Path:
         """Genera un archivo XML desde un objeto Norma.
 
         Args:
-            norma: Objeto Norma con los datos de la ley.
+            norma: Objeto Norma con los datos de la ley o ruta de un snapshot
+                (ver :mod:`leychile_epub.snapshot`).
             output_dir: Directorio de salida.
             filename: Nombre del archivo (opcional).
 
         Returns:
             Path al archivo XML generado.
         """
-        # Crear elemento raíz
-        root = self._create_root(norma)
+        norma = as_norma(norma)
 
-        # Agregar metadatos
-        self._add_metadata(root, norma)
+        with span(RENDER):
+            # Crear elemento raíz
+            root = self._create_root(norma)
 
-        # Agregar encabezado si existe
-        if norma.encabezado_texto or norma.vistos_texto or norma.considerandos_texto:
-            self._add_encabezado(root, norma)
+            # Agregar metadatos
+            self._add_metadata(root, norma)
 
-        # Agregar contenido estructurado
-        self._add_contenido(root, norma)
+            # Agregar encabezado si existe
+            if norma.encabezado_texto or norma.vistos_texto or norma.considerandos_texto:
+                self._add_encabezado(root, norma)
 
-        # Agregar promulgación (BCN) o disposiciones finales (SUPERIR)
-        if norma.disposiciones_finales_texto:
-            self._add_disposiciones_finales(root, norma)
-        elif norma.promulgacion_texto:
-            self._add_promulgacion(root, norma)
+            # Agregar contenido estructurado
+            self._add_contenido(root, norma)
 
-        # Agregar anexos si existen
-        if norma.anexos:
-            self._add_anexos(root, norma)
+            # Agregar promulgación (BCN) o disposiciones finales (SUPERIR)
+            if norma.disposiciones_finales_texto:
+                self._add_disposiciones_finales(root, norma)
+            elif norma.promulgacion_texto:
+                self._add_promulgacion(root, norma)
+
+            # Agregar anexos si existen
+            if norma.anexos:
+                self._add_anexos(root, norma)
 
         # Generar nombre de archivo
         output_path = self._get_output_path(norma, output_dir, filename)
 
         # Escribir archivo con formato bonito
-        self._write_xml(root, output_path)
+        with span(ESCRITURA):
+            self._write_xml(root, output_path)
 
         logger.info(f"XML generado: {output_path}")
         return output_path
@@ -728,6 +743,7 @@ class BibliotecaXMLGenerator:
         output_dir: str = "./biblioteca_legal",
         nombre: str = "Biblioteca Legal Chilena",
         generar_indice: bool = True,
+        incremental: bool = False,
     ) -> dict[str, Any]:
         """Genera una biblioteca de leyes en XML.
 
@@ -736,6 +752,13 @@ class BibliotecaXMLGenerator:
             output_dir: Directorio de salida.
             nombre: Nombre de la biblioteca.
             generar_indice: Si genera archivo de índice.
+            incremental: Si es True, sólo regenera las leyes cuya versión en la
+                BCN cambió desde la corrida anterior (manifiesto en
+                ``output_dir``, ver :mod:`leychile_epub.refresh`).
+
+        Si ``config.scraper.parse_workers`` es distinto de 1 (y no es una
+        corrida incremental), las normas se descargan por grupos y cada grupo
+        se parsea en un pool de procesos.
 
         Returns:
             Diccionario con resultados de la generación.
@@ -753,42 +776,88 @@ class BibliotecaXMLGenerator:
             "leyes": [],
             "exitosas": 0,
             "fallidas": 0,
+            "sin_cambios": 0,
         }
 
+        refresher = None
+        if incremental:
+            refresher = IncrementalRefresher(
+                self.generator.scraper, VersionManifest(output_path / MANIFEST_FILENAME)
+            )
+
         logger.info(f"Generando biblioteca: {nombre}")
         logger.info(f"Total de leyes: {len(leyes)}")
 
-        for key, info in leyes.items():
-            logger.info(f"Procesando: {info['nombre']}")
-
-            try:
-                xml_path = self.generator.generate_from_url(
-                    url=info["url"],
-                    output_dir=str(output_path),
-                    filename=key,
+        # Una descarga por norma aunque varias claves apunten a ella
+        plan = plan_fetches(leyes.items(), lambda item: item[1]["url"], self.generator.scraper)
+        resultados["plan"] = plan.to_dict()
+        logger.info(f"Plan: {plan.summary()}")
+
+        entradas: dict[str, dict[str, Any]] = {}
+        for (key, info), error in plan.invalid:
+            entradas[key] = self._resultado_fallido(key, info, error)
+
+        # Con parse_workers != 1 se descarga por grupos y cada grupo se parsea
+        # en paralelo (ver BCNLawScraperV2.scrape_batch)
+        scraper_config = self.generator.scraper.config.scraper
+        workers = resolve_workers(scraper_config.parse_workers, len(plan.fetches))
+        en_lote = (
+            refresher is None and scraper_config.parse_workers != 1 and not scraper_config.streaming
+        )
+        grupo_size = workers * BATCH_PER_WORKER if en_lote else max(len(plan.fetches), 1)
+
+        for inicio in range(0, len(plan.fetches), grupo_size):
+            grupo = plan.fetches[inicio : inicio + grupo_size]
+            parseadas = (
+                self.generator.scraper.scrape_batch([f.url for f in grupo], workers)
+                if en_lote
+                else None
+            )
+
+            for j, fetch in enumerate(grupo):
+                logger.info(
+                    f"Procesando: {', '.join(info['nombre'] for _, info in fetch.outputs)}"
                 )
 
-                resultados["leyes"].append({
-                    "clave": key,
-                    "nombre": info["nombre"],
-                    "descripcion": info.get("descripcion", ""),
-                    "url": info["url"],
-                    "archivo": xml_path.name,
-                    "estado": "exitoso",
-                })
-                resultados["exitosas"] += 1
-                logger.info(f"  ✓ Generado: {xml_path.name}")
-
-            except Exception as e:
-                resultados["leyes"].append({
-                    "clave": key,
-                    "nombre": info["nombre"],
-                    "url": info["url"],
-                    "estado": "fallido",
-                    "error": str(e),
-                })
-                resultados["fallidas"] += 1
-                logger.error(f"  ✗ Error: {e}")
+                with record_norma(fetch.url):
+                    try:
+                        if refresher is not None:
+                            xml_paths, regenerada = self._refresh_leyes(refresher, fetch, output_path)
+                            if not regenerada:
+                                resultados["sin_cambios"] += len(fetch.outputs)
+                        else:
+                            if parseadas is not None:
+                                if parseadas[j].error is not None:
+                                    raise parseadas[j].error
+                                norma = parseadas[j].norma
+                            else:
+                                norma = self.generator.scraper.scrape(fetch.url)
+                            xml_paths = [
+                                self.generator.generate(norma, str(output_path), key)
+                                for key, _info in fetch.outputs
+                            ]
+
+                    except Exception as e:
+                        for key, info in fetch.outputs:
+                            entradas[key] = self._resultado_fallido(key, info, str(e))
+                        logger.error(f"  ✗ Error: {e}")
+                        continue
+
+                for (key, info), xml_path in zip(fetch.outputs, xml_paths, strict=True):
+                    entradas[key] = {
+                        "clave": key,
+                        "nombre": info["nombre"],
+                        "descripcion": info.get("descripcion", ""),
+                        "url": info["url"],
+                        "archivo": xml_path.name,
+                        "estado": "exitoso",
+                    }
+                    logger.info(f"  ✓ Generado: {xml_path.name}")
+
+        # Resultados en el orden del catálogo
+        resultados["leyes"] = [entradas[key] for key in leyes if key in entradas]
+        resultados["exitosas"] = sum(1 for e in resultados["leyes"] if e["estado"] == "exitoso")
+        resultados["fallidas"] = len(resultados["leyes"]) - resultados["exitosas"]
 
         # Generar índice
         if generar_indice:
@@ -803,6 +872,51 @@ class BibliotecaXMLGenerator:
 
         return resultados
 
+    @staticmethod
+    def _resultado_fallido(key: str, info: dict[str, str], error: str) -> dict[str, Any]:
+        return {
+            "clave": key,
+            "nombre": info["nombre"],
+            "url": info["url"],
+            "estado": "fallido",
+            "error": error,
+        }
+
+    def _refresh_leyes(
+        self,
+        refresher: IncrementalRefresher,
+        fetch: PlannedFetch,
+        output_path: Path,
+    ) -> tuple[list[Path], bool]:
+        """Genera las leyes de una descarga sólo si su versión cambió.
+
+        Returns:
+            Tupla (rutas de los XML vigentes, si se regeneraron).
+
+        Si el manifiesto registra otras salidas para la norma (por ejemplo,
+        el lote agrega un alias de una norma ya generada), se regenera.
+
+        Raises:
+            RuntimeError: Si la actualización falló.
+        """
+        esperadas = [
+            output_path / (key if key.endswith(".xml") else f"{key}.xml")
+            for key, _info in fetch.outputs
+        ]
+        resultado = refresher.refresh(
+            fetch.url,
+            lambda norma: [
+                self.generator.generate(norma, str(output_path), key)
+                for key, _info in fetch.outputs
+            ],
+            outputs=esperadas,
+        )
+        if resultado.estado == ESTADO_FALLIDA:
+            raise RuntimeError(resultado.error)
+        if not resultado.regenerada:
+            logger.info(f"  = Sin cambios (versión {resultado.fecha_version})")
+        return [Path(p) for p in resultado.outputs], resultado.regenerada
+
     def _generate_index(self, resultados: dict[str, Any], output_dir: Path) -> Path:
         """Genera el archivo de índice de la biblioteca.
 
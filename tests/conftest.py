@@ -0,0 +1,189 @@
+"""
+Configuración compartida de pytest: presupuestos de rendimiento.
+
+Los tests marcados con ``@pytest.mark.perf`` usan el fixture ``perf_budget``
+para medir una etapa y compararla con su presupuesto guardado en
+``tests/perf_budgets.json``. Cada muestra repite la etapa las veces necesarias
+para durar al menos ``--perf-min-ms``, de modo que incluso las etapas de pocos
+milisegundos queden por sobre el ruido del sistema; se guarda el mejor tiempo
+por llamada y el pico de memoria de una llamada (``tracemalloc``). El tiempo
+se expresa en unidades de una rutina de calibración que se mide junto con
+cada muestra, para que el presupuesto no dependa de la velocidad de la máquina.
+
+Opciones:
+    --perf-update       Regraba los presupuestos con lo medido.
+    --perf-tolerance    Exceso de tiempo tolerado (default 0.5; el doble falla).
+    --perf-mem-tolerance  Exceso de memoria tolerado (default 0.25).
+    --perf-min-ms       Duración mínima de cada muestra (default 100).
+
+Los tests de rendimiento se omiten con ``-m "not perf"``.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import json
+import math
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+BUDGETS_PATH = Path(__file__).parent / "perf_budgets.json"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("perf", "presupuestos de rendimiento")
+    group.addoption(
+        "--perf-update",
+        action="store_true",
+        help="Regrabar tests/perf_budgets.json con los valores medidos",
+    )
+    group.addoption(
+        "--perf-tolerance",
+        type=float,
+        default=0.5,
+        help="Exceso de tiempo tolerado sobre el presupuesto (default: %(default)s)",
+    )
+    group.addoption(
+        "--perf-mem-tolerance",
+        type=float,
+        default=0.25,
+        help="Exceso de memoria tolerado sobre el presupuesto (default: %(default)s)",
+    )
+    group.addoption(
+        "--perf-min-ms",
+        type=float,
+        default=100.0,
+        help="Duración mínima (ms) de cada muestra de tiempo (default: %(default)s)",
+    )
+
+
+def _calibration_workload() -> int:
+    """Trabajo fijo en Python puro (cadenas, dicts y listas, como un parser)."""
+    index: dict[str, int] = {}
+    for i in range(60_000):
+        key = f"art{i % 5000}".upper().replace("ART", "a")
+        index[key] = index.get(key, 0) + len(key.split("a"))
+    return sum(index.values())
+
+
+class PerfBudgets:
+    """Presupuestos guardados y mediciones de la sesión.
+
+    Attributes:
+        calibration_ms: Duración de la rutina de calibración al inicio de la sesión.
+        budgets: Presupuestos por ``norma::etapa``.
+        measured: Mediciones de esta sesión (se guardan con ``--perf-update``).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        update: bool,
+        tolerance: float,
+        mem_tolerance: float,
+        min_ms: float = 100.0,
+    ):
+        self.path = path
+        self.update = update
+        self.tolerance = tolerance
+        self.mem_tolerance = mem_tolerance
+        self.min_ms = min_ms
+        data = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        self.budgets: dict[str, dict[str, float]] = data.get("presupuestos", {})
+        self.measured: dict[str, dict[str, float]] = {}
+        self.calibration_ms = self._calibrate()
+
+    @staticmethod
+    def _calibrate(repeat: int = 5) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _calibration_workload()
+            best = min(best, time.perf_counter() - start)
+        return best * 1000
+
+    def measure(
+        self, norma: str, etapa: str, func: Callable[[], Any], repeat: int = 5
+    ) -> dict[str, float]:
+        """Mide ``func`` y falla si supera su presupuesto más la tolerancia.
+
+        Cada muestra va precedida de una corrida de la rutina de calibración,
+        así la conversión a unidades usa la velocidad que tenía la máquina
+        durante la medición y no la del inicio de la sesión.
+        """
+        func()  # calentamiento (imports, cachés)
+        start = time.perf_counter()
+        func()
+        veces = max(1, math.ceil(self.min_ms / 1000 / (time.perf_counter() - start)))
+
+        best = calibration_ms = float("inf")
+        for _ in range(repeat):
+            calibration_ms = min(calibration_ms, self._calibrate(repeat=1))
+            start = time.perf_counter()
+            for _ in range(veces):
+                func()
+            best = min(best, (time.perf_counter() - start) / veces)
+
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        key = f"{norma}::{etapa}"
+        medido = {"tiempo": round(best * 1000 / calibration_ms, 4), "memoria": peak}
+        self.measured[key] = medido
+        if self.update:
+            return medido
+
+        budget = self.budgets.get(key)
+        if budget is None:
+            pytest.fail(f"{key} no tiene presupuesto; correr pytest --perf-update")
+        limite_tiempo = budget["tiempo"] * (1 + self.tolerance)
+        limite_memoria = budget["memoria"] * (1 + self.mem_tolerance)
+        assert medido["tiempo"] <= limite_tiempo, (
+            f"{key}: {best * 1000:.2f} ms = {medido['tiempo']} unidades de calibración, "
+            f"presupuesto {budget['tiempo']} (+{self.tolerance:.0%})"
+        )
+        assert medido["memoria"] <= limite_memoria, (
+            f"{key}: pico de {peak / 1e6:.2f} MB, presupuesto "
+            f"{budget['memoria'] / 1e6:.2f} MB (+{self.mem_tolerance:.0%})"
+        )
+        return medido
+
+    def save(self) -> None:
+        """Guarda los presupuestos (los no medidos en esta sesión se conservan)."""
+        presupuestos = {**self.budgets, **self.measured}
+        data = {
+            "nota": "Tiempo en unidades de la rutina de calibración de tests/conftest.py; "
+            "memoria en bytes (pico de tracemalloc). Regrabar con pytest --perf-update.",
+            "calibracion_ms": round(self.calibration_ms, 3),
+            "presupuestos": dict(sorted(presupuestos.items())),
+        }
+        self.path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", "utf-8")
+
+
+@pytest.fixture(scope="session")
+def perf_budgets(request: pytest.FixtureRequest) -> Any:
+    config = request.config
+    budgets = PerfBudgets(
+        BUDGETS_PATH,
+        update=config.getoption("--perf-update"),
+        tolerance=config.getoption("--perf-tolerance"),
+        mem_tolerance=config.getoption("--perf-mem-tolerance"),
+        min_ms=config.getoption("--perf-min-ms"),
+    )
+    yield budgets
+    if budgets.update and budgets.measured:
+        budgets.save()
+
+
+@pytest.fixture
+def perf_budget(perf_budgets: PerfBudgets) -> Callable[..., dict[str, float]]:
+    """Mide una etapa contra su presupuesto: ``perf_budget(norma, etapa, func)``."""
+    return perf_budgets.measure
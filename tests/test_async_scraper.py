@@ -0,0 +1,174 @@
+"""
+Tests unitarios para el scraper asíncrono.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from leychile_epub.async_scraper import AsyncBCNLawScraper, ScrapeResult, scrape_many
+from leychile_epub.config import Config
+from leychile_epub.exceptions import NetworkError, ParsingError, ValidationError
+from leychile_epub.scraper_v2 import BCNLawScraperV2
+
+SAMPLE_XML = """<?xml version="1.0" encoding="utf-8"?>
+<Norma xmlns="http://www.leychile.cl/esquemas" normaId="{id}" fechaVersion="2024-01-01">
+  <Identificador fechaPromulgacion="2024-01-01" fechaPublicacion="2024-01-02">
+    <TiposNumeros><TipoNumero><Tipo>Ley</Tipo><Numero>{id}</Numero></TipoNumero></TiposNumeros>
+  </Identificador>
+  <Metadatos><TituloNorma>LEY {id}</TituloNorma></Metadatos>
+  <EstructurasFuncionales>
+    <EstructuraFuncional idParte="1" tipoParte="Artículo">
+      <Texto>Artículo 1.- Texto de prueba.</Texto>
+      <Metadatos><NombreParte presente="si">1</NombreParte></Metadatos>
+    </EstructuraFuncional>
+  </EstructurasFuncionales>
+</Norma>
+"""
+
+
+def _url(id_norma: str) -> str:
+    return f"https://www.leychile.cl/Navegar?idNorma={id_norma}"
+
+
+@pytest.fixture
+def config():
+    config = Config()
+    config.scraper.rate_limit_delay = 0
+    config.scraper.max_concurrency = 4
+    return config
+
+
+@pytest.fixture
+def scraper(config, monkeypatch):
+    scraper = AsyncBCNLawScraper(config)
+
+    def fake_download(url: str) -> bytes:
+        id_norma = url.rsplit("=", 1)[1]
+        if id_norma == "500":
+            raise NetworkError("Error HTTP al acceder a la BCN", url=url, status_code=500)
+        if id_norma == "666":
+            return b"<Norma><sin cerrar>"
+        time.sleep(0.01)
+        return SAMPLE_XML.format(id=id_norma).encode("utf-8")
+
+    monkeypatch.setattr(scraper.scraper, "_download", fake_download)
+    yield scraper
+    scraper.close()
+
+
+class TestAsyncBCNLawScraper:
+    """Tests para AsyncBCNLawScraper."""
+
+    def test_default_concurrency_from_config(self, config):
+        scraper = AsyncBCNLawScraper(config)
+        assert scraper.max_concurrency == 4
+        scraper.close()
+
+    def test_scrape_single(self, scraper):
+        norma = asyncio.run(scraper.scrape(_url("123")))
+        assert norma.norma_id == "123"
+        assert norma.url_original == _url("123")
+        assert norma.estructuras[0].nombre_parte == "1"
+
+    def test_same_result_as_sync_parser(self, scraper):
+        norma = asyncio.run(scraper.scrape(_url("42")))
+        sync = BCNLawScraperV2(scraper.config)
+        root = sync._parse_xml(SAMPLE_XML.format(id="42").encode("utf-8"), "test")
+        assert norma == sync._build_norma(root, _url("42"), None)
+
+    def test_scrape_all_preserves_order(self, scraper):
+        ids = [str(i) for i in range(1, 9)]
+        resultados = scraper.scrape_all(_url(i) for i in ids)
+        assert [r.norma.norma_id for r in resultados] == ids
+        assert all(isinstance(r, ScrapeResult) and r.ok for r in resultados)
+
+    def test_errors_are_reported_per_url(self, scraper):
+        resultados = scraper.scrape_all([_url("1"), _url("500"), _url("666"), _url("2")])
+        assert [r.ok for r in resultados] == [True, False, False, True]
+        assert isinstance(resultados[1].error, NetworkError)
+        assert resultados[1].error.status_code == 500
+        assert isinstance(resultados[2].error, ParsingError)
+
+    def test_invalid_url_raises_validation_error(self, scraper):
+        with pytest.raises(ValidationError):
+            asyncio.run(scraper.scrape("https://www.leychile.cl/Navegar"))
+
+    def test_concurrency_cap(self, config, monkeypatch):
+        config.scraper.max_concurrency = 2
+        scraper = AsyncBCNLawScraper(config)
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def fake_download(url: str) -> bytes:
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return SAMPLE_XML.format(id=url.rsplit("=", 1)[1]).encode("utf-8")
+
+        monkeypatch.setattr(scraper.scraper, "_download", fake_download)
+        resultados = scraper.scrape_all(_url(str(i)) for i in range(8))
+        scraper.close()
+
+        assert all(r.ok for r in resultados)
+        assert state["peak"] == 2
+
+    def test_rate_limiter_spaces_network_requests(self, config, monkeypatch):
+        config.scraper.rate_limit_delay = 0.05
+        scraper = AsyncBCNLawScraper(config)
+        starts: list[float] = []
+
+        class Response:
+            status_code = 200
+            headers: dict = {}
+
+            def __init__(self, url):
+                self.content = SAMPLE_XML.format(id=url.rsplit("=", 1)[1]).encode("utf-8")
+
+            def raise_for_status(self):
+                pass
+
+        def fake_get(url, timeout=None, headers=None, stream=False):
+            starts.append(time.monotonic())
+            return Response(url)
+
+        monkeypatch.setattr(scraper.scraper.session, "get", fake_get)
+        scraper.scrape_all(_url(str(i)) for i in range(4))
+        scraper.close()
+
+        starts.sort()
+        gaps = [b - a for a, b in zip(starts, starts[1:], strict=False)]
+        assert min(gaps) >= 0.04
+
+    def test_scrape_many_yields_as_completed(self, scraper):
+        async def collect():
+            return [r.index async for r in scraper.scrape_many([_url("1"), _url("2")])]
+
+        assert sorted(asyncio.run(collect())) == [0, 1]
+
+    def test_early_exit_awaits_cancelled_tasks(self, scraper):
+        async def first():
+            resultados = scraper.scrape_many([_url(str(i)) for i in range(1, 9)])
+            resultado = await anext(resultados)
+            await resultados.aclose()
+            return resultado, asyncio.all_tasks() - {asyncio.current_task()}
+
+        resultado, pendientes = asyncio.run(first())
+        assert resultado.ok
+        assert pendientes == set()
+
+    def test_convenience_function(self, config, monkeypatch):
+        monkeypatch.setattr(
+            BCNLawScraperV2,
+            "_download",
+            lambda self, url: SAMPLE_XML.format(id=url.rsplit("=", 1)[1]).encode("utf-8"),
+        )
+        resultados = scrape_many([_url("7")], config)
+        assert resultados[0].norma.norma_id == "7"
@@ -0,0 +1,56 @@
+"""
+Tests unitarios para los fixtures en formato BCN.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+import pytest
+
+from leychile_epub.bcn_fixtures import ley_xml_to_bcn_xml, norma_from_ley_xml, norma_to_bcn_xml
+from leychile_epub.scraper_v2 import BCNXMLParser, create_parser
+
+from .test_scraper_v2 import STREAM_XML
+
+BIBLIOTECA = Path(__file__).parent.parent / "biblioteca_xml"
+LEY_PEQUENA = BIBLIOTECA / "leyes" / "ley_3918_sociedades_responsabilidad_limitada.xml"
+
+
+class TestNormaToBcnXml:
+    """Tests para la serialización Norma → obtxml."""
+
+    def test_roundtrip(self):
+        parser = BCNXMLParser()
+        norma = parser.parse(ET.fromstring(STREAM_XML))
+        assert parser.parse(ET.fromstring(norma_to_bcn_xml(norma))) == norma
+
+    def test_uses_bcn_namespace(self):
+        parser = BCNXMLParser()
+        xml = norma_to_bcn_xml(parser.parse(ET.fromstring(STREAM_XML)))
+        assert xml.startswith(b"<?xml")
+        assert ET.fromstring(xml).tag == "{http://www.leychile.cl/esquemas}Norma"
+
+
+@pytest.mark.skipif(not LEY_PEQUENA.exists(), reason="biblioteca_xml no disponible")
+class TestLeyXmlConversion:
+    """Tests para la conversión desde la biblioteca ley_v1."""
+
+    def test_reads_biblioteca_xml(self):
+        norma = norma_from_ley_xml(LEY_PEQUENA)
+        assert norma.norma_id
+        assert norma.identificador.tipo
+        assert norma.estructuras
+
+    def test_bcn_xml_parses_to_same_norma(self):
+        norma = norma_from_ley_xml(LEY_PEQUENA)
+        parsed = BCNXMLParser().parse(ET.fromstring(ley_xml_to_bcn_xml(LEY_PEQUENA)))
+        parsed.url_original = norma.url_original
+        assert parsed == norma
+
+    def test_lxml_backend_identical_on_biblioteca(self):
+        xml = ley_xml_to_bcn_xml(LEY_PEQUENA)
+        etree_parser, lxml_parser = create_parser("etree"), create_parser("lxml")
+        expected = etree_parser.parse(etree_parser.fromstring(xml))
+        assert lxml_parser.parse(lxml_parser.fromstring(xml)) == expected
@@ -0,0 +1,123 @@
+"""
+Tests unitarios para los benchmarks sobre los corpus del repositorio.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from leychile_epub.bench import (
+    DEFAULT_CASES,
+    CaseResult,
+    Corpus,
+    compare_reports,
+    percentile,
+    run_bench,
+)
+from leychile_epub.cli import main
+from leychile_epub.exceptions import ValidationError
+
+ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture(scope="module")
+def report():
+    return run_bench(ROOT, repeat=1, limit=1)
+
+
+class TestPercentile:
+    """Tests para percentile."""
+
+    def test_interpolates(self):
+        assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+        assert percentile([4.0, 1.0], 0) == 1.0
+        assert percentile([4.0, 1.0], 100) == 4.0
+
+    def test_empty(self):
+        assert percentile([], 99) == 0.0
+
+    def test_case_result_throughput(self):
+        result = CaseResult("x", items=2, nbytes=2_000_000, articles=10, seconds=0.5)
+        assert result.mb_per_s == 4.0
+        assert result.articles_per_s == 20.0
+        assert CaseResult("vacio").mb_per_s == 0.0
+
+
+class TestCorpus:
+    """Tests para Corpus."""
+
+    def test_repository_corpus(self):
+        corpus = Corpus(ROOT)
+        assert corpus.leyes()
+        assert corpus.superir()
+        assert corpus.suseso_textos()
+        assert set(corpus.leyes()).isdisjoint(corpus.superir())
+
+    def test_fingerprint_is_stable(self):
+        assert Corpus(ROOT).fingerprint() == Corpus(ROOT).fingerprint()
+
+    def test_missing_corpus(self, tmp_path):
+        with pytest.raises(ValidationError):
+            Corpus(tmp_path)
+
+
+class TestRunBench:
+    """Tests para run_bench."""
+
+    def test_all_cases(self, report):
+        assert [case.name for case in report.cases] == list(DEFAULT_CASES)
+        for case in report.cases:
+            assert case.items >= 1
+            assert case.seconds > 0
+            assert case.peak_memory is not None
+        parse = report.cases[0]
+        assert parse.articles > 0
+        assert parse.percentile(50) <= parse.percentile(99)
+
+    def test_xsd_counts_invalid(self, report):
+        xsd = next(case for case in report.cases if case.name == "xsd")
+        assert "invalidos" in xsd.notes
+
+    def test_report_json(self, report):
+        data = json.loads(report.to_json())
+        assert data["formato"] == 1
+        assert data["repeticiones"] == 1
+        assert set(data["casos"]) == set(DEFAULT_CASES)
+        assert set(data["casos"]["parse"]["latencia_ms"]) == {"p50", "p90", "p99", "max"}
+        assert data["corpus"] == Corpus(ROOT).fingerprint()
+
+    def test_unknown_case(self):
+        with pytest.raises(ValidationError):
+            run_bench(ROOT, cases=["nada"])
+
+    def test_compare_reports(self, report):
+        data = report.to_dict()
+        comparacion = compare_reports(data, data)
+        assert comparacion["parse"] == {"mb_s": 1.0, "p50": 1.0}
+
+        otro = json.loads(report.to_json())
+        otro["corpus"]["sha1"] = "distinto"
+        with pytest.raises(ValidationError):
+            compare_reports(data, otro)
+
+
+class TestBenchCommand:
+    """Tests del subcomando bench."""
+
+    def test_bench_command(self, tmp_path, capsys):
+        salida = tmp_path / "bench.json"
+        args = ["bench", "--root", str(ROOT), "--cases", "parse", "--limit", "1", "--repeat", "1"]
+
+        assert main([*args, "--no-memory", "-o", str(salida)]) == 0
+        assert main([*args, "--baseline", str(salida)]) == 0
+
+        data = json.loads(salida.read_text(encoding="utf-8"))
+        assert data["casos"]["parse"]["memoria_pico"] is None
+        assert "parse" in capsys.readouterr().out
+
+    def test_bench_command_unknown_case(self, capsys):
+        assert main(["bench", "--root", str(ROOT), "--cases", "nada"]) == 1
+        assert "desconocido" in capsys.readouterr().out
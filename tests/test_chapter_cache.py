@@ -0,0 +1,216 @@
+"""
+Tests unitarios para la regeneración incremental de capítulos.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import copy
+import json
+import zipfile
+
+import pytest
+
+from leychile_epub.chapter_cache import ChapterCache, chapter_key, manifest_path
+from leychile_epub.generator_v2 import EPubConfig, EPubGeneratorV2
+from leychile_epub.scraper_v2 import EstructuraFuncional
+
+from .test_generator_v2 import sample_norma  # noqa: F401
+
+
+def _titulo(i: int, texto: str = "Texto del artículo.") -> EstructuraFuncional:
+    return EstructuraFuncional(
+        id_parte=f"t{i}",
+        tipo_parte="Título",
+        titulo_parte=f"TÍTULO {i}",
+        hijos=[
+            EstructuraFuncional(
+                id_parte=f"t{i}_{j}", tipo_parte="Artículo", nombre_parte=str(j), texto=texto
+            )
+            for j in range(3)
+        ],
+    )
+
+
+@pytest.fixture
+def norma(sample_norma):  # noqa: F811
+    sample_norma.estructuras = sample_norma.estructuras + [_titulo(i) for i in range(5)]
+    return sample_norma
+
+
+@pytest.fixture(autouse=True)
+def _sin_source_date_epoch(monkeypatch):
+    monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+
+
+def _generator(**kwargs) -> EPubGeneratorV2:
+    return EPubGeneratorV2(EPubConfig(incremental=True, reproducible=True, **kwargs))
+
+
+class TestChapterKey:
+    """Tests para chapter_key."""
+
+    def test_depends_on_subtree_and_config(self):
+        base = chapter_key("a", _titulo(1))
+        assert chapter_key("a", _titulo(1)) == base
+        assert chapter_key("b", _titulo(1)) != base
+        assert chapter_key("a", _titulo(1, "Otro texto.")) != base
+
+
+class TestChapterCache:
+    """Tests para abrir el ePub anterior."""
+
+    def test_without_manifest(self, norma, tmp_path):
+        EPubGeneratorV2().generate(norma, tmp_path / "a.epub")
+        assert ChapterCache.open(tmp_path / "a.epub", "x") is None
+
+    def test_other_config(self, norma, tmp_path):
+        generator = _generator()
+        generator.generate(norma, tmp_path / "a.epub")
+        assert ChapterCache.open(tmp_path / "a.epub", "otra") is None
+        with ChapterCache.open(tmp_path / "a.epub", generator.config_hash()) as cache:
+            assert len(cache) == len(norma.estructuras)
+
+    def test_invalid_manifest(self, norma, tmp_path):
+        generator = _generator()
+        generator.generate(norma, tmp_path / "a.epub")
+        manifest_path(tmp_path / "a.epub").write_text("{", encoding="utf-8")
+        assert ChapterCache.open(tmp_path / "a.epub", generator.config_hash()) is None
+
+
+class TestIncrementalGenerate:
+    """Tests para EPubGeneratorV2 con incremental=True."""
+
+    def test_first_build_writes_manifest(self, norma, tmp_path):
+        generator = _generator()
+        generator.generate(norma, tmp_path / "a.epub")
+        assert generator.copied_chapters == 0
+        data = json.loads(manifest_path(tmp_path / "a.epub").read_text(encoding="utf-8"))
+        assert data["config"] == generator.config_hash()
+        assert len(data["capitulos"]) == len(norma.estructuras)
+
+    def test_copies_unchanged_chapters(self, norma, tmp_path):
+        generator = _generator()
+        generator.generate(norma, tmp_path / "a.epub")
+        nueva = copy.deepcopy(norma)
+        nueva.estructuras[-1].hijos[0].texto = "Texto modificado."
+        generator.generate(nueva, tmp_path / "a.epub")
+        assert generator.copied_chapters == len(norma.estructuras) - 1
+
+        _generator().generate(nueva, tmp_path / "completo.epub")
+        assert (tmp_path / "a.epub").read_bytes() == (tmp_path / "completo.epub").read_bytes()
+
+    def test_inserted_chapter_shifts_filenames(self, norma, tmp_path):
+        generator = _generator()
+        generator.generate(norma, tmp_path / "a.epub")
+        nueva = copy.deepcopy(norma)
+        nueva.estructuras.insert(0, _titulo(99))
+        generator.generate(nueva, tmp_path / "a.epub")
+        assert generator.copied_chapters == len(norma.estructuras)
+
+        _generator().generate(nueva, tmp_path / "completo.epub")
+        assert (tmp_path / "a.epub").read_bytes() == (tmp_path / "completo.epub").read_bytes()
+
+    def test_split_chapters(self, norma, tmp_path):
+        generator = _generator(max_chapter_articles=1)
+        generator.generate(norma, tmp_path / "a.epub")
+        data = json.loads(manifest_path(tmp_path / "a.epub").read_text(encoding="utf-8"))
+        assert "chapter_008_03.xhtml" in data["capitulos"]
+
+        nueva = copy.deepcopy(norma)
+        nueva.estructuras.insert(0, _titulo(99))
+        generator.generate(nueva, tmp_path / "a.epub")
+        assert generator.copied_chapters == len(norma.estructuras)
+        _generator(max_chapter_articles=1).generate(nueva, tmp_path / "completo.epub")
+        assert (tmp_path / "a.epub").read_bytes() == (tmp_path / "completo.epub").read_bytes()
+
+    def test_repeated_chapter(self, norma, tmp_path):
+        norma.estructuras.append(copy.deepcopy(norma.estructuras[-1]))
+        generator = _generator(max_chapter_articles=1)
+        generator.generate(norma, tmp_path / "a.epub")
+        with ChapterCache.open(tmp_path / "a.epub", generator.config_hash()) as cache:
+            assert len(cache.get(chapter_key(generator.config_hash(), _titulo(4)))) == 3
+
+    def test_zip64_chapter_is_rendered(self, norma, tmp_path):
+        generator = _generator()
+        generator.generate(norma, tmp_path / "a.epub")
+        # Reescribe el ePub con un capítulo con extensiones zip64
+        original = (tmp_path / "a.epub").read_bytes()
+        (tmp_path / "a.epub").rename(tmp_path / "b.epub")
+        with (
+            zipfile.ZipFile(tmp_path / "b.epub") as origen,
+            zipfile.ZipFile(tmp_path / "a.epub", "w", zipfile.ZIP_DEFLATED) as destino,
+        ):
+            for info in origen.infolist():
+                if info.filename == "EPUB/chapter_005.xhtml":
+                    with destino.open(info, "w", force_zip64=True) as f:
+                        f.write(origen.read(info))
+                else:
+                    destino.writestr(info, origen.read(info))
+
+        generator.generate(norma, tmp_path / "a.epub")
+        assert generator.copied_chapters == len(norma.estructuras) - 1
+        assert (tmp_path / "a.epub").read_bytes() == original
+
+    def test_interrupted_replace_invalidates_manifest(self, norma, tmp_path, monkeypatch):
+        generator = _generator()
+        generator.generate(norma, tmp_path / "a.epub")
+        nueva = copy.deepcopy(norma)
+        nueva.estructuras.insert(0, _titulo(99))
+
+        def interrumpir(*args):
+            raise KeyboardInterrupt
+
+        # El proceso muere tras reemplazar el ePub y antes de guardar el manifiesto
+        monkeypatch.setattr("leychile_epub.generator_v2.save_manifest", interrumpir)
+        with pytest.raises(KeyboardInterrupt):
+            generator.generate(nueva, tmp_path / "a.epub")
+        monkeypatch.undo()
+        assert not manifest_path(tmp_path / "a.epub").exists()
+
+        generator.generate(nueva, tmp_path / "a.epub")
+        assert generator.copied_chapters == 0
+
+    def test_failed_build_removes_temp_file(self, norma, tmp_path, monkeypatch):
+        generator = _generator()
+        generator.generate(norma, tmp_path / "a.epub")
+        anterior = (tmp_path / "a.epub").read_bytes()
+
+        def fallar(*args):
+            raise RuntimeError("falla")
+
+        monkeypatch.setattr(generator, "_add_promulgacion", fallar)
+        with pytest.raises(RuntimeError):
+            generator.generate(norma, tmp_path / "a.epub")
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.epub", "a.epub.chapters.json"]
+        assert (tmp_path / "a.epub").read_bytes() == anterior
+
+    def test_with_render_workers(self, norma, tmp_path):
+        _generator().generate(norma, tmp_path / "a.epub")
+        nueva = copy.deepcopy(norma)
+        nueva.estructuras[-2].hijos[1].derogado = True
+        generator = _generator(render_workers=2)
+        generator.generate(nueva, tmp_path / "a.epub")
+        assert generator.copied_chapters == len(norma.estructuras) - 1
+        with zipfile.ZipFile(tmp_path / "a.epub") as zf:
+            assert zf.testzip() is None
+
+    def test_config_change_renders_everything(self, norma, tmp_path):
+        _generator().generate(norma, tmp_path / "a.epub")
+        generator = _generator(include_version_info=False)
+        generator.generate(norma, tmp_path / "a.epub")
+        assert generator.copied_chapters == 0
+
+    def test_failure_keeps_previous_epub(self, norma, tmp_path, monkeypatch):
+        generator = _generator()
+        generator.generate(norma, tmp_path / "a.epub")
+        anterior = (tmp_path / "a.epub").read_bytes()
+
+        def falla(*args, **kwargs):
+            raise RuntimeError("falla de render")
+
+        monkeypatch.setattr(generator, "_add_promulgacion", falla)
+        norma.promulgacion_texto = "Promúlguese."
+        with pytest.raises(RuntimeError):
+            generator.generate(norma, tmp_path / "a.epub")
+        assert (tmp_path / "a.epub").read_bytes() == anterior
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.epub", "a.epub.chapters.json"]
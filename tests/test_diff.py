@@ -0,0 +1,218 @@
+"""
+Tests unitarios para el diff estructural entre versiones de una norma.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import copy
+import json
+from xml.etree import ElementTree as ET
+
+import pytest
+
+from leychile_epub.diff import (
+    AGREGADA,
+    DEROGADA,
+    DIFF_NS,
+    ELIMINADA,
+    MODIFICADA,
+    RESTABLECIDA,
+    diff_normas,
+    diff_texto,
+    hash_subarbol,
+)
+from leychile_epub.scraper_v2 import EMPTY, EstructuraFuncional, Norma
+
+
+def _articulo(id_parte, numero, texto, **kwargs):
+    return EstructuraFuncional(
+        id_parte=id_parte, tipo_parte="Artículo", nombre_parte=numero, texto=texto, **kwargs
+    )
+
+
+@pytest.fixture
+def norma():
+    return Norma(
+        norma_id="500",
+        fecha_version="2024-01-01",
+        estructuras=[
+            EstructuraFuncional(
+                id_parte="10",
+                tipo_parte="Capítulo",
+                titulo_parte="CAPÍTULO I",
+                hijos=[
+                    _articulo("11", "1", "El deudor pagará en dinero efectivo."),
+                    _articulo("12", "2", "Los plazos son de días hábiles."),
+                ],
+            ),
+            EstructuraFuncional(
+                id_parte="20",
+                tipo_parte="Capítulo",
+                titulo_parte="CAPÍTULO II",
+                hijos=[_articulo("21", "3", "Las multas serán a beneficio fiscal.")],
+            ),
+        ],
+    )
+
+
+def _find(norma, id_parte):
+    pendientes = list(norma.estructuras)
+    while pendientes:
+        ef = pendientes.pop()
+        if ef.id_parte == id_parte:
+            return ef
+        pendientes.extend(ef.hijos)
+    raise KeyError(id_parte)
+
+
+class TestDiffTexto:
+    """Tests para el diff por palabras."""
+
+    def test_replacement(self):
+        assert diff_texto("pagará en dinero", "pagará en especie") == [
+            {"op": "=", "texto": "pagará en"},
+            {"op": "-", "texto": "dinero"},
+            {"op": "+", "texto": "especie"},
+        ]
+
+    def test_identical(self):
+        assert diff_texto("a b", "a  b") == [{"op": "=", "texto": "a b"}]
+
+
+class TestHashSubarbol:
+    """Tests para hash_subarbol."""
+
+    def test_stable(self, norma):
+        assert hash_subarbol(norma.estructuras[0]) == hash_subarbol(
+            copy.deepcopy(norma.estructuras[0])
+        )
+
+    def test_changes_with_descendant(self, norma):
+        antes = hash_subarbol(norma.estructuras[0])
+        _find(norma, "12").texto += " Salvo feriados."
+        assert hash_subarbol(norma.estructuras[0]) != antes
+
+    def test_changes_with_id_parte(self, norma):
+        antes = hash_subarbol(norma.estructuras[1])
+        _find(norma, "21").id_parte = "22"
+        assert hash_subarbol(norma.estructuras[1]) != antes
+
+    def test_ignores_empty_representation(self):
+        parseado = _articulo("31", "5", "Texto.", materias=EMPTY, hijos=EMPTY)
+        manual = _articulo("31", "5", "Texto.")
+        assert hash_subarbol(parseado) == hash_subarbol(manual)
+        assert diff_normas(Norma(estructuras=[parseado]), Norma(estructuras=[manual])).vacio
+
+
+class TestDiffNormas:
+    """Tests para diff_normas."""
+
+    def test_identical_versions_skip_whole_tree(self, norma):
+        diff = diff_normas(norma, copy.deepcopy(norma))
+        assert diff.vacio
+        assert diff.comparadas == 0
+        assert diff.omitidas == 5
+
+    def test_modified_article(self, norma):
+        nueva = copy.deepcopy(norma)
+        nueva.fecha_version = "2025-01-01"
+        art = _find(nueva, "11")
+        art.texto = "El deudor pagará en especie."
+        art.fecha_version = "2025-01-01"
+
+        diff = diff_normas(norma, nueva)
+        (cambio,) = diff.cambios
+        assert cambio.tipo == MODIFICADA
+        assert cambio.id_parte == "11"
+        assert cambio.campos == ["texto", "fecha_version"]
+        assert cambio.ruta == ["10"]
+        assert {"op": "+", "texto": "especie."} in cambio.texto
+        assert diff.metadatos == {"fecha_version": ["2024-01-01", "2025-01-01"]}
+        # El capítulo II no se compara: su subárbol es idéntico
+        assert diff.omitidas == 3
+        assert cambio.capitulo == "10"
+
+    def test_added_and_removed(self, norma):
+        nueva = copy.deepcopy(norma)
+        nueva.estructuras[0].hijos.pop()
+        nueva.estructuras[1].hijos.append(_articulo("22", "4", "Vigencia inmediata."))
+
+        diff = diff_normas(norma, nueva)
+        tipos = {(c.tipo, c.id_parte) for c in diff.cambios}
+        assert tipos == {(AGREGADA, "22"), (ELIMINADA, "12")}
+        assert {c.capitulo for c in diff.cambios} == {"10", "20"}
+
+    def test_removed_subtree_reports_descendants(self, norma):
+        nueva = copy.deepcopy(norma)
+        del nueva.estructuras[1]
+        diff = diff_normas(norma, nueva)
+        assert [(c.tipo, c.id_parte) for c in diff.cambios] == [
+            (ELIMINADA, "20"),
+            (ELIMINADA, "21"),
+        ]
+
+    def test_derogation_changes(self, norma):
+        nueva = copy.deepcopy(norma)
+        _find(nueva, "21").derogado = True
+        diff = diff_normas(norma, nueva)
+        assert diff.cambios[0].tipo == DEROGADA
+
+        diff = diff_normas(nueva, norma)
+        assert diff.cambios[0].tipo == RESTABLECIDA
+
+    def test_moved_article(self, norma):
+        nueva = copy.deepcopy(norma)
+        nueva.estructuras[1].hijos.append(nueva.estructuras[0].hijos.pop())
+        diff = diff_normas(norma, nueva)
+        movido = next(c for c in diff.cambios if c.id_parte == "12")
+        assert movido.tipo == MODIFICADA
+        assert movido.campos == ["ubicacion"]
+        assert all(c.tipo != ELIMINADA for c in diff.cambios)
+
+    def test_reordered_children(self, norma):
+        nueva = copy.deepcopy(norma)
+        nueva.estructuras[0].hijos.reverse()
+        diff = diff_normas(norma, nueva)
+        assert [(c.id_parte, c.campos) for c in diff.cambios] == [("10", ["orden_hijos"])]
+
+    def test_renamed_child_id(self, norma):
+        nueva = copy.deepcopy(norma)
+        _find(nueva, "21").id_parte = "22"
+        diff = diff_normas(norma, nueva)
+        tipos = {(c.tipo, c.id_parte) for c in diff.cambios}
+        assert tipos == {(AGREGADA, "22"), (ELIMINADA, "21")}
+        assert {c.capitulo for c in diff.cambios} == {"20"}
+
+    def test_structures_without_id_use_position(self):
+        anterior = Norma(estructuras=[_articulo("", "1", "uno"), _articulo("", "2", "dos")])
+        nueva = copy.deepcopy(anterior)
+        nueva.estructuras[1].texto = "dos bis"
+        (cambio,) = diff_normas(anterior, nueva).cambios
+        assert cambio.id_parte == "/1"
+
+
+class TestDiffSerialization:
+    """Tests para la salida JSON y XML."""
+
+    @pytest.fixture
+    def diff(self, norma):
+        nueva = copy.deepcopy(norma)
+        _find(nueva, "12").texto = "Los plazos son de días corridos."
+        _find(nueva, "21").derogado = True
+        return diff_normas(norma, nueva)
+
+    def test_json(self, diff):
+        data = json.loads(diff.to_json())
+        assert data["resumen"][MODIFICADA] == 1
+        assert data["resumen"][DEROGADA] == 1
+        assert data["cambios"][0]["id_parte"] == "12"
+
+    def test_annotated_xml(self, diff):
+        root = ET.fromstring(diff.to_xml())
+        ns = {"d": DIFF_NS}
+        assert root.get("id_norma") == "500"
+        cambios = root.findall("d:cambios/d:cambio", ns)
+        assert [c.get("tipo") for c in cambios] == [MODIFICADA, DEROGADA]
+        assert cambios[0].get("ruta") == "10"
+        assert cambios[0].find("d:texto/d:eliminado", ns).text == "hábiles."
+        assert cambios[0].find("d:texto/d:agregado", ns).text == "corridos."
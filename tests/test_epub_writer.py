@@ -0,0 +1,258 @@
+"""
+Tests unitarios para el escritor de ePub en streaming.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import zipfile
+import zlib
+from datetime import datetime, timezone
+
+import pytest
+from lxml import etree
+
+from leychile_epub.epub_writer import (
+    ZIP_EPOCH,
+    EpubMetadata,
+    NavPoint,
+    StreamingEpubWriter,
+    raw_copy_available,
+    raw_data_offset,
+    reproducible_timestamp,
+)
+from leychile_epub.exceptions import GeneratorError
+
+OPF = {"opf": "http://www.idpf.org/2007/opf", "dc": "http://purl.org/dc/elements/1.1/"}
+
+
+@pytest.fixture
+def metadata():
+    return EpubMetadata(
+        identifier="leychile-1-abc",
+        title="Ley 21.000 & otras",
+        creators=["Ministerio A", "Ministerio B"],
+        extra=[("publisher", "BCN"), ("date", ""), ("subject", "Economía")],
+        modified=datetime(2024, 6, 15, 12, 0, tzinfo=timezone.utc),
+    )
+
+
+@pytest.fixture
+def epub_path(tmp_path, metadata):
+    """ePub de dos capítulos con un TOC anidado."""
+    path = tmp_path / "libro.epub"
+    with StreamingEpubWriter(path, metadata) as writer:
+        writer.add_file("styles/main.css", "body {}", "text/css", item_id="css")
+        writer.add_chapter("uno.xhtml", "Uno", "<h1>Uno</h1>", stylesheets=("styles/main.css",))
+        writer.add_chapter("dos.xhtml", "Dos <b>", '<h2 id="p1">Párrafo 1</h2>')
+        writer.toc.append(NavPoint("Uno", "uno.xhtml"))
+        writer.toc.append(NavPoint("Dos", "dos.xhtml", [NavPoint("Párrafo 1", "dos.xhtml#p1")]))
+    return path
+
+
+class TestContainer:
+    """Tests para la estructura del contenedor OCF."""
+
+    def test_mimetype_first_and_stored(self, epub_path):
+        with zipfile.ZipFile(epub_path) as zf:
+            first = zf.infolist()[0]
+            assert first.filename == "mimetype"
+            assert first.compress_type == zipfile.ZIP_STORED
+            assert zf.read("mimetype") == b"application/epub+zip"
+
+    def test_members_in_write_order(self, epub_path):
+        with zipfile.ZipFile(epub_path) as zf:
+            assert zf.namelist() == [
+                "mimetype",
+                "META-INF/container.xml",
+                "EPUB/styles/main.css",
+                "EPUB/uno.xhtml",
+                "EPUB/dos.xhtml",
+                "EPUB/nav.xhtml",
+                "EPUB/toc.ncx",
+                "EPUB/content.opf",
+            ]
+
+    def test_documents_are_well_formed(self, epub_path):
+        with zipfile.ZipFile(epub_path) as zf:
+            for name in zf.namelist():
+                if name.endswith((".xhtml", ".opf", ".ncx", ".xml")):
+                    etree.fromstring(zf.read(name))
+
+    def test_chapter_head(self, epub_path):
+        with zipfile.ZipFile(epub_path) as zf:
+            doc = etree.fromstring(zf.read("EPUB/uno.xhtml"))
+            dos = etree.fromstring(zf.read("EPUB/dos.xhtml"))
+        ns = {"h": "http://www.w3.org/1999/xhtml"}
+        assert doc.xpath("string(h:head/h:title)", namespaces=ns) == "Uno"
+        assert doc.xpath("h:head/h:link/@href", namespaces=ns) == ["styles/main.css"]
+        assert dos.xpath("string(h:head/h:title)", namespaces=ns) == "Dos <b>"
+        assert dos.xpath("h:head/h:link", namespaces=ns) == []
+
+
+class TestPackage:
+    """Tests para content.opf, nav.xhtml y toc.ncx."""
+
+    def test_opf_metadata(self, epub_path):
+        with zipfile.ZipFile(epub_path) as zf:
+            opf = etree.fromstring(zf.read("EPUB/content.opf"))
+        assert opf.xpath("string(//dc:title)", namespaces=OPF) == "Ley 21.000 & otras"
+        assert opf.xpath("//dc:creator/@id", namespaces=OPF) == ["creator_0", "creator_1"]
+        assert opf.xpath("//dc:date", namespaces=OPF) == []
+        assert opf.xpath("string(//opf:meta[@property='dcterms:modified'])", namespaces=OPF) == (
+            "2024-06-15T12:00:00Z"
+        )
+
+    def test_opf_manifest_and_spine(self, epub_path):
+        with zipfile.ZipFile(epub_path) as zf:
+            opf = etree.fromstring(zf.read("EPUB/content.opf"))
+        hrefs = opf.xpath("//opf:manifest/opf:item/@href", namespaces=OPF)
+        assert hrefs == ["nav.xhtml", "toc.ncx", "styles/main.css", "uno.xhtml", "dos.xhtml"]
+        assert opf.xpath("//opf:item[@id='nav']/@properties", namespaces=OPF) == ["nav"]
+        spine = opf.xpath("//opf:spine/opf:itemref/@idref", namespaces=OPF)
+        assert spine == ["nav", "chapter_0", "chapter_1"]
+
+    def test_nav_nesting(self, epub_path):
+        with zipfile.ZipFile(epub_path) as zf:
+            nav = etree.fromstring(zf.read("EPUB/nav.xhtml"))
+        ns = {"h": "http://www.w3.org/1999/xhtml"}
+        assert nav.xpath("//h:nav/h:ol/h:li/h:a/@href", namespaces=ns) == [
+            "uno.xhtml",
+            "dos.xhtml",
+        ]
+        assert nav.xpath("//h:li/h:ol/h:li/h:a/@href", namespaces=ns) == ["dos.xhtml#p1"]
+
+    def test_ncx(self, epub_path):
+        with zipfile.ZipFile(epub_path) as zf:
+            ncx = etree.fromstring(zf.read("EPUB/toc.ncx"))
+        ns = {"n": "http://www.daisy.org/z3986/2005/ncx/"}
+        assert ncx.xpath("//n:meta[@name='dtb:depth']/@content", namespaces=ns) == ["2"]
+        assert ncx.xpath("//n:navPoint/@playOrder", namespaces=ns) == ["1", "2", "3"]
+
+
+class TestReproducible:
+    """Tests para fechas fijas y builds reproducibles."""
+
+    def test_zip_dates_from_modified(self, epub_path):
+        with zipfile.ZipFile(epub_path) as zf:
+            assert {info.date_time for info in zf.infolist()} == {(2024, 6, 15, 12, 0, 0)}
+
+    def test_same_input_same_bytes(self, tmp_path, metadata):
+        for name in ("a.epub", "b.epub"):
+            with StreamingEpubWriter(tmp_path / name, metadata) as writer:
+                writer.add_chapter("uno.xhtml", "Uno", "<p>Uno</p>")
+                writer.toc.append(NavPoint("Uno", "uno.xhtml"))
+        assert (tmp_path / "a.epub").read_bytes() == (tmp_path / "b.epub").read_bytes()
+
+    def test_timestamp_from_fecha(self, monkeypatch):
+        monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+        assert reproducible_timestamp("2024-06-15") == datetime(2024, 6, 15, tzinfo=timezone.utc)
+        assert reproducible_timestamp("") == ZIP_EPOCH
+        assert reproducible_timestamp("sin fecha") == ZIP_EPOCH
+
+    def test_source_date_epoch_wins(self, monkeypatch):
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", "1718452800")
+        assert reproducible_timestamp("2020-01-01") == datetime(
+            2024, 6, 15, 12, 0, tzinfo=timezone.utc
+        )
+
+
+class TestCopyChapter:
+    """Tests para copy_chapter."""
+
+    def test_copies_compressed_entry(self, tmp_path, metadata, epub_path):
+        with zipfile.ZipFile(epub_path) as zf:
+            member = zf.getinfo("EPUB/dos.xhtml")
+            original = zf.read(member)
+        path = tmp_path / "copia.epub"
+        with open(epub_path, "rb") as source, StreamingEpubWriter(path, metadata) as writer:
+            writer.add_chapter("uno.xhtml", "Uno", "<p/>")
+            assert writer.copy_chapter("tres.xhtml", source, member) == "chapter_1"
+            writer.add_chapter("cuatro.xhtml", "Cuatro", "<p/>")
+        with zipfile.ZipFile(path) as zf:
+            assert zf.testzip() is None
+            assert zf.read("EPUB/tres.xhtml") == original
+            copiado = zf.getinfo("EPUB/tres.xhtml")
+            assert copiado.compress_size == member.compress_size
+            assert zf.namelist()[-4:-3] == ["EPUB/cuatro.xhtml"]
+            opf = etree.fromstring(zf.read("EPUB/content.opf"))
+        spine = opf.xpath("//opf:spine/opf:itemref/@idref", namespaces=OPF)
+        assert spine == ["nav", "chapter_0", "chapter_1", "chapter_2"]
+
+    def test_invalid_offset_raises(self, tmp_path, metadata, epub_path):
+        with zipfile.ZipFile(epub_path) as zf:
+            member = zf.getinfo("EPUB/dos.xhtml")
+        member.header_offset += 1
+        with (
+            open(epub_path, "rb") as source,
+            StreamingEpubWriter(tmp_path / "copia.epub", metadata) as writer,
+        ):
+            with pytest.raises(GeneratorError):
+                writer.copy_chapter("dos.xhtml", source, member)
+
+    def test_zip64_member_raises(self, tmp_path, metadata):
+        source_path = tmp_path / "zip64.epub"
+        with zipfile.ZipFile(source_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            with zf.open("EPUB/dos.xhtml", "w", force_zip64=True) as f:
+                f.write(b"<p/>")
+        with zipfile.ZipFile(source_path) as zf:
+            member = zf.getinfo("EPUB/dos.xhtml")
+        with (
+            open(source_path, "rb") as source,
+            StreamingEpubWriter(tmp_path / "copia.epub", metadata) as writer,
+        ):
+            with pytest.raises(GeneratorError, match="sin descomprimir"):
+                writer.copy_chapter("dos.xhtml", source, member)
+            # No queda registrado: se puede renderizar en su lugar
+            writer.add_chapter("dos.xhtml", "Dos", "<p/>")
+
+
+class TestZipInternals:
+    """Tests del formato y del estado de zipfile del que depende copy_chapter."""
+
+    def test_internals_available(self):
+        assert raw_copy_available()
+
+    def test_local_header_layout(self, tmp_path):
+        path = tmp_path / "a.zip"
+        contenido = "<p>Artículo único</p>".encode() * 50
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("EPUB/capítulo.xhtml", contenido)
+        with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+            member = zf.getinfo("EPUB/capítulo.xhtml")
+            offset = raw_data_offset(f, member)
+            nombre = member.filename.encode("utf-8")
+            assert offset == member.header_offset + 30 + len(nombre) + len(member.extra)
+            f.seek(offset)
+            datos = f.read(member.compress_size)
+        assert zlib.decompress(datos, -15) == contenido
+
+    def test_file_header_without_zip64(self):
+        info = zipfile.ZipInfo("EPUB/a.xhtml", date_time=ZIP_EPOCH.timetuple()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.CRC = 0
+        info.file_size = info.compress_size = 10
+        assert len(info.FileHeader(zip64=False)) == 30 + len("EPUB/a.xhtml")
+
+
+class TestErrors:
+    """Tests para errores y archivos incompletos."""
+
+    def test_duplicate_href_raises(self, tmp_path, metadata):
+        with StreamingEpubWriter(tmp_path / "a.epub", metadata) as writer:
+            writer.add_chapter("uno.xhtml", "Uno", "<p/>")
+            with pytest.raises(GeneratorError):
+                writer.add_chapter("uno.xhtml", "Otra", "<p/>")
+
+    def test_add_after_close_raises(self, tmp_path, metadata):
+        writer = StreamingEpubWriter(tmp_path / "a.epub", metadata)
+        writer.close()
+        with pytest.raises(GeneratorError):
+            writer.add_chapter("uno.xhtml", "Uno", "<p/>")
+
+    def test_exception_removes_partial_file(self, tmp_path, metadata):
+        path = tmp_path / "a.epub"
+        with pytest.raises(RuntimeError):
+            with StreamingEpubWriter(path, metadata) as writer:
+                writer.add_chapter("uno.xhtml", "Uno", "<p/>")
+                raise RuntimeError("falla de render")
+        assert not path.exists()
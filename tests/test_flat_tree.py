@@ -0,0 +1,97 @@
+"""
+Tests unitarios para la representación plana del árbol de una norma.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import pytest
+
+from leychile_epub.flat_tree import NINGUNO, FlatNorma, StringColumn, parse_flat
+from leychile_epub.scraper_v2 import BCNXMLParser, EstructuraFuncional, Norma, create_parser
+
+from .test_scraper_v2 import STREAM_XML, _chunks
+
+
+@pytest.fixture
+def norma():
+    parser = BCNXMLParser()
+    return parser.parse(parser.fromstring(STREAM_XML))
+
+
+@pytest.fixture
+def flat(norma):
+    return FlatNorma.from_norma(norma)
+
+
+class TestStringColumn:
+    """Tests para StringColumn."""
+
+    def test_access(self):
+        col = StringColumn.from_strings(["uno", "", "tres"])
+        assert len(col) == 3
+        assert list(col) == ["uno", "", "tres"]
+        assert col[-1] == "tres"
+        assert col.length(2) == 4
+
+    def test_search_does_not_cross_boundaries(self):
+        col = StringColumn.from_strings(["abc", "def", "cdx", "xcd"])
+        assert col.search("cd") == [2, 3]
+        assert col.search("") == [0, 1, 2, 3]
+
+
+class TestFlatNorma:
+    """Tests para FlatNorma."""
+
+    def test_round_trip(self, norma, flat):
+        assert len(flat) == 4
+        assert flat.to_norma() == norma
+
+    def test_round_trip_manual_tree(self):
+        norma = Norma(
+            norma_id="1",
+            estructuras=[
+                EstructuraFuncional(
+                    id_parte="a",
+                    tipo_parte="Título",
+                    materias=["x"],
+                    hijos=[EstructuraFuncional(id_parte="b", tipo_parte="Artículo", nivel=1)],
+                )
+            ],
+        )
+        assert FlatNorma.from_norma(norma).to_norma() == norma
+
+    def test_navigation(self, flat):
+        capitulo, art_1, art_2, art_3 = range(4)
+        assert list(flat.raices()) == [capitulo, art_3]
+        assert list(flat.hijos(capitulo)) == [art_1, art_2]
+        assert flat.padre[art_2] == capitulo
+        assert flat.padre[art_3] == NINGUNO
+        assert flat.primer_hijo(capitulo) == art_1
+        assert flat.primer_hijo(art_1) == NINGUNO
+        assert flat.siguiente_hermano(art_1) == art_2
+        assert flat.siguiente_hermano(art_2) == NINGUNO
+        assert flat.siguiente_hermano(capitulo) == art_3
+        assert flat.ancestros(art_2) == [capitulo]
+        assert list(flat.subarbol(capitulo)) == [0, 1, 2]
+
+    def test_analytics(self, flat):
+        assert flat.contar_por_tipo() == {"Capítulo": 1, "Artículo": 3}
+        assert flat.indices(tipo="Artículo", derogado=True) == [2]
+        assert flat.indices(transitorio=True) == [1]
+        assert flat.indices(tipo={"Capítulo", "Artículo"}, nivel=0) == [0, 3]
+        assert flat.texto.search("Final") == [3]
+        assert flat.materias == {1: ["Detalle"]}
+
+    def test_estructura(self, norma, flat):
+        assert flat.estructura(0) == norma.estructuras[0]
+
+
+class TestParseFlat:
+    """Tests para parse_flat."""
+
+    @pytest.mark.parametrize("backend", ["etree", "lxml"])
+    def test_same_as_tree_parser(self, norma, flat, backend):
+        resultado = parse_flat(_chunks(STREAM_XML, 9), create_parser(backend))
+        assert resultado.to_norma() == norma
+        assert list(resultado.fin) == list(flat.fin)
+        assert resultado.cabecera.anexos[0]["titulo"] == "Anexo A"
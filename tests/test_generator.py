@@ -9,6 +9,7 @@ from pathlib import Path
 
 import pytest
 
+from leychile_epub.config import Config
 from leychile_epub.exceptions import ValidationError
 from leychile_epub.generator import LawEpubGenerator
 
@@ -111,6 +112,18 @@ class TestLawEpubGenerator:
 
             assert "mi_ley.epub" in result
 
+    def test_reproducible_build(self, sample_law_data, monkeypatch):
+        """Verifica que en modo reproducible dos builds son idénticos."""
+        monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+        config = Config()
+        config.epub.reproducible = True
+        generator = LawEpubGenerator(config)
+        sample_law_data["id_version"] = "2024-06-15"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            a = generator.generate(sample_law_data, output_dir=tmpdir, filename="a")
+            b = generator.generate(sample_law_data, output_dir=tmpdir, filename="b")
+            assert Path(a).read_bytes() == Path(b).read_bytes()
+
 
 class TestCrossReferences:
     """Tests para referencias cruzadas."""
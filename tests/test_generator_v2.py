@@ -220,6 +220,23 @@ class TestEPubGeneratorV2Generate:
             result = gen.generate(sample_norma, output)
             assert result.exists()
 
+    def test_generate_writes_well_formed_xhtml(self, sample_norma):
+        import zipfile
+
+        from lxml import etree
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = EPubGeneratorV2().generate(sample_norma, Path(tmpdir) / "test.epub")
+            with zipfile.ZipFile(result) as zf:
+                names = zf.namelist()
+                assert names[0] == "mimetype"
+                for name in names:
+                    if name.endswith((".xhtml", ".opf", ".ncx")):
+                        etree.fromstring(zf.read(name))
+                nav = zf.read("EPUB/nav.xhtml").decode("utf-8")
+        assert "TÍTULO I DISPOSICIONES GENERALES" in nav
+        assert "encabezado.xhtml" not in nav
+
 
 class TestEPubGeneratorV2Formatting:
     """Tests para formateo de texto."""
@@ -329,6 +346,158 @@ class TestEPubGeneratorV2Estructura:
         assert result == "capitulo_456"
 
 
+def _codigo(n_parrafos: int = 3, n_articulos: int = 4, derogado: bool = False):
+    """Libro con párrafos de artículos, como los del Código Civil."""
+    return EstructuraFuncional(
+        id_parte="L1",
+        tipo_parte="Capítulo",
+        titulo_parte="LIBRO I",
+        derogado=derogado,
+        hijos=[
+            EstructuraFuncional(
+                id_parte=f"P{i}",
+                tipo_parte="Párrafo",
+                titulo_parte=f"Párrafo {i}",
+                hijos=[
+                    EstructuraFuncional(
+                        id_parte=f"A{i}_{j}",
+                        tipo_parte="Artículo",
+                        nombre_parte=f"{i}.{j}",
+                        texto="Texto del artículo con ñandú y acentos. " * 20,
+                    )
+                    for j in range(n_articulos)
+                ],
+            )
+            for i in range(n_parrafos)
+        ],
+    )
+
+
+class TestChapterSplitting:
+    """Tests para partir capítulos grandes en varios archivos."""
+
+    @staticmethod
+    def _parse(part: str):
+        from lxml import etree
+
+        return etree.fromstring(f"<div>{part}</div>".encode())
+
+    def test_small_chapter_not_split(self):
+        gen = EPubGeneratorV2()
+        chapter = gen._render_chapter(_codigo())
+        assert chapter.parts == [gen._render_estructura(_codigo(), is_root=True)]
+
+    def test_split_by_articles(self):
+        gen = EPubGeneratorV2(EPubConfig(max_chapter_articles=5))
+        chapter = gen._render_chapter(_codigo())
+        assert len(chapter.parts) == 3
+        articulos = [len(self._parse(p).xpath("//div[@class='articulo']")) for p in chapter.parts]
+        assert articulos == [5, 5, 2]
+        # El encabezado de un párrafo no queda solo al final de una parte
+        for part in chapter.parts:
+            assert not part.rstrip().endswith("</h4>")
+        assert chapter.anchors == {
+            "capitulo_L1": 0,
+            "parrafo_P0": 0,
+            "parrafo_P1": 0,
+            "parrafo_P2": 1,
+        }
+
+    def test_split_by_bytes(self):
+        gen = EPubGeneratorV2(EPubConfig(max_chapter_bytes=3000))
+        chapter = gen._render_chapter(_codigo())
+        assert len(chapter.parts) > 1
+        articulo = len(gen._render_estructura(_codigo().hijos[0].hijos[0]).encode("utf-8"))
+        for part in chapter.parts:
+            # Un encabezado no se separa del artículo que lo sigue
+            assert len(part.encode("utf-8")) <= 3000 + articulo
+        unido = "".join(chapter.parts)
+        assert unido.count('class="articulo"') == 12
+
+    def test_sections_reopened(self):
+        gen = EPubGeneratorV2(EPubConfig(max_chapter_articles=4))
+        chapter = gen._render_chapter(_codigo(derogado=True))
+        assert len(chapter.parts) == 3
+        for part in chapter.parts:
+            root = self._parse(part)
+            assert [el.get("class") for el in root] == ["derogado"]
+
+    def test_toc_points_to_split_files(self, tmp_path):
+        import zipfile
+
+        from lxml import etree
+
+        norma = Norma(norma_id="1", estructuras=[_codigo()])
+        path = EPubGeneratorV2(EPubConfig(max_chapter_articles=5)).generate(
+            norma, tmp_path / "a.epub"
+        )
+        ns = {"h": "http://www.w3.org/1999/xhtml"}
+        with zipfile.ZipFile(path) as zf:
+            assert "EPUB/chapter_003_03.xhtml" in zf.namelist()
+            nav = etree.fromstring(zf.read("EPUB/nav.xhtml"))
+            hrefs = nav.xpath("//h:a/@href", namespaces=ns)
+            assert "chapter_003_02.xhtml#parrafo_P2" in hrefs
+            for href in hrefs:
+                file_name, _, anchor = href.partition("#")
+                doc = etree.fromstring(zf.read(f"EPUB/{file_name}"))
+                if anchor:
+                    assert doc.xpath(f"//*[@id='{anchor}']")
+            titulo = etree.fromstring(zf.read("EPUB/chapter_003_02.xhtml"))
+            assert titulo.xpath("string(h:head/h:title)", namespaces=ns) == "LIBRO I (2/3)"
+
+
+class TestReproducibleBuild:
+    """Tests para el modo reproducible."""
+
+    @pytest.fixture(autouse=True)
+    def _sin_source_date_epoch(self, monkeypatch):
+        monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+
+    def test_same_bytes(self, sample_norma, tmp_path):
+        config = EPubConfig(reproducible=True)
+        a = EPubGeneratorV2(config).generate(sample_norma, tmp_path / "a.epub")
+        b = EPubGeneratorV2(config).generate(sample_norma, tmp_path / "b.epub")
+        assert a.read_bytes() == b.read_bytes()
+
+    def test_identifier_and_dates(self, sample_norma, tmp_path):
+        import zipfile
+
+        path = EPubGeneratorV2(EPubConfig(reproducible=True)).generate(
+            sample_norma, tmp_path / "a.epub"
+        )
+        with zipfile.ZipFile(path) as zf:
+            opf = zf.read("EPUB/content.opf").decode("utf-8")
+            metadatos = zf.read("EPUB/metadatos.xhtml").decode("utf-8")
+            assert {info.date_time for info in zf.infolist()} == {(2024, 6, 15, 0, 0, 0)}
+        assert "2024-06-15T00:00:00Z" in opf
+        assert "Generado:" not in metadatos
+
+    def test_identifier_depends_on_version_and_config(self, sample_norma):
+        gen = EPubGeneratorV2(EPubConfig(reproducible=True))
+        ident = gen._identifier(sample_norma)
+        assert ident.startswith("leychile-12345-")
+        assert gen._identifier(sample_norma) == ident
+        otro = EPubGeneratorV2(EPubConfig(reproducible=True, include_toc=False))
+        assert otro._identifier(sample_norma) != ident
+        sample_norma.fecha_version = "2025-01-01"
+        assert gen._identifier(sample_norma) != ident
+
+    def test_build_key(self, sample_norma):
+        gen = EPubGeneratorV2(EPubConfig(reproducible=True))
+        key = gen.build_key(sample_norma)
+        assert len(key) == 64
+        assert (
+            EPubGeneratorV2(EPubConfig(reproducible=True, render_workers=4)).build_key(sample_norma)
+            == key
+        )
+        sample_norma.estructuras[0].hijos[0].texto += " Modificado."
+        assert gen.build_key(sample_norma) != key
+
+    def test_default_not_reproducible(self, sample_norma):
+        gen = EPubGeneratorV2()
+        assert gen._identifier(sample_norma) != gen._identifier(sample_norma)
+
+
 class TestDefaultCSS:
     """Tests para el CSS predeterminado."""
 
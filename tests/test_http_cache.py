@@ -0,0 +1,240 @@
+"""
+Tests unitarios para el caché en disco de XML.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import time
+
+import pytest
+import requests
+
+from leychile_epub.config import Config, ScraperConfig
+from leychile_epub.http_cache import XMLCache, fetch_with_cache, get_cache
+from leychile_epub.scraper import BCNLawScraper
+from leychile_epub.scraper_v2 import BCNLawScraperV2
+
+URL = "https://www.leychile.cl/Consulta/obtxml?opt=7&idNorma=242302"
+
+
+class FakeResponse:
+    """Respuesta HTTP mínima para los tests."""
+
+    def __init__(self, status_code=200, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def close(self):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"HTTP {self.status_code}", response=self)
+
+
+class FakeSession:
+    """Sesión que responde con una lista de respuestas y registra las cabeceras."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, timeout=None, headers=None, stream=False):
+        self.requests.append(headers or {})
+        return self.responses.pop(0)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return XMLCache(tmp_path / "cache", ttl=60)
+
+
+class TestCacheKeys:
+    """Tests para la clave de caché."""
+
+    def test_key_by_id_norma(self):
+        assert XMLCache.key_for_url(URL) == "norma-242302"
+
+    def test_key_includes_version(self):
+        assert XMLCache.key_for_url(URL + "&idVersion=2020-01-01") == "norma-242302@2020-01-01"
+
+    def test_key_without_id_norma_uses_hash(self):
+        key = XMLCache.key_for_url("https://www.bcn.cl/otra")
+        assert key.startswith("url-")
+
+
+class TestFetchWithCache:
+    """Tests para fetch_with_cache."""
+
+    def test_without_cache_always_downloads(self):
+        session = FakeSession(FakeResponse(content=b"<a/>"), FakeResponse(content=b"<b/>"))
+        assert fetch_with_cache(session, URL, None, 10) == b"<a/>"
+        assert fetch_with_cache(session, URL, None, 10) == b"<b/>"
+
+    def test_miss_then_fresh_hit(self, cache):
+        session = FakeSession(FakeResponse(content=b"<Norma/>", headers={"ETag": '"v1"'}))
+        assert fetch_with_cache(session, URL, cache, 10) == b"<Norma/>"
+        assert fetch_with_cache(session, URL, cache, 10) == b"<Norma/>"
+        assert len(session.requests) == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.hits == 1
+
+    def test_stale_entry_revalidates_with_304(self, cache):
+        session = FakeSession(
+            FakeResponse(
+                content=b"<Norma/>",
+                headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+            ),
+            FakeResponse(status_code=304),
+        )
+        fetch_with_cache(session, URL, cache, 10)
+        cache.ttl = 0
+
+        assert fetch_with_cache(session, URL, cache, 10) == b"<Norma/>"
+        assert session.requests[1] == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+        }
+        assert cache.stats.revalidated == 1
+
+    def test_stale_entry_replaced_by_new_content(self, cache):
+        session = FakeSession(
+            FakeResponse(content=b"<v1/>", headers={"ETag": '"v1"'}),
+            FakeResponse(content=b"<v2/>", headers={"ETag": '"v2"'}),
+        )
+        fetch_with_cache(session, URL, cache, 10)
+        cache.ttl = 0
+
+        assert fetch_with_cache(session, URL, cache, 10) == b"<v2/>"
+        assert cache.lookup("norma-242302").etag == '"v2"'
+        assert len(list((cache.directory / "objects").rglob("*.xml"))) == 1
+
+    def test_expired_entry_revalidates(self, cache):
+        session = FakeSession(
+            FakeResponse(content=b"<Norma/>", headers={"ETag": '"v1"'}),
+            FakeResponse(status_code=304),
+        )
+        fetch_with_cache(session, URL, cache, 10)
+        cache.expire("norma-242302")
+
+        assert fetch_with_cache(session, URL, cache, 10) == b"<Norma/>"
+        assert session.requests[1] == {"If-None-Match": '"v1"'}
+
+    def test_http_error_is_propagated(self, cache):
+        session = FakeSession(FakeResponse(status_code=500))
+        with pytest.raises(requests.exceptions.HTTPError):
+            fetch_with_cache(session, URL, cache, 10)
+        assert len(cache) == 0
+
+
+class TestXMLCache:
+    """Tests para el almacenamiento y la expiración."""
+
+    def test_identical_content_is_stored_once(self, cache):
+        cache.store("norma-1", URL, b"<Norma/>")
+        cache.store("norma-2", URL, b"<Norma/>")
+        assert cache.stats.stores == 1
+        assert cache.total_bytes() == len(b"<Norma/>")
+
+    def test_index_persists_between_instances(self, cache):
+        cache.store("norma-1", URL, b"<Norma/>", etag='"x"')
+        reopened = XMLCache(cache.directory)
+        entry = reopened.lookup("norma-1")
+        assert entry.etag == '"x"'
+        assert reopened.read(entry) == b"<Norma/>"
+
+    def test_hits_do_not_rewrite_index(self, cache):
+        entry = cache.store("norma-1", URL, b"<Norma/>")
+        entry.last_access = 0.0
+        cache._save_index()
+        index = cache.directory / "index.json"
+        antes = index.read_bytes()
+        for _ in range(100):
+            cache.read(entry)
+        assert index.read_bytes() == antes
+
+        cache.close()
+        assert XMLCache(cache.directory).lookup("norma-1").last_access > 0
+
+    def test_hits_are_flushed_periodically(self, cache, monkeypatch):
+        entry = cache.store("norma-1", URL, b"<Norma/>")
+        monkeypatch.setattr("leychile_epub.http_cache.FLUSH_INTERVAL", 0.0)
+        entry.last_access = 0.0
+        cache.read(entry)
+        assert XMLCache(cache.directory).lookup("norma-1").last_access > 0
+
+    def test_missing_object_is_treated_as_miss(self, cache):
+        entry = cache.store("norma-1", URL, b"<Norma/>")
+        cache._object_path(entry.digest).unlink()
+        assert cache.lookup("norma-1") is None
+
+    def test_evicts_least_recently_used_over_max_bytes(self, cache):
+        cache.max_bytes = 20
+        cache.store("norma-1", URL, b"a" * 10)
+        cache._entries["norma-1"].last_access = time.time() - 100
+        cache.store("norma-2", URL, b"b" * 10)
+        cache.store("norma-3", URL, b"c" * 10)
+
+        assert cache.lookup("norma-1") is None
+        assert cache.lookup("norma-3") is not None
+        assert cache.stats.evictions == 1
+
+    def test_evicts_entries_older_than_max_age(self, cache):
+        cache.max_age = 10
+        cache.store("norma-1", URL, b"<Norma/>")
+        cache._entries["norma-1"].last_access = time.time() - 100
+        assert cache.evict() == 1
+        assert len(cache) == 0
+
+    def test_clear(self, cache):
+        cache.store("norma-1", URL, b"<Norma/>")
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.total_bytes() == 0
+
+
+class TestCacheConfig:
+    """Tests para la integración con la configuración y el scraper."""
+
+    def test_disabled_by_default(self):
+        assert XMLCache.from_config(ScraperConfig()) is None
+
+    def test_shared_instance_per_directory(self, tmp_path):
+        assert get_cache(tmp_path) is get_cache(tmp_path)
+
+    def test_scraper_uses_cache(self, tmp_path, monkeypatch):
+        config = Config()
+        config.scraper.cache_dir = str(tmp_path)
+        scraper = BCNLawScraperV2(config)
+        session = FakeSession(FakeResponse(content=b"<Norma/>"))
+        monkeypatch.setattr(scraper, "session", session)
+
+        assert scraper._download(URL) == b"<Norma/>"
+        assert scraper._download(URL) == b"<Norma/>"
+        assert len(session.requests) == 1
+        scraper.close()
+
+    def test_versioned_url_has_its_own_key(self):
+        scraper = BCNLawScraperV2(Config())
+        xml_url = scraper.get_xml_url("242302", "2020-01-01")
+        assert XMLCache.key_for_url(xml_url) == "norma-242302@2020-01-01"
+        assert XMLCache.key_for_url(scraper.get_xml_url("242302")) == "norma-242302"
+
+    def test_v1_close_flushes_index(self, tmp_path):
+        config = Config()
+        config.scraper.cache_dir = str(tmp_path)
+        scraper = BCNLawScraper(config)
+        entry = scraper.cache.store("norma-1", URL, b"<Norma/>")
+        entry.last_access = 0.0
+        scraper.cache._save_index()
+        scraper.cache.read(entry)
+        scraper.close()
+        assert XMLCache(tmp_path).lookup("norma-1").last_access > 0
+
+    def test_env_var(self, monkeypatch):
+        monkeypatch.setenv("LEYCHILE_CACHE_DIR", "/tmp/leychile-cache")
+        assert Config.from_env().scraper.cache_dir == "/tmp/leychile-cache"
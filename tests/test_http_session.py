@@ -0,0 +1,99 @@
+"""
+Tests unitarios para las sesiones HTTP compartidas.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import pytest
+
+from leychile_epub.config import Config, ScraperConfig
+from leychile_epub.http_session import (
+    SessionSettings,
+    close_sessions,
+    create_session,
+    get_session,
+)
+from leychile_epub.replay_server import ReplayServer
+from leychile_epub.scraper import BCNLawScraper
+from leychile_epub.scraper_v2 import BCNLawScraperV2
+
+from .test_scraper_v2 import STREAM_XML
+
+
+class TestSessionSettings:
+    """Tests para SessionSettings."""
+
+    def test_from_config(self):
+        config = ScraperConfig(max_retries=5, retry_delay=2.0, max_concurrency=16)
+        settings = SessionSettings.from_config(config)
+        assert settings.max_retries == 5
+        assert settings.backoff == 2.0
+        assert settings.pool_maxsize == 16
+        assert settings.user_agent == config.user_agent
+
+    def test_pool_at_least_default(self):
+        assert SessionSettings.from_config(ScraperConfig(max_concurrency=1)).pool_maxsize == 10
+
+
+class TestCreateSession:
+    """Tests para create_session."""
+
+    def test_headers(self):
+        session = create_session(SessionSettings(accept="text/html"))
+        assert session.headers["Accept"] == "text/html"
+        assert session.headers["Accept-Encoding"] == "gzip, deflate"
+        assert session.headers["Connection"] == "keep-alive"
+
+    def test_keep_alive_disabled(self):
+        session = create_session(SessionSettings(keep_alive=False))
+        assert session.headers["Connection"] == "close"
+
+    def test_adapter_pool_and_retries(self):
+        session = create_session(SessionSettings(max_retries=2, pool_maxsize=7))
+        adapter = session.get_adapter("https://www.leychile.cl")
+        assert adapter._pool_maxsize == 7
+        assert adapter.max_retries.total == 2
+        assert 503 not in adapter.max_retries.status_forcelist
+
+
+class TestSharedSession:
+    """Tests para get_session y su uso en los scrapers."""
+
+    def test_same_settings_share_session(self):
+        assert get_session(SessionSettings()) is get_session(SessionSettings())
+        assert get_session(SessionSettings()) is not get_session(SessionSettings(max_retries=0))
+
+    def test_scrapers_share_session(self):
+        v2_a, v2_b = BCNLawScraperV2(), BCNLawScraperV2()
+        assert v2_a.session is v2_b.session
+        assert BCNLawScraper().session is v2_a.session
+
+    def test_close_keeps_shared_session_open(self):
+        scraper = BCNLawScraperV2()
+        scraper.close()
+        assert BCNLawScraperV2().session is scraper.session
+
+    def test_close_sessions(self):
+        session = get_session(SessionSettings(user_agent="test-close"))
+        close_sessions()
+        assert get_session(SessionSettings(user_agent="test-close")) is not session
+
+    def test_connections_are_reused_across_scrapers(self, tmp_path):
+        (tmp_path / "norma.xml").write_bytes(STREAM_XML)
+        with ReplayServer(tmp_path) as server:
+            config = Config()
+            config.scraper.base_url = server.url
+            config.scraper.rate_limit_delay = 0
+            config.scraper.user_agent = "test-reuse"
+            for _ in range(3):
+                with BCNLawScraperV2(config) as scraper:
+                    scraper.scrape("https://www.leychile.cl/Navegar?idNorma=99")
+
+        assert server.stats.requests == 3
+        assert server.stats.connections == 1
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _close_test_sessions():
+    yield
+    close_sessions()
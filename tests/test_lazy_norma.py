@@ -0,0 +1,157 @@
+"""
+Tests unitarios para la vista perezosa de normas.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import pytest
+
+from leychile_epub.config import Config
+from leychile_epub.exceptions import ParsingError, ValidationError
+from leychile_epub.lazy_norma import LazyNorma
+from leychile_epub.scraper_v2 import BCNLawScraperV2, LxmlBCNXMLParser
+
+from .test_scraper_v2 import STREAM_XML
+
+LAZY_XML = """<?xml version="1.0" encoding="utf-8"?>
+<Norma xmlns="http://www.leychile.cl/esquemas" normaId="7" fechaVersion="2024-05-01">
+  <Metadatos><TituloNorma>LEY DE CONSULTAS</TituloNorma></Metadatos>
+  <EstructurasFuncionales>
+    <EstructuraFuncional idParte="10" tipoParte="T&amp;iacute;tulo">
+      <Texto>TÍTULO I</Texto>
+      <EstructurasFuncionales>
+        <EstructuraFuncional idParte="11" tipoParte="Artículo">
+          <Texto>Artículo 1.- Primero.</Texto>
+          <Metadatos><NombreParte presente="si">Artículo 1°</NombreParte></Metadatos>
+        </EstructuraFuncional>
+        <EstructuraFuncional idParte="12" tipoParte="Artículo">
+          <Texto>Artículo 1 bis.- Intercalado.</Texto>
+          <Metadatos><NombreParte presente="si">1  BIS</NombreParte></Metadatos>
+        </EstructuraFuncional>
+      </EstructurasFuncionales>
+      <EstructurasFuncionales>
+        <EstructuraFuncional idParte="99" tipoParte="Artículo">
+          <Texto>Ignorado por el parser.</Texto>
+          <Metadatos><NombreParte presente="si">5</NombreParte></Metadatos>
+        </EstructuraFuncional>
+      </EstructurasFuncionales>
+    </EstructuraFuncional>
+    <EstructuraFuncional idParte="20" tipoParte="Artículo" transitorio="transitorio">
+      <Texto>Artículo 1 transitorio.- Vigencia.</Texto>
+      <Metadatos><NombreParte presente="si">1</NombreParte></Metadatos>
+    </EstructuraFuncional>
+  </EstructurasFuncionales>
+</Norma>
+""".encode()
+
+
+def _todas(estructuras):
+    for ef in estructuras:
+        yield ef
+        yield from _todas(ef.hijos)
+
+
+@pytest.fixture
+def parser():
+    return LxmlBCNXMLParser()
+
+
+class TestLazyNormaIndex:
+    """Tests del índice de estructuras."""
+
+    @pytest.mark.parametrize("xml", [STREAM_XML, LAZY_XML])
+    def test_same_structures_as_full_parse(self, parser, xml):
+        norma = parser.parse(parser.fromstring(xml))
+        lazy = LazyNorma.from_bytes(xml, parser)
+
+        completas = list(_todas(norma.estructuras))
+        assert lazy.ids == [ef.id_parte for ef in completas]
+        assert [lazy.estructura(ef.id_parte) for ef in completas] == completas
+        assert lazy.to_norma() == norma
+
+    def test_header_is_eager(self):
+        lazy = LazyNorma.from_bytes(STREAM_XML)
+        assert lazy.norma_id == "99"
+        assert lazy.fecha_version == "2024-03-01"
+        assert lazy.identificador.numero == "99"
+        assert lazy.metadatos.materias == ["Pruebas"]
+
+    def test_only_first_container_is_indexed(self):
+        lazy = LazyNorma.from_bytes(LAZY_XML)
+        assert len(lazy) == 4
+        assert "99" not in lazy
+        assert lazy.buscar("5") == []
+
+    def test_nothing_parsed_until_requested(self):
+        lazy = LazyNorma.from_bytes(LAZY_XML)
+        assert lazy._parseadas == {}
+        assert lazy.estructura("11") is lazy.estructura("11")
+        assert list(lazy._parseadas) == ["11"]
+        assert lazy.estructura("404") is None
+
+    def test_invalid_xml(self):
+        with pytest.raises(LxmlBCNXMLParser.parse_errors):
+            LazyNorma.from_bytes(b"<Norma><sin cerrar>")
+
+
+class TestLazyNormaQueries:
+    """Tests de las consultas puntuales."""
+
+    @pytest.fixture
+    def lazy(self):
+        return LazyNorma.from_bytes(LAZY_XML)
+
+    @pytest.mark.parametrize("numero", ["1", "Art. 1", "Artículo 1°", "art 1", "ARTÍCULO 1."])
+    def test_articulo_por_numero(self, lazy, numero):
+        assert lazy.articulo(numero).id_parte == "11"
+
+    def test_articulo_transitorio(self, lazy):
+        assert lazy.articulo("1", transitorio=True).id_parte == "20"
+
+    def test_articulo_bis(self, lazy):
+        assert lazy.articulo("1 bis").texto == "Artículo 1 bis.- Intercalado."
+
+    def test_articulo_inexistente(self, lazy):
+        assert lazy.articulo("1000") is None
+
+    def test_buscar_por_tipo(self, lazy):
+        assert [ef.id_parte for ef in lazy.buscar("1")] == ["11", "20"]
+        assert lazy.buscar("1", tipo_parte="título") == []
+
+    def test_lazy_sections(self):
+        lazy = LazyNorma.from_bytes(STREAM_XML)
+        assert "encabezado" not in vars(lazy)
+        assert lazy.encabezado == ("Encabezado de la ley.", False)
+        assert lazy.promulgacion == ("Promúlguese.", True)
+        assert lazy.anexos[0]["titulo"] == "Anexo A"
+
+
+class TestScrapeLazy:
+    """Tests para BCNLawScraperV2.scrape_lazy."""
+
+    @pytest.fixture
+    def scraper(self, monkeypatch):
+        config = Config()
+        config.scraper.rate_limit_delay = 0
+        monkeypatch.setattr("leychile_epub.scraper_v2.get_config", lambda: config)
+
+        def fake_download(self, url):
+            return b"<Norma><sin cerrar>" if "666" in url else LAZY_XML
+
+        monkeypatch.setattr(BCNLawScraperV2, "_download", fake_download)
+        return BCNLawScraperV2()
+
+    def test_scrape_lazy(self, scraper):
+        lazy = scraper.scrape_lazy("https://www.leychile.cl/Navegar?idNorma=7&idVersion=2024-05-01")
+        assert lazy.url_original.endswith("idVersion=2024-05-01")
+        assert lazy.id_version == "2024-05-01"
+        assert lazy.articulo("1").texto == "Artículo 1.- Primero."
+        assert lazy.to_norma().url_original == lazy.url_original
+
+    def test_invalid_url(self, scraper):
+        with pytest.raises(ValidationError):
+            scraper.scrape_lazy("https://www.leychile.cl/Navegar")
+
+    def test_invalid_xml(self, scraper):
+        with pytest.raises(ParsingError):
+            scraper.scrape_lazy("https://www.leychile.cl/Navegar?idNorma=666")
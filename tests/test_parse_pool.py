@@ -0,0 +1,123 @@
+"""
+Tests unitarios para el parseo en paralelo de varias normas.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import pytest
+
+from leychile_epub.cli import process_batch
+from leychile_epub.config import Config
+from leychile_epub.exceptions import NetworkError, ParsingError, ValidationError
+from leychile_epub.parse_pool import parse_many, resolve_workers
+from leychile_epub.scraper_v2 import BCNLawScraperV2, BCNXMLParser, create_parser
+from leychile_epub.xml_generator import BibliotecaXMLGenerator
+
+from .test_async_scraper import SAMPLE_XML
+
+INVALID_XML = b"<Norma><sin cerrar>"
+
+
+def _xml(id_norma: str) -> bytes:
+    return SAMPLE_XML.format(id=id_norma).encode("utf-8")
+
+
+def _url(id_norma: str) -> str:
+    return f"https://www.leychile.cl/Navegar?idNorma={id_norma}"
+
+
+def fake_download(self, url: str) -> bytes:
+    id_norma = url.rsplit("=", 1)[1]
+    if id_norma == "500":
+        raise NetworkError("Error HTTP al acceder a la BCN", url=url, status_code=500)
+    if id_norma == "666":
+        return INVALID_XML
+    return _xml(id_norma)
+
+
+@pytest.fixture
+def config(monkeypatch):
+    config = Config()
+    config.scraper.rate_limit_delay = 0
+    config.scraper.parse_workers = 2
+    monkeypatch.setattr("leychile_epub.scraper_v2.get_config", lambda: config)
+    monkeypatch.setattr(BCNLawScraperV2, "_download", fake_download)
+    return config
+
+
+class TestParseMany:
+    """Tests para parse_many / BCNXMLParser.parse_many."""
+
+    @pytest.mark.parametrize("backend", ["etree", "lxml"])
+    def test_pool_matches_local(self, backend):
+        blobs = [_xml("1"), INVALID_XML, _xml("2"), _xml("3")]
+        parser = create_parser(backend)
+        local = parser.parse_many(blobs, max_workers=1)
+        pool = parser.parse_many(blobs, max_workers=2)
+
+        assert [r.index for r in pool] == [0, 1, 2, 3]
+        assert [r.ok for r in pool] == [True, False, True, True]
+        assert [r.norma for r in pool] == [r.norma for r in local]
+        assert pool[2].norma.identificador.numero == "2"
+
+    def test_invalid_is_reported_per_norm(self):
+        resultados = parse_many([INVALID_XML, _xml("7")], max_workers=2)
+        assert isinstance(resultados[0].error, ParsingError)
+        assert resultados[0].error.details["index"] == 0
+        assert resultados[1].ok
+
+    def test_empty(self):
+        assert BCNXMLParser().parse_many([]) == []
+
+    def test_resolve_workers(self):
+        assert resolve_workers(4, 2) == 2
+        assert resolve_workers(1, 10) == 1
+        assert resolve_workers(None, 0) == 1
+        assert resolve_workers(0, 10) >= 1
+
+
+class TestScrapeBatch:
+    """Tests para BCNLawScraperV2.scrape_batch."""
+
+    def test_order_and_errors(self, config):
+        urls = [_url("1"), "https://www.example.com/", _url("500"), _url("666"), _url("2")]
+        resultados = BCNLawScraperV2(config).scrape_batch(urls)
+
+        assert [r.index for r in resultados] == [0, 1, 2, 3, 4]
+        assert resultados[0].norma.url_original == urls[0]
+        assert resultados[4].norma.identificador.numero == "2"
+        assert isinstance(resultados[1].error, ValidationError)
+        assert isinstance(resultados[2].error, NetworkError)
+        assert isinstance(resultados[3].error, ParsingError)
+        assert resultados[3].error.details["url"].endswith("idNorma=666")
+
+
+class TestBatchIntegration:
+    """Tests del parseo en paralelo desde la biblioteca y el CLI."""
+
+    def test_biblioteca(self, config, tmp_path):
+        leyes = {f"ley_{i}": {"url": _url(i), "nombre": f"Ley {i}"} for i in ("1", "666", "2", "3")}
+        resultado = BibliotecaXMLGenerator().generate(
+            leyes, str(tmp_path / "out"), generar_indice=False
+        )
+        assert [ley["estado"] for ley in resultado["leyes"]] == [
+            "exitoso",
+            "fallido",
+            "exitoso",
+            "exitoso",
+        ]
+        assert (tmp_path / "out" / "ley_3.xml").exists()
+
+    def test_cli_batch(self, config, tmp_path):
+        batch = tmp_path / "urls.txt"
+        batch.write_text("\n".join([_url("1"), _url("500"), _url("2")]))
+        (tmp_path / "out").mkdir()
+        (tmp_path / "out1").mkdir()
+        assert process_batch(str(batch), str(tmp_path / "out"), quiet=True) == (2, 1)
+        assert process_batch(str(batch), str(tmp_path / "out1"), quiet=True, parse_workers=1) == (
+            2,
+            1,
+        )
+        assert sorted(p.name for p in (tmp_path / "out").iterdir()) == sorted(
+            p.name for p in (tmp_path / "out1").iterdir()
+        )
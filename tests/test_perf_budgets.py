@@ -0,0 +1,134 @@
+"""
+Presupuestos de rendimiento por etapa para normas representativas.
+
+Cada test mide una etapa (ver ``perf_budget`` en ``tests/conftest.py``) y
+falla si el tiempo o la memoria superan el presupuesto guardado en
+``tests/perf_budgets.json`` más la tolerancia. Tras un cambio que altere el
+rendimiento a propósito, regrabar con ``pytest -m perf --perf-update``.
+
+El ePub se mide con el Código del Trabajo y no con el Código Civil: la
+conversión de este último anida casi todo el código bajo el artículo 2 y
+produce capítulos diminutos, mientras que el del Trabajo genera capítulos
+reales y uno que supera ``max_chapter_bytes`` y se divide.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from leychile_epub.bcn_fixtures import ley_xml_to_bcn_xml
+from leychile_epub.bench import superir_text
+from leychile_epub.generator_v2 import EPubGeneratorV2
+from leychile_epub.scraper_v2 import create_parser
+from leychile_epub.superir_structured_parser import SuperirStructuredParser
+from leychile_epub.superir_xml_generator import SuperirXMLGenerator
+from leychile_epub.text_to_xml_parser import NormaTextParser
+from leychile_epub.xml_generator import LawXMLGenerator
+
+from .conftest import PerfBudgets, _calibration_workload
+from .test_parser_vs_biblioteca import BIBLIOTECA_PATH
+
+pytestmark = pytest.mark.perf
+
+SUSESO_PATH = BIBLIOTECA_PATH.parent / "biblioteca_suseso"
+
+LEYES = {
+    "ley_19799": BIBLIOTECA_PATH / "leyes" / "ley_19799_firma_electronica.xml",
+    "codigo_civil": BIBLIOTECA_PATH / "codigos" / "codigo_civil.xml",
+    "codigo_trabajo": BIBLIOTECA_PATH / "codigos" / "codigo_trabajo.xml",
+}
+LEYES_TEXTO = ["ley_19799", "codigo_civil"]
+LEYES_EPUB = ["ley_19799", "codigo_trabajo"]
+NCG = BIBLIOTECA_PATH / "organismos" / "SUPERIR" / "NCG" / "NCG_16.xml"
+LIBRO_SUSESO = SUSESO_PATH / "libro_1"
+
+
+@pytest.fixture(scope="module")
+def salida():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture(scope="module")
+def ley(request):
+    """(nombre, XML de la BCN, Norma parseada) de cada ley representativa."""
+    bcn_xml = ley_xml_to_bcn_xml(LEYES[request.param])
+    parser = create_parser("lxml")
+    return request.param, bcn_xml, parser.parse(parser.fromstring(bcn_xml))
+
+
+class TestLeyBudgets:
+    """Presupuestos de las etapas de una ley de la BCN."""
+
+    @pytest.mark.parametrize("ley", LEYES_TEXTO, indirect=True)
+    def test_parse(self, perf_budget, ley):
+        nombre, bcn_xml, _norma = ley
+        parser = create_parser("lxml")
+        perf_budget(nombre, "parse", lambda: parser.parse(parser.fromstring(bcn_xml)))
+
+    @pytest.mark.parametrize("ley", LEYES_EPUB, indirect=True)
+    def test_epub(self, perf_budget, ley, salida):
+        nombre, _bcn_xml, norma = ley
+        generator = EPubGeneratorV2()
+        perf_budget(nombre, "epub", lambda: generator.generate(norma, salida / "n.epub"))
+
+    @pytest.mark.parametrize("ley", LEYES_TEXTO, indirect=True)
+    def test_xml(self, perf_budget, ley, salida):
+        nombre, _bcn_xml, norma = ley
+        generator = LawXMLGenerator()
+        perf_budget(nombre, "xml", lambda: generator.generate(norma, str(salida), "n"))
+
+
+class TestSuperirBudgets:
+    """Presupuestos de una NCG de la SUPERIR."""
+
+    @pytest.fixture(scope="class")
+    def texto(self):
+        return superir_text(NCG)
+
+    def test_parse(self, perf_budget, texto):
+        parser = SuperirStructuredParser()
+        perf_budget("ncg_16", "superir", lambda: parser.parse(texto))
+
+    def test_xml(self, perf_budget, texto):
+        norma = SuperirStructuredParser().parse(texto)
+        generator = SuperirXMLGenerator()
+        perf_budget("ncg_16", "xml", lambda: generator.generate(norma))
+
+
+class TestSusesoBudgets:
+    """Presupuestos de un libro del Compendio SUSESO."""
+
+    def test_texto(self, perf_budget):
+        texto = "\n\n".join(
+            path.read_text(encoding="utf-8") for path in sorted(LIBRO_SUSESO.glob("*.txt"))
+        )
+        parser = NormaTextParser()
+        metadatos = {"tipo": "Circular", "numero": "1", "titulo": "Compendio SUSESO, Libro I"}
+        perf_budget("suseso_libro_1", "texto", lambda: parser.parse_text(texto, metadatos))
+
+
+class TestPerfGate:
+    """La compuerta detecta una etapa el doble de lenta que su presupuesto."""
+
+    @pytest.fixture
+    def presupuestos(self, tmp_path):
+        path = tmp_path / "budgets.json"
+        grabar = PerfBudgets(path, update=True, tolerance=0.5, mem_tolerance=0.25)
+        grabar.measure("rutina", "calibracion", _calibration_workload)
+        grabar.save()
+        return PerfBudgets(path, update=False, tolerance=0.5, mem_tolerance=0.25)
+
+    def test_unchanged_stage_passes(self, presupuestos):
+        presupuestos.measure("rutina", "calibracion", _calibration_workload)
+
+    def test_double_time_fails(self, presupuestos):
+        def lenta():
+            _calibration_workload()
+            _calibration_workload()
+
+        with pytest.raises(AssertionError, match="rutina::calibracion"):
+            presupuestos.measure("rutina", "calibracion", lenta)
@@ -0,0 +1,113 @@
+"""
+Tests unitarios para la planificación de descargas por lotes.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import pytest
+
+from leychile_epub.cli import process_batch
+from leychile_epub.config import Config
+from leychile_epub.planner import NormaRef, plan_fetches
+from leychile_epub.replay_server import ReplayServer
+from leychile_epub.xml_generator import BibliotecaXMLGenerator
+
+from .test_scraper_v2 import STREAM_XML
+
+
+class TestNormaRef:
+    """Tests para NormaRef."""
+
+    def test_key_and_url(self):
+        assert NormaRef("242302").key == "242302"
+        ref = NormaRef("242302", "2024-01-01")
+        assert ref.key == "242302@2024-01-01"
+        assert ref.url == "https://www.leychile.cl/Navegar?idNorma=242302&idVersion=2024-01-01"
+
+
+class TestPlanFetches:
+    """Tests para plan_fetches."""
+
+    def test_deduplicates_url_shapes(self):
+        plan = plan_fetches(
+            [
+                "https://www.leychile.cl/Navegar?idNorma=242302",
+                "https://www.bcn.cl/leychile/navegar?idNorma=242302",
+                "https://leychile.cl/Navegar?idParte=1&idNorma=242302",
+                "https://www.leychile.cl/Navegar?idNorma=1984",
+            ]
+        )
+        assert [f.ref.key for f in plan.fetches] == ["242302", "1984"]
+        assert len(plan.fetches[0].outputs) == 3
+        assert plan.fetches[0].url == "https://www.leychile.cl/Navegar?idNorma=242302"
+        assert (plan.requested, plan.duplicates) == (4, 2)
+
+    def test_versions_are_distinct(self):
+        plan = plan_fetches(
+            [
+                "https://www.leychile.cl/Navegar?idNorma=242302",
+                "https://www.leychile.cl/Navegar?idNorma=242302&idVersion=2020-01-01",
+            ]
+        )
+        assert [f.ref.key for f in plan.fetches] == ["242302", "242302@2020-01-01"]
+
+    def test_invalid_inputs(self):
+        plan = plan_fetches(
+            ["https://www.example.com/?idNorma=1", "https://www.leychile.cl/Navegar"]
+        )
+        assert plan.fetches == []
+        errores = [error for _url, error in plan.invalid]
+        assert errores[0].startswith("Dominio no permitido: www.example.com")
+        assert errores[1] == "No se pudo extraer el ID de la norma de la URL"
+
+    def test_url_of_and_summary(self):
+        leyes = {
+            "a": {"url": "https://www.leychile.cl/Navegar?idNorma=1"},
+            "b": {"url": "https://www.bcn.cl/leychile/navegar?idNorma=1"},
+            "c": {"url": "ftp://www.leychile.cl/Navegar?idNorma=2"},
+        }
+        plan = plan_fetches(leyes.items(), lambda item: item[1]["url"])
+        assert [key for key, _info in plan.fetches[0].outputs] == ["a", "b"]
+        assert plan.summary() == "3 solicitudes → 1 descargas únicas (1 duplicada, 1 inválida)"
+        assert plan.to_dict() == {"solicitudes": 3, "descargas": 1, "duplicadas": 1, "invalidas": 1}
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    fixtures = tmp_path / "fixtures"
+    fixtures.mkdir()
+    (fixtures / "norma.xml").write_bytes(STREAM_XML)
+    with ReplayServer(fixtures) as server:
+        config = Config()
+        config.scraper.base_url = server.url
+        config.scraper.rate_limit_delay = 0
+        monkeypatch.setattr("leychile_epub.scraper_v2.get_config", lambda: config)
+        yield server
+
+
+class TestPlannedExecution:
+    """Tests de la ejecución con una descarga por norma."""
+
+    def test_biblioteca_fans_out_single_fetch(self, server, tmp_path):
+        leyes = {
+            "ley_99": {"url": "https://www.leychile.cl/Navegar?idNorma=99", "nombre": "Ley 99"},
+            "alias": {"url": "https://www.bcn.cl/leychile/navegar?idNorma=99", "nombre": "Alias"},
+            "mala": {"url": "https://www.example.com/?idNorma=99", "nombre": "Mala"},
+        }
+        resultado = BibliotecaXMLGenerator().generate(
+            leyes, str(tmp_path / "out"), generar_indice=False
+        )
+        assert server.stats.requests == 1
+        assert [ley["clave"] for ley in resultado["leyes"]] == ["ley_99", "alias", "mala"]
+        assert (resultado["exitosas"], resultado["fallidas"]) == (2, 1)
+        assert (tmp_path / "out" / "ley_99.xml").exists()
+        assert (tmp_path / "out" / "alias.xml").exists()
+
+    def test_cli_batch_fetches_once(self, server, tmp_path):
+        batch = tmp_path / "urls.txt"
+        batch.write_text(
+            "https://www.leychile.cl/Navegar?idNorma=99\n"
+            "https://www.bcn.cl/leychile/navegar?idNorma=99\n"
+        )
+        assert process_batch(str(batch), str(tmp_path / "out"), quiet=True) == (2, 0)
+        assert server.stats.requests == 1
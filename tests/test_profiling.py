@@ -0,0 +1,136 @@
+"""
+Tests unitarios para el perfilado por norma.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import io
+import json
+
+import pytest
+
+from leychile_epub import profiling
+from leychile_epub.cli import main
+from leychile_epub.config import Config
+from leychile_epub.profiling import (
+    DESCARGA,
+    ESCRITURA,
+    PARSEO,
+    RENDER,
+    NormaTiming,
+    add_bytes,
+    profile_normas,
+    record_norma,
+    span,
+)
+from leychile_epub.scraper_v2 import BCNLawScraperV2
+
+from .test_scraper_v2 import STREAM_XML
+
+URL = "https://www.leychile.cl/Navegar?idNorma=99"
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    config = Config()
+    config.scraper.rate_limit_delay = 0
+    monkeypatch.setattr("leychile_epub.scraper_v2.get_config", lambda: config)
+    monkeypatch.setattr(BCNLawScraperV2, "_fetch", lambda self, url: STREAM_XML)
+    return BCNLawScraperV2()
+
+
+class TestSpans:
+    """Tests de las marcas de etapa."""
+
+    def test_noop_without_profiler(self):
+        assert profiling._profiler is None
+        assert span(PARSEO) is span(RENDER)
+        assert record_norma("x") is span(PARSEO)
+        add_bytes(10)
+
+    def test_spans_outside_norma_are_ignored(self):
+        with profile_normas() as profiler:
+            with span(PARSEO):
+                pass
+        assert profiler.records == []
+
+    def test_accumulates_and_skips_nested_same_stage(self):
+        record = NormaTiming("x")
+        with record.span(PARSEO):
+            with record.span(PARSEO):
+                pass
+            with record.span(RENDER):
+                pass
+        with record.span(PARSEO):
+            pass
+        assert set(record.ms) == {PARSEO, RENDER}
+        assert record.ms[PARSEO] >= record.ms[RENDER]
+
+    def test_profiles_do_not_nest(self):
+        with profile_normas() as exterior:
+            with profile_normas() as interior:
+                with record_norma("a"):
+                    pass
+            with record_norma("b"):
+                pass
+        assert [r.norma for r in interior.records] == ["a"]
+        assert [r.norma for r in exterior.records] == ["b"]
+        assert profiling._profiler is None
+
+
+class TestNormaRecords:
+    """Tests de los registros por norma."""
+
+    def test_scrape_and_generate(self, scraper, tmp_path):
+        from leychile_epub.generator_v2 import EPubGeneratorV2
+
+        sink = io.StringIO()
+        with profile_normas(sink) as profiler:
+            with record_norma(URL):
+                norma = scraper.scrape(URL)
+                EPubGeneratorV2().generate(norma, tmp_path / "ley.epub")
+
+        (record,) = profiler.records
+        assert record.bytes == len(STREAM_XML)
+        assert record.nodos == 4
+        assert set(record.ms) == {DESCARGA, PARSEO, RENDER, ESCRITURA}
+        assert record.total_ms >= sum(record.ms.values())
+        assert record.memoria_pico is None
+        assert json.loads(sink.getvalue()) == record.to_dict()
+
+    def test_streaming_download_is_part_of_parse(self, scraper, monkeypatch):
+        scraper.config.scraper.streaming = True
+        monkeypatch.setattr(BCNLawScraperV2, "_iter_download", lambda self, url: iter([STREAM_XML]))
+        with profile_normas() as profiler, record_norma(URL):
+            scraper.scrape(URL)
+        assert profiler.records[0].nodos == 4
+        assert set(profiler.records[0].ms) == {PARSEO}
+
+    def test_trace_memory(self, scraper):
+        with profile_normas(trace_memory=True) as profiler, record_norma(URL):
+            scraper.scrape(URL)
+        assert profiler.records[0].memoria_pico > 0
+        assert "memoria_pico" in profiler.records[0].to_dict()
+
+    def test_record_survives_errors(self):
+        with profile_normas() as profiler:
+            with pytest.raises(ValueError), record_norma("x"):
+                raise ValueError
+        assert [r.norma for r in profiler.records] == ["x"]
+
+
+class TestCliProfile:
+    """Tests de la opción --profile del CLI."""
+
+    def test_profile_file(self, scraper, tmp_path, monkeypatch):
+        monkeypatch.setattr("leychile_epub.cli.BCNLawScraperV2", lambda: scraper)
+        perfil = tmp_path / "perfil.jsonl"
+
+        result = main([URL, "-o", str(tmp_path), "-q", "--profile", str(perfil)])
+
+        assert result == 0
+        (linea,) = perfil.read_text(encoding="utf-8").splitlines()
+        data = json.loads(linea)
+        assert data["norma"] == URL
+        assert data["nodos"] == 4
+        assert set(data["ms"]) == {DESCARGA, PARSEO, RENDER, ESCRITURA}
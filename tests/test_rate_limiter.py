@@ -0,0 +1,194 @@
+"""
+Tests unitarios para el limitador de tasa.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import formatdate
+
+import pytest
+import requests
+
+from leychile_epub.config import Config, ScraperConfig
+from leychile_epub.exceptions import RateLimitError
+from leychile_epub.rate_limiter import (
+    MAX_RETRY_AFTER,
+    TokenBucket,
+    get_rate_limiter,
+    parse_retry_after,
+    throttled_get,
+)
+from leychile_epub.scraper_v2 import BCNLawScraperV2
+
+URL = "https://www.leychile.cl/Consulta/obtxml?opt=7&idNorma=1"
+
+
+class FakeClock:
+    """Reloj manual para tests deterministas."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, headers=None, content=b"<Norma/>"):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = content
+
+    def close(self):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"HTTP {self.status_code}", response=self)
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, timeout=None, headers=None, stream=False):
+        self.calls += 1
+        return self.responses.pop(0)
+
+    def close(self):
+        pass
+
+
+class TestTokenBucket:
+    """Tests para TokenBucket."""
+
+    def test_burst_then_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, burst=3, clock=clock)
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.reserve() == pytest.approx(0.5)
+        assert bucket.reserve() == pytest.approx(1.0)
+
+    def test_refills_over_time(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, burst=1, clock=clock)
+        bucket.reserve()
+        clock.now += 1.0
+        assert bucket.reserve() == 0.0
+
+    def test_elapsed_request_time_is_credited(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, clock=clock)
+        bucket.reserve()
+        clock.now += 0.8  # la solicitud tardó más que el intervalo
+        assert bucket.reserve() == 0.0
+
+    def test_penalize_blocks_everyone(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10.0, burst=5, clock=clock)
+        bucket.penalize(3.0)
+        assert bucket.reserve() == pytest.approx(3.0)
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_thread_safe_reservations(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, burst=1, clock=clock)
+        waits: list[float] = []
+        lock = threading.Lock()
+
+        def worker():
+            wait = bucket.reserve()
+            with lock:
+                waits.append(wait)
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sorted(waits) == [pytest.approx(float(i)) for i in range(10)]
+
+    def test_acquire_async(self):
+        bucket = TokenBucket(rate=50.0, burst=1)
+
+        async def run():
+            return [await bucket.acquire_async() for _ in range(3)]
+
+        waits = asyncio.run(run())
+        assert waits[0] == 0.0
+        assert waits[2] > 0
+
+
+class TestFromConfig:
+    """Tests para la construcción desde la configuración."""
+
+    def test_derived_from_rate_limit_delay(self):
+        limiter = TokenBucket.from_config(ScraperConfig(rate_limit_delay=0.25))
+        assert limiter.rate == 4.0
+
+    def test_explicit_rate_and_burst(self):
+        limiter = TokenBucket.from_config(ScraperConfig(requests_per_second=3, burst=2))
+        assert (limiter.rate, limiter.burst) == (3.0, 2)
+
+    def test_unlimited(self):
+        assert TokenBucket.from_config(ScraperConfig(rate_limit_delay=0)) is None
+
+    def test_shared_between_scrapers(self):
+        assert get_rate_limiter(7.0, 2) is get_rate_limiter(7.0, 2)
+        config = Config()
+        config.scraper.requests_per_second = 11.0
+        assert BCNLawScraperV2(config).limiter is BCNLawScraperV2(config).limiter
+
+
+class TestRetryAfter:
+    """Tests para Retry-After y throttled_get."""
+
+    def test_parse_seconds(self):
+        assert parse_retry_after("7") == 7.0
+
+    def test_parse_http_date(self):
+        assert 0 < parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+
+    def test_parse_invalid_and_capped(self):
+        assert parse_retry_after("mañana") is None
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("99999") == MAX_RETRY_AFTER
+
+    def test_retries_after_429(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1000.0, clock=clock)
+        penalties: list[float] = []
+        bucket.penalize = penalties.append
+        session = FakeSession(
+            FakeResponse(429, headers={"Retry-After": "0"}), FakeResponse(200, content=b"ok")
+        )
+
+        response = throttled_get(session, URL, bucket, timeout=1, max_retries=2)
+        assert response.content == b"ok"
+        assert session.calls == 2
+        assert penalties == [0.0]
+
+    def test_gives_up_after_max_retries(self):
+        session = FakeSession(FakeResponse(503), FakeResponse(503))
+        response = throttled_get(session, URL, None, timeout=1, max_retries=1, backoff=0)
+        assert response.status_code == 503
+        assert session.calls == 2
+
+    def test_scraper_raises_rate_limit_error(self, monkeypatch):
+        config = Config()
+        config.scraper.max_retries = 0
+        scraper = BCNLawScraperV2(config)
+        monkeypatch.setattr(
+            scraper, "session", FakeSession(FakeResponse(429, headers={"Retry-After": "12"}))
+        )
+        with pytest.raises(RateLimitError) as exc_info:
+            scraper._download(URL)
+        assert exc_info.value.retry_after == 12.0
+        assert exc_info.value.status_code == 429
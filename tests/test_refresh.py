@@ -0,0 +1,245 @@
+"""
+Tests unitarios para la actualización incremental por versión.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import json
+from functools import partial
+from xml.etree import ElementTree as ET
+
+import pytest
+
+from leychile_epub.cli import main
+from leychile_epub.config import Config
+from leychile_epub.http_cache import XMLCache
+from leychile_epub.refresh import (
+    ESTADO_ACTUALIZADA,
+    ESTADO_FALLIDA,
+    ESTADO_NUEVA,
+    ESTADO_SIN_CAMBIOS,
+    IncrementalRefresher,
+    VersionManifest,
+)
+from leychile_epub.replay_server import ReplayServer
+from leychile_epub.scraper_v2 import BCNLawScraperV2, BCNXMLParser
+from leychile_epub.xml_generator import BibliotecaXMLGenerator
+
+from .test_scraper_v2 import STREAM_XML
+
+URL = "https://www.leychile.cl/Navegar?idNorma=99"
+
+
+@pytest.fixture
+def fixtures_dir(tmp_path):
+    directory = tmp_path / "fixtures"
+    directory.mkdir()
+    (directory / "norma.xml").write_bytes(STREAM_XML)
+    return directory
+
+
+def _refresher(server, manifest_path, **kwargs):
+    config = Config()
+    config.scraper.base_url = server.url
+    config.scraper.rate_limit_delay = 0
+    config.scraper.max_retries = 0
+    return IncrementalRefresher(BCNLawScraperV2(config), VersionManifest(manifest_path), **kwargs)
+
+
+def _writer(tmp_path):
+    generated = []
+
+    def generate(norma):
+        path = tmp_path / f"{norma.norma_id}.txt"
+        path.write_text(norma.fecha_version)
+        generated.append(norma.fecha_version)
+        return [path]
+
+    return generate, generated
+
+
+class TestVersionManifest:
+    """Tests para el manifiesto de versiones."""
+
+    def test_missing_file_is_empty(self, tmp_path):
+        assert len(VersionManifest(tmp_path / "manifest.json")) == 0
+
+    def test_corrupt_file_is_ignored(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        path.write_text("{no es json")
+        assert len(VersionManifest(path)) == 0
+
+    def test_save_and_reload(self, tmp_path):
+        norma = BCNXMLParser().parse(ET.fromstring(STREAM_XML))
+        manifest = VersionManifest(tmp_path / "manifest.json")
+        manifest.update(norma, [tmp_path / "salida.epub"])
+        manifest.save()
+
+        entry = VersionManifest(tmp_path / "manifest.json").get("99")
+        assert entry.fecha_version == "2024-03-01"
+        assert entry.outputs == [str(tmp_path / "salida.epub")]
+        data = json.loads((tmp_path / "manifest.json").read_text())
+        assert data["version"] == 1
+
+    def test_old_fields_are_ignored(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        entrada = {"id_norma": "99", "fecha_version": "2024-03-01", "estructuras": {"2": "x"}}
+        path.write_text(json.dumps({"version": 1, "normas": {"99": entrada}}))
+        assert VersionManifest(path).get("99").fecha_version == "2024-03-01"
+
+
+class TestIncrementalRefresher:
+    """Tests del ciclo completo contra el servidor de réplica."""
+
+    def test_new_then_unchanged_then_updated(self, tmp_path, fixtures_dir):
+        manifest_path = tmp_path / "manifest.json"
+        generate, generated = _writer(tmp_path)
+
+        with ReplayServer(fixtures_dir) as server:
+            refresher = _refresher(server, manifest_path)
+            assert refresher.refresh(URL, generate).estado == ESTADO_NUEVA
+            result = refresher.refresh(URL, generate)
+        assert result.estado == ESTADO_SIN_CAMBIOS
+        assert result.outputs == [str(tmp_path / "99.txt")]
+        assert generated == ["2024-03-01"]
+        # La consulta de versión se corta tras la etiqueta raíz
+        assert server.stats.requests == 2
+
+        (fixtures_dir / "norma.xml").write_bytes(
+            STREAM_XML.replace(b'fechaVersion="2024-03-01"', b'fechaVersion="2025-01-15"')
+        )
+        with ReplayServer(fixtures_dir) as server:
+            result = _refresher(server, manifest_path).refresh(URL, generate)
+        assert result.estado == ESTADO_ACTUALIZADA
+        assert (result.version_anterior, result.fecha_version) == ("2024-03-01", "2025-01-15")
+        assert generated == ["2024-03-01", "2025-01-15"]
+
+    def test_probe_bypasses_cache(self, tmp_path, fixtures_dir):
+        generate, generated = _writer(tmp_path)
+        cache = XMLCache(tmp_path / "cache")
+        with ReplayServer(fixtures_dir) as server:
+            refresher = _refresher(server, tmp_path / "manifest.json")
+            refresher.scraper.cache = cache
+            refresher.refresh(URL, generate)
+
+        # La BCN publica una versión nueva mientras el caché sigue fresco
+        (fixtures_dir / "norma.xml").write_bytes(
+            STREAM_XML.replace(b'fechaVersion="2024-03-01"', b'fechaVersion="2025-01-15"')
+        )
+        with ReplayServer(fixtures_dir) as server:
+            refresher = _refresher(server, tmp_path / "manifest.json")
+            refresher.scraper.cache = cache
+            result = refresher.refresh(URL, generate)
+        assert result.estado == ESTADO_ACTUALIZADA
+        assert generated == ["2024-03-01", "2025-01-15"]
+        assert refresher.manifest.get("99").fecha_version == "2025-01-15"
+
+    def test_missing_output_forces_regeneration(self, tmp_path, fixtures_dir):
+        generate, generated = _writer(tmp_path)
+        with ReplayServer(fixtures_dir) as server:
+            refresher = _refresher(server, tmp_path / "manifest.json")
+            refresher.refresh(URL, generate)
+            (tmp_path / "99.txt").unlink()
+            assert refresher.refresh(URL, generate).estado == ESTADO_ACTUALIZADA
+        assert len(generated) == 2
+
+    def test_force(self, tmp_path, fixtures_dir):
+        generate, generated = _writer(tmp_path)
+        with ReplayServer(fixtures_dir) as server:
+            refresher = _refresher(server, tmp_path / "manifest.json", force=True)
+            refresher.refresh(URL, generate)
+            refresher.refresh(URL, generate)
+        assert len(generated) == 2
+
+    def test_pinned_version_skips_probe(self, tmp_path, fixtures_dir):
+        generate, _generated = _writer(tmp_path)
+        url = f"{URL}&idVersion=2024-03-01"
+        with ReplayServer(fixtures_dir) as server:
+            refresher = _refresher(server, tmp_path / "manifest.json")
+            refresher.refresh(url, generate)
+            assert refresher.refresh(url, generate).estado == ESTADO_SIN_CAMBIOS
+        assert server.stats.requests == 1
+
+    def test_different_outputs_regenerate(self, tmp_path, fixtures_dir):
+        generate, generated = _writer(tmp_path)
+        with ReplayServer(fixtures_dir) as server:
+            refresher = _refresher(server, tmp_path / "manifest.json")
+            refresher.refresh(URL, generate, outputs=[tmp_path / "99.txt"])
+            result = refresher.refresh(URL, generate, outputs=[tmp_path / "99.txt"])
+            assert result.estado == ESTADO_SIN_CAMBIOS
+            result = refresher.refresh(URL, generate, outputs=[tmp_path / "otro.txt"])
+        assert result.estado == ESTADO_ACTUALIZADA
+        assert len(generated) == 2
+
+    def test_errors_are_reported(self, tmp_path, fixtures_dir):
+        generate, generated = _writer(tmp_path)
+        with ReplayServer(fixtures_dir, forced_errors={"99": "500"}) as server:
+            result = _refresher(server, tmp_path / "manifest.json").refresh(URL, generate)
+        assert result.estado == ESTADO_FALLIDA
+        assert "500" in result.error
+        assert generated == []
+
+    def test_write_errors_are_reported(self, tmp_path, fixtures_dir):
+        def generate(norma):
+            raise PermissionError("sin permiso de escritura")
+
+        with ReplayServer(fixtures_dir) as server:
+            result = _refresher(server, tmp_path / "manifest.json").refresh(URL, generate)
+        assert result.estado == ESTADO_FALLIDA
+        assert "sin permiso" in result.error
+
+    def test_programming_errors_propagate(self, tmp_path, fixtures_dir):
+        def generate(norma):
+            raise KeyError("titulo")
+
+        with ReplayServer(fixtures_dir) as server:
+            refresher = _refresher(server, tmp_path / "manifest.json")
+            with pytest.raises(KeyError):
+                refresher.refresh(URL, generate)
+
+
+class TestIncrementalCLI:
+    """Tests para ``--incremental`` en el CLI."""
+
+    def test_batch_skips_unchanged(self, tmp_path, fixtures_dir, monkeypatch):
+        with ReplayServer(fixtures_dir) as server:
+            config = _config(server.url)
+            monkeypatch.setattr("leychile_epub.scraper_v2.get_config", lambda: config)
+            batch = tmp_path / "urls.txt"
+            batch.write_text(URL + "\n")
+            argv = ["--batch", str(batch), "-o", str(tmp_path / "out"), "-q", "--incremental"]
+            assert main(argv) == 0
+            assert main(argv) == 0
+        assert server.stats.status == {"200": 2}
+        assert (tmp_path / "out" / ".leychile-manifest.json").exists()
+
+
+class TestIncrementalBiblioteca:
+    """Tests para ``BibliotecaXMLGenerator.generate(incremental=True)``."""
+
+    def test_new_alias_of_generated_norma(self, tmp_path, fixtures_dir, monkeypatch):
+        ley = {"url": URL, "nombre": "Ley 99"}
+        with ReplayServer(fixtures_dir) as server:
+            monkeypatch.setattr("leychile_epub.scraper_v2.get_config", lambda: _config(server.url))
+            generate = partial(
+                BibliotecaXMLGenerator().generate,
+                output_dir=str(tmp_path),
+                generar_indice=False,
+                incremental=True,
+            )
+            assert generate({"ley_99": ley})["exitosas"] == 1
+            resultado = generate({"ley_99": ley, "alias": ley})
+            assert (resultado["exitosas"], resultado["fallidas"]) == (2, 0)
+            assert (tmp_path / "alias.xml").exists()
+            # El alias regenera la norma; la siguiente corrida ya no
+            resultado = generate({"ley_99": ley, "alias": ley})
+        assert resultado["sin_cambios"] == 2
+        # Descarga, descarga por el alias (sin consultar versión) y consulta
+        assert server.stats.status == {"200": 3}
+
+
+def _config(base_url):
+    config = Config()
+    config.scraper.base_url = base_url
+    config.scraper.rate_limit_delay = 0
+    return config
@@ -0,0 +1,86 @@
+"""
+Tests unitarios para el render en paralelo de los capítulos del ePub.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import zipfile
+
+import pytest
+
+from leychile_epub import render_pool
+from leychile_epub.generator_v2 import EPubConfig, EPubGeneratorV2
+from leychile_epub.render_pool import render_chapters
+from leychile_epub.scraper_v2 import EstructuraFuncional
+
+from .test_generator_v2 import sample_norma  # noqa: F401
+
+
+def _titulos(n: int) -> list[EstructuraFuncional]:
+    return [
+        EstructuraFuncional(
+            id_parte=str(i),
+            tipo_parte="Título",
+            titulo_parte=f"TÍTULO {i}",
+            hijos=[
+                EstructuraFuncional(
+                    id_parte=f"{i}_{j}",
+                    tipo_parte="Artículo",
+                    nombre_parte=str(j),
+                    texto=f"Texto del artículo {j} del título {i}.",
+                )
+                for j in range(3)
+            ],
+        )
+        for i in range(n)
+    ]
+
+
+def _chapters(path) -> dict[str, bytes]:
+    """Capítulos y nav del ePub (sin lo que lleva la hora o el identificador aleatorio)."""
+    variables = ("EPUB/metadatos.xhtml", "EPUB/content.opf", "EPUB/toc.ncx")
+    with zipfile.ZipFile(path) as zf:
+        return {
+            name: zf.read(name)
+            for name in zf.namelist()
+            if name.startswith("EPUB/") and name not in variables
+        }
+
+
+class TestRenderChapters:
+    """Tests para render_chapters."""
+
+    def test_single_worker_matches_sequential(self):
+        generator = EPubGeneratorV2()
+        estructuras = _titulos(3)
+        esperado = [generator._render_chapter(ef) for ef in estructuras]
+        assert list(render_chapters(generator, estructuras, max_workers=1)) == esperado
+
+    def test_process_pool_keeps_order(self):
+        generator = EPubGeneratorV2(EPubConfig(include_version_info=False))
+        estructuras = _titulos(7)
+        esperado = [generator._render_chapter(ef) for ef in estructuras]
+        assert list(render_chapters(generator, estructuras, max_workers=2)) == esperado
+
+    def test_thread_pool_when_free_threaded(self, monkeypatch):
+        monkeypatch.setattr(render_pool, "free_threaded", lambda: True)
+        generator = EPubGeneratorV2()
+        estructuras = _titulos(5)
+        esperado = [generator._render_chapter(ef) for ef in estructuras]
+        assert list(render_chapters(generator, estructuras, max_workers=3)) == esperado
+
+    def test_empty(self):
+        assert list(render_chapters(EPubGeneratorV2(), [], max_workers=4)) == []
+
+
+class TestGenerateWithWorkers:
+    """Tests para EPubGeneratorV2 con render_workers."""
+
+    @pytest.mark.parametrize("workers", [2, 0])
+    def test_same_epub_as_sequential(self, sample_norma, tmp_path, workers):  # noqa: F811
+        sample_norma.estructuras = sample_norma.estructuras + _titulos(4)
+        EPubGeneratorV2().generate(sample_norma, tmp_path / "seq.epub")
+        EPubGeneratorV2(EPubConfig(render_workers=workers)).generate(
+            sample_norma, tmp_path / "par.epub"
+        )
+        assert _chapters(tmp_path / "par.epub") == _chapters(tmp_path / "seq.epub")
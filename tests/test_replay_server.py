@@ -0,0 +1,181 @@
+"""
+Tests unitarios para el servidor de réplica de la API de la BCN.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import json
+import shutil
+import urllib.request
+from xml.etree import ElementTree as ET
+
+import pytest
+
+from leychile_epub.cli import create_replay_parser, main
+from leychile_epub.config import Config
+from leychile_epub.exceptions import NetworkError, ParsingError, RateLimitError
+from leychile_epub.http_cache import XMLCache
+from leychile_epub.replay_server import FixtureStore, ReplayServer
+from leychile_epub.scraper_v2 import BCNLawScraperV2, BCNXMLParser
+
+from .test_bcn_fixtures import LEY_PEQUENA
+from .test_scraper_v2 import STREAM_XML
+
+NORMA_ID = BCNXMLParser().parse(ET.fromstring(STREAM_XML)).norma_id
+URL = f"https://www.leychile.cl/Navegar?idNorma={NORMA_ID}"
+
+
+@pytest.fixture
+def fixtures_dir(tmp_path):
+    directory = tmp_path / "fixtures"
+    directory.mkdir()
+    (directory / "norma.xml").write_bytes(STREAM_XML)
+    (directory / "notas.xml").write_bytes(b"<notas/>")
+    return directory
+
+
+def _scraper(server, **overrides):
+    config = Config()
+    config.scraper.base_url = server.url
+    config.scraper.rate_limit_delay = 0
+    config.scraper.max_retries = 0
+    config.scraper.retry_delay = 0
+    for name, value in overrides.items():
+        setattr(config.scraper, name, value)
+    return BCNLawScraperV2(config)
+
+
+class TestFixtureStore:
+    """Tests para el índice de fixtures."""
+
+    def test_indexes_bcn_xml_by_norma_id(self, fixtures_dir):
+        store = FixtureStore(fixtures_dir)
+        assert store.ids() == [NORMA_ID]
+        content, etag = store.get(NORMA_ID)
+        assert content == STREAM_XML
+        assert etag.startswith('"')
+
+    def test_unknown_id(self, fixtures_dir):
+        assert FixtureStore(fixtures_dir).get("999") is None
+
+    @pytest.mark.skipif(not LEY_PEQUENA.exists(), reason="biblioteca_xml no disponible")
+    def test_converts_ley_v1_library(self, tmp_path):
+        shutil.copy(LEY_PEQUENA, tmp_path)
+        store = FixtureStore(tmp_path)
+        (id_norma,) = store.ids()
+        content, _etag = store.get(id_norma)
+        assert BCNXMLParser().parse(ET.fromstring(content)).norma_id == id_norma
+
+    def test_serves_recorded_cache(self, tmp_path):
+        cache_dir = tmp_path / "cache"
+        url = BCNLawScraperV2(Config()).get_xml_url(NORMA_ID)
+        XMLCache(cache_dir).store(XMLCache.key_for_url(url), url, STREAM_XML)
+
+        assert FixtureStore(cache_dir).get(NORMA_ID)[0] == STREAM_XML
+
+
+class TestReplayServer:
+    """Tests del camino completo scraper → servidor de réplica."""
+
+    def test_scrape_matches_fixture(self, fixtures_dir):
+        expected = BCNXMLParser().parse(ET.fromstring(STREAM_XML))
+        with ReplayServer(fixtures_dir) as server:
+            scraper = _scraper(server)
+            norma = scraper.scrape(URL)
+            scraper.close()
+        assert norma.norma_id == expected.norma_id
+        assert norma.estructuras == expected.estructuras
+        assert server.stats.requests == 1
+        assert server.stats.bytes_sent == len(STREAM_XML)
+
+    def test_streaming_mode(self, fixtures_dir):
+        with ReplayServer(fixtures_dir) as server:
+            scraper = _scraper(server, streaming=True)
+            norma = scraper.scrape(URL)
+            scraper.close()
+        assert norma.norma_id == NORMA_ID
+
+    def test_unknown_norma_is_404(self, fixtures_dir):
+        with ReplayServer(fixtures_dir) as server:
+            scraper = _scraper(server)
+            with pytest.raises(NetworkError) as exc_info:
+                scraper.scrape("https://www.leychile.cl/Navegar?idNorma=999")
+            scraper.close()
+        assert exc_info.value.status_code == 404
+
+    def test_injected_server_error(self, fixtures_dir):
+        with ReplayServer(fixtures_dir, forced_errors={NORMA_ID: "500"}) as server:
+            scraper = _scraper(server)
+            with pytest.raises(NetworkError) as exc_info:
+                scraper.scrape(URL)
+            scraper.close()
+        assert exc_info.value.status_code == 500
+        assert server.stats.injected == {"500": 1}
+
+    def test_injected_rate_limit(self, fixtures_dir):
+        with ReplayServer(fixtures_dir, forced_errors={NORMA_ID: "429"}, retry_after=7) as server:
+            scraper = _scraper(server)
+            with pytest.raises(RateLimitError) as exc_info:
+                scraper.scrape(URL)
+            scraper.close()
+        assert exc_info.value.retry_after == 7
+
+    def test_injected_malformed_xml(self, fixtures_dir):
+        with ReplayServer(fixtures_dir, forced_errors={NORMA_ID: "malformed"}) as server:
+            scraper = _scraper(server)
+            with pytest.raises(ParsingError):
+                scraper.scrape(URL)
+            scraper.close()
+
+    def test_injected_timeout(self, fixtures_dir):
+        with ReplayServer(
+            fixtures_dir, forced_errors={NORMA_ID: "timeout"}, timeout_delay=1.0
+        ) as server:
+            scraper = _scraper(server, timeout=0.2)
+            with pytest.raises(NetworkError, match="Timeout"):
+                scraper.scrape(URL)
+            scraper.close()
+
+    def test_random_errors_are_reproducible(self, fixtures_dir):
+        def run():
+            server = ReplayServer(fixtures_dir, error_rate=0.5, error_kinds=("500",), seed=3)
+            return [server._choose_error(NORMA_ID) for _ in range(20)]
+
+        assert run() == run()
+        assert set(run()) == {None, "500"}
+
+    def test_invalid_error_kind(self, fixtures_dir):
+        with pytest.raises(ValueError):
+            ReplayServer(fixtures_dir, error_kinds=("teapot",))
+
+    def test_conditional_revalidation(self, fixtures_dir, tmp_path):
+        with ReplayServer(fixtures_dir) as server:
+            scraper = _scraper(server, cache_dir=str(tmp_path / "cache"), cache_ttl=0)
+            scraper.scrape(URL)
+            scraper.scrape(URL)
+            scraper.close()
+        assert server.stats.status == {"200": 1, "304": 1}
+
+    def test_stats_endpoint(self, fixtures_dir):
+        with ReplayServer(fixtures_dir) as server:
+            scraper = _scraper(server)
+            scraper.scrape(URL)
+            scraper.close()
+            with urllib.request.urlopen(f"{server.url}/_stats") as response:
+                stats = json.load(response)
+        assert stats["requests"] == 1
+        assert stats["status"] == {"200": 1}
+        assert "requests_per_second" in stats
+
+
+class TestReplayCLI:
+    """Tests para el subcomando ``replay-server``."""
+
+    def test_parser_defaults(self):
+        args = create_replay_parser().parse_args([])
+        assert args.dir == "biblioteca_xml"
+        assert args.port == 8765
+        assert args.error_rate == 0.0
+
+    def test_invalid_errors_exit_code(self, fixtures_dir):
+        assert main(["replay-server", "--dir", str(fixtures_dir), "--errors", "teapot"]) == 1
@@ -59,6 +59,13 @@ class TestBCNLawScraper:
         assert "242302" in api_url
         assert "obtxml" in api_url
         assert "opt=7" in api_url
+        assert "idVersion" not in api_url
+
+    def test_get_api_url_with_version(self, scraper):
+        """Verifica que la versión pedida viaja en la URL de la API."""
+        api_url = scraper.get_api_url("242302", "2024-01-01")
+
+        assert api_url.endswith("idNorma=242302&idVersion=2024-01-01")
 
     def test_classify_text_titulo(self, scraper):
         """Verifica clasificación de títulos."""
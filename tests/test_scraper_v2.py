@@ -4,10 +4,27 @@ Tests unitarios para el scraper v2.
 Author: Luis Aguilera Arteaga <luis@aguilera.cl>
 """
 
+import copy
+import pickle
+from xml.etree import ElementTree as ET
+
 import pytest
 
-from leychile_epub.exceptions import ValidationError
-from leychile_epub.scraper_v2 import BCNLawScraperV2, BCNXMLParser, Norma
+from leychile_epub.config import Config
+from leychile_epub.exceptions import ParsingError, ValidationError
+from leychile_epub.scraper_v2 import (
+    _HIJOS_SLOT,
+    _MATERIAS_SLOT,
+    EMPTY,
+    BCNLawScraperV2,
+    BCNXMLParser,
+    EstructuraFuncional,
+    LxmlBCNXMLParser,
+    Norma,
+    NormaIdentificador,
+    NormaMetadatos,
+    create_parser,
+)
 
 
 class TestBCNLawScraperV2:
@@ -99,3 +116,262 @@ class TestNormaDataclass:
             identificador=NormaIdentificador(tipo="Decreto Ley", numero="3.500"),
         )
         assert norma.nombre_archivo == "Decreto_Ley_3.500"
+
+
+STREAM_XML = """<?xml version="1.0" encoding="utf-8"?>
+<Norma xmlns="http://www.leychile.cl/esquemas" normaId="99" fechaVersion="2024-03-01"
+       SchemaVersion="1.0" derogado="no derogado">
+  <Identificador fechaPromulgacion="2024-01-01" fechaPublicacion="2024-01-02">
+    <TiposNumeros><TipoNumero><Tipo>Ley</Tipo><Numero>99</Numero></TipoNumero></TiposNumeros>
+    <Organismos><Organismo>MINISTERIO DE JUSTICIA</Organismo></Organismos>
+  </Identificador>
+  <Metadatos>
+    <TituloNorma>LEY DE   PRUEBA &amp;amp; STREAMING</TituloNorma>
+    <Materias><Materia>Pruebas</Materia></Materias>
+  </Metadatos>
+  <Encabezado><Texto>Encabezado de la ley.</Texto></Encabezado>
+  <EstructurasFuncionales>
+    <EstructuraFuncional idParte="1" tipoParte="Cap&amp;iacute;tulo">
+      <Texto>CAPÍTULO I</Texto>
+      <Metadatos><TituloParte presente="si">Disposiciones generales</TituloParte></Metadatos>
+      <EstructurasFuncionales>
+        <EstructuraFuncional idParte="2" tipoParte="Artículo" transitorio="transitorio">
+          <Texto>Artículo 1.- Texto <b>con</b> marcas.<ArchivoBinario>xx</ArchivoBinario> Fin.
+
+Segundo inciso.</Texto>
+          <Metadatos>
+            <NombreParte presente="si">1</NombreParte>
+            <Materias><Materia>Detalle</Materia></Materias>
+          </Metadatos>
+        </EstructuraFuncional>
+        <EstructuraFuncional idParte="3" tipoParte="Artículo" derogado="derogado">
+          <Texto>Artículo 2.- Derogado.</Texto>
+          <Metadatos><NombreParte presente="no">2</NombreParte></Metadatos>
+        </EstructuraFuncional>
+      </EstructurasFuncionales>
+    </EstructuraFuncional>
+    <EstructuraFuncional idParte="4" tipoParte="Artículo">
+      <Texto>Artículo 3.- Final.</Texto>
+    </EstructuraFuncional>
+  </EstructurasFuncionales>
+  <Promulgacion derogado="derogado"><Texto>Promúlguese.</Texto></Promulgacion>
+  <Anexos>
+    <Anexo idParte="9"><Metadatos><Titulo>Anexo A</Titulo></Metadatos><Texto>Tabla</Texto></Anexo>
+  </Anexos>
+</Norma>
+""".encode()
+
+
+def _chunks(data: bytes, size: int):
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+class TestStreamingParser:
+    """Tests para BCNXMLParser.parse_stream."""
+
+    @pytest.fixture
+    def parser(self):
+        return BCNXMLParser()
+
+    @pytest.mark.parametrize("size", [1, 7, 64 * 1024])
+    def test_same_result_as_tree_parser(self, parser, size):
+        expected = parser.parse(ET.fromstring(STREAM_XML))
+        assert parser.parse_stream(_chunks(STREAM_XML, size)) == expected
+
+    def test_structure(self, parser):
+        norma = parser.parse_stream([STREAM_XML])
+        assert norma.norma_id == "99"
+        assert norma.metadatos.titulo == "LEY DE PRUEBA & STREAMING"
+        capitulo, articulo_3 = norma.estructuras
+        assert capitulo.tipo_parte == "Capítulo"
+        assert [h.id_parte for h in capitulo.hijos] == ["2", "3"]
+        assert capitulo.hijos[0].nivel == 1
+        assert capitulo.hijos[0].texto.startswith("Artículo 1.- Texto con marcas.")
+        assert articulo_3.nivel == 0
+        assert norma.promulgacion_derogado
+        assert norma.anexos[0]["titulo"] == "Anexo A"
+
+    def test_invalid_xml(self, parser):
+        with pytest.raises(ET.ParseError):
+            parser.parse_stream([b"<Norma><sin cerrar>"])
+
+    def test_parse_root_reads_only_first_chunk(self, parser):
+        chunks = iter(_chunks(STREAM_XML, 200))
+        norma = parser.parse_root(chunks)
+        assert (norma.norma_id, norma.fecha_version) == ("99", "2024-03-01")
+        assert norma.estructuras == []
+        assert next(chunks, None) is not None
+
+    def test_parse_root_without_root(self, parser):
+        with pytest.raises(ET.ParseError):
+            parser.parse_root([b"<?xml version='1.0'?>"])
+
+    def test_scraper_streaming_mode(self, monkeypatch):
+        config = Config()
+        config.scraper.streaming = True
+        config.scraper.rate_limit_delay = 0
+        scraper = BCNLawScraperV2(config)
+
+        class Response:
+            status_code = 200
+            headers: dict = {}
+
+            def raise_for_status(self):
+                pass
+
+            def iter_content(self, chunk_size):
+                return _chunks(STREAM_XML, 16)
+
+            def close(self):
+                pass
+
+        calls = []
+
+        def fake_get(url, timeout=None, headers=None, stream=False):
+            calls.append(stream)
+            return Response()
+
+        monkeypatch.setattr(scraper.session, "get", fake_get)
+        norma = scraper.scrape("https://www.leychile.cl/Navegar?idNorma=99&idVersion=2024")
+
+        assert calls == [True]
+        assert norma.url_original.endswith("idVersion=2024")
+        assert norma.id_version == "2024"
+        assert len(norma.estructuras) == 2
+
+    def test_scraper_streaming_invalid_xml(self, monkeypatch):
+        config = Config()
+        config.scraper.rate_limit_delay = 0
+        scraper = BCNLawScraperV2(config)
+        monkeypatch.setattr(scraper, "_iter_download", lambda url: iter([b"<Norma>"]))
+        with pytest.raises(ParsingError):
+            scraper.fetch_norma_stream("https://www.leychile.cl/Consulta/obtxml?idNorma=1")
+
+
+MIXED_XML = b"""<?xml version="1.0" encoding="utf-8"?>
+<Norma xmlns="http://www.leychile.cl/esquemas" normaId="1">
+  <!-- comentario -->
+  <EstructurasFuncionales>
+    <EstructuraFuncional idParte="1" tipoParte="Art&amp;iacute;culo">
+      <Texto>  Uno&amp;amp;amp;  <i> dos\t&amp;amp;lt;  </i>
+<!-- nota -->
+
+  tres <b><u>  cuatro  </u></b></Texto>
+      <Metadatos>
+        <NombreParte presente="si"> 1 </NombreParte>
+        <NombreParte presente="si">ignorado</NombreParte>
+      </Metadatos>
+    </EstructuraFuncional>
+  </EstructurasFuncionales>
+</Norma>
+"""
+
+
+class TestParserBackends:
+    """Tests para el backend lxml de BCNXMLParser."""
+
+    @pytest.mark.parametrize("xml", [STREAM_XML, MIXED_XML])
+    def test_identical_output(self, xml):
+        etree_parser = create_parser("etree")
+        lxml_parser = create_parser("lxml")
+        expected = etree_parser.parse(etree_parser.fromstring(xml))
+        assert lxml_parser.parse(lxml_parser.fromstring(xml)) == expected
+        assert lxml_parser.parse_stream(_chunks(xml, 5)) == expected
+
+    def test_backend_class(self):
+        assert isinstance(create_parser("lxml"), LxmlBCNXMLParser)
+        assert type(create_parser()) is BCNXMLParser
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValidationError):
+            create_parser("sax")
+
+    def test_scraper_uses_configured_backend(self):
+        config = Config()
+        config.scraper.parser_backend = "lxml"
+        scraper = BCNLawScraperV2(config)
+        assert isinstance(scraper.parser, LxmlBCNXMLParser)
+        with pytest.raises(ParsingError):
+            scraper._parse_xml(b"<Norma><sin cerrar>", "test")
+
+
+class TestCompactTree:
+    """Tests para la representación compacta del árbol de estructuras."""
+
+    @pytest.mark.parametrize("backend", ["etree", "lxml"])
+    def test_parsed_nodes_share_empty_and_interned_values(self, backend):
+        parser = create_parser(backend)
+        norma = parser.parse(parser.fromstring(STREAM_XML))
+        capitulo, articulo_3 = norma.estructuras
+        articulo_1, articulo_2 = capitulo.hijos
+
+        assert articulo_1.materias == ["Detalle"]
+        assert _MATERIAS_SLOT.__get__(articulo_2) is EMPTY
+        assert _HIJOS_SLOT.__get__(articulo_2) is EMPTY
+        assert _HIJOS_SLOT.__get__(articulo_3) is EMPTY
+        assert articulo_2.materias == [] and articulo_2.hijos == []
+        assert articulo_2.tipo_parte is articulo_3.tipo_parte
+
+    @pytest.mark.parametrize("backend", ["etree", "lxml"])
+    def test_parsed_nodes_accept_append(self, backend):
+        parser = create_parser(backend)
+        articulo_2 = parser.parse(parser.fromstring(STREAM_XML)).estructuras[0].hijos[1]
+        articulo_2.materias.append("Nueva")
+        articulo_2.hijos.append(EstructuraFuncional(nivel=2))
+        articulo_2.hijos += [EstructuraFuncional(nivel=2)]
+        articulo_2.materias.sort()
+        assert articulo_2.materias == ["Nueva"]
+        assert len(articulo_2.hijos) == 2
+        articulo_2.hijos.clear()
+        assert articulo_2.hijos == []
+        assert EstructuraFuncional(hijos=EMPTY).hijos == []
+
+    def test_dict_materias_are_plain_lists(self):
+        norma = BCNXMLParser().parse(ET.fromstring(STREAM_XML))
+        articulos = [
+            item
+            for item in BCNLawScraperV2()._norma_to_dict(norma)["content"]
+            if item["type"] == "articulo"
+        ]
+        assert [type(item["materias"]) for item in articulos] == [list, list, list]
+        articulos[1]["materias"].append("Otra")
+        assert norma.estructuras[0].hijos[1].materias == []
+
+    def test_slots(self):
+        for obj in (Norma(), EstructuraFuncional(), NormaMetadatos(), NormaIdentificador()):
+            assert not hasattr(obj, "__dict__")
+
+    def test_equality_ignores_empty_representation(self):
+        parser = BCNXMLParser()
+        articulo_3 = parser.parse(ET.fromstring(STREAM_XML)).estructuras[1]
+        manual = EstructuraFuncional(
+            id_parte="4", tipo_parte="Artículo", texto="Artículo 3.- Final.", hijos=[]
+        )
+        assert articulo_3 == manual
+        manual.materias.append("Otra")
+        assert articulo_3 != manual
+
+    def test_empty_is_a_readonly_list(self):
+        assert isinstance(EMPTY, list) and EMPTY == [] and repr(EMPTY) == "[]"
+        with pytest.raises(TypeError):
+            EMPTY.append("x")
+        assert pickle.loads(pickle.dumps(EMPTY)) is EMPTY
+        assert copy.deepcopy(EMPTY) is EMPTY
+
+    def test_copies_keep_shared_empty(self):
+        ef = EstructuraFuncional(id_parte="1", hijos=EMPTY, materias=EMPTY)
+        restored = pickle.loads(pickle.dumps(ef))
+        assert restored == ef
+        assert _HIJOS_SLOT.__get__(restored) is EMPTY
+        copia = copy.deepcopy(ef)
+        copia.hijos.append(EstructuraFuncional())
+        assert len(copia.hijos) == 1 and ef.hijos == []
+        vista = copy.copy(ef.materias)
+        vista.append("x")
+        assert ef.materias == []
+
+    def test_new_nodes_accept_append(self):
+        ef = EstructuraFuncional()
+        ef.hijos.append(EstructuraFuncional(nivel=1))
+        assert len(ef.hijos) == 1
+        assert EstructuraFuncional().hijos is not ef.hijos
@@ -0,0 +1,110 @@
+"""
+Tests unitarios para los snapshots binarios de normas.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import re
+
+import pytest
+
+from leychile_epub.exceptions import ParsingError
+from leychile_epub.generator_v2 import EPubGeneratorV2
+from leychile_epub.scraper_v2 import BCNXMLParser, EstructuraFuncional, create_parser
+from leychile_epub.snapshot import (
+    as_norma,
+    dumps_snapshot,
+    load_snapshot,
+    loads_snapshot,
+    save_snapshot,
+)
+from leychile_epub.superir_models import CierreSuperir, Firmante, NormaSuperir
+from leychile_epub.superir_structured_parser import SuperirStructuredParser
+from leychile_epub.superir_xml_generator import SuperirXMLGenerator
+from leychile_epub.xml_generator import LawXMLGenerator
+
+from .test_scraper_v2 import STREAM_XML
+from .test_superir_structured_parser import TestFullParseNCG4
+
+
+def _sin_fecha(xml: str) -> str:
+    return re.sub(r'generado="[^"]*"', "", xml)
+
+
+@pytest.fixture
+def norma():
+    parser = BCNXMLParser()
+    return parser.parse(parser.fromstring(STREAM_XML))
+
+
+class TestSnapshotFormat:
+    """Tests para dumps_snapshot / loads_snapshot."""
+
+    def test_round_trip_norma(self, norma):
+        data = dumps_snapshot(norma)
+        assert data.startswith(b"LCSNAP")
+        assert loads_snapshot(data) == norma
+
+    def test_round_trip_text_buffer(self):
+        parser = create_parser(text_buffer=True)
+        norma = parser.parse(parser.fromstring(STREAM_XML))
+        cargada = loads_snapshot(dumps_snapshot(norma))
+        assert cargada == norma
+        assert cargada.text_buffer is None
+
+    def test_round_trip_superir(self, norma):
+        superir = NormaSuperir(
+            norma_base=norma,
+            articulos_epigrafe={"1": "Modelo"},
+            cierre=CierreSuperir("Anótese.", Firmante("NOMBRE", "Cargo")),
+            disposiciones_finales=[EstructuraFuncional(id_parte="x", texto="Final")],
+        )
+        assert loads_snapshot(dumps_snapshot(superir)) == superir
+
+    def test_round_trip_superir_parser(self):
+        superir = SuperirStructuredParser().parse(TestFullParseNCG4.NCG4_TEXTO)
+        assert loads_snapshot(dumps_snapshot(superir)) == superir
+
+    @pytest.mark.parametrize(
+        "corromper",
+        [
+            lambda d: b"XXXXXX" + d[6:],
+            lambda d: d[:6] + b"\x09\x00" + d[8:],
+            lambda d: d[:-1] + bytes([d[-1] ^ 0xFF]),
+            lambda d: d[:10],
+        ],
+        ids=["magic", "version", "crc", "truncado"],
+    )
+    def test_invalid(self, norma, corromper):
+        with pytest.raises(ParsingError):
+            loads_snapshot(corromper(dumps_snapshot(norma)))
+
+    def test_unsupported_object(self):
+        with pytest.raises(TypeError):
+            dumps_snapshot({"no": "es una norma"})
+
+
+class TestSnapshotFiles:
+    """Tests para save_snapshot / load_snapshot y los generadores."""
+
+    def test_save_and_load(self, norma, tmp_path):
+        path = save_snapshot(norma, tmp_path / "sub" / "ley.lcsnap")
+        assert load_snapshot(path) == norma
+        assert as_norma(str(path)) == norma
+        assert as_norma(norma) is norma
+
+    def test_generators_accept_snapshot_path(self, norma, tmp_path):
+        path = save_snapshot(norma, tmp_path / "ley.lcsnap")
+
+        epub = EPubGeneratorV2().generate(path, tmp_path / "ley.epub")
+        assert epub.exists()
+
+        desde_norma = LawXMLGenerator().generate(norma, str(tmp_path / "a"))
+        desde_snapshot = LawXMLGenerator().generate(path, str(tmp_path / "b"))
+        assert _sin_fecha(desde_snapshot.read_text()) == _sin_fecha(desde_norma.read_text())
+
+    def test_superir_generator_accepts_snapshot_path(self, tmp_path):
+        superir = SuperirStructuredParser().parse(TestFullParseNCG4.NCG4_TEXTO)
+        path = save_snapshot(superir, tmp_path / "ncg.lcsnap")
+        generator = SuperirXMLGenerator()
+        assert _sin_fecha(generator.generate(path)) == _sin_fecha(generator.generate(superir))
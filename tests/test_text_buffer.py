@@ -0,0 +1,99 @@
+"""
+Tests unitarios para el buffer único de textos.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import hashlib
+
+import pytest
+
+from leychile_epub.config import Config
+from leychile_epub.diff import diff_normas
+from leychile_epub.scraper_v2 import (
+    BCNLawScraperV2,
+    BufferedEstructura,
+    buscar_texto,
+    create_parser,
+    texto_utf8,
+)
+from leychile_epub.text_buffer import TextBuffer
+
+from .test_scraper_v2 import STREAM_XML, _chunks
+
+
+class TestTextBuffer:
+    """Tests para TextBuffer."""
+
+    def test_append_and_read(self):
+        buffer = TextBuffer()
+        assert buffer.append("Artículo ñandú") == 0
+        assert buffer.append("") == 1
+        assert buffer.append("fin") == 2
+        buffer.freeze()
+        assert len(buffer) == 3
+        assert buffer.text(0) == "Artículo ñandú"
+        assert buffer.text(1) == ""
+        assert buffer.length(0) == len("Artículo ñandú".encode())
+        assert bytes(buffer.view(2)) == b"fin"
+        assert buffer.digest(2) == hashlib.blake2b(b"fin", digest_size=16).digest()
+
+    def test_frozen(self):
+        buffer = TextBuffer()
+        buffer.freeze()
+        with pytest.raises(ValueError):
+            buffer.append("x")
+
+    def test_search(self):
+        buffer = TextBuffer()
+        for texto in ["abc", "def", "cdx", "xcd"]:
+            buffer.append(texto)
+        buffer.freeze()
+        assert buffer.search("cd") == [2, 3]
+
+
+class TestBufferedParsing:
+    """Tests para el modo text_buffer del parser."""
+
+    @pytest.mark.parametrize("backend", ["etree", "lxml"])
+    def test_same_norma(self, backend):
+        plain = create_parser(backend)
+        buffered = create_parser(backend, text_buffer=True)
+        expected = plain.parse(plain.fromstring(STREAM_XML))
+        norma = buffered.parse(buffered.fromstring(STREAM_XML))
+        assert norma == expected
+        assert buffered.parse_stream(_chunks(STREAM_XML, 11)) == expected
+        assert isinstance(norma.estructuras[0], BufferedEstructura)
+        assert norma.text_buffer.frozen
+        assert len(norma.text_buffer) == 4
+
+    def test_consumers_do_not_materialize(self, monkeypatch):
+        parser = create_parser(text_buffer=True)
+        norma = parser.parse(parser.fromstring(STREAM_XML))
+        otra = parser.parse(parser.fromstring(STREAM_XML))
+
+        def fail(self, i):
+            raise AssertionError("texto materializado")
+
+        monkeypatch.setattr(TextBuffer, "text", fail)
+        assert diff_normas(norma, otra).vacio
+        assert [ef.id_parte for ef in buscar_texto(norma, "Final")] == ["4"]
+        assert bytes(texto_utf8(norma.estructuras[1])) == "Artículo 3.- Final.".encode()
+
+    def test_assignment_detaches(self):
+        parser = create_parser(text_buffer=True)
+        ef = parser.parse(parser.fromstring(STREAM_XML)).estructuras[1]
+        ef.texto = "Nuevo"
+        assert ef.texto == "Nuevo"
+        assert ef.text_ref is None
+        assert texto_utf8(ef) == b"Nuevo"
+
+    def test_buscar_texto_without_buffer(self):
+        parser = create_parser()
+        norma = parser.parse(parser.fromstring(STREAM_XML))
+        assert [ef.id_parte for ef in buscar_texto(norma, "Artículo")] == ["2", "3", "4"]
+
+    def test_scraper_config(self):
+        config = Config()
+        config.scraper.text_buffer = True
+        assert BCNLawScraperV2(config).parser.text_buffer
@@ -0,0 +1,129 @@
+"""
+Tests unitarios para el módulo de normalización de texto.
+
+Author: Luis Aguilera Arteaga <luis@aguilera.cl>
+"""
+
+import html
+import re
+
+import pytest
+
+from leychile_epub import text_normalize
+from leychile_epub.superir_base_parser import SuperirBaseParser
+from leychile_epub.text_normalize import (
+    escape_html,
+    escape_html_preserve_links,
+    normalize_short,
+    normalize_text,
+    profile_text,
+    set_cache_size,
+    split_parrafos,
+    unwrap_pdf_lines,
+)
+
+
+def _referencia(text: str) -> str:
+    # Limpieza original de BCNXMLParser._get_text, sin atajos
+    text = html.unescape(text)
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n\s*\n", "\n\n", text)
+    return text.strip()
+
+
+CASOS = [
+    "",
+    "  Artículo 1.- Texto simple.  ",
+    "A &amp; B &#233;",
+    "uno\t\tdos   tres",
+    "a\n \nb",
+    "a\n\n\n\nb\nc",
+    "línea\nsola",
+    "&nbsp;&nbsp;x",
+]
+
+
+class TestNormalizeText:
+    """Tests para normalize_text / normalize_short."""
+
+    @pytest.mark.parametrize("texto", CASOS)
+    def test_same_as_reference(self, texto):
+        assert normalize_text(texto) == _referencia(texto)
+        assert normalize_short(texto) == _referencia(texto)
+
+    def test_long_text_skips_cache(self):
+        texto = "x  " * text_normalize.SHORT_MAX
+        with profile_text() as perfil:
+            assert normalize_short(texto) == _referencia(texto)
+        assert perfil.cache_hits == perfil.cache_misses == 0
+
+    def test_cache_disabled(self):
+        try:
+            set_cache_size(0)
+            assert normalize_short("A &amp; B") == "A & B"
+            with pytest.raises(ValueError):
+                set_cache_size(-1)
+        finally:
+            set_cache_size(text_normalize.DEFAULT_CACHE_SIZE)
+
+
+class TestEscapeHtml:
+    """Tests para escape_html / escape_html_preserve_links."""
+
+    def test_escape(self):
+        assert escape_html('<a> & "b"') == "&lt;a&gt; &amp; &quot;b&quot;"
+        assert escape_html("sin cambios") == "sin cambios"
+        assert escape_html("") == ""
+
+    def test_preserve_links(self):
+        link = '<a href="#art_5" class="cross-ref">artículo 5 <b></a>'
+        assert escape_html_preserve_links(f"ver {link} & más") == (
+            'ver <a href="#art_5" class="cross-ref">artículo 5 &lt;b&gt;</a> &amp; más'
+        )
+        assert escape_html_preserve_links("<b>") == "&lt;b&gt;"
+
+
+class TestPdfText:
+    """Tests para unwrap_pdf_lines / split_parrafos."""
+
+    def test_unwrap(self):
+        texto = "El deudor deberá\npresentar los antecedentes.\nArtículo 2. Otro"
+        assert unwrap_pdf_lines(texto, SuperirBaseParser._is_new_unit_start) == (
+            "El deudor deberá presentar los antecedentes.\n\nArtículo 2. Otro"
+        )
+        assert unwrap_pdf_lines("  una línea ", SuperirBaseParser._is_new_unit_start) == (
+            "una línea"
+        )
+
+    def test_split_parrafos(self):
+        assert split_parrafos("Uno.\n\nDos.") == ["Uno.", "Dos."]
+        assert split_parrafos("Uno sin\n\ncierre.") == ["Uno sin cierre."]
+        assert split_parrafos("Uno.  Dos.") == ["Uno.", "Dos."]
+        assert split_parrafos(" simple ") == ["simple"]
+        assert split_parrafos("a\xa0 b") == ["a\xa0 b"]
+        assert split_parrafos("   ") == []
+
+
+class TestProfileText:
+    """Tests para el perfilado de las funciones calientes."""
+
+    def test_counts(self):
+        text_normalize.clear_cache()
+        with profile_text() as perfil:
+            normalize_text("simple")
+            normalize_text("a &amp; b")
+            normalize_short("Ministerio de Justicia")
+            normalize_short("Ministerio de Justicia")
+            escape_html("texto")
+        assert perfil.calls["normalize_text"] == 2
+        assert perfil.unchanged["normalize_text"] == 1
+        assert perfil.unchanged["escape_html"] == 1
+        assert (perfil.cache_hits, perfil.cache_misses) == (1, 1)
+        assert "normalize_short" in perfil.report()
+        assert perfil.to_dict()["cache"] == {"aciertos": 1, "fallos": 1}
+
+    def test_inactive_outside_block(self):
+        with profile_text() as perfil:
+            pass
+        normalize_text("fuera")
+        assert not perfil.calls